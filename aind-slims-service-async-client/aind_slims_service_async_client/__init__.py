@@ -32,17 +32,22 @@ from aind_slims_service_async_client.exceptions import ApiAttributeError
 from aind_slims_service_async_client.exceptions import ApiException
 
 # import models into sdk package
+from aind_slims_service_async_client.models.cache_metrics import CacheMetrics
 from aind_slims_service_async_client.models.ecephys_reward_spouts import EcephysRewardSpouts
 from aind_slims_service_async_client.models.ecephys_stream_module import EcephysStreamModule
 from aind_slims_service_async_client.models.http_validation_error import HTTPValidationError
 from aind_slims_service_async_client.models.health_check import HealthCheck
 from aind_slims_service_async_client.models.histology_reagent_data import HistologyReagentData
 from aind_slims_service_async_client.models.histology_wash_data import HistologyWashData
+from aind_slims_service_async_client.models.mirror_metrics import MirrorMetrics
+from aind_slims_service_async_client.models.session_pool_metrics import SessionPoolMetrics
+from aind_slims_service_async_client.models.single_flight_metrics import SingleFlightMetrics
 from aind_slims_service_async_client.models.slims_ecephys_data import SlimsEcephysData
 from aind_slims_service_async_client.models.slims_histology_data import SlimsHistologyData
 from aind_slims_service_async_client.models.slims_spim_data import SlimsSpimData
 from aind_slims_service_async_client.models.slims_viral_injection_data import SlimsViralInjectionData
 from aind_slims_service_async_client.models.slims_viral_material_data import SlimsViralMaterialData
 from aind_slims_service_async_client.models.slims_water_restriction_data import SlimsWaterRestrictionData
+from aind_slims_service_async_client.models.subject_batch_query import SubjectBatchQuery
 from aind_slims_service_async_client.models.validation_error import ValidationError
 from aind_slims_service_async_client.models.validation_error_loc_inner import ValidationErrorLocInner
@@ -24,6 +24,7 @@ from aind_slims_service_async_client.models.slims_histology_data import SlimsHis
 from aind_slims_service_async_client.models.slims_spim_data import SlimsSpimData
 from aind_slims_service_async_client.models.slims_viral_injection_data import SlimsViralInjectionData
 from aind_slims_service_async_client.models.slims_water_restriction_data import SlimsWaterRestrictionData
+from aind_slims_service_async_client.models.subject_batch_query import SubjectBatchQuery
 
 from aind_slims_service_async_client.api_client import ApiClient, RequestSerialized
 from aind_slims_service_async_client.api_response import ApiResponse
@@ -330,6 +331,9 @@ class DefaultApi:
         session_name: Annotated[Optional[StrictStr], Field(description="Name of the session")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Experiment run created on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Experiment run created on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -355,6 +359,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Experiment run created on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -382,6 +392,9 @@ class DefaultApi:
             session_name=session_name,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -410,6 +423,9 @@ class DefaultApi:
         session_name: Annotated[Optional[StrictStr], Field(description="Name of the session")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Experiment run created on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Experiment run created on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -435,6 +451,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Experiment run created on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -462,6 +484,9 @@ class DefaultApi:
             session_name=session_name,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -490,6 +515,9 @@ class DefaultApi:
         session_name: Annotated[Optional[StrictStr], Field(description="Name of the session")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Experiment run created on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Experiment run created on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -515,6 +543,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Experiment run created on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -542,6 +576,9 @@ class DefaultApi:
             session_name=session_name,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -565,6 +602,9 @@ class DefaultApi:
         session_name,
         start_date_gte,
         end_date_lte,
+        limit,
+        cursor,
+        stream,
         _request_auth,
         _content_type,
         _headers,
@@ -603,6 +643,18 @@ class DefaultApi:
             
             _query_params.append(('end_date_lte', end_date_lte))
             
+        if limit is not None:
+            
+            _query_params.append(('limit', limit))
+            
+        if cursor is not None:
+            
+            _query_params.append(('cursor', cursor))
+            
+        if stream is not None:
+            
+            _query_params.append(('stream', stream))
+            
         # process the header parameters
         # process the form parameters
         # process the body parameter
@@ -612,7 +664,8 @@ class DefaultApi:
         if 'Accept' not in _header_params:
             _header_params['Accept'] = self.api_client.select_header_accept(
                 [
-                    'application/json'
+                    'application/json', 
+                    'application/x-ndjson'
                 ]
             )
 
@@ -640,11 +693,9 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_histology_data(
+    async def get_ecephys_sessions_by_subject(
         self,
-        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
-        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
-        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        subject_batch_query: SubjectBatchQuery,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -657,17 +708,13 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> List[SlimsHistologyData]:
-        """Get Histology Data
+    ) -> Dict[str, List[SlimsEcephysData]]:
+        """Get Ecephys Sessions By Subject
 
-        ## Histology metadata Retrieves histology information from SLIMS.
+        ## Ecephys session metadata of a batch of subjects Retrieves Ecephys session information of several subjects from SLIMS in one query. Results are grouped by subject ID.
 
-        :param subject_id: Subject ID
-        :type subject_id: str
-        :param start_date_gte: Date performed on or after. (ISO format)
-        :type start_date_gte: str
-        :param end_date_lte: Date performed on or before. (ISO format)
-        :type end_date_lte: str
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -690,10 +737,8 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_histology_data_serialize(
-            subject_id=subject_id,
-            start_date_gte=start_date_gte,
-            end_date_lte=end_date_lte,
+        _param = self._get_ecephys_sessions_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -701,7 +746,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsHistologyData]",
+            '200': "Dict[str, List[SlimsEcephysData]]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -716,11 +761,9 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_histology_data_with_http_info(
+    async def get_ecephys_sessions_by_subject_with_http_info(
         self,
-        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
-        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
-        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        subject_batch_query: SubjectBatchQuery,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -733,17 +776,13 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> ApiResponse[List[SlimsHistologyData]]:
-        """Get Histology Data
+    ) -> ApiResponse[Dict[str, List[SlimsEcephysData]]]:
+        """Get Ecephys Sessions By Subject
 
-        ## Histology metadata Retrieves histology information from SLIMS.
+        ## Ecephys session metadata of a batch of subjects Retrieves Ecephys session information of several subjects from SLIMS in one query. Results are grouped by subject ID.
 
-        :param subject_id: Subject ID
-        :type subject_id: str
-        :param start_date_gte: Date performed on or after. (ISO format)
-        :type start_date_gte: str
-        :param end_date_lte: Date performed on or before. (ISO format)
-        :type end_date_lte: str
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -766,10 +805,8 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_histology_data_serialize(
-            subject_id=subject_id,
-            start_date_gte=start_date_gte,
-            end_date_lte=end_date_lte,
+        _param = self._get_ecephys_sessions_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -777,7 +814,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsHistologyData]",
+            '200': "Dict[str, List[SlimsEcephysData]]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -792,11 +829,9 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_histology_data_without_preload_content(
+    async def get_ecephys_sessions_by_subject_without_preload_content(
         self,
-        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
-        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
-        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        subject_batch_query: SubjectBatchQuery,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -810,16 +845,12 @@ class DefaultApi:
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
     ) -> RESTResponseType:
-        """Get Histology Data
+        """Get Ecephys Sessions By Subject
 
-        ## Histology metadata Retrieves histology information from SLIMS.
+        ## Ecephys session metadata of a batch of subjects Retrieves Ecephys session information of several subjects from SLIMS in one query. Results are grouped by subject ID.
 
-        :param subject_id: Subject ID
-        :type subject_id: str
-        :param start_date_gte: Date performed on or after. (ISO format)
-        :type start_date_gte: str
-        :param end_date_lte: Date performed on or before. (ISO format)
-        :type end_date_lte: str
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -842,10 +873,8 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_histology_data_serialize(
-            subject_id=subject_id,
-            start_date_gte=start_date_gte,
-            end_date_lte=end_date_lte,
+        _param = self._get_ecephys_sessions_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -853,7 +882,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsHistologyData]",
+            '200': "Dict[str, List[SlimsEcephysData]]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -863,11 +892,9 @@ class DefaultApi:
         return response_data.response
 
 
-    def _get_histology_data_serialize(
+    def _get_ecephys_sessions_by_subject_serialize(
         self,
-        subject_id,
-        start_date_gte,
-        end_date_lte,
+        subject_batch_query,
         _request_auth,
         _content_type,
         _headers,
@@ -890,21 +917,11 @@ class DefaultApi:
 
         # process the path parameters
         # process the query parameters
-        if subject_id is not None:
-            
-            _query_params.append(('subject_id', subject_id))
-            
-        if start_date_gte is not None:
-            
-            _query_params.append(('start_date_gte', start_date_gte))
-            
-        if end_date_lte is not None:
-            
-            _query_params.append(('end_date_lte', end_date_lte))
-            
         # process the header parameters
         # process the form parameters
         # process the body parameter
+        if subject_batch_query is not None:
+            _body_params = subject_batch_query
 
 
         # set the HTTP header `Accept`
@@ -915,14 +932,27 @@ class DefaultApi:
                 ]
             )
 
+        # set the HTTP header `Content-Type`
+        if _content_type:
+            _header_params['Content-Type'] = _content_type
+        else:
+            _default_content_type = (
+                self.api_client.select_header_content_type(
+                    [
+                        'application/json'
+                    ]
+                )
+            )
+            if _default_content_type is not None:
+                _header_params['Content-Type'] = _default_content_type
 
         # authentication setting
         _auth_settings: List[str] = [
         ]
 
         return self.api_client.param_serialize(
-            method='GET',
-            resource_path='/histology',
+            method='POST',
+            resource_path='/ecephys_sessions/by_subject',
             path_params=_path_params,
             query_params=_query_params,
             header_params=_header_params,
@@ -939,11 +969,14 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_smartspim_imaging(
+    async def get_histology_data(
         self,
         subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -956,10 +989,10 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> List[SlimsSpimData]:
-        """Get Smartspim Imaging
+    ) -> List[SlimsHistologyData]:
+        """Get Histology Data
 
-        ## SmartSPIM imaging metadata Retrieves SmartSPIM imaging information from SLIMS.
+        ## Histology metadata Retrieves histology information from SLIMS.
 
         :param subject_id: Subject ID
         :type subject_id: str
@@ -967,6 +1000,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Date performed on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -989,10 +1028,13 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_smartspim_imaging_serialize(
+        _param = self._get_histology_data_serialize(
             subject_id=subject_id,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1000,7 +1042,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsSpimData]",
+            '200': "List[SlimsHistologyData]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1015,11 +1057,14 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_smartspim_imaging_with_http_info(
+    async def get_histology_data_with_http_info(
         self,
         subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1032,10 +1077,10 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> ApiResponse[List[SlimsSpimData]]:
-        """Get Smartspim Imaging
+    ) -> ApiResponse[List[SlimsHistologyData]]:
+        """Get Histology Data
 
-        ## SmartSPIM imaging metadata Retrieves SmartSPIM imaging information from SLIMS.
+        ## Histology metadata Retrieves histology information from SLIMS.
 
         :param subject_id: Subject ID
         :type subject_id: str
@@ -1043,6 +1088,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Date performed on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1065,10 +1116,13 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_smartspim_imaging_serialize(
+        _param = self._get_histology_data_serialize(
             subject_id=subject_id,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1076,7 +1130,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsSpimData]",
+            '200': "List[SlimsHistologyData]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1091,11 +1145,14 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_smartspim_imaging_without_preload_content(
+    async def get_histology_data_without_preload_content(
         self,
         subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1109,9 +1166,9 @@ class DefaultApi:
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
     ) -> RESTResponseType:
-        """Get Smartspim Imaging
+        """Get Histology Data
 
-        ## SmartSPIM imaging metadata Retrieves SmartSPIM imaging information from SLIMS.
+        ## Histology metadata Retrieves histology information from SLIMS.
 
         :param subject_id: Subject ID
         :type subject_id: str
@@ -1119,6 +1176,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Date performed on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1141,10 +1204,13 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_smartspim_imaging_serialize(
+        _param = self._get_histology_data_serialize(
             subject_id=subject_id,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1152,7 +1218,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsSpimData]",
+            '200': "List[SlimsHistologyData]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1162,11 +1228,14 @@ class DefaultApi:
         return response_data.response
 
 
-    def _get_smartspim_imaging_serialize(
+    def _get_histology_data_serialize(
         self,
         subject_id,
         start_date_gte,
         end_date_lte,
+        limit,
+        cursor,
+        stream,
         _request_auth,
         _content_type,
         _headers,
@@ -1201,6 +1270,18 @@ class DefaultApi:
             
             _query_params.append(('end_date_lte', end_date_lte))
             
+        if limit is not None:
+            
+            _query_params.append(('limit', limit))
+            
+        if cursor is not None:
+            
+            _query_params.append(('cursor', cursor))
+            
+        if stream is not None:
+            
+            _query_params.append(('stream', stream))
+            
         # process the header parameters
         # process the form parameters
         # process the body parameter
@@ -1210,7 +1291,8 @@ class DefaultApi:
         if 'Accept' not in _header_params:
             _header_params['Accept'] = self.api_client.select_header_accept(
                 [
-                    'application/json'
+                    'application/json', 
+                    'application/x-ndjson'
                 ]
             )
 
@@ -1221,7 +1303,7 @@ class DefaultApi:
 
         return self.api_client.param_serialize(
             method='GET',
-            resource_path='/smartspim_imaging',
+            resource_path='/histology',
             path_params=_path_params,
             query_params=_query_params,
             header_params=_header_params,
@@ -1238,11 +1320,9 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_viral_injections(
+    async def get_histology_data_by_subject(
         self,
-        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
-        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
-        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        subject_batch_query: SubjectBatchQuery,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1255,17 +1335,13 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> List[SlimsViralInjectionData]:
-        """Get Viral Injections
+    ) -> Dict[str, List[SlimsHistologyData]]:
+        """Get Histology Data By Subject
 
-        ## Viral Injection data Retrieves viral injection information from SLIMS.
+        ## Histology metadata of a batch of subjects Retrieves histology information of several subjects from SLIMS in one query. Results are grouped by subject ID.
 
-        :param subject_id: Subject ID
-        :type subject_id: str
-        :param start_date_gte: Date performed on or after. (ISO format)
-        :type start_date_gte: str
-        :param end_date_lte: Date performed on or before. (ISO format)
-        :type end_date_lte: str
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1288,10 +1364,8 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_viral_injections_serialize(
-            subject_id=subject_id,
-            start_date_gte=start_date_gte,
-            end_date_lte=end_date_lte,
+        _param = self._get_histology_data_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1299,7 +1373,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsViralInjectionData]",
+            '200': "Dict[str, List[SlimsHistologyData]]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1314,11 +1388,9 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_viral_injections_with_http_info(
+    async def get_histology_data_by_subject_with_http_info(
         self,
-        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
-        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
-        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        subject_batch_query: SubjectBatchQuery,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1331,17 +1403,13 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> ApiResponse[List[SlimsViralInjectionData]]:
-        """Get Viral Injections
+    ) -> ApiResponse[Dict[str, List[SlimsHistologyData]]]:
+        """Get Histology Data By Subject
 
-        ## Viral Injection data Retrieves viral injection information from SLIMS.
+        ## Histology metadata of a batch of subjects Retrieves histology information of several subjects from SLIMS in one query. Results are grouped by subject ID.
 
-        :param subject_id: Subject ID
-        :type subject_id: str
-        :param start_date_gte: Date performed on or after. (ISO format)
-        :type start_date_gte: str
-        :param end_date_lte: Date performed on or before. (ISO format)
-        :type end_date_lte: str
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1364,10 +1432,8 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_viral_injections_serialize(
-            subject_id=subject_id,
-            start_date_gte=start_date_gte,
-            end_date_lte=end_date_lte,
+        _param = self._get_histology_data_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1375,7 +1441,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsViralInjectionData]",
+            '200': "Dict[str, List[SlimsHistologyData]]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1390,11 +1456,9 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_viral_injections_without_preload_content(
+    async def get_histology_data_by_subject_without_preload_content(
         self,
-        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
-        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
-        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        subject_batch_query: SubjectBatchQuery,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1408,16 +1472,12 @@ class DefaultApi:
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
     ) -> RESTResponseType:
-        """Get Viral Injections
+        """Get Histology Data By Subject
 
-        ## Viral Injection data Retrieves viral injection information from SLIMS.
+        ## Histology metadata of a batch of subjects Retrieves histology information of several subjects from SLIMS in one query. Results are grouped by subject ID.
 
-        :param subject_id: Subject ID
-        :type subject_id: str
-        :param start_date_gte: Date performed on or after. (ISO format)
-        :type start_date_gte: str
-        :param end_date_lte: Date performed on or before. (ISO format)
-        :type end_date_lte: str
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1440,10 +1500,8 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_viral_injections_serialize(
-            subject_id=subject_id,
-            start_date_gte=start_date_gte,
-            end_date_lte=end_date_lte,
+        _param = self._get_histology_data_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1451,7 +1509,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsViralInjectionData]",
+            '200': "Dict[str, List[SlimsHistologyData]]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1461,11 +1519,9 @@ class DefaultApi:
         return response_data.response
 
 
-    def _get_viral_injections_serialize(
+    def _get_histology_data_by_subject_serialize(
         self,
-        subject_id,
-        start_date_gte,
-        end_date_lte,
+        subject_batch_query,
         _request_auth,
         _content_type,
         _headers,
@@ -1488,21 +1544,11 @@ class DefaultApi:
 
         # process the path parameters
         # process the query parameters
-        if subject_id is not None:
-            
-            _query_params.append(('subject_id', subject_id))
-            
-        if start_date_gte is not None:
-            
-            _query_params.append(('start_date_gte', start_date_gte))
-            
-        if end_date_lte is not None:
-            
-            _query_params.append(('end_date_lte', end_date_lte))
-            
         # process the header parameters
         # process the form parameters
         # process the body parameter
+        if subject_batch_query is not None:
+            _body_params = subject_batch_query
 
 
         # set the HTTP header `Accept`
@@ -1513,14 +1559,27 @@ class DefaultApi:
                 ]
             )
 
+        # set the HTTP header `Content-Type`
+        if _content_type:
+            _header_params['Content-Type'] = _content_type
+        else:
+            _default_content_type = (
+                self.api_client.select_header_content_type(
+                    [
+                        'application/json'
+                    ]
+                )
+            )
+            if _default_content_type is not None:
+                _header_params['Content-Type'] = _default_content_type
 
         # authentication setting
         _auth_settings: List[str] = [
         ]
 
         return self.api_client.param_serialize(
-            method='GET',
-            resource_path='/viral_injections',
+            method='POST',
+            resource_path='/histology/by_subject',
             path_params=_path_params,
             query_params=_query_params,
             header_params=_header_params,
@@ -1537,11 +1596,14 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_water_restriction_data(
+    async def get_smartspim_imaging(
         self,
         subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1554,10 +1616,10 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> List[SlimsWaterRestrictionData]:
-        """Get Water Restriction Data
+    ) -> List[SlimsSpimData]:
+        """Get Smartspim Imaging
 
-        ## Water Restriction data Retrieves water restriction information from SLIMS.
+        ## SmartSPIM imaging metadata Retrieves SmartSPIM imaging information from SLIMS.
 
         :param subject_id: Subject ID
         :type subject_id: str
@@ -1565,6 +1627,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Date performed on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1587,10 +1655,13 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_water_restriction_data_serialize(
+        _param = self._get_smartspim_imaging_serialize(
             subject_id=subject_id,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1598,7 +1669,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsWaterRestrictionData]",
+            '200': "List[SlimsSpimData]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1613,11 +1684,14 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_water_restriction_data_with_http_info(
+    async def get_smartspim_imaging_with_http_info(
         self,
         subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1630,10 +1704,10 @@ class DefaultApi:
         _content_type: Optional[StrictStr] = None,
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
-    ) -> ApiResponse[List[SlimsWaterRestrictionData]]:
-        """Get Water Restriction Data
+    ) -> ApiResponse[List[SlimsSpimData]]:
+        """Get Smartspim Imaging
 
-        ## Water Restriction data Retrieves water restriction information from SLIMS.
+        ## SmartSPIM imaging metadata Retrieves SmartSPIM imaging information from SLIMS.
 
         :param subject_id: Subject ID
         :type subject_id: str
@@ -1641,6 +1715,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Date performed on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1663,10 +1743,13 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_water_restriction_data_serialize(
+        _param = self._get_smartspim_imaging_serialize(
             subject_id=subject_id,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1674,7 +1757,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsWaterRestrictionData]",
+            '200': "List[SlimsSpimData]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1689,11 +1772,14 @@ class DefaultApi:
 
 
     @validate_call
-    async def get_water_restriction_data_without_preload_content(
+    async def get_smartspim_imaging_without_preload_content(
         self,
         subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
         start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
         end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
         _request_timeout: Union[
             None,
             Annotated[StrictFloat, Field(gt=0)],
@@ -1707,9 +1793,9 @@ class DefaultApi:
         _headers: Optional[Dict[StrictStr, Any]] = None,
         _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
     ) -> RESTResponseType:
-        """Get Water Restriction Data
+        """Get Smartspim Imaging
 
-        ## Water Restriction data Retrieves water restriction information from SLIMS.
+        ## SmartSPIM imaging metadata Retrieves SmartSPIM imaging information from SLIMS.
 
         :param subject_id: Subject ID
         :type subject_id: str
@@ -1717,6 +1803,12 @@ class DefaultApi:
         :type start_date_gte: str
         :param end_date_lte: Date performed on or before. (ISO format)
         :type end_date_lte: str
+        :param limit: Maximum number of experiment runs per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
         :param _request_timeout: timeout setting for this request. If one
                                  number provided, it will be total request
                                  timeout. It can also be a pair (tuple) of
@@ -1739,10 +1831,13 @@ class DefaultApi:
         :return: Returns the result object.
         """ # noqa: E501
 
-        _param = self._get_water_restriction_data_serialize(
+        _param = self._get_smartspim_imaging_serialize(
             subject_id=subject_id,
             start_date_gte=start_date_gte,
             end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
             _request_auth=_request_auth,
             _content_type=_content_type,
             _headers=_headers,
@@ -1750,7 +1845,7 @@ class DefaultApi:
         )
 
         _response_types_map: Dict[str, Optional[str]] = {
-            '200': "List[SlimsWaterRestrictionData]",
+            '200': "List[SlimsSpimData]",
             '422': "HTTPValidationError",
         }
         response_data = await self.api_client.call_api(
@@ -1760,11 +1855,14 @@ class DefaultApi:
         return response_data.response
 
 
-    def _get_water_restriction_data_serialize(
+    def _get_smartspim_imaging_serialize(
         self,
         subject_id,
         start_date_gte,
         end_date_lte,
+        limit,
+        cursor,
+        stream,
         _request_auth,
         _content_type,
         _headers,
@@ -1799,6 +1897,18 @@ class DefaultApi:
             
             _query_params.append(('end_date_lte', end_date_lte))
             
+        if limit is not None:
+            
+            _query_params.append(('limit', limit))
+            
+        if cursor is not None:
+            
+            _query_params.append(('cursor', cursor))
+            
+        if stream is not None:
+            
+            _query_params.append(('stream', stream))
+            
         # process the header parameters
         # process the form parameters
         # process the body parameter
@@ -1808,7 +1918,8 @@ class DefaultApi:
         if 'Accept' not in _header_params:
             _header_params['Accept'] = self.api_client.select_header_accept(
                 [
-                    'application/json'
+                    'application/json', 
+                    'application/x-ndjson'
                 ]
             )
 
@@ -1819,7 +1930,1537 @@ class DefaultApi:
 
         return self.api_client.param_serialize(
             method='GET',
-            resource_path='/water_restriction',
+            resource_path='/smartspim_imaging',
+            path_params=_path_params,
+            query_params=_query_params,
+            header_params=_header_params,
+            body=_body_params,
+            post_params=_form_params,
+            files=_files,
+            auth_settings=_auth_settings,
+            collection_formats=_collection_formats,
+            _host=_host,
+            _request_auth=_request_auth
+        )
+
+
+
+
+    @validate_call
+    async def get_smartspim_imaging_by_subject(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> Dict[str, List[SlimsSpimData]]:
+        """Get Smartspim Imaging By Subject
+
+        ## SmartSPIM imaging metadata of a batch of subjects Retrieves SmartSPIM imaging information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_smartspim_imaging_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsSpimData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        ).data
+
+
+    @validate_call
+    async def get_smartspim_imaging_by_subject_with_http_info(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> ApiResponse[Dict[str, List[SlimsSpimData]]]:
+        """Get Smartspim Imaging By Subject
+
+        ## SmartSPIM imaging metadata of a batch of subjects Retrieves SmartSPIM imaging information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_smartspim_imaging_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsSpimData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        )
+
+
+    @validate_call
+    async def get_smartspim_imaging_by_subject_without_preload_content(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> RESTResponseType:
+        """Get Smartspim Imaging By Subject
+
+        ## SmartSPIM imaging metadata of a batch of subjects Retrieves SmartSPIM imaging information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_smartspim_imaging_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsSpimData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        return response_data.response
+
+
+    def _get_smartspim_imaging_by_subject_serialize(
+        self,
+        subject_batch_query,
+        _request_auth,
+        _content_type,
+        _headers,
+        _host_index,
+    ) -> RequestSerialized:
+
+        _host = None
+
+        _collection_formats: Dict[str, str] = {
+        }
+
+        _path_params: Dict[str, str] = {}
+        _query_params: List[Tuple[str, str]] = []
+        _header_params: Dict[str, Optional[str]] = _headers or {}
+        _form_params: List[Tuple[str, str]] = []
+        _files: Dict[
+            str, Union[str, bytes, List[str], List[bytes], List[Tuple[str, bytes]]]
+        ] = {}
+        _body_params: Optional[bytes] = None
+
+        # process the path parameters
+        # process the query parameters
+        # process the header parameters
+        # process the form parameters
+        # process the body parameter
+        if subject_batch_query is not None:
+            _body_params = subject_batch_query
+
+
+        # set the HTTP header `Accept`
+        if 'Accept' not in _header_params:
+            _header_params['Accept'] = self.api_client.select_header_accept(
+                [
+                    'application/json'
+                ]
+            )
+
+        # set the HTTP header `Content-Type`
+        if _content_type:
+            _header_params['Content-Type'] = _content_type
+        else:
+            _default_content_type = (
+                self.api_client.select_header_content_type(
+                    [
+                        'application/json'
+                    ]
+                )
+            )
+            if _default_content_type is not None:
+                _header_params['Content-Type'] = _default_content_type
+
+        # authentication setting
+        _auth_settings: List[str] = [
+        ]
+
+        return self.api_client.param_serialize(
+            method='POST',
+            resource_path='/smartspim_imaging/by_subject',
+            path_params=_path_params,
+            query_params=_query_params,
+            header_params=_header_params,
+            body=_body_params,
+            post_params=_form_params,
+            files=_files,
+            auth_settings=_auth_settings,
+            collection_formats=_collection_formats,
+            _host=_host,
+            _request_auth=_request_auth
+        )
+
+
+
+
+    @validate_call
+    async def get_viral_injections(
+        self,
+        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
+        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
+        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of viral injections per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> List[SlimsViralInjectionData]:
+        """Get Viral Injections
+
+        ## Viral Injection data Retrieves viral injection information from SLIMS.
+
+        :param subject_id: Subject ID
+        :type subject_id: str
+        :param start_date_gte: Date performed on or after. (ISO format)
+        :type start_date_gte: str
+        :param end_date_lte: Date performed on or before. (ISO format)
+        :type end_date_lte: str
+        :param limit: Maximum number of viral injections per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_viral_injections_serialize(
+            subject_id=subject_id,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "List[SlimsViralInjectionData]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        ).data
+
+
+    @validate_call
+    async def get_viral_injections_with_http_info(
+        self,
+        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
+        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
+        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of viral injections per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> ApiResponse[List[SlimsViralInjectionData]]:
+        """Get Viral Injections
+
+        ## Viral Injection data Retrieves viral injection information from SLIMS.
+
+        :param subject_id: Subject ID
+        :type subject_id: str
+        :param start_date_gte: Date performed on or after. (ISO format)
+        :type start_date_gte: str
+        :param end_date_lte: Date performed on or before. (ISO format)
+        :type end_date_lte: str
+        :param limit: Maximum number of viral injections per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_viral_injections_serialize(
+            subject_id=subject_id,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "List[SlimsViralInjectionData]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        )
+
+
+    @validate_call
+    async def get_viral_injections_without_preload_content(
+        self,
+        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
+        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
+        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of viral injections per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> RESTResponseType:
+        """Get Viral Injections
+
+        ## Viral Injection data Retrieves viral injection information from SLIMS.
+
+        :param subject_id: Subject ID
+        :type subject_id: str
+        :param start_date_gte: Date performed on or after. (ISO format)
+        :type start_date_gte: str
+        :param end_date_lte: Date performed on or before. (ISO format)
+        :type end_date_lte: str
+        :param limit: Maximum number of viral injections per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_viral_injections_serialize(
+            subject_id=subject_id,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "List[SlimsViralInjectionData]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        return response_data.response
+
+
+    def _get_viral_injections_serialize(
+        self,
+        subject_id,
+        start_date_gte,
+        end_date_lte,
+        limit,
+        cursor,
+        stream,
+        _request_auth,
+        _content_type,
+        _headers,
+        _host_index,
+    ) -> RequestSerialized:
+
+        _host = None
+
+        _collection_formats: Dict[str, str] = {
+        }
+
+        _path_params: Dict[str, str] = {}
+        _query_params: List[Tuple[str, str]] = []
+        _header_params: Dict[str, Optional[str]] = _headers or {}
+        _form_params: List[Tuple[str, str]] = []
+        _files: Dict[
+            str, Union[str, bytes, List[str], List[bytes], List[Tuple[str, bytes]]]
+        ] = {}
+        _body_params: Optional[bytes] = None
+
+        # process the path parameters
+        # process the query parameters
+        if subject_id is not None:
+            
+            _query_params.append(('subject_id', subject_id))
+            
+        if start_date_gte is not None:
+            
+            _query_params.append(('start_date_gte', start_date_gte))
+            
+        if end_date_lte is not None:
+            
+            _query_params.append(('end_date_lte', end_date_lte))
+            
+        if limit is not None:
+            
+            _query_params.append(('limit', limit))
+            
+        if cursor is not None:
+            
+            _query_params.append(('cursor', cursor))
+            
+        if stream is not None:
+            
+            _query_params.append(('stream', stream))
+            
+        # process the header parameters
+        # process the form parameters
+        # process the body parameter
+
+
+        # set the HTTP header `Accept`
+        if 'Accept' not in _header_params:
+            _header_params['Accept'] = self.api_client.select_header_accept(
+                [
+                    'application/json', 
+                    'application/x-ndjson'
+                ]
+            )
+
+
+        # authentication setting
+        _auth_settings: List[str] = [
+        ]
+
+        return self.api_client.param_serialize(
+            method='GET',
+            resource_path='/viral_injections',
+            path_params=_path_params,
+            query_params=_query_params,
+            header_params=_header_params,
+            body=_body_params,
+            post_params=_form_params,
+            files=_files,
+            auth_settings=_auth_settings,
+            collection_formats=_collection_formats,
+            _host=_host,
+            _request_auth=_request_auth
+        )
+
+
+
+
+    @validate_call
+    async def get_viral_injections_by_subject(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> Dict[str, List[SlimsViralInjectionData]]:
+        """Get Viral Injections By Subject
+
+        ## Viral Injection data of a batch of subjects Retrieves viral injection information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_viral_injections_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsViralInjectionData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        ).data
+
+
+    @validate_call
+    async def get_viral_injections_by_subject_with_http_info(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> ApiResponse[Dict[str, List[SlimsViralInjectionData]]]:
+        """Get Viral Injections By Subject
+
+        ## Viral Injection data of a batch of subjects Retrieves viral injection information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_viral_injections_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsViralInjectionData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        )
+
+
+    @validate_call
+    async def get_viral_injections_by_subject_without_preload_content(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> RESTResponseType:
+        """Get Viral Injections By Subject
+
+        ## Viral Injection data of a batch of subjects Retrieves viral injection information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_viral_injections_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsViralInjectionData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        return response_data.response
+
+
+    def _get_viral_injections_by_subject_serialize(
+        self,
+        subject_batch_query,
+        _request_auth,
+        _content_type,
+        _headers,
+        _host_index,
+    ) -> RequestSerialized:
+
+        _host = None
+
+        _collection_formats: Dict[str, str] = {
+        }
+
+        _path_params: Dict[str, str] = {}
+        _query_params: List[Tuple[str, str]] = []
+        _header_params: Dict[str, Optional[str]] = _headers or {}
+        _form_params: List[Tuple[str, str]] = []
+        _files: Dict[
+            str, Union[str, bytes, List[str], List[bytes], List[Tuple[str, bytes]]]
+        ] = {}
+        _body_params: Optional[bytes] = None
+
+        # process the path parameters
+        # process the query parameters
+        # process the header parameters
+        # process the form parameters
+        # process the body parameter
+        if subject_batch_query is not None:
+            _body_params = subject_batch_query
+
+
+        # set the HTTP header `Accept`
+        if 'Accept' not in _header_params:
+            _header_params['Accept'] = self.api_client.select_header_accept(
+                [
+                    'application/json'
+                ]
+            )
+
+        # set the HTTP header `Content-Type`
+        if _content_type:
+            _header_params['Content-Type'] = _content_type
+        else:
+            _default_content_type = (
+                self.api_client.select_header_content_type(
+                    [
+                        'application/json'
+                    ]
+                )
+            )
+            if _default_content_type is not None:
+                _header_params['Content-Type'] = _default_content_type
+
+        # authentication setting
+        _auth_settings: List[str] = [
+        ]
+
+        return self.api_client.param_serialize(
+            method='POST',
+            resource_path='/viral_injections/by_subject',
+            path_params=_path_params,
+            query_params=_query_params,
+            header_params=_header_params,
+            body=_body_params,
+            post_params=_form_params,
+            files=_files,
+            auth_settings=_auth_settings,
+            collection_formats=_collection_formats,
+            _host=_host,
+            _request_auth=_request_auth
+        )
+
+
+
+
+    @validate_call
+    async def get_water_restriction_data(
+        self,
+        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
+        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
+        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of content events per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> List[SlimsWaterRestrictionData]:
+        """Get Water Restriction Data
+
+        ## Water Restriction data Retrieves water restriction information from SLIMS.
+
+        :param subject_id: Subject ID
+        :type subject_id: str
+        :param start_date_gte: Date performed on or after. (ISO format)
+        :type start_date_gte: str
+        :param end_date_lte: Date performed on or before. (ISO format)
+        :type end_date_lte: str
+        :param limit: Maximum number of content events per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_water_restriction_data_serialize(
+            subject_id=subject_id,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "List[SlimsWaterRestrictionData]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        ).data
+
+
+    @validate_call
+    async def get_water_restriction_data_with_http_info(
+        self,
+        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
+        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
+        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of content events per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> ApiResponse[List[SlimsWaterRestrictionData]]:
+        """Get Water Restriction Data
+
+        ## Water Restriction data Retrieves water restriction information from SLIMS.
+
+        :param subject_id: Subject ID
+        :type subject_id: str
+        :param start_date_gte: Date performed on or after. (ISO format)
+        :type start_date_gte: str
+        :param end_date_lte: Date performed on or before. (ISO format)
+        :type end_date_lte: str
+        :param limit: Maximum number of content events per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_water_restriction_data_serialize(
+            subject_id=subject_id,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "List[SlimsWaterRestrictionData]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        )
+
+
+    @validate_call
+    async def get_water_restriction_data_without_preload_content(
+        self,
+        subject_id: Annotated[Optional[StrictStr], Field(description="Subject ID")] = None,
+        start_date_gte: Annotated[Optional[StrictStr], Field(description="Date performed on or after. (ISO format)")] = None,
+        end_date_lte: Annotated[Optional[StrictStr], Field(description="Date performed on or before. (ISO format)")] = None,
+        limit: Annotated[Optional[Annotated[int, Field(le=1000, strict=True, ge=1)]], Field(description="Maximum number of content events per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.")] = None,
+        cursor: Annotated[Optional[StrictStr], Field(description="Cursor of the page to return, from the X-Next-Cursor header of the previous page.")] = None,
+        stream: Annotated[Optional[StrictBool], Field(description="Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.")] = None,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> RESTResponseType:
+        """Get Water Restriction Data
+
+        ## Water Restriction data Retrieves water restriction information from SLIMS.
+
+        :param subject_id: Subject ID
+        :type subject_id: str
+        :param start_date_gte: Date performed on or after. (ISO format)
+        :type start_date_gte: str
+        :param end_date_lte: Date performed on or before. (ISO format)
+        :type end_date_lte: str
+        :param limit: Maximum number of content events per page, newest first. The cursor of the next page is returned in the X-Next-Cursor header.
+        :type limit: int
+        :param cursor: Cursor of the page to return, from the X-Next-Cursor header of the previous page.
+        :type cursor: str
+        :param stream: Stream the results as newline-delimited JSON. Same as sending Accept: application/x-ndjson.
+        :type stream: bool
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_water_restriction_data_serialize(
+            subject_id=subject_id,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            limit=limit,
+            cursor=cursor,
+            stream=stream,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "List[SlimsWaterRestrictionData]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        return response_data.response
+
+
+    def _get_water_restriction_data_serialize(
+        self,
+        subject_id,
+        start_date_gte,
+        end_date_lte,
+        limit,
+        cursor,
+        stream,
+        _request_auth,
+        _content_type,
+        _headers,
+        _host_index,
+    ) -> RequestSerialized:
+
+        _host = None
+
+        _collection_formats: Dict[str, str] = {
+        }
+
+        _path_params: Dict[str, str] = {}
+        _query_params: List[Tuple[str, str]] = []
+        _header_params: Dict[str, Optional[str]] = _headers or {}
+        _form_params: List[Tuple[str, str]] = []
+        _files: Dict[
+            str, Union[str, bytes, List[str], List[bytes], List[Tuple[str, bytes]]]
+        ] = {}
+        _body_params: Optional[bytes] = None
+
+        # process the path parameters
+        # process the query parameters
+        if subject_id is not None:
+            
+            _query_params.append(('subject_id', subject_id))
+            
+        if start_date_gte is not None:
+            
+            _query_params.append(('start_date_gte', start_date_gte))
+            
+        if end_date_lte is not None:
+            
+            _query_params.append(('end_date_lte', end_date_lte))
+            
+        if limit is not None:
+            
+            _query_params.append(('limit', limit))
+            
+        if cursor is not None:
+            
+            _query_params.append(('cursor', cursor))
+            
+        if stream is not None:
+            
+            _query_params.append(('stream', stream))
+            
+        # process the header parameters
+        # process the form parameters
+        # process the body parameter
+
+
+        # set the HTTP header `Accept`
+        if 'Accept' not in _header_params:
+            _header_params['Accept'] = self.api_client.select_header_accept(
+                [
+                    'application/json', 
+                    'application/x-ndjson'
+                ]
+            )
+
+
+        # authentication setting
+        _auth_settings: List[str] = [
+        ]
+
+        return self.api_client.param_serialize(
+            method='GET',
+            resource_path='/water_restriction',
+            path_params=_path_params,
+            query_params=_query_params,
+            header_params=_header_params,
+            body=_body_params,
+            post_params=_form_params,
+            files=_files,
+            auth_settings=_auth_settings,
+            collection_formats=_collection_formats,
+            _host=_host,
+            _request_auth=_request_auth
+        )
+
+
+
+
+    @validate_call
+    async def get_water_restriction_data_by_subject(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> Dict[str, List[SlimsWaterRestrictionData]]:
+        """Get Water Restriction Data By Subject
+
+        ## Water Restriction data of a batch of subjects Retrieves water restriction information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_water_restriction_data_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsWaterRestrictionData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        ).data
+
+
+    @validate_call
+    async def get_water_restriction_data_by_subject_with_http_info(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> ApiResponse[Dict[str, List[SlimsWaterRestrictionData]]]:
+        """Get Water Restriction Data By Subject
+
+        ## Water Restriction data of a batch of subjects Retrieves water restriction information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_water_restriction_data_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsWaterRestrictionData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        await response_data.read()
+        return self.api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=_response_types_map,
+        )
+
+
+    @validate_call
+    async def get_water_restriction_data_by_subject_without_preload_content(
+        self,
+        subject_batch_query: SubjectBatchQuery,
+        _request_timeout: Union[
+            None,
+            Annotated[StrictFloat, Field(gt=0)],
+            Tuple[
+                Annotated[StrictFloat, Field(gt=0)],
+                Annotated[StrictFloat, Field(gt=0)]
+            ]
+        ] = None,
+        _request_auth: Optional[Dict[StrictStr, Any]] = None,
+        _content_type: Optional[StrictStr] = None,
+        _headers: Optional[Dict[StrictStr, Any]] = None,
+        _host_index: Annotated[StrictInt, Field(ge=0, le=0)] = 0,
+    ) -> RESTResponseType:
+        """Get Water Restriction Data By Subject
+
+        ## Water Restriction data of a batch of subjects Retrieves water restriction information of several subjects from SLIMS in one query. Results are grouped by subject ID.
+
+        :param subject_batch_query: (required)
+        :type subject_batch_query: SubjectBatchQuery
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        :type _request_timeout: int, tuple(int, int), optional
+        :param _request_auth: set to override the auth_settings for an a single
+                              request; this effectively ignores the
+                              authentication in the spec for a single request.
+        :type _request_auth: dict, optional
+        :param _content_type: force content-type for the request.
+        :type _content_type: str, Optional
+        :param _headers: set to override the headers for a single
+                         request; this effectively ignores the headers
+                         in the spec for a single request.
+        :type _headers: dict, optional
+        :param _host_index: set to override the host_index for a single
+                            request; this effectively ignores the host_index
+                            in the spec for a single request.
+        :type _host_index: int, optional
+        :return: Returns the result object.
+        """ # noqa: E501
+
+        _param = self._get_water_restriction_data_by_subject_serialize(
+            subject_batch_query=subject_batch_query,
+            _request_auth=_request_auth,
+            _content_type=_content_type,
+            _headers=_headers,
+            _host_index=_host_index
+        )
+
+        _response_types_map: Dict[str, Optional[str]] = {
+            '200': "Dict[str, List[SlimsWaterRestrictionData]]",
+            '422': "HTTPValidationError",
+        }
+        response_data = await self.api_client.call_api(
+            *_param,
+            _request_timeout=_request_timeout
+        )
+        return response_data.response
+
+
+    def _get_water_restriction_data_by_subject_serialize(
+        self,
+        subject_batch_query,
+        _request_auth,
+        _content_type,
+        _headers,
+        _host_index,
+    ) -> RequestSerialized:
+
+        _host = None
+
+        _collection_formats: Dict[str, str] = {
+        }
+
+        _path_params: Dict[str, str] = {}
+        _query_params: List[Tuple[str, str]] = []
+        _header_params: Dict[str, Optional[str]] = _headers or {}
+        _form_params: List[Tuple[str, str]] = []
+        _files: Dict[
+            str, Union[str, bytes, List[str], List[bytes], List[Tuple[str, bytes]]]
+        ] = {}
+        _body_params: Optional[bytes] = None
+
+        # process the path parameters
+        # process the query parameters
+        # process the header parameters
+        # process the form parameters
+        # process the body parameter
+        if subject_batch_query is not None:
+            _body_params = subject_batch_query
+
+
+        # set the HTTP header `Accept`
+        if 'Accept' not in _header_params:
+            _header_params['Accept'] = self.api_client.select_header_accept(
+                [
+                    'application/json'
+                ]
+            )
+
+        # set the HTTP header `Content-Type`
+        if _content_type:
+            _header_params['Content-Type'] = _content_type
+        else:
+            _default_content_type = (
+                self.api_client.select_header_content_type(
+                    [
+                        'application/json'
+                    ]
+                )
+            )
+            if _default_content_type is not None:
+                _header_params['Content-Type'] = _default_content_type
+
+        # authentication setting
+        _auth_settings: List[str] = [
+        ]
+
+        return self.api_client.param_serialize(
+            method='POST',
+            resource_path='/water_restriction/by_subject',
             path_params=_path_params,
             query_params=_query_params,
             header_params=_header_params,
@@ -0,0 +1,95 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+import pprint
+import re  # noqa: F401
+import json
+
+from pydantic import BaseModel, ConfigDict, StrictInt
+from typing import Any, ClassVar, Dict, List, Optional
+from typing import Optional, Set
+from typing_extensions import Self
+
+class CacheMetrics(BaseModel):
+    """
+    Metrics describing the state of an in-process cache.
+    """ # noqa: E501
+    size: StrictInt
+    max_size: StrictInt
+    hits: Optional[StrictInt] = 0
+    misses: Optional[StrictInt] = 0
+    evictions: Optional[StrictInt] = 0
+    __properties: ClassVar[List[str]] = ["size", "max_size", "hits", "misses", "evictions"]
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        validate_assignment=True,
+        protected_namespaces=(),
+    )
+
+
+    def to_str(self) -> str:
+        """Returns the string representation of the model using alias"""
+        return pprint.pformat(self.model_dump(by_alias=True))
+
+    def to_json(self) -> str:
+        """Returns the JSON representation of the model using alias"""
+        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_str: str) -> Optional[Self]:
+        """Create an instance of CacheMetrics from a JSON string"""
+        return cls.from_dict(json.loads(json_str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary representation of the model using alias.
+
+        This has the following differences from calling pydantic's
+        `self.model_dump(by_alias=True)`:
+
+        * `None` is only added to the output dict for nullable fields that
+          were set at model initialization. Other fields with value `None`
+          are ignored.
+        """
+        excluded_fields: Set[str] = set([
+        ])
+
+        _dict = self.model_dump(
+            by_alias=True,
+            exclude=excluded_fields,
+            exclude_none=True,
+        )
+        return _dict
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]:
+        """Create an instance of CacheMetrics from a dict"""
+        if obj is None:
+            return None
+
+        if not isinstance(obj, dict):
+            return cls.model_validate(obj)
+
+        _obj = cls.model_validate({
+            "size": obj.get("size"),
+            "max_size": obj.get("max_size"),
+            "hits": obj.get("hits") if obj.get("hits") is not None else 0,
+            "misses": obj.get("misses") if obj.get("misses") is not None else 0,
+            "evictions": obj.get("evictions") if obj.get("evictions") is not None else 0
+        })
+        return _obj
+
+
@@ -0,0 +1,108 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+import pprint
+import re  # noqa: F401
+import json
+
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, StrictBool, StrictInt
+from typing import Any, ClassVar, Dict, List, Optional
+from typing import Optional, Set
+from typing_extensions import Self
+
+class MirrorMetrics(BaseModel):
+    """
+    Metrics describing the state of the local SLIMS mirror.
+    """ # noqa: E501
+    enabled: StrictBool
+    ready: Optional[StrictBool] = False
+    synced_at: Optional[datetime] = None
+    reconciled_at: Optional[datetime] = None
+    rows_deleted: Optional[StrictInt] = 0
+    rows_restored: Optional[StrictInt] = 0
+    __properties: ClassVar[List[str]] = ["enabled", "ready", "synced_at", "reconciled_at", "rows_deleted", "rows_restored"]
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        validate_assignment=True,
+        protected_namespaces=(),
+    )
+
+
+    def to_str(self) -> str:
+        """Returns the string representation of the model using alias"""
+        return pprint.pformat(self.model_dump(by_alias=True))
+
+    def to_json(self) -> str:
+        """Returns the JSON representation of the model using alias"""
+        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_str: str) -> Optional[Self]:
+        """Create an instance of MirrorMetrics from a JSON string"""
+        return cls.from_dict(json.loads(json_str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary representation of the model using alias.
+
+        This has the following differences from calling pydantic's
+        `self.model_dump(by_alias=True)`:
+
+        * `None` is only added to the output dict for nullable fields that
+          were set at model initialization. Other fields with value `None`
+          are ignored.
+        """
+        excluded_fields: Set[str] = set([
+        ])
+
+        _dict = self.model_dump(
+            by_alias=True,
+            exclude=excluded_fields,
+            exclude_none=True,
+        )
+        # set to None if synced_at (nullable) is None
+        # and model_fields_set contains the field
+        if self.synced_at is None and "synced_at" in self.model_fields_set:
+            _dict['synced_at'] = None
+
+        # set to None if reconciled_at (nullable) is None
+        # and model_fields_set contains the field
+        if self.reconciled_at is None and "reconciled_at" in self.model_fields_set:
+            _dict['reconciled_at'] = None
+
+        return _dict
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]:
+        """Create an instance of MirrorMetrics from a dict"""
+        if obj is None:
+            return None
+
+        if not isinstance(obj, dict):
+            return cls.model_validate(obj)
+
+        _obj = cls.model_validate({
+            "enabled": obj.get("enabled"),
+            "ready": obj.get("ready") if obj.get("ready") is not None else False,
+            "synced_at": obj.get("synced_at"),
+            "reconciled_at": obj.get("reconciled_at"),
+            "rows_deleted": obj.get("rows_deleted") if obj.get("rows_deleted") is not None else 0,
+            "rows_restored": obj.get("rows_restored") if obj.get("rows_restored") is not None else 0
+        })
+        return _obj
+
+
@@ -0,0 +1,102 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+import pprint
+import re  # noqa: F401
+import json
+
+from pydantic import BaseModel, ConfigDict, Field, StrictStr
+from typing import Any, ClassVar, Dict, List, Optional
+from typing_extensions import Annotated
+from typing import Optional, Set
+from typing_extensions import Self
+
+class SubjectBatchQuery(BaseModel):
+    """
+    Request body of a list endpoint queried for a batch of subjects.
+    """ # noqa: E501
+    subject_ids: Annotated[List[Annotated[str, Field(min_length=1, strict=True)]], Field(min_length=1, max_length=500)] = Field(description="Labtracks IDs of mice.")
+    start_date_gte: Optional[StrictStr] = None
+    end_date_lte: Optional[StrictStr] = None
+    __properties: ClassVar[List[str]] = ["subject_ids", "start_date_gte", "end_date_lte"]
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        validate_assignment=True,
+        protected_namespaces=(),
+    )
+
+
+    def to_str(self) -> str:
+        """Returns the string representation of the model using alias"""
+        return pprint.pformat(self.model_dump(by_alias=True))
+
+    def to_json(self) -> str:
+        """Returns the JSON representation of the model using alias"""
+        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_str: str) -> Optional[Self]:
+        """Create an instance of SubjectBatchQuery from a JSON string"""
+        return cls.from_dict(json.loads(json_str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary representation of the model using alias.
+
+        This has the following differences from calling pydantic's
+        `self.model_dump(by_alias=True)`:
+
+        * `None` is only added to the output dict for nullable fields that
+          were set at model initialization. Other fields with value `None`
+          are ignored.
+        """
+        excluded_fields: Set[str] = set([
+        ])
+
+        _dict = self.model_dump(
+            by_alias=True,
+            exclude=excluded_fields,
+            exclude_none=True,
+        )
+        # set to None if start_date_gte (nullable) is None
+        # and model_fields_set contains the field
+        if self.start_date_gte is None and "start_date_gte" in self.model_fields_set:
+            _dict['start_date_gte'] = None
+
+        # set to None if end_date_lte (nullable) is None
+        # and model_fields_set contains the field
+        if self.end_date_lte is None and "end_date_lte" in self.model_fields_set:
+            _dict['end_date_lte'] = None
+
+        return _dict
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]:
+        """Create an instance of SubjectBatchQuery from a dict"""
+        if obj is None:
+            return None
+
+        if not isinstance(obj, dict):
+            return cls.model_validate(obj)
+
+        _obj = cls.model_validate({
+            "subject_ids": obj.get("subject_ids"),
+            "start_date_gte": obj.get("start_date_gte"),
+            "end_date_lte": obj.get("end_date_lte")
+        })
+        return _obj
+
+
@@ -40,6 +40,13 @@ class TestDefaultApi(unittest.IsolatedAsyncioTestCase):
         """
         pass
 
+    async def test_get_ecephys_sessions_by_subject(self) -> None:
+        """Test case for get_ecephys_sessions_by_subject
+
+        Get Ecephys Sessions By Subject
+        """
+        pass
+
     async def test_get_histology_data(self) -> None:
         """Test case for get_histology_data
 
@@ -47,6 +54,13 @@ class TestDefaultApi(unittest.IsolatedAsyncioTestCase):
         """
         pass
 
+    async def test_get_histology_data_by_subject(self) -> None:
+        """Test case for get_histology_data_by_subject
+
+        Get Histology Data By Subject
+        """
+        pass
+
     async def test_get_smartspim_imaging(self) -> None:
         """Test case for get_smartspim_imaging
 
@@ -54,6 +68,13 @@ class TestDefaultApi(unittest.IsolatedAsyncioTestCase):
         """
         pass
 
+    async def test_get_smartspim_imaging_by_subject(self) -> None:
+        """Test case for get_smartspim_imaging_by_subject
+
+        Get Smartspim Imaging By Subject
+        """
+        pass
+
     async def test_get_viral_injections(self) -> None:
         """Test case for get_viral_injections
 
@@ -61,6 +82,13 @@ class TestDefaultApi(unittest.IsolatedAsyncioTestCase):
         """
         pass
 
+    async def test_get_viral_injections_by_subject(self) -> None:
+        """Test case for get_viral_injections_by_subject
+
+        Get Viral Injections By Subject
+        """
+        pass
+
     async def test_get_water_restriction_data(self) -> None:
         """Test case for get_water_restriction_data
 
@@ -68,6 +96,13 @@ class TestDefaultApi(unittest.IsolatedAsyncioTestCase):
         """
         pass
 
+    async def test_get_water_restriction_data_by_subject(self) -> None:
+        """Test case for get_water_restriction_data_by_subject
+
+        Get Water Restriction Data By Subject
+        """
+        pass
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -26,6 +26,13 @@ class TestHealthcheckApi(unittest.IsolatedAsyncioTestCase):
     async def asyncTearDown(self) -> None:
         await self.api.api_client.close()
 
+    async def test_get_attachment_cache_metrics(self) -> None:
+        """Test case for get_attachment_cache_metrics
+
+        Attachment cache metrics
+        """
+        pass
+
     async def test_get_health(self) -> None:
         """Test case for get_health
 
@@ -33,6 +40,41 @@ class TestHealthcheckApi(unittest.IsolatedAsyncioTestCase):
         """
         pass
 
+    async def test_get_mirror_metrics(self) -> None:
+        """Test case for get_mirror_metrics
+
+        SLIMS mirror metrics
+        """
+        pass
+
+    async def test_get_reference_cache_metrics(self) -> None:
+        """Test case for get_reference_cache_metrics
+
+        Reference data cache metrics
+        """
+        pass
+
+    async def test_get_result_cache_metrics(self) -> None:
+        """Test case for get_result_cache_metrics
+
+        Date-partitioned result cache metrics
+        """
+        pass
+
+    async def test_get_session_pool_metrics(self) -> None:
+        """Test case for get_session_pool_metrics
+
+        SLIMS connection pool metrics
+        """
+        pass
+
+    async def test_get_single_flight_metrics(self) -> None:
+        """Test case for get_single_flight_metrics
+
+        Coalesced request metrics
+        """
+        pass
+
 
 if __name__ == '__main__':
     unittest.main()
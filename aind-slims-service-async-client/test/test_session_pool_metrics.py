@@ -0,0 +1,64 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+import unittest
+
+from aind_slims_service_async_client.models.session_pool_metrics import SessionPoolMetrics
+
+class TestSessionPoolMetrics(unittest.TestCase):
+    """SessionPoolMetrics unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def make_instance(self, include_optional) -> SessionPoolMetrics:
+        """Test SessionPoolMetrics
+            include_optional is a boolean, when False only required
+            params are included, when True both required and
+            optional params are included """
+        # uncomment below to create an instance of `SessionPoolMetrics`
+        """
+        model = SessionPoolMetrics()
+        if include_optional:
+            return SessionPoolMetrics(
+                max_connections = 56,
+                max_keepalive_connections = 56,
+                max_client_requests = 56,
+                client_requests = 56,
+                in_flight = 56,
+                requests = 56,
+                clients_created = 56,
+                recycled = 56,
+                auth_recycled = 56
+            )
+        else:
+            return SessionPoolMetrics(
+                max_connections = 56,
+                max_keepalive_connections = 56,
+                max_client_requests = 56,
+                client_requests = 56,
+                in_flight = 56,
+        )
+        """
+
+    def testSessionPoolMetrics(self):
+        """Test SessionPoolMetrics"""
+        # inst_req_only = self.make_instance(include_optional=False)
+        # inst_req_and_optional = self.make_instance(include_optional=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+import unittest
+
+from aind_slims_service_async_client.models.single_flight_metrics import SingleFlightMetrics
+
+class TestSingleFlightMetrics(unittest.TestCase):
+    """SingleFlightMetrics unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def make_instance(self, include_optional) -> SingleFlightMetrics:
+        """Test SingleFlightMetrics
+            include_optional is a boolean, when False only required
+            params are included, when True both required and
+            optional params are included """
+        # uncomment below to create an instance of `SingleFlightMetrics`
+        """
+        model = SingleFlightMetrics()
+        if include_optional:
+            return SingleFlightMetrics(
+                in_flight = 56,
+                executed = 56,
+                coalesced = 56
+            )
+        else:
+            return SingleFlightMetrics(
+                in_flight = 56,
+                executed = 56,
+                coalesced = 56,
+        )
+        """
+
+    def testSingleFlightMetrics(self):
+        """Test SingleFlightMetrics"""
+        # inst_req_only = self.make_instance(include_optional=False)
+        # inst_req_and_optional = self.make_instance(include_optional=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+import pprint
+import re  # noqa: F401
+import json
+
+from pydantic import BaseModel, ConfigDict, StrictInt
+from typing import Any, ClassVar, Dict, List, Optional
+from typing import Optional, Set
+from typing_extensions import Self
+
+class SessionPoolMetrics(BaseModel):
+    """
+    Metrics describing the connection pool of the async SLIMS client.
+    """ # noqa: E501
+    max_connections: StrictInt
+    max_keepalive_connections: StrictInt
+    max_client_requests: StrictInt
+    client_requests: StrictInt
+    in_flight: StrictInt
+    requests: Optional[StrictInt] = 0
+    clients_created: Optional[StrictInt] = 0
+    recycled: Optional[StrictInt] = 0
+    auth_recycled: Optional[StrictInt] = 0
+    __properties: ClassVar[List[str]] = ["max_connections", "max_keepalive_connections", "max_client_requests", "client_requests", "in_flight", "requests", "clients_created", "recycled", "auth_recycled"]
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        validate_assignment=True,
+        protected_namespaces=(),
+    )
+
+
+    def to_str(self) -> str:
+        """Returns the string representation of the model using alias"""
+        return pprint.pformat(self.model_dump(by_alias=True))
+
+    def to_json(self) -> str:
+        """Returns the JSON representation of the model using alias"""
+        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_str: str) -> Optional[Self]:
+        """Create an instance of SessionPoolMetrics from a JSON string"""
+        return cls.from_dict(json.loads(json_str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary representation of the model using alias.
+
+        This has the following differences from calling pydantic's
+        `self.model_dump(by_alias=True)`:
+
+        * `None` is only added to the output dict for nullable fields that
+          were set at model initialization. Other fields with value `None`
+          are ignored.
+        """
+        excluded_fields: Set[str] = set([
+        ])
+
+        _dict = self.model_dump(
+            by_alias=True,
+            exclude=excluded_fields,
+            exclude_none=True,
+        )
+        return _dict
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]:
+        """Create an instance of SessionPoolMetrics from a dict"""
+        if obj is None:
+            return None
+
+        if not isinstance(obj, dict):
+            return cls.model_validate(obj)
+
+        _obj = cls.model_validate({
+            "max_connections": obj.get("max_connections"),
+            "max_keepalive_connections": obj.get("max_keepalive_connections"),
+            "max_client_requests": obj.get("max_client_requests"),
+            "client_requests": obj.get("client_requests"),
+            "in_flight": obj.get("in_flight"),
+            "requests": obj.get("requests") if obj.get("requests") is not None else 0,
+            "clients_created": obj.get("clients_created") if obj.get("clients_created") is not None else 0,
+            "recycled": obj.get("recycled") if obj.get("recycled") is not None else 0,
+            "auth_recycled": obj.get("auth_recycled") if obj.get("auth_recycled") is not None else 0
+        })
+        return _obj
+
+
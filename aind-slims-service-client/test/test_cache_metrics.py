@@ -0,0 +1,57 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+import unittest
+
+from aind_slims_service_client.models.cache_metrics import CacheMetrics
+
+class TestCacheMetrics(unittest.TestCase):
+    """CacheMetrics unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def make_instance(self, include_optional) -> CacheMetrics:
+        """Test CacheMetrics
+            include_optional is a boolean, when False only required
+            params are included, when True both required and
+            optional params are included """
+        # uncomment below to create an instance of `CacheMetrics`
+        """
+        model = CacheMetrics()
+        if include_optional:
+            return CacheMetrics(
+                size = 56,
+                max_size = 56,
+                hits = 56,
+                misses = 56,
+                evictions = 56
+            )
+        else:
+            return CacheMetrics(
+                size = 56,
+                max_size = 56,
+        )
+        """
+
+    def testCacheMetrics(self):
+        """Test CacheMetrics"""
+        # inst_req_only = self.make_instance(include_optional=False)
+        # inst_req_and_optional = self.make_instance(include_optional=True)
+
+if __name__ == '__main__':
+    unittest.main()
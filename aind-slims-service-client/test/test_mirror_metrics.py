@@ -0,0 +1,57 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+import unittest
+
+from aind_slims_service_client.models.mirror_metrics import MirrorMetrics
+
+class TestMirrorMetrics(unittest.TestCase):
+    """MirrorMetrics unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def make_instance(self, include_optional) -> MirrorMetrics:
+        """Test MirrorMetrics
+            include_optional is a boolean, when False only required
+            params are included, when True both required and
+            optional params are included """
+        # uncomment below to create an instance of `MirrorMetrics`
+        """
+        model = MirrorMetrics()
+        if include_optional:
+            return MirrorMetrics(
+                enabled = True,
+                ready = True,
+                synced_at = datetime.datetime.strptime('2013-10-20 19:20:30.00', '%Y-%m-%d %H:%M:%S.%f'),
+                reconciled_at = datetime.datetime.strptime('2013-10-20 19:20:30.00', '%Y-%m-%d %H:%M:%S.%f'),
+                rows_deleted = 56,
+                rows_restored = 56
+            )
+        else:
+            return MirrorMetrics(
+                enabled = True,
+        )
+        """
+
+    def testMirrorMetrics(self):
+        """Test MirrorMetrics"""
+        # inst_req_only = self.make_instance(include_optional=False)
+        # inst_req_and_optional = self.make_instance(include_optional=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# coding: utf-8
+
+"""
+    aind-slims-service
+
+     ## aind-slims-service  Service to pull data from SLIMS.  
+
+    The version of the OpenAPI document: 0.3.5
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+import unittest
+
+from aind_slims_service_client.models.subject_batch_query import SubjectBatchQuery
+
+class TestSubjectBatchQuery(unittest.TestCase):
+    """SubjectBatchQuery unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def make_instance(self, include_optional) -> SubjectBatchQuery:
+        """Test SubjectBatchQuery
+            include_optional is a boolean, when False only required
+            params are included, when True both required and
+            optional params are included """
+        # uncomment below to create an instance of `SubjectBatchQuery`
+        """
+        model = SubjectBatchQuery()
+        if include_optional:
+            return SubjectBatchQuery(
+                subject_ids = [
+                    '0'
+                    ],
+                start_date_gte = '',
+                end_date_lte = ''
+            )
+        else:
+            return SubjectBatchQuery(
+                subject_ids = [
+                    '0'
+                    ],
+        )
+        """
+
+    def testSubjectBatchQuery(self):
+        """Test SubjectBatchQuery"""
+        # inst_req_only = self.make_instance(include_optional=False)
+        # inst_req_and_optional = self.make_instance(include_optional=True)
+
+if __name__ == '__main__':
+    unittest.main()
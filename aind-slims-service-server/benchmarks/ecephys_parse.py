@@ -0,0 +1,243 @@
+"""
+Benchmark of EcephysSessionHandler._parse_graph on a synthetic graph of
+ecephys sessions. Each session has a content, a group of sessions step, a
+mouse session and a streams result, a reward delivery record, two reward
+spouts and four dome modules. The handler collects the fields of a session
+into a dict and creates the model once. The earlier implementation, which
+set the fields on a model and then dumped and validated it again, is kept
+here as a baseline. Both must produce the same models.
+
+Importing the handlers reads the SLIMS_* settings, so they must be set (to
+any value):
+
+    python benchmarks/ecephys_parse.py --sessions 5000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from slims.internal import Record
+
+from aind_slims_service_server.handlers.ecephys import (
+    CONTENT_MAPPER,
+    EXPERIMENT_RUN_MAPPER,
+    GROUP_OF_SESSIONS_MAPPER,
+    MOUSE_SESSION_MAPPER,
+    REWARD_DELIVERY_MAPPER,
+    REWARD_SPOUTS_MAPPER,
+    STREAM_MODULE_MAPPER,
+    STREAMS_MAPPER,
+    EcephysSessionHandler,
+)
+from aind_slims_service_server.handlers.table_handler import RecordGraph
+from aind_slims_service_server.models import SlimsEcephysData
+
+
+def create_record(table_name: str, pk: int, **columns: Any) -> Record:
+    """
+    Create a slims Record. A column is either a value or a dict of the
+    attributes of the column.
+    """
+    json_entity = {
+        "tableName": table_name,
+        "pk": pk,
+        "columns": [
+            {"name": k, **(v if isinstance(v, dict) else {"value": v})}
+            for k, v in columns.items()
+        ],
+    }
+    # noinspection PyTypeChecker
+    return Record(json_entity=json_entity, slims_api=None)
+
+
+def reference_data(pk: int, ref_type: str, **columns: Any) -> Record:
+    """Create a reference data record of a type"""
+    return create_record(
+        "ReferenceDataRecord",
+        pk,
+        rdrc_fk_referenceDataType={"value": 1, "displayValue": ref_type},
+        **columns,
+    )
+
+
+def create_graph(sessions: int) -> Tuple[RecordGraph, List[int]]:
+    """Graph of the records of synthetic ecephys sessions"""
+    g = RecordGraph()
+    root_nodes = []
+    pks = iter(range(sessions * 20))
+    for i in range(sessions):
+        root = g.add_node(
+            "ExperimentRun",
+            create_record(
+                "ExperimentRun",
+                next(pks),
+                xprn_createdOn=1735689600000 + i * 60000,
+            ),
+        )
+        root_nodes.append(root)
+        rows = [
+            create_record("Content", next(pks), cntn_barCode=str(750000 + i)),
+            create_record(
+                "ExperimentRunStep",
+                next(pks),
+                xprs_name="Group of Sessions",
+                xprs_cf_fk_operator={"joinedDisplayValue": "Operator"},
+                xprs_cf_sessionType="OPTO",
+                xprs_cf_mousePlatformName="Running Wheel",
+                xprs_cf_activeMousePlatform=False,
+                xprs_cf_fk_instrument={"displayValue": "323_EPHYS1"},
+            ),
+            create_record(
+                "Result",
+                next(pks),
+                test_label="Mouse Session",
+                rslt_cf_sessionName=f"ecephys_{750000 + i}",
+                rslt_cf_animalWeightPrior={"value": 21.2, "unit": "g"},
+                rslt_cf_animalWeightPost={"value": 21.9, "unit": "g"},
+                rslt_cf_rewardConsumedvolume={"value": 0.45, "unit": "mL"},
+            ),
+            create_record(
+                "Result",
+                next(pks),
+                test_label="Streams",
+                rslt_cf_streamModalities=["Ecephys", "Behavior videos"],
+                rslt_cf_daqNames=["Harp Behavior"],
+                rslt_cf_cameraNames=["Face Camera", "Body Camera"],
+            ),
+            reference_data(
+                next(pks), "Reward Delivery", rdrc_cf_rewardSolution="Water"
+            ),
+        ]
+        rows += [
+            reference_data(
+                next(pks),
+                "Reward Spouts",
+                rdrc_cf_spoutSide=side,
+                rdrc_cf_startingPosition="0",
+                rdrc_cf_variablePosition=False,
+            )
+            for side in ["Left", "Right"]
+        ]
+        rows += [
+            reference_data(
+                next(pks),
+                "Dome Module",
+                rdrc_cf_implantHole=j,
+                rdrc_cf_probeName=f"ProbeA{j}",
+                rdrc_cf_fk_primaryTargetedStructure={"displayValue": "LGd"},
+                rdrc_cf_fk_secondaryTargetedStructures={
+                    "displayValues": ["CA1", "VISp"]
+                },
+                rdrc_cf_arcAngle=-14.5,
+                rdrc_cf_moduleAngle=6,
+                rdrc_cf_ccfCoordinatesAp={"value": 8150.5, "unit": "um"},
+                rdrc_cf_manipulatorX={"value": 8600.5, "unit": "um"},
+            )
+            for j in range(4)
+        ]
+        for row in rows:
+            g.add_edge(root, g.add_node(row.table_name(), row))
+    return g, root_nodes
+
+
+class RoundTripEcephysSessionHandler(EcephysSessionHandler):
+    """The handler that set fields on a model and validated it again"""
+
+    def _handle_content(self, ephys_data: SlimsEcephysData, row: Record):
+        """Handles the content table."""
+        CONTENT_MAPPER.update(ephys_data, row)
+
+    def _handle_experimentrunstep(
+        self, ephys_data: SlimsEcephysData, row: Record
+    ):
+        """Handles the experiment run step table."""
+        if self.get_attr_or_none(row, "xprs_name") == "Group of Sessions":
+            GROUP_OF_SESSIONS_MAPPER.update(ephys_data, row)
+
+    def _handle_result(self, ephys_data: SlimsEcephysData, row: Record):
+        """Handles the result table."""
+        label = self.get_attr_or_none(row, "test_label")
+        if label == "Mouse Session":
+            MOUSE_SESSION_MAPPER.update(ephys_data, row)
+        elif label == "Streams":
+            STREAMS_MAPPER.update(ephys_data, row)
+
+    def _handle_referencedatarecord(
+        self, ephys_data: SlimsEcephysData, row: Record
+    ):
+        """Handles the reference data record table."""
+        ref_type = self.get_attr_or_none(
+            row, "rdrc_fk_referenceDataType", "displayValue"
+        )
+        if ref_type == "Reward Delivery":
+            REWARD_DELIVERY_MAPPER.update(ephys_data, row)
+        elif ref_type == "Reward Spouts":
+            ephys_data.reward_spouts.append(REWARD_SPOUTS_MAPPER.create(row))
+        elif ref_type == "Dome Module":
+            ephys_data.stream_modules.append(STREAM_MODULE_MAPPER.create(row))
+
+    def _iter_parse_graph(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str],
+        session_name: Optional[str],
+    ) -> Iterator[SlimsEcephysData]:
+        """Set the fields on a model and dump and validate it again"""
+        for node, node_des in g.iter_descendants(root_nodes):
+            ephys_data = EXPERIMENT_RUN_MAPPER.create(g.row(node))
+            for n in node_des:
+                table_handler = getattr(
+                    self, f"_handle_{g.table_name(n).lower()}", None
+                )
+                if table_handler:
+                    table_handler(ephys_data, g.row(n))
+            if (
+                subject_id is None or subject_id == ephys_data.subject_id
+            ) and (
+                session_name is None or session_name == ephys_data.session_name
+            ):
+                yield SlimsEcephysData.model_validate(ephys_data.model_dump())
+
+
+def measure(
+    parse_graph: Callable, g: RecordGraph, root_nodes: List[int], repeat: int
+) -> Tuple[float, List[SlimsEcephysData]]:
+    """Best time of parsing the graph and the parsed models"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        models = parse_graph(
+            g=g, root_nodes=root_nodes, subject_id=None, session_name=None
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings), models
+
+
+def main():
+    """Run the benchmark and print a table of the results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    g, root_nodes = create_graph(args.sessions)
+    print(f"{len(g)} records")
+    print(f"{'_parse_graph':<12}{'s':>8}{'us/session':>12}")
+    results = []
+    for name, handler_class in [
+        ("round trip", RoundTripEcephysSessionHandler),
+        ("builder", EcephysSessionHandler),
+    ]:
+        handler = handler_class(session=None)
+        seconds, models = measure(
+            handler._parse_graph, g, root_nodes, args.repeat
+        )
+        results.append(models)
+        per_session = seconds / args.sessions * 1e6
+        print(f"{name:<12}{seconds:>8.3f}{per_session:>12.1f}")
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
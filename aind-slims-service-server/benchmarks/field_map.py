@@ -0,0 +1,160 @@
+"""
+Benchmark of the RecordMapper used by the handlers against the hand-written
+get_attr_or_none extraction it replaced. Parses synthetic Dome Module rows
+into EcephysStreamModule models, the widest model the handlers build, and
+checks both paths produce the same models.
+
+Importing the handlers reads the SLIMS_* settings, so they must be set (to
+any value):
+
+    python benchmarks/field_map.py --rows 100000
+"""
+
+import argparse
+import time
+from decimal import Decimal
+from typing import Callable, List
+
+from slims.internal import Record
+
+from aind_slims_service_server.handlers.ecephys import STREAM_MODULE_MAPPER
+from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.models import EcephysStreamModule
+
+# Columns of a Dome Module row holding numbers in millimeters or degrees
+NUMBER_COLUMNS = [
+    "rdrc_cf_arcAngle",
+    "rdrc_cf_moduleAngle",
+    "rdrc_cf_rotationAngle",
+    "rdrc_cf_ccfCoordinatesAp",
+    "rdrc_cf_ccfCoordinatesMl",
+    "rdrc_cf_ccfCoordinatesDv",
+    "rdrc_cf_bregmaAP",
+    "rdrc_cf_bregmaML",
+    "rdrc_cf_bregmaDV",
+    "rdrc_cf_surfaceZ",
+    "rdrc_cf_manipulatorX",
+    "rdrc_cf_manipulatory",
+    "rdrc_cf_manipulatorZ",
+]
+
+# Columns of a Dome Module row holding text
+TEXT_COLUMNS = [
+    "rdrc_cf_implantHole",
+    "rdrc_cf_assemblyName",
+    "rdrc_cf_probeName",
+    "rdrc_cf_ccfVersion",
+]
+
+# Columns of a Dome Module row pointing at other records
+DISPLAY_COLUMNS = [
+    "rdrc_cf_fk_primaryTargetedStructure",
+    "rdrc_cf_coordinateTransform",
+    "rdrc_cf_fk_dye",
+]
+
+
+def create_row(pk: int) -> Record:
+    """Create a Dome Module row with every column the model maps"""
+    columns = [
+        {"name": name, "value": pk * 0.1 + i, "unit": "mm"}
+        for i, name in enumerate(NUMBER_COLUMNS)
+    ]
+    columns += [{"name": name, "value": f"{pk}"} for name in TEXT_COLUMNS]
+    columns += [
+        {"name": name, "value": pk, "displayValue": f"{name}.{pk}"}
+        for name in DISPLAY_COLUMNS
+    ]
+    columns.append(
+        {
+            "name": "rdrc_cf_fk_secondaryTargetedStructures",
+            "value": [pk],
+            "displayValues": ["VISp", "LGd"],
+        }
+    )
+    json_entity = {
+        "tableName": "ReferenceDataRecord",
+        "pk": pk,
+        "columns": columns,
+    }
+    # noinspection PyTypeChecker
+    return Record(json_entity=json_entity, slims_api=None)
+
+
+def to_decimal(row: Record, column: str):
+    """Decimal of a column the way the handlers used to convert it"""
+    value = SlimsTableHandler.get_attr_or_none(row, column)
+    return None if value is None else Decimal(str(value))
+
+
+def get_stream_module_data(row: Record) -> EcephysStreamModule:
+    """The hand-written EcephysSessionHandler._get_stream_module_data"""
+    get_attr_or_none = SlimsTableHandler.get_attr_or_none
+    return EcephysStreamModule(
+        implant_hole=get_attr_or_none(row, "rdrc_cf_implantHole"),
+        assembly_name=get_attr_or_none(row, "rdrc_cf_assemblyName"),
+        probe_name=get_attr_or_none(row, "rdrc_cf_probeName"),
+        primary_target_structure=get_attr_or_none(
+            row, "rdrc_cf_fk_primaryTargetedStructure", "displayValue"
+        ),
+        secondary_target_structures=get_attr_or_none(
+            row, "rdrc_cf_fk_secondaryTargetedStructures", "displayValues"
+        ),
+        arc_angle=to_decimal(row, "rdrc_cf_arcAngle"),
+        module_angle=to_decimal(row, "rdrc_cf_moduleAngle"),
+        rotation_angle=to_decimal(row, "rdrc_cf_rotationAngle"),
+        coordinate_transform=get_attr_or_none(
+            row, "rdrc_cf_coordinateTransform", "displayValue"
+        ),
+        ccf_coordinate_ap=to_decimal(row, "rdrc_cf_ccfCoordinatesAp"),
+        ccf_coordinate_ml=to_decimal(row, "rdrc_cf_ccfCoordinatesMl"),
+        ccf_coordinate_dv=to_decimal(row, "rdrc_cf_ccfCoordinatesDv"),
+        ccf_coordinate_unit=get_attr_or_none(
+            row, "rdrc_cf_ccfCoordinatesAp", "unit"
+        ),
+        ccf_version=get_attr_or_none(row, "rdrc_cf_ccfVersion"),
+        bregma_target_ap=to_decimal(row, "rdrc_cf_bregmaAP"),
+        bregma_target_ml=to_decimal(row, "rdrc_cf_bregmaML"),
+        bregma_target_dv=to_decimal(row, "rdrc_cf_bregmaDV"),
+        bregma_target_unit=get_attr_or_none(row, "rdrc_cf_bregmaAP", "unit"),
+        surface_z=to_decimal(row, "rdrc_cf_surfaceZ"),
+        surface_z_unit=get_attr_or_none(row, "rdrc_cf_surfaceZ", "unit"),
+        manipulator_x=to_decimal(row, "rdrc_cf_manipulatorX"),
+        manipulator_y=to_decimal(row, "rdrc_cf_manipulatory"),
+        manipulator_z=to_decimal(row, "rdrc_cf_manipulatorZ"),
+        manipulator_unit=get_attr_or_none(row, "rdrc_cf_manipulatorX", "unit"),
+        dye=get_attr_or_none(row, "rdrc_cf_fk_dye", "displayValue"),
+    )
+
+
+def measure(parse: Callable, rows: List[Record], repeat: int):
+    """Best time to parse every row and the models of the last run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        models = [parse(row) for row in rows]
+        timings.append(time.perf_counter() - start)
+    return min(timings), models
+
+
+def main():
+    """Run the benchmark and print a table of the results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rows = [create_row(pk) for pk in range(args.rows)]
+    print(f"{'parser':<14}{'total s':>10}{'us/row':>10}")
+    results = []
+    for name, parse in [
+        ("hand-written", get_stream_module_data),
+        ("RecordMapper", STREAM_MODULE_MAPPER.create),
+    ]:
+        total, models = measure(parse, rows, args.repeat)
+        results.append(models)
+        print(f"{name:<14}{total:>10.3f}{total / args.rows * 1e6:>10.2f}")
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Benchmark of the RecordGraph used by the handlers against the networkx
+DiGraph it replaced. Builds the graph of a synthetic ecephys-like plan
+(ExperimentRun -> ExperimentRunStep -> Result -> ReferenceDataRecord) and
+reports build time, traversal time and the memory held by the graph. The
+records are created before measuring, so only the graph itself is counted.
+
+Requires networkx, which is installed with the dev extras. Importing the
+handlers reads the SLIMS_* settings, so they must be set (to any value):
+
+    python benchmarks/record_graph.py --runs 20000
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from networkx import DiGraph, descendants
+from slims.internal import Record
+
+from aind_slims_service_server.handlers.table_handler import (
+    RecordGraph,
+    SlimsTableHandler,
+)
+
+# (foreign table, foreign rows key, foreign table col, input table,
+# input rows key, input table cols) for each non-root level of the plan
+LEVELS = [
+    (
+        "ExperimentRunStep",
+        "steps",
+        "xprs_fk_experimentRun",
+        "ExperimentRun",
+        "runs",
+        ["xprn_pk"],
+    ),
+    (
+        "Result",
+        "results",
+        "rslt_fk_experimentRunStep",
+        "ExperimentRunStep",
+        "steps",
+        ["xprs_pk"],
+    ),
+    (
+        "ReferenceDataRecord",
+        "references",
+        "rdrc_pk",
+        "Result",
+        "results",
+        ["rslt_cf_fk_referenceDataRecord"],
+    ),
+]
+
+
+def create_record(table_name: str, pk: int, **columns) -> Record:
+    """Create a slims Record with the given columns"""
+    json_entity = {
+        "tableName": table_name,
+        "pk": pk,
+        "columns": [{"name": k, "value": v} for k, v in columns.items()],
+    }
+    # noinspection PyTypeChecker
+    return Record(json_entity=json_entity, slims_api=None)
+
+
+def create_rows(runs: int, steps: int) -> Dict[str, List[Record]]:
+    """Create the rows of every table in the plan"""
+    rows: Dict[str, List[Record]] = {
+        "runs": [],
+        "steps": [],
+        "results": [],
+        "references": [],
+    }
+    for run_pk in range(runs):
+        rows["runs"].append(
+            create_record("ExperimentRun", run_pk, xprn_pk=run_pk)
+        )
+        for i in range(steps):
+            step_pk = run_pk * steps + i
+            rows["steps"].append(
+                create_record(
+                    "ExperimentRunStep",
+                    step_pk,
+                    xprs_pk=step_pk,
+                    xprs_fk_experimentRun=run_pk,
+                )
+            )
+            rows["results"].append(
+                create_record(
+                    "Result",
+                    step_pk,
+                    rslt_pk=step_pk,
+                    rslt_fk_experimentRunStep=step_pk,
+                    rslt_cf_fk_referenceDataRecord=step_pk,
+                )
+            )
+            rows["references"].append(
+                create_record("ReferenceDataRecord", step_pk, rdrc_pk=step_pk)
+            )
+    return rows
+
+
+def update_digraph(  # noqa: C901
+    foreign_table: str,
+    foreign_rows: List[Record],
+    foreign_table_col: str,
+    input_table: str,
+    input_rows: List[Record],
+    input_table_cols: List[str],
+    g: DiGraph,
+) -> None:
+    """The networkx version of SlimsTableHandler._update_graph"""
+    get_attr_or_none = SlimsTableHandler.get_attr_or_none
+    for row in foreign_rows:
+        g.add_node(
+            f"{foreign_table}.{row.pk()}",
+            row=row,
+            pk=row.pk(),
+            table_name=foreign_table,
+        )
+    if foreign_table_col.endswith("_pk"):
+        for row in input_rows:
+            for input_table_col in input_table_cols:
+                f_pk = get_attr_or_none(row, input_table_col)
+                if (
+                    isinstance(f_pk, int)
+                    and g.nodes.get(f"{foreign_table}.{f_pk}") is not None
+                ):
+                    g.add_edge(
+                        f"{row.table_name()}.{row.pk()}",
+                        f"{foreign_table}.{f_pk}",
+                    )
+                elif isinstance(f_pk, list):
+                    for pk in f_pk:
+                        if g.nodes.get(f"{foreign_table}.{pk}") is not None:
+                            g.add_edge(
+                                f"{row.table_name()}.{row.pk()}",
+                                f"{foreign_table}.{pk}",
+                            )
+    else:
+        for row in foreign_rows:
+            input_pk = get_attr_or_none(row, foreign_table_col)
+            if (
+                isinstance(input_pk, int)
+                and g.nodes.get(f"{input_table}.{input_pk}") is not None
+            ):
+                g.add_edge(
+                    f"{input_table}.{input_pk}",
+                    f"{row.table_name()}.{row.pk()}",
+                )
+
+
+def build_digraph(rows: Dict[str, List[Record]]) -> Tuple[DiGraph, list]:
+    """Build the networkx graph of the plan"""
+    g = DiGraph()
+    root_nodes = []
+    for row in rows["runs"]:
+        node = f"{row.table_name()}.{row.pk()}"
+        g.add_node(node, row=row, pk=row.pk(), table_name=row.table_name())
+        root_nodes.append(node)
+    for level in LEVELS:
+        foreign_table, foreign_key, col, input_table, input_key, cols = level
+        update_digraph(
+            foreign_table,
+            rows[foreign_key],
+            col,
+            input_table,
+            rows[input_key],
+            cols,
+            g,
+        )
+    return g, root_nodes
+
+
+def build_record_graph(
+    rows: Dict[str, List[Record]],
+) -> Tuple[RecordGraph, list]:
+    """Build the RecordGraph of the plan the way the handlers do"""
+    handler = SlimsTableHandler(session=None)
+    g = RecordGraph()
+    root_nodes = [g.add_node(row.table_name(), row) for row in rows["runs"]]
+    for level in LEVELS:
+        foreign_table, foreign_key, col, input_table, input_key, cols = level
+        handler._update_graph(
+            foreign_table=foreign_table,
+            foreign_rows=rows[foreign_key],
+            foreign_table_col=col,
+            input_table=input_table,
+            input_rows=rows[input_key],
+            input_table_cols=cols,
+            g=g,
+        )
+    return g, root_nodes
+
+
+def traverse_digraph(g: DiGraph, root_nodes: list) -> int:
+    """Visit the descendants of every root like the handlers do"""
+    count = 0
+    for node in root_nodes:
+        for n in descendants(g, node):
+            g.nodes[n]["row"]
+            g.nodes[n]["table_name"]
+            count += 1
+    return count
+
+
+def traverse_record_graph(g: RecordGraph, root_nodes: list) -> int:
+    """Visit the descendants of every root like the handlers do"""
+    count = 0
+    for node in root_nodes:
+        for n in g.descendants(node):
+            g.row(n)
+            g.table_name(n)
+            count += 1
+    return count
+
+
+def measure(
+    build: Callable, traverse: Callable, rows: Dict[str, List[Record]]
+) -> Tuple[float, float, float, int]:
+    """Build time, traversal time, graph memory in MiB and node visits"""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    g, root_nodes = build(rows)
+    memory = (tracemalloc.get_traced_memory()[0] - baseline) / 2**20
+    tracemalloc.stop()
+    start = time.perf_counter()
+    g, root_nodes = build(rows)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    visits = traverse(g, root_nodes)
+    traverse_time = time.perf_counter() - start
+    return build_time, traverse_time, memory, visits
+
+
+def main():
+    """Run the benchmark and print a table of the results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20000)
+    parser.add_argument("--steps", type=int, default=4)
+    args = parser.parse_args()
+    rows = create_rows(args.runs, args.steps)
+    print(f"{sum(len(r) for r in rows.values())} records")
+    print(f"{'graph':<12}{'build s':>10}{'traverse s':>12}{'memory MiB':>12}")
+    for name, build, traverse in [
+        ("DiGraph", build_digraph, traverse_digraph),
+        ("RecordGraph", build_record_graph, traverse_record_graph),
+    ]:
+        build_time, traverse_time, memory, visits = measure(
+            build, traverse, rows
+        )
+        assert visits == args.runs * args.steps * 3
+        print(
+            f"{name:<12}{build_time:>10.3f}{traverse_time:>12.3f}"
+            f"{memory:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark of serializing a list endpoint response of 10k ecephys sessions.
+Compares the adapter used by the routes against FastAPI's response_model
+path, which validates the returned models again before dumping them, and
+against jsonable_encoder followed by json.dumps, the path of a route
+without a response_model. All must produce the same JSON.
+
+Importing the routes reads the SLIMS_* settings, so they must be set (to
+any value):
+
+    python benchmarks/serialize_response.py --sessions 10000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+
+from aind_slims_service_server.models import (
+    EcephysRewardSpouts,
+    EcephysStreamModule,
+    SlimsEcephysData,
+)
+from aind_slims_service_server.route import (
+    ECEPHYS_LIST_ADAPTER,
+    _json_response,
+    router,
+)
+
+
+def create_sessions(sessions: int) -> List[SlimsEcephysData]:
+    """Ecephys sessions with two reward spouts and four stream modules"""
+    created_on = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        SlimsEcephysData(
+            experiment_run_created_on=created_on + timedelta(minutes=i),
+            subject_id=str(750000 + i % 1000),
+            operator="Operator",
+            instrument="323_EPHYS1",
+            session_type="OPTO",
+            mouse_platform_name="Running Wheel",
+            active_mouse_platform=False,
+            session_name=f"ecephys_{750000 + i % 1000}_{i}",
+            animal_weight_prior=Decimal("21.2"),
+            animal_weight_after=Decimal("21.9"),
+            animal_weight_unit="g",
+            reward_consumed=Decimal("0.45"),
+            reward_consumed_unit="mL",
+            reward_spouts=[
+                EcephysRewardSpouts(
+                    spout_side=side,
+                    starting_position="0",
+                    variable_position=False,
+                )
+                for side in ["Left", "Right"]
+            ],
+            stream_modalities=["Ecephys", "Behavior videos"],
+            stream_modules=[
+                EcephysStreamModule(
+                    implant_hole=j,
+                    assembly_name=f"46110{j}",
+                    probe_name=f"ProbeA{j}",
+                    primary_target_structure="LGd",
+                    secondary_target_structures=["CA1", "VISp"],
+                    arc_angle=Decimal("-14.5"),
+                    module_angle=Decimal("6"),
+                    rotation_angle=Decimal("0"),
+                    ccf_coordinate_ap=Decimal("8150.5"),
+                    ccf_coordinate_ml=Decimal("3250.25"),
+                    ccf_coordinate_dv=Decimal("3000"),
+                    ccf_coordinate_unit="um",
+                    ccf_version="2017",
+                    manipulator_x=Decimal("8600.5"),
+                    manipulator_y=Decimal("5700"),
+                    manipulator_z=Decimal("7500.75"),
+                    manipulator_unit="um",
+                    dye="DiI",
+                )
+                for j in range(4)
+            ],
+            daq_names=["Harp Behavior"],
+            camera_names=["Face Camera", "Body Camera"],
+        )
+        for i in range(sessions)
+    ]
+
+
+def dump_response_model(models: List[SlimsEcephysData]) -> bytes:
+    """FastAPI's serialization of the route's response_model"""
+    route = next(r for r in router.routes if r.path == "/ecephys_sessions")
+    return asyncio.run(
+        serialize_response(
+            field=route.response_field,
+            response_content=models,
+            dump_json=True,
+        )
+    )
+
+
+def dump_jsonable_encoder(models: List[SlimsEcephysData]) -> bytes:
+    """Serialization of a route without a response_model"""
+    return json.dumps(
+        jsonable_encoder(models),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dump_adapter(models: List[SlimsEcephysData]) -> bytes:
+    """Serialization used by the routes"""
+    return _json_response(ECEPHYS_LIST_ADAPTER, models).body
+
+
+def measure(dump: Callable, models: List[SlimsEcephysData], repeat: int):
+    """Best time of a serialization and its output"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        content = dump(models)
+        timings.append(time.perf_counter() - start)
+    return min(timings), content
+
+
+def main():
+    """Run the benchmark and print a table of the results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    models = create_sessions(args.sessions)
+    print(f"{'serializer':<18}{'ms':>10}{'MiB':>8}")
+    contents = []
+    for name, dump in [
+        ("jsonable_encoder", dump_jsonable_encoder),
+        ("response_model", dump_response_model),
+        ("TypeAdapter", dump_adapter),
+    ]:
+        seconds, content = measure(dump, models, args.repeat)
+        contents.append(json.loads(content))
+        print(f"{name:<18}{seconds * 1000:>10.1f}{len(content) / 2**20:>8.1f}")
+    assert contents[0] == contents[1] == contents[2]
+
+
+if __name__ == "__main__":
+    main()
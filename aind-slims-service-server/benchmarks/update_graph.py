@@ -0,0 +1,190 @@
+"""
+Micro-benchmark of SlimsTableHandler._update_graph on a synthetic join of
+100k foreign rows. Both kinds of joins are timed: foreign rows that point
+at their input rows (Result.rslt_fk_experimentRunStep -> ExperimentRunStep)
+and input rows that point at foreign rows through a single and a list
+column (Result -> ReferenceDataRecord). Two earlier implementations are
+kept here as baselines: the networkx one that built a "Table.pk" string
+per key, and the RecordGraph one that looked up every key with
+get_attr_or_none and RecordGraph.get_node. All must produce the same edges.
+
+Requires networkx, which is installed with the dev extras. Importing the
+handlers reads the SLIMS_* settings, so they must be set (to any value):
+
+    python benchmarks/update_graph.py --rows 100000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List, Set, Tuple, Union
+
+from networkx import DiGraph
+from record_graph import create_record, update_digraph
+from slims.internal import Record
+
+from aind_slims_service_server.handlers.table_handler import (
+    RecordGraph,
+    SlimsTableHandler,
+)
+
+
+def get_foreign_keys(
+    input_rows: List[Record], input_table_cols: List[str]
+) -> Set[Any]:
+    """_get_foreign_keys with a get_attr_or_none call per column"""
+    total_fks = set()
+    for row in input_rows:
+        for fk_name in input_table_cols:
+            key_values = SlimsTableHandler.get_attr_or_none(row, fk_name)
+            if key_values is None:
+                continue
+            if isinstance(key_values, list):
+                total_fks.update(key_values)
+            else:
+                total_fks.add(key_values)
+    return total_fks
+
+
+def update_graph_by_key(
+    foreign_table: str,
+    foreign_rows: List[Record],
+    foreign_table_col: str,
+    input_table: str,
+    input_rows: List[Record],
+    input_table_cols: List[str],
+    g: RecordGraph,
+) -> None:
+    """_update_graph with a get_attr_or_none and get_node call per key"""
+    for row in foreign_rows:
+        g.add_node(foreign_table, row)
+    if foreign_table_col.endswith("_pk"):
+        for row in input_rows:
+            u = g.add_node(row.table_name(), row)
+            for f_pk in get_foreign_keys([row], input_table_cols):
+                v = g.get_node(foreign_table, f_pk)
+                if v is not None:
+                    g.add_edge(u, v)
+    else:
+        for row in foreign_rows:
+            input_table_pk = SlimsTableHandler.get_attr_or_none(
+                row, foreign_table_col
+            )
+            if not isinstance(input_table_pk, int):
+                continue
+            u = g.get_node(input_table, input_table_pk)
+            if u is not None:
+                g.add_edge(u, g.get_node(foreign_table, row.pk()))
+
+
+def create_digraph(steps: List[Record]) -> DiGraph:
+    """networkx graph holding the step nodes"""
+    g = DiGraph()
+    for row in steps:
+        g.add_node(
+            f"{row.table_name()}.{row.pk()}",
+            row=row,
+            pk=row.pk(),
+            table_name=row.table_name(),
+        )
+    return g
+
+
+def create_record_graph(steps: List[Record]) -> RecordGraph:
+    """RecordGraph holding the step nodes"""
+    g = RecordGraph()
+    g.add_nodes("ExperimentRunStep", steps)
+    return g
+
+
+def get_edge_names(g: Union[DiGraph, RecordGraph]) -> Set[Tuple[str, str]]:
+    """Edges of a graph as pairs of Table.pk names"""
+    if isinstance(g, DiGraph):
+        return set(g.edges())
+    return {(g.name(u), g.name(v)) for u, v in g.edges()}
+
+
+def create_rows(rows: int, fan_out: int) -> Tuple[List[Record], ...]:
+    """Steps, results pointing at the steps, and reference data records"""
+    steps = [
+        create_record("ExperimentRunStep", pk, xprs_pk=pk)
+        for pk in range(rows // fan_out)
+    ]
+    results = [
+        create_record(
+            "Result",
+            pk,
+            rslt_fk_experimentRunStep=pk // fan_out,
+            rslt_cf_fk_referenceDataRecord=pk,
+            rslt_cf_fk_referenceDataRecords=[pk, pk + 1],
+        )
+        for pk in range(rows)
+    ]
+    references = [
+        create_record("ReferenceDataRecord", pk, rdrc_pk=pk)
+        for pk in range(rows)
+    ]
+    return steps, results, references
+
+
+def run_joins(
+    update_graph: Callable, create_graph: Callable, steps, results, references
+) -> Tuple[float, float, Set[Tuple[str, str]]]:
+    """Time both joins and return the edges of the resulting graph"""
+    g = create_graph(steps)
+    start = time.perf_counter()
+    update_graph(
+        foreign_table="Result",
+        foreign_rows=results,
+        foreign_table_col="rslt_fk_experimentRunStep",
+        input_table="ExperimentRunStep",
+        input_rows=steps,
+        input_table_cols=["xprs_pk"],
+        g=g,
+    )
+    fk_time = time.perf_counter() - start
+    start = time.perf_counter()
+    update_graph(
+        foreign_table="ReferenceDataRecord",
+        foreign_rows=references,
+        foreign_table_col="rdrc_pk",
+        input_table="Result",
+        input_rows=results,
+        input_table_cols=[
+            "rslt_cf_fk_referenceDataRecord",
+            "rslt_cf_fk_referenceDataRecords",
+        ],
+        g=g,
+    )
+    pk_time = time.perf_counter() - start
+    return fk_time, pk_time, get_edge_names(g)
+
+
+def main():
+    """Run the benchmark and print a table of the results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--fan-out", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rows = create_rows(args.rows, args.fan_out)
+    handler = SlimsTableHandler(session=None)
+    print(f"{'_update_graph':<14}{'fk join s':>11}{'pk join s':>11}")
+    edges = []
+    for name, update_graph, create_graph in [
+        ("networkx", update_digraph, create_digraph),
+        ("by key", update_graph_by_key, create_record_graph),
+        ("indexed", handler._update_graph, create_record_graph),
+    ]:
+        timings = [
+            run_joins(update_graph, create_graph, *rows)
+            for _ in range(args.repeat)
+        ]
+        fk_time = min(t[0] for t in timings)
+        pk_time = min(t[1] for t in timings)
+        edges.append(timings[0][2])
+        print(f"{name:<14}{fk_time:>11.3f}{pk_time:>11.3f}")
+    assert edges[0] == edges[1] == edges[2]
+
+
+if __name__ == "__main__":
+    main()
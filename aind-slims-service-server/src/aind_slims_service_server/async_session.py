@@ -0,0 +1,493 @@
+"""Module to handle async requests to SLIMS"""
+
+import logging
+from typing import Any, Collection, Dict, List, NamedTuple, Optional
+
+import httpx
+import orjson
+from slims.criteria import Criterion
+from slims.internal import Attachment, Record, _SlimsApi, _SlimsApiException
+from slims.slims import Slims
+
+from aind_slims_service_server.models import SessionPoolMetrics
+from aind_slims_service_server.session import SlimsAuthError, settings
+
+
+class RawColumn(NamedTuple):
+    """
+    The attributes of a SLIMS column read by the handlers. Attributes that
+    are missing from the JSON of the column are None.
+    """
+
+    value: Any = None
+    displayValue: Any = None
+    displayValues: Any = None
+    joinedDisplayValue: Any = None
+    unit: Any = None
+
+
+class RawRecord:
+    """
+    Lightweight stand-in for slims.internal.Record, built straight from the
+    JSON of an entity. Like a Record, the columns live in the instance dict
+    and are read with getattr or vars, and pk and table_name are methods.
+    Unlike a Record, each column is a RawColumn tuple instead of an object
+    with its own dict, and only the requested columns are kept.
+    """
+
+    __slots__ = ("_table_name", "_pk", "__dict__")
+
+    def __init__(
+        self, table_name: str, pk: int, columns: Dict[str, RawColumn]
+    ):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        table_name : str
+        pk : int
+        columns : Dict[str, RawColumn]
+          Columns keyed by column name.
+        """
+        self._table_name = table_name
+        self._pk = pk
+        self.__dict__.update(columns)
+
+    @classmethod
+    def from_entity(
+        cls, entity: Dict[str, Any], columns: Optional[Collection[str]]
+    ) -> "RawRecord":
+        """
+        Create a RawRecord from the JSON of a SLIMS entity.
+        Parameters
+        ----------
+        entity : Dict[str, Any]
+        columns : Collection[str] | None
+          Names of the columns to keep. If None, every column is kept.
+
+        Returns
+        -------
+        RawRecord
+
+        """
+        return cls(
+            entity["tableName"],
+            entity["pk"],
+            {
+                c["name"]: RawColumn(
+                    c.get("value"),
+                    c.get("displayValue"),
+                    c.get("displayValues"),
+                    c.get("joinedDisplayValue"),
+                    c.get("unit"),
+                )
+                for c in entity["columns"]
+                if columns is None or c["name"] in columns
+            },
+        )
+
+    def table_name(self) -> str:
+        """Name of the table the record belongs to."""
+        return self._table_name
+
+    def pk(self) -> int:
+        """Primary key of the record."""
+        return self._pk
+
+
+class AsyncSlims:
+    """
+    Async counterpart of slims.slims.Slims. Speaks the same REST endpoints as
+    Slims.fetch and returns the same Record objects, but sends requests
+    through a shared httpx.AsyncClient so that many requests can be in flight
+    on one event loop while reusing pooled connections. The client is
+    recycled after max_client_requests requests, and also if SLIMS starts
+    rejecting a client it accepted before, e.g. because the server side
+    session expired. A recycled client is closed once its requests in flight
+    have finished.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        username: str,
+        password: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_client_requests: int = 10000,
+        timeout_seconds: float = 60.0,
+        column_projection: bool = False,
+    ):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        name : str
+          The name of this slims instance.
+        url : str
+          The url of the SLIMS server.
+        username : str
+        password : str
+        max_connections : int
+          Maximum number of open connections to SLIMS.
+        max_keepalive_connections : int
+          Maximum number of idle connections kept open.
+        max_client_requests : int
+          Number of requests sent by a client before it is recycled.
+        timeout_seconds : float
+          Timeout applied to each request.
+        column_projection : bool
+          If True, fetch_raw asks SLIMS for the requested columns only.
+        """
+        self.name = name
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_client_requests = max_client_requests
+        self.timeout_seconds = timeout_seconds
+        self.column_projection = column_projection
+        # Records keep a reference to a (sync) api object so that methods
+        # like Record.update still work on the records returned here.
+        self.slims_api = _SlimsApi(url, username, password)
+        self._clients_created = 0
+        self.client = self._create_client()
+        # The last client SLIMS accepted, and the replaced clients that still
+        # have requests in flight
+        self._accepted_client: Optional[httpx.AsyncClient] = None
+        self._retired_clients: List[httpx.AsyncClient] = []
+        self._in_flight: Dict[httpx.AsyncClient, int] = {}
+        self._client_requests = 0
+        self._requests = 0
+        self._recycled = 0
+        self._auth_recycled = 0
+
+    @classmethod
+    def from_slims(cls, slims: Slims, **kwargs: Any) -> "AsyncSlims":
+        """
+        Create an AsyncSlims with the url and credentials of a Slims object.
+        Parameters
+        ----------
+        slims : Slims
+        kwargs : Any
+          Other arguments of the constructor, e.g. max_connections.
+
+        Returns
+        -------
+        AsyncSlims
+
+        """
+        api = slims.slims_api
+        return cls(
+            name="slims",
+            url=api.raw_url,
+            username=api.username,
+            password=api.password,
+            **kwargs,
+        )
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create an HTTP client with its own connections and cookies."""
+        self._clients_created += 1
+        return httpx.AsyncClient(
+            base_url=self.slims_api.url,
+            auth=(self.slims_api.username, self.slims_api.password),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+            ),
+            timeout=self.timeout_seconds,
+        )
+
+    def metrics(self) -> SessionPoolMetrics:
+        """Settings and counters of the connection pool."""
+        return SessionPoolMetrics(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            max_client_requests=self.max_client_requests,
+            client_requests=self._client_requests,
+            in_flight=sum(self._in_flight.values()),
+            requests=self._requests,
+            clients_created=self._clients_created,
+            recycled=self._recycled,
+            auth_recycled=self._auth_recycled,
+        )
+
+    @staticmethod
+    def _is_auth_failure(response: httpx.Response) -> bool:
+        """Check whether SLIMS rejected the credentials of a request."""
+        return response.status_code in (401, 403)
+
+    def _check_response(self, response: httpx.Response) -> None:
+        """Raise SlimsAuthError if the credentials were rejected."""
+        if self._is_auth_failure(response):
+            raise SlimsAuthError("Authentication failed: " + response.text)
+
+    async def _replace_client(self) -> None:
+        """
+        Replace the client with a new one. The old client is closed now if
+        it has no requests in flight, and otherwise once they finish.
+        """
+        client = self.client
+        self.client = self._create_client()
+        self._client_requests = 0
+        if client in self._in_flight:
+            self._retired_clients.append(client)
+        else:
+            await client.aclose()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        The client to send the next request with. The client is recycled
+        first if it already sent max_client_requests requests.
+        """
+        if self._client_requests >= self.max_client_requests:
+            self._recycled += 1
+            await self._replace_client()
+        self._client_requests += 1
+        self._requests += 1
+        return self.client
+
+    async def _send(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request with a client, keeping count of its requests in
+        flight. A retired client is closed after its last request.
+        """
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            return await client.request(method, url, **kwargs)
+        finally:
+            self._in_flight[client] -= 1
+            if not self._in_flight[client]:
+                del self._in_flight[client]
+                if client in self._retired_clients:
+                    self._retired_clients.remove(client)
+                    await client.aclose()
+
+    async def _recycle_client(self, client: httpx.AsyncClient) -> bool:
+        """
+        Replace a client that SLIMS rejected with a new one.
+        Parameters
+        ----------
+        client : httpx.AsyncClient
+          The client that sent the rejected request.
+
+        Returns
+        -------
+        bool
+          False if SLIMS never accepted the client. The credentials are
+          wrong then, and a new client would be rejected as well.
+
+        """
+        if client is not self.client:
+            # Already replaced by a concurrent request
+            return True
+        if client is not self._accepted_client:
+            return False
+        self._auth_recycled += 1
+        await self._replace_client()
+        logging.warning("SLIMS rejected the session. Recreated the client.")
+        return True
+
+    async def _request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request to SLIMS. If the credentials are rejected by a client
+        that SLIMS accepted before, the client is recycled and the request
+        is sent once more with the new client.
+        Parameters
+        ----------
+        method : str
+        url : str
+          Url relative to the REST root.
+        kwargs : Any
+          Passed to httpx.AsyncClient.request.
+
+        Returns
+        -------
+        httpx.Response
+
+        Raises
+        ------
+        SlimsAuthError
+          If the credentials are rejected.
+
+        """
+        client = await self._get_client()
+        response = await self._send(client, method, url, **kwargs)
+        if self._is_auth_failure(response) and await self._recycle_client(
+            client
+        ):
+            client = await self._get_client()
+            response = await self._send(client, method, url, **kwargs)
+        self._check_response(response)
+        self._accepted_client = client
+        return response
+
+    @staticmethod
+    def _check_entities_response(response: httpx.Response) -> None:
+        """
+        Check a SLIMS response holds entities.
+        Parameters
+        ----------
+        response : httpx.Response
+
+        Raises
+        ------
+        _SlimsApiException
+          If SLIMS did not return the entities.
+
+        """
+        if response.status_code != 200:
+            raise _SlimsApiException(
+                "Could not fetch entities: " + response.text
+            )
+
+    def _get_records(self, response: httpx.Response) -> List[Record]:
+        """
+        Parse the entities in a SLIMS response into Records.
+        Parameters
+        ----------
+        response : httpx.Response
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        self._check_entities_response(response)
+        records = []
+        for entity in response.json()["entities"]:
+            if entity["tableName"] == "Attachment":
+                records.append(Attachment(entity, self.slims_api))
+            else:
+                records.append(Record(entity, self.slims_api))
+        return records
+
+    @staticmethod
+    def _get_fetch_body(
+        criteria: Optional[Criterion],
+        sort: Optional[List[str]],
+        start: Optional[int],
+        end: Optional[int],
+    ) -> Dict[str, Any]:
+        """Body of an advanced fetch. Same as the one Slims.fetch sends."""
+        body: Dict[str, Any] = {
+            "sortBy": [] if sort is None else sort,
+            "startRow": start,
+            "endRow": end,
+        }
+        if criteria:
+            body["criteria"] = criteria.to_dict()
+        return body
+
+    async def fetch(
+        self,
+        table: str,
+        criteria: Optional[Criterion],
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Record]:
+        """
+        Fetch data by criteria. Same arguments as Slims.fetch.
+        Parameters
+        ----------
+        table : str
+        criteria : Criterion | None
+        sort : List[str] | None
+        start : int | None
+        end : int | None
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        response = await self._request(
+            "GET",
+            f"{table}/advanced",
+            json=self._get_fetch_body(criteria, sort, start, end),
+        )
+        return self._get_records(response)
+
+    async def fetch_raw(
+        self,
+        table: str,
+        criteria: Optional[Criterion],
+        columns: Optional[Collection[str]] = None,
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[RawRecord]:
+        """
+        Same as fetch, but the response is parsed with orjson into
+        RawRecords holding only the given columns. Skips building a Record
+        and a Column object per column of every row. If column_projection is
+        set, the columns are also sent to SLIMS, so that the other columns
+        are not returned at all.
+        Parameters
+        ----------
+        table : str
+        criteria : Criterion | None
+        columns : Collection[str] | None
+          Names of the columns to keep. If None, every column is kept.
+        sort : List[str] | None
+        start : int | None
+        end : int | None
+
+        Returns
+        -------
+        List[RawRecord]
+
+        """
+        body = self._get_fetch_body(criteria, sort, start, end)
+        if self.column_projection and columns is not None:
+            body["columns"] = sorted(columns)
+        response = await self._request("GET", f"{table}/advanced", json=body)
+        self._check_entities_response(response)
+        return [
+            RawRecord.from_entity(entity, columns)
+            for entity in orjson.loads(response.content)["entities"]
+        ]
+
+    async def get(self, url: str) -> httpx.Response:
+        """
+        Issue a GET request against the REST API.
+        Parameters
+        ----------
+        url : str
+          Url relative to the REST root, e.g. repo/{pk}
+
+        Returns
+        -------
+        httpx.Response
+
+        """
+        return await self._request("GET", url)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pools."""
+        for client in self._retired_clients + [self.client]:
+            await client.aclose()
+        self._retired_clients = []
+
+
+async_session = AsyncSlims(
+    name=settings.db,
+    url=settings.host,
+    username=settings.username,
+    password=settings.password.get_secret_value(),
+    max_connections=settings.http_max_connections,
+    max_keepalive_connections=settings.http_max_keepalive_connections,
+    max_client_requests=settings.http_client_max_requests,
+    timeout_seconds=settings.http_timeout_seconds,
+    column_projection=settings.column_projection,
+)
+
+
+def get_async_session() -> AsyncSlims:
+    """Return the process-wide async SLIMS session."""
+    return async_session
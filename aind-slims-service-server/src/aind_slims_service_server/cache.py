@@ -0,0 +1,434 @@
+"""Module for in-process caches"""
+
+import asyncio
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from aind_slims_service_server.models import CacheMetrics
+from aind_slims_service_server.session import settings
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire ttl_seconds after they were set.
+    Once max_size entries are held, the least recently used entry is evicted
+    to make room for a new one.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        ttl_seconds : float
+          How long an entry is served after it was set.
+        max_size : int
+          Maximum number of entries held at once.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get the value stored for key.
+        Parameters
+        ----------
+        key : Hashable
+
+        Returns
+        -------
+        Any | None
+          None if the key is missing or its entry expired.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store value for key, evicting the least recently used entries if the
+        cache is full.
+        Parameters
+        ----------
+        key : Hashable
+        value : Any
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> CacheMetrics:
+        """Current cache usage and lifetime counters."""
+        with self._lock:
+            return CacheMetrics(
+                size=len(self._entries),
+                max_size=self.max_size,
+                **self._counters,
+            )
+
+
+class DatePartitionedCache:
+    """
+    Caches the results of date-filtered queries in date (UTC) partitions.
+    Days past the hot window are grouped by calendar month once the whole
+    month is past it, so a long window takes a few entries of the cache
+    rather than one per day. A query is answered from the cached partitions
+    in its window and only the missing ones, plus the days in the hot window,
+    are fetched. Consecutive partitions to fetch are merged into a single
+    query.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int, hot_days: int):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        ttl_seconds : float
+          How long a cached partition is served.
+        max_size : int
+          Maximum number of cached partitions across all queries.
+        hot_days : int
+          Number of days before today that are always fetched. Today is
+          never cached since it is still changing.
+        """
+        self.cache = TTLCache(ttl_seconds=ttl_seconds, max_size=max_size)
+        self.hot_days = hot_days
+
+    @staticmethod
+    def _as_utc(dt: datetime) -> datetime:
+        """Convert to UTC. Naive datetimes are read as local time."""
+        if dt.tzinfo is None:
+            return datetime.fromtimestamp(dt.timestamp(), tz=timezone.utc)
+        return dt.astimezone(timezone.utc)
+
+    @staticmethod
+    def _get_partition(day: date, last_cold_day: date) -> Tuple[date, date]:
+        """
+        The first and last day of the partition holding a day: its calendar
+        month if the whole month is cold, otherwise the day itself.
+        """
+        first = day.replace(day=1)
+        last = (first + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+        if last <= last_cold_day:
+            return first, last
+        return day, day
+
+    @staticmethod
+    def _get_ranges(
+        partitions: List[Tuple[date, date]],
+    ) -> List[List[Tuple[date, date]]]:
+        """Group sorted partitions into runs of consecutive partitions."""
+        ranges = []
+        for partition in partitions:
+            if (
+                ranges
+                and ranges[-1][-1][1] + timedelta(days=1) == partition[0]
+            ):
+                ranges[-1].append(partition)
+            else:
+                ranges.append([partition])
+        return ranges
+
+    async def _fetch_partitions(
+        self,
+        partitions: List[Tuple[date, date]],
+        fetch: Callable[[datetime, datetime], Awaitable[List[T]]],
+        get_date: Callable[[T], Optional[datetime]],
+    ) -> Dict[Tuple[date, date], List[T]]:
+        """
+        Fetch consecutive partitions in one query and split the rows by
+        partition. Rows without a date are kept with the newest partition.
+        Parameters
+        ----------
+        partitions : List[Tuple[date, date]]
+        fetch : Callable[[datetime, datetime], Awaitable[List[T]]]
+        get_date : Callable[[T], datetime | None]
+
+        Returns
+        -------
+        Dict[Tuple[date, date], List[T]]
+
+        """
+        first, last = partitions[0][0], partitions[-1][1]
+        start = datetime.combine(first, datetime.min.time(), timezone.utc)
+        end = datetime.combine(
+            last + timedelta(days=1), datetime.min.time(), timezone.utc
+        ) - timedelta(milliseconds=1)
+        firsts = [partition[0] for partition in partitions]
+        rows_by_partition: Dict[Tuple[date, date], List[T]] = {
+            partition: [] for partition in partitions
+        }
+        for row in await fetch(start, end):
+            row_date = get_date(row)
+            day = last if row_date is None else self._as_utc(row_date).date()
+            if first <= day <= last:
+                partition = partitions[bisect_right(firsts, day) - 1]
+                rows_by_partition[partition].append(row)
+        return rows_by_partition
+
+    async def fetch(
+        self,
+        key: Hashable,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        fetch: Callable[
+            [Optional[datetime], Optional[datetime]], Awaitable[List[T]]
+        ],
+        get_date: Callable[[T], Optional[datetime]],
+    ) -> List[T]:
+        """
+        Get the rows dated between start and end.
+        Parameters
+        ----------
+        key : Hashable
+          Identifies the query apart from its date window, e.g. endpoint and
+          subject_id.
+        start : datetime | None
+          If None, the window is unbounded and the cache is bypassed.
+        end : datetime | None
+          If None, the window ends now.
+        fetch : Callable[[datetime | None, datetime | None], Awaitable]
+          Fetches the rows dated between two datetimes (inclusive), newest
+          first.
+        get_date : Callable[[T], datetime | None]
+          The date of a row. Rows without a date returned by fetch are kept.
+
+        Returns
+        -------
+        List[T]
+          Rows without a date first, then the rest newest first, like the
+          handlers' output.
+
+        """
+        if start is None:
+            return await fetch(start, end)
+        now = datetime.now(timezone.utc)
+        start = self._as_utc(start)
+        end = now if end is None else self._as_utc(end)
+        last_cold_day = now.date() - timedelta(days=self.hot_days + 1)
+        partitions = sorted(
+            {
+                self._get_partition(
+                    start.date() + timedelta(days=i), last_cold_day
+                )
+                for i in range((end.date() - start.date()).days + 1)
+            }
+        )
+        rows_by_partition: Dict[Tuple[date, date], List[T]] = {}
+        for partition in partitions:
+            if partition[1] <= last_cold_day:
+                rows = self.cache.get((key, partition))
+                if rows is not None:
+                    rows_by_partition[partition] = rows
+        missing = [p for p in partitions if p not in rows_by_partition]
+        fetched = await asyncio.gather(
+            *[
+                self._fetch_partitions(run, fetch, get_date)
+                for run in self._get_ranges(missing)
+            ]
+        )
+        for fetched_rows_by_partition in fetched:
+            for partition, rows in fetched_rows_by_partition.items():
+                rows_by_partition[partition] = rows
+                if partition[1] <= last_cold_day:
+                    self.cache.set((key, partition), rows)
+        rows = [
+            row
+            for partition in reversed(partitions)
+            for row in rows_by_partition[partition]
+            if get_date(row) is None
+            or start <= self._as_utc(get_date(row)) <= end
+        ]
+        return sorted(rows, key=lambda row: get_date(row) is not None)
+
+    def metrics(self) -> CacheMetrics:
+        """Current cache usage and lifetime counters."""
+        return self.cache.metrics()
+
+
+class AttachmentCache:
+    """
+    Thread-safe LRU cache of the contents of SLIMS attachments, keyed by
+    attachment pk. Attachments addressed by repo/{pk} never change, so
+    entries do not expire. Once max_size contents are held in memory, the
+    least recently used one is evicted, or written to spill_dir if it is
+    set. At most max_spill_size contents are kept in spill_dir, and a
+    content read back from it moves to memory again. Since get and set may
+    access spill_dir, async callers should run them in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        spill_dir: Optional[str] = None,
+        max_spill_size: int = 0,
+    ):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        max_size : int
+          Maximum number of contents held in memory.
+        spill_dir : str | None
+          Directory that contents evicted from memory are written to. If
+          None, they are dropped.
+        max_spill_size : int
+          Maximum number of contents kept in spill_dir.
+        """
+        self.max_size = max_size
+        self.spill_dir = spill_dir
+        self.max_spill_size = max_spill_size if spill_dir is not None else 0
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, bytes] = OrderedDict()
+        self._spilled: OrderedDict[int, None] = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _get_spill_path(self, pk: int) -> str:
+        """Path of the spilled content of an attachment."""
+        return os.path.join(self.spill_dir, str(pk))
+
+    def _spill(self, pk: int, content: bytes) -> None:
+        """Write a content to spill_dir, dropping the oldest ones if full."""
+        if self.max_spill_size == 0:
+            self._counters["evictions"] += 1
+            return
+        with open(self._get_spill_path(pk), "wb") as f:
+            f.write(content)
+        self._spilled[pk] = None
+        self._spilled.move_to_end(pk)
+        while len(self._spilled) > self.max_spill_size:
+            oldest, _ = self._spilled.popitem(last=False)
+            os.remove(self._get_spill_path(oldest))
+            self._counters["evictions"] += 1
+
+    def _unspill(self, pk: int) -> bytes:
+        """Read a content back from spill_dir and remove its file."""
+        del self._spilled[pk]
+        path = self._get_spill_path(pk)
+        with open(path, "rb") as f:
+            content = f.read()
+        os.remove(path)
+        return content
+
+    def _set(self, pk: int, content: bytes) -> None:
+        """Store a content in memory, spilling the least recently used."""
+        self._entries[pk] = content
+        self._entries.move_to_end(pk)
+        while len(self._entries) > self.max_size:
+            self._spill(*self._entries.popitem(last=False))
+
+    def get(self, pk: int) -> Optional[bytes]:
+        """
+        Get the content stored for an attachment.
+        Parameters
+        ----------
+        pk : int
+
+        Returns
+        -------
+        bytes | None
+          None if the content is not cached.
+
+        """
+        with self._lock:
+            content = self._entries.get(pk)
+            if content is not None:
+                self._entries.move_to_end(pk)
+            elif pk in self._spilled:
+                content = self._unspill(pk)
+                self._set(pk, content)
+            else:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            return content
+
+    def set(self, pk: int, content: bytes) -> None:
+        """
+        Store the content of an attachment.
+        Parameters
+        ----------
+        pk : int
+        content : bytes
+        """
+        with self._lock:
+            if pk in self._spilled:
+                os.remove(self._get_spill_path(pk))
+                del self._spilled[pk]
+            self._set(pk, content)
+
+    def clear(self) -> None:
+        """Remove all contents, including the spilled ones."""
+        with self._lock:
+            for pk in self._spilled:
+                os.remove(self._get_spill_path(pk))
+            self._spilled.clear()
+            self._entries.clear()
+
+    def metrics(self) -> CacheMetrics:
+        """
+        Current cache usage and lifetime counters. Sizes count the contents
+        in memory and in spill_dir.
+        """
+        with self._lock:
+            return CacheMetrics(
+                size=len(self._entries) + len(self._spilled),
+                max_size=self.max_size + self.max_spill_size,
+                **self._counters,
+            )
+
+
+reference_cache = TTLCache(
+    ttl_seconds=settings.reference_cache_ttl_seconds,
+    max_size=settings.reference_cache_max_size,
+)
+
+result_cache = DatePartitionedCache(
+    ttl_seconds=settings.result_cache_ttl_seconds,
+    max_size=settings.result_cache_max_size,
+    hot_days=settings.result_cache_hot_days,
+)
+
+attachment_cache = AttachmentCache(
+    max_size=settings.attachment_cache_max_size,
+    spill_dir=settings.attachment_cache_spill_dir,
+    max_spill_size=settings.attachment_cache_max_spill_size,
+)
@@ -1,5 +1,7 @@
 """Module for settings to connect to SLIMS backend"""
 
+from typing import Optional
+
 from aind_settings_utils.aws import SecretsManagerBaseSettings
 from pydantic import Field, SecretStr
 from pydantic_settings import SettingsConfigDict
@@ -12,6 +14,154 @@ class Settings(SecretsManagerBaseSettings):
     password: SecretStr = Field(..., description="Password")
     host: str = Field(..., description="host")
     db: str = Field(default="slims", description="Database")
+    fetch_max_workers: int = Field(
+        default=4,
+        description=(
+            "Maximum number of fetches sent to SLIMS concurrently per "
+            "request, counting each chunk of a large key set."
+        ),
+        gt=0,
+    )
+    fk_chunk_size: int = Field(
+        default=500,
+        description=(
+            "Maximum number of keys sent to SLIMS in a single is_one_of "
+            "criterion. Larger key sets are split and fetched in parallel."
+        ),
+        gt=0,
+    )
+    http_max_connections: int = Field(
+        default=100,
+        description="Maximum number of open connections of the async client.",
+        gt=0,
+    )
+    http_max_keepalive_connections: int = Field(
+        default=20,
+        description="Maximum number of idle connections kept open.",
+        ge=0,
+    )
+    http_client_max_requests: int = Field(
+        default=10000,
+        description=(
+            "Number of requests sent by the async client before it is "
+            "replaced by a new client with fresh connections."
+        ),
+        gt=0,
+    )
+    http_timeout_seconds: float = Field(
+        default=60.0,
+        description="Timeout of a single request sent by the async client.",
+        gt=0,
+    )
+    reference_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        description=(
+            "How long near-static lookup rows (e.g. ExperimentTemplate, "
+            "ContentType) are cached before being fetched again."
+        ),
+        gt=0,
+    )
+    reference_cache_max_size: int = Field(
+        default=256,
+        description="Maximum number of cached lookup queries.",
+        gt=0,
+    )
+    result_cache_hot_days: int = Field(
+        default=1,
+        description=(
+            "Number of days before today whose results are always fetched "
+            "from SLIMS instead of the date-partitioned result cache. Today "
+            "is never cached."
+        ),
+        ge=0,
+    )
+    result_cache_ttl_seconds: float = Field(
+        default=86400.0,
+        description="How long a cached date partition of results is served.",
+        gt=0,
+    )
+    result_cache_max_size: int = Field(
+        default=4096,
+        description=(
+            "Maximum number of cached date partitions of results. Days past "
+            "the hot window are cached by month."
+        ),
+        gt=0,
+    )
+    attachment_cache_max_size: int = Field(
+        default=256,
+        description=(
+            "Maximum number of downloaded attachments, such as instrument "
+            "JSON files, held in memory."
+        ),
+        gt=0,
+    )
+    attachment_cache_spill_dir: Optional[str] = Field(
+        default=None,
+        description=(
+            "Directory that attachments evicted from memory are written to. "
+            "If not set, they are dropped and downloaded again when needed."
+        ),
+    )
+    attachment_cache_max_spill_size: int = Field(
+        default=4096,
+        description="Maximum number of attachments kept in the spill dir.",
+        ge=0,
+    )
+    instrument_index: bool = Field(
+        default=False,
+        description=(
+            "Keep an in-process index of the names of the instrument "
+            "records, synced in the background, and answer instrument "
+            "queries from it once synced. Only the attachments are then "
+            "downloaded from SLIMS."
+        ),
+    )
+    instrument_index_poll_seconds: float = Field(
+        default=300.0,
+        description="Seconds between incremental syncs of the index.",
+        gt=0,
+    )
+    instrument_index_page_size: int = Field(
+        default=1000,
+        description="Number of rows requested per page when syncing.",
+        gt=0,
+    )
+    column_projection: bool = Field(
+        default=False,
+        description=(
+            "Send the columns a handler reads with each fetch, so that SLIMS "
+            "only returns those columns. Enable only if the SLIMS REST API "
+            "supports column selection in advanced fetches. Either way, the "
+            "unused columns are dropped when the rows are parsed."
+        ),
+    )
+    mirror_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Path of a local SQLite mirror of the SLIMS tables the service "
+            "reads. If set, the tables are synced in the background and "
+            "record graphs are built from the mirror once it is synced."
+        ),
+    )
+    mirror_poll_seconds: float = Field(
+        default=60.0,
+        description="Seconds between incremental syncs of the mirror.",
+        gt=0,
+    )
+    mirror_reconcile_seconds: float = Field(
+        default=86400.0,
+        description=(
+            "Seconds between full comparisons of the mirrored primary keys "
+            "with SLIMS, which remove the rows deleted in SLIMS."
+        ),
+        gt=0,
+    )
+    mirror_page_size: int = Field(
+        default=1000,
+        description="Number of rows requested per page when syncing.",
+        gt=0,
+    )
     model_config = SettingsConfigDict(
         env_prefix="SLIMS_",
         case_sensitive=False,
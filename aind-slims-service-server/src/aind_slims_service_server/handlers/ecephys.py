@@ -1,15 +1,24 @@
 """Module to retrieve ephys data from SLIMS using session object."""
 
-from datetime import datetime, timezone
-from decimal import Decimal
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
 
-from networkx import DiGraph, descendants
 from slims.criteria import equals
 from slims.internal import Record
 
+from aind_slims_service_server.handlers.field_map import (
+    FieldMap,
+    RecordMapper,
+    to_datetime,
+    to_decimal,
+)
 from aind_slims_service_server.handlers.table_handler import (
+    ForeignTableFetch,
+    RecordGraph,
+    RootPage,
+    RootSpec,
     SlimsTableHandler,
+    SubjectLookup,
 )
 from aind_slims_service_server.models import (
     EcephysRewardSpouts,
@@ -17,238 +26,203 @@ from aind_slims_service_server.models import (
     SlimsEcephysData,
 )
 
+STREAM_MODULE_MAPPER = RecordMapper(
+    EcephysStreamModule,
+    [
+        FieldMap("implant_hole", "rdrc_cf_implantHole"),
+        FieldMap("assembly_name", "rdrc_cf_assemblyName"),
+        FieldMap("probe_name", "rdrc_cf_probeName"),
+        FieldMap(
+            "primary_target_structure",
+            "rdrc_cf_fk_primaryTargetedStructure",
+            "displayValue",
+        ),
+        FieldMap(
+            "secondary_target_structures",
+            "rdrc_cf_fk_secondaryTargetedStructures",
+            "displayValues",
+        ),
+        FieldMap("arc_angle", "rdrc_cf_arcAngle", converter=to_decimal),
+        FieldMap("module_angle", "rdrc_cf_moduleAngle", converter=to_decimal),
+        FieldMap(
+            "rotation_angle", "rdrc_cf_rotationAngle", converter=to_decimal
+        ),
+        FieldMap(
+            "coordinate_transform",
+            "rdrc_cf_coordinateTransform",
+            "displayValue",
+        ),
+        FieldMap(
+            "ccf_coordinate_ap",
+            "rdrc_cf_ccfCoordinatesAp",
+            converter=to_decimal,
+        ),
+        FieldMap(
+            "ccf_coordinate_ml",
+            "rdrc_cf_ccfCoordinatesMl",
+            converter=to_decimal,
+        ),
+        FieldMap(
+            "ccf_coordinate_dv",
+            "rdrc_cf_ccfCoordinatesDv",
+            converter=to_decimal,
+        ),
+        FieldMap("ccf_coordinate_unit", "rdrc_cf_ccfCoordinatesAp", "unit"),
+        FieldMap("ccf_version", "rdrc_cf_ccfVersion"),
+        FieldMap("bregma_target_ap", "rdrc_cf_bregmaAP", converter=to_decimal),
+        FieldMap("bregma_target_ml", "rdrc_cf_bregmaML", converter=to_decimal),
+        FieldMap("bregma_target_dv", "rdrc_cf_bregmaDV", converter=to_decimal),
+        FieldMap("bregma_target_unit", "rdrc_cf_bregmaAP", "unit"),
+        FieldMap("surface_z", "rdrc_cf_surfaceZ", converter=to_decimal),
+        FieldMap("surface_z_unit", "rdrc_cf_surfaceZ", "unit"),
+        FieldMap(
+            "manipulator_x", "rdrc_cf_manipulatorX", converter=to_decimal
+        ),
+        FieldMap(
+            "manipulator_y", "rdrc_cf_manipulatory", converter=to_decimal
+        ),
+        FieldMap(
+            "manipulator_z", "rdrc_cf_manipulatorZ", converter=to_decimal
+        ),
+        FieldMap("manipulator_unit", "rdrc_cf_manipulatorX", "unit"),
+        FieldMap("dye", "rdrc_cf_fk_dye", "displayValue"),
+    ],
+)
+
+REWARD_SPOUTS_MAPPER = RecordMapper(
+    EcephysRewardSpouts,
+    [
+        FieldMap("spout_side", "rdrc_cf_spoutSide"),
+        FieldMap("starting_position", "rdrc_cf_startingPosition"),
+        FieldMap("variable_position", "rdrc_cf_variablePosition"),
+    ],
+)
+
+EXPERIMENT_RUN_MAPPER = RecordMapper(
+    SlimsEcephysData,
+    [
+        FieldMap(
+            "experiment_run_created_on",
+            "xprn_createdOn",
+            converter=to_datetime,
+        ),
+    ],
+)
+
+CONTENT_MAPPER = RecordMapper(
+    SlimsEcephysData, [FieldMap("subject_id", "cntn_barCode")]
+)
+
+GROUP_OF_SESSIONS_MAPPER = RecordMapper(
+    SlimsEcephysData,
+    [
+        FieldMap("operator", "xprs_cf_fk_operator", "joinedDisplayValue"),
+        FieldMap("session_type", "xprs_cf_sessionType"),
+        FieldMap("mouse_platform_name", "xprs_cf_mousePlatformName"),
+        FieldMap("active_mouse_platform", "xprs_cf_activeMousePlatform"),
+        FieldMap("instrument", "xprs_cf_fk_instrument", "displayValue"),
+        FieldMap("device_calibrations", "xprs_cf_deviceCalibrations"),
+    ],
+)
+
+MOUSE_SESSION_MAPPER = RecordMapper(
+    SlimsEcephysData,
+    [
+        FieldMap("session_name", "rslt_cf_sessionName"),
+        FieldMap(
+            "animal_weight_prior",
+            "rslt_cf_animalWeightPrior",
+            converter=to_decimal,
+        ),
+        FieldMap(
+            "animal_weight_after",
+            "rslt_cf_animalWeightPost",
+            converter=to_decimal,
+        ),
+        FieldMap("animal_weight_unit", "rslt_cf_animalWeightPrior", "unit"),
+        FieldMap(
+            "reward_consumed",
+            "rslt_cf_rewardConsumedvolume",
+            converter=to_decimal,
+        ),
+        FieldMap(
+            "reward_consumed_unit", "rslt_cf_rewardConsumedvolume", "unit"
+        ),
+        FieldMap(
+            "link_to_stimulus_epoch_code", "rslt_cf_linkToStimulusEpochCode"
+        ),
+        FieldMap("stimulus_epochs", "rslt_cf_stimulusEpochs"),
+    ],
+)
+
+STREAMS_MAPPER = RecordMapper(
+    SlimsEcephysData,
+    [
+        FieldMap("stream_modalities", "rslt_cf_streamModalities"),
+        FieldMap("daq_names", "rslt_cf_daqNames"),
+        FieldMap("camera_names", "rslt_cf_cameraNames"),
+    ],
+)
+
+REWARD_DELIVERY_MAPPER = RecordMapper(
+    SlimsEcephysData,
+    [
+        FieldMap("reward_solution", "rdrc_cf_rewardSolution"),
+        FieldMap("other_reward_solution", "rdrc_cf_specifyRewardSolution"),
+    ],
+)
+
 
 class EcephysSessionHandler(SlimsTableHandler):
     """Class to handle getting Ephys Session info from SLIMS."""
 
-    def _get_stream_module_data(self, row: Record) -> EcephysStreamModule:
-        """Parses a stream module info from a SLIMS row."""
-        arc_angle = self.get_attr_or_none(row, "rdrc_cf_arcAngle")
-        module_angle = self.get_attr_or_none(row, "rdrc_cf_moduleAngle")
-        rotation_angle = self.get_attr_or_none(row, "rdrc_cf_rotationAngle")
-        ccf_coordinate_ap = self.get_attr_or_none(
-            row, "rdrc_cf_ccfCoordinatesAp"
-        )
-        ccf_coordinate_ml = self.get_attr_or_none(
-            row, "rdrc_cf_ccfCoordinatesMl"
-        )
-        ccf_coordinate_dv = self.get_attr_or_none(
-            row, "rdrc_cf_ccfCoordinatesDv"
-        )
-        bregma_target_ap = self.get_attr_or_none(row, "rdrc_cf_bregmaAP")
-        bregma_target_ml = self.get_attr_or_none(row, "rdrc_cf_bregmaML")
-        bregma_target_dv = self.get_attr_or_none(row, "rdrc_cf_bregmaDV")
-        surface_z = self.get_attr_or_none(row, "rdrc_cf_surfaceZ")
-        manipulator_x = self.get_attr_or_none(row, "rdrc_cf_manipulatorX")
-        manipulator_y = self.get_attr_or_none(row, "rdrc_cf_manipulatory")
-        manipulator_z = self.get_attr_or_none(row, "rdrc_cf_manipulatorZ")
-        return EcephysStreamModule(
-            implant_hole=self.get_attr_or_none(row, "rdrc_cf_implantHole"),
-            assembly_name=self.get_attr_or_none(row, "rdrc_cf_assemblyName"),
-            probe_name=self.get_attr_or_none(row, "rdrc_cf_probeName"),
-            primary_target_structure=self.get_attr_or_none(
-                row, "rdrc_cf_fk_primaryTargetedStructure", "displayValue"
-            ),
-            secondary_target_structures=self.get_attr_or_none(
-                row, "rdrc_cf_fk_secondaryTargetedStructures", "displayValues"
-            ),
-            arc_angle=(None if arc_angle is None else Decimal(str(arc_angle))),
-            module_angle=(
-                None if module_angle is None else Decimal(str(module_angle))
-            ),
-            rotation_angle=(
-                None
-                if rotation_angle is None
-                else Decimal(str(rotation_angle))
-            ),
-            coordinate_transform=self.get_attr_or_none(
-                row, "rdrc_cf_coordinateTransform", "displayValue"
-            ),
-            ccf_coordinate_ap=(
-                None
-                if ccf_coordinate_ap is None
-                else Decimal(str(ccf_coordinate_ap))
-            ),
-            ccf_coordinate_ml=(
-                None
-                if ccf_coordinate_ml is None
-                else Decimal(str(ccf_coordinate_ml))
-            ),
-            ccf_coordinate_dv=(
-                None
-                if ccf_coordinate_dv is None
-                else Decimal(str(ccf_coordinate_dv))
-            ),
-            ccf_coordinate_unit=self.get_attr_or_none(
-                row, "rdrc_cf_ccfCoordinatesAp", "unit"
-            ),
-            ccf_version=self.get_attr_or_none(row, "rdrc_cf_ccfVersion"),
-            bregma_target_ap=(
-                None
-                if bregma_target_ap is None
-                else Decimal(str(bregma_target_ap))
-            ),
-            bregma_target_ml=(
-                None
-                if bregma_target_ml is None
-                else Decimal(str(bregma_target_ml))
-            ),
-            bregma_target_dv=(
-                None
-                if bregma_target_dv is None
-                else Decimal(str(bregma_target_dv))
-            ),
-            bregma_target_unit=self.get_attr_or_none(
-                row, "rdrc_cf_bregmaAP", "unit"
-            ),
-            surface_z=(None if surface_z is None else Decimal(str(surface_z))),
-            surface_z_unit=self.get_attr_or_none(
-                row, "rdrc_cf_surfaceZ", "unit"
-            ),
-            manipulator_x=(
-                None if manipulator_x is None else Decimal(str(manipulator_x))
-            ),
-            manipulator_y=(
-                None if manipulator_y is None else Decimal(str(manipulator_y))
-            ),
-            manipulator_z=(
-                None if manipulator_z is None else Decimal(str(manipulator_z))
-            ),
-            manipulator_unit=self.get_attr_or_none(
-                row, "rdrc_cf_manipulatorX", "unit"
-            ),
-            dye=self.get_attr_or_none(row, "rdrc_cf_fk_dye", "displayValue"),
-        )
-
-    def _get_reward_spouts_data(self, row: Record) -> EcephysRewardSpouts:
-        """Parses a reward spouts info from a SLIMS row."""
-        return EcephysRewardSpouts(
-            spout_side=self.get_attr_or_none(row, "rdrc_cf_spoutSide"),
-            starting_position=self.get_attr_or_none(
-                row, "rdrc_cf_startingPosition"
-            ),
-            variable_position=self.get_attr_or_none(
-                row, "rdrc_cf_variablePosition"
-            ),
-        )
+    ROOT = RootSpec("xprn_createdOn", "xprn_pk", "experiment_run_created_on")
 
-    def _handle_content(self, ephys_data: SlimsEcephysData, row: Record):
+    def _handle_content(self, fields: Dict[str, Any], row: Record):
         """Handles the content table."""
-        ephys_data.subject_id = self.get_attr_or_none(row, "cntn_barCode")
+        fields.update(CONTENT_MAPPER.extract(row))
 
-    def _handle_experimentrunstep(
-        self, ephys_data: SlimsEcephysData, row: Record
-    ):
+    def _handle_experimentrunstep(self, fields: Dict[str, Any], row: Record):
         """Handles the experiment run step table."""
-        if self.get_attr_or_none(row, "xprs_name") != "Group of Sessions":
-            return
-        ephys_data.operator = self.get_attr_or_none(
-            row, "xprs_cf_fk_operator", "joinedDisplayValue"
-        )
-        ephys_data.session_type = self.get_attr_or_none(
-            row, "xprs_cf_sessionType"
-        )
-        ephys_data.mouse_platform_name = self.get_attr_or_none(
-            row, "xprs_cf_mousePlatformName"
-        )
-        ephys_data.active_mouse_platform = self.get_attr_or_none(
-            row, "xprs_cf_activeMousePlatform"
-        )
-        ephys_data.instrument = self.get_attr_or_none(
-            row, "xprs_cf_fk_instrument", "displayValue"
-        )
-        ephys_data.device_calibrations = self.get_attr_or_none(
-            row, "xprs_cf_deviceCalibrations"
-        )
+        if self.get_attr_or_none(row, "xprs_name") == "Group of Sessions":
+            fields.update(GROUP_OF_SESSIONS_MAPPER.extract(row))
 
-    def _handle_result(self, ephys_data: SlimsEcephysData, row: Record):
+    def _handle_result(self, fields: Dict[str, Any], row: Record):
         """Handles the result table."""
         label = self.get_attr_or_none(row, "test_label")
         if label == "Mouse Session":
-            ephys_data.session_name = self.get_attr_or_none(
-                row, "rslt_cf_sessionName"
-            )
-            animal_weight_prior = self.get_attr_or_none(
-                row, "rslt_cf_animalWeightPrior"
-            )
-            ephys_data.animal_weight_prior = (
-                None
-                if animal_weight_prior is None
-                else Decimal(str(animal_weight_prior))
-            )
-            animal_weight_after = self.get_attr_or_none(
-                row, "rslt_cf_animalWeightPost"
-            )
-            ephys_data.animal_weight_after = (
-                None
-                if animal_weight_after is None
-                else Decimal(str(animal_weight_after))
-            )
-            ephys_data.animal_weight_unit = self.get_attr_or_none(
-                row, "rslt_cf_animalWeightPrior", "unit"
-            )
-            reward_consumed = self.get_attr_or_none(
-                row, "rslt_cf_rewardConsumedvolume"
-            )
-            ephys_data.reward_consumed = (
-                None
-                if reward_consumed is None
-                else Decimal(str(reward_consumed))
-            )
-            ephys_data.reward_consumed_unit = self.get_attr_or_none(
-                row, "rslt_cf_rewardConsumedvolume", "unit"
-            )
-            ephys_data.link_to_stimulus_epoch_code = self.get_attr_or_none(
-                row, "rslt_cf_linkToStimulusEpochCode"
-            )
-            ephys_data.stimulus_epochs = self.get_attr_or_none(
-                row, "rslt_cf_stimulusEpochs"
-            )
-
+            fields.update(MOUSE_SESSION_MAPPER.extract(row))
         elif label == "Streams":
-            ephys_data.stream_modalities = self.get_attr_or_none(
-                row, "rslt_cf_streamModalities"
-            )
-            ephys_data.daq_names = self.get_attr_or_none(
-                row, "rslt_cf_daqNames"
-            )
-            ephys_data.camera_names = self.get_attr_or_none(
-                row, "rslt_cf_cameraNames"
-            )
-
-    def _handle_referencedatarecord(
-        self, ephys_data: SlimsEcephysData, row: Record
-    ):
+            fields.update(STREAMS_MAPPER.extract(row))
+
+    def _handle_referencedatarecord(self, fields: Dict[str, Any], row: Record):
         """Handles the reference data record table."""
         ref_type = self.get_attr_or_none(
             row, "rdrc_fk_referenceDataType", "displayValue"
         )
         if ref_type == "Reward Delivery":
-            ephys_data.reward_solution = self.get_attr_or_none(
-                row, "rdrc_cf_rewardSolution"
-            )
-            ephys_data.other_reward_solution = self.get_attr_or_none(
-                row, "rdrc_cf_specifyRewardSolution"
-            )
+            fields.update(REWARD_DELIVERY_MAPPER.extract(row))
         elif ref_type == "Reward Spouts":
-            ephys_data.reward_spouts.append(self._get_reward_spouts_data(row))
+            fields["reward_spouts"].append(REWARD_SPOUTS_MAPPER.create(row))
         elif ref_type == "Dome Module":
-            ephys_data.stream_modules.append(self._get_stream_module_data(row))
+            fields["stream_modules"].append(STREAM_MODULE_MAPPER.create(row))
 
-    def _parse_graph(
+    def _iter_parse_graph(
         self,
-        g: DiGraph,
-        root_nodes: List[str],
-        subject_id: Optional[str],
-        session_name: Optional[str],
-    ) -> List[SlimsEcephysData]:
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str] = None,
+        session_name: Optional[str] = None,
+    ) -> Iterator[SlimsEcephysData]:
         """
-        Parses the graph object into a list of pydantic models.
+        Parses the graph object into pydantic models, one root node at a
+        time. The fields of a session are collected from its descendants
+        into a dict, and the model is created once from it.
         Parameters
         ----------
-        g : DiGraph
+        g : RecordGraph
           Graph of the SLIMS records.
-        root_nodes : List[str]
+        root_nodes : List[int]
           List of root nodes to pull descendants from.
         subject_id : Optional[str]
           Labtracks ID of mouse to filter records by.
@@ -256,146 +230,182 @@ class EcephysSessionHandler(SlimsTableHandler):
             Name of the session to filter records by.
         Returns
         -------
-        List[SlimsEcephysData]
+        Iterator[SlimsEcephysData]
         """
-        ephys_data_list = []
-
-        for node in root_nodes:
-            ephys_data = SlimsEcephysData()
-            experiment_run_created_on_ts = self.get_attr_or_none(
-                g.nodes[node]["row"], "xprn_createdOn"
-            )
-            ephys_data.experiment_run_created_on = (
-                None
-                if experiment_run_created_on_ts is None
-                else datetime.fromtimestamp(
-                    experiment_run_created_on_ts / 1000, tz=timezone.utc
-                )
-            )
-            for n in descendants(g, node):
-                row = g.nodes[n]["row"]
-                table_name = g.nodes[n]["table_name"]
+
+        for node, node_des in g.iter_descendants(root_nodes):
+            fields = EXPERIMENT_RUN_MAPPER.extract(g.row(node))
+            fields["reward_spouts"] = []
+            fields["stream_modules"] = []
+            for n in node_des:
+                row = g.row(n)
+                table_name = g.table_name(n)
 
                 table_handler = getattr(
                     self, f"_handle_{table_name.lower()}", None
                 )
                 if table_handler:
-                    table_handler(ephys_data, row)
+                    table_handler(fields, row)
 
             if (
-                subject_id is None or subject_id == ephys_data.subject_id
+                subject_id is None or subject_id == fields.get("subject_id")
             ) and (
-                session_name is None or session_name == ephys_data.session_name
+                session_name is None
+                or session_name == fields.get("session_name")
             ):
-                ephys_data_list.append(
-                    SlimsEcephysData.model_validate(ephys_data.model_dump())
-                )
-        return ephys_data_list
+                yield SlimsEcephysData(**fields)
+
+    def _get_lookup(
+        self,
+        subject_id: Optional[Union[str, List[str]]],
+        session_name: Optional[str] = None,
+    ) -> Optional[SubjectLookup]:
+        """
+        Lookup of the experiment runs to fetch. A session name identifies a
+        single run through the Result row that holds it, so it is preferred
+        over the subject ID.
+        Parameters
+        ----------
+        subject_id : str | List[str] | None
+        session_name : str | None
+
+        Returns
+        -------
+        SubjectLookup | None
+          None if neither subject_id nor session_name is set.
+
+        """
+        if session_name is None:
+            return self._get_experiment_run_lookup("cntn_barCode", subject_id)
+        return SubjectLookup(
+            plan=[
+                ForeignTableFetch(
+                    name="Result",
+                    foreign_table="Result",
+                    extra_criteria=equals("rslt_cf_sessionName", session_name),
+                ),
+                ForeignTableFetch(
+                    name="ExperimentRunStep",
+                    input_name="Result",
+                    input_table_cols=("rslt_fk_experimentRunStep",),
+                    foreign_table="ExperimentRunStep",
+                    foreign_table_col="xprs_pk",
+                ),
+            ],
+            key_fetch="ExperimentRunStep",
+            key_col="xprs_fk_experimentRun",
+            root_col="xprn_pk",
+        )
 
-    def _get_graph(
+    def _get_fetch_plan(
         self,
         start_date_greater_than_or_equal: Optional[datetime] = None,
         end_date_less_than_or_equal: Optional[datetime] = None,
-    ) -> Tuple[DiGraph, List[str]]:
+        page: Optional[RootPage] = None,
+    ) -> List[ForeignTableFetch]:
         """
-        Generate a Graph of the records from SLIMS for Ecephys experiment runs.
+        Plan of the SLIMS fetches needed for Ecephys experiment runs.
         Parameters
         ----------
         start_date_greater_than_or_equal : datetime | None
           Filter experiment runs that were created on or after this datetime.
         end_date_less_than_or_equal : datetime | None
           Filter experiment runs that were created on or before this datetime.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
 
         Returns
         -------
-        Tuple[DiGraph, List[str]]
-          A directed graph of the SLIMS records and a list of the root nodes.
+        List[ForeignTableFetch]
 
         """
-
-        experiment_template_rows = self.session.fetch(
-            table="ExperimentTemplate",
-            criteria=equals(
-                "xptm_name", "In Vivo Electrophysiology Recording"
-            ),
-        )
         date_criteria = self._get_date_criteria(
             start_date=start_date_greater_than_or_equal,
             end_date=end_date_less_than_or_equal,
             field_name="xprn_createdOn",
         )
-        exp_run_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentTemplate",
-            input_rows=experiment_template_rows,
-            input_table_cols=["xptm_pk"],
-            foreign_table="ExperimentRun",
-            foreign_table_col="xprn_fk_experimentTemplate",
-            extra_criteria=date_criteria,
-        )
-        G = DiGraph()
-        root_nodes = []
-        for row in exp_run_rows:
-            G.add_node(
-                f"{row.table_name()}.{row.pk()}",
-                row=row,
-                pk=row.pk(),
-                table_name=row.table_name(),
-            )
-            root_nodes.append(f"{row.table_name()}.{row.pk()}")
-
-        exp_run_step_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRun",
-            input_rows=exp_run_rows,
-            input_table_cols=["xprn_pk"],
-            foreign_table="ExperimentRunStep",
-            foreign_table_col="xprs_fk_experimentRun",
-            graph=G,
-        )
-        exp_run_step_content_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_pk"],
-            foreign_table="ExperimentRunStepContent",
-            foreign_table_col="xrsc_fk_experimentRunStep",
-            graph=G,
-        )
-        result_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_pk"],
-            foreign_table="Result",
-            foreign_table_col="rslt_fk_experimentRunStep",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStepContent",
-            input_rows=exp_run_step_content_rows,
-            input_table_cols=["xrsc_fk_content"],
-            foreign_table="Content",
-            foreign_table_col="cntn_pk",
-            graph=G,
-        )
-        reference_data_rows = self.get_rows_from_foreign_table(
-            input_table="Result",
-            input_rows=result_rows,
-            input_table_cols=[
-                "rslt_cf_fk_modulesinStream",
-                "rslt_cf_fk_rewardDelivery",
-            ],
-            foreign_table="ReferenceDataRecord",
-            foreign_table_col="rdrc_pk",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="ReferenceDataRecord",
-            input_rows=reference_data_rows,
-            input_table_cols=["rdrc_cf_fk_rewardSpouts"],
-            foreign_table="ReferenceDataRecord",
-            foreign_table_col="rdrc_pk",
-            graph=G,
-        )
-
-        return G, root_nodes
+        return [
+            ForeignTableFetch(
+                name="ExperimentTemplate",
+                foreign_table="ExperimentTemplate",
+                cacheable=True,
+                extra_criteria=equals(
+                    "xptm_name", "In Vivo Electrophysiology Recording"
+                ),
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="ExperimentRun",
+                input_name="ExperimentTemplate",
+                input_table_cols=("xptm_pk",),
+                foreign_table="ExperimentRun",
+                foreign_table_col="xprn_fk_experimentTemplate",
+                extra_criteria=date_criteria,
+                is_root=True,
+                page=page,
+                columns=EXPERIMENT_RUN_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ExperimentRunStep",
+                input_name="ExperimentRun",
+                input_table_cols=("xprn_pk",),
+                foreign_table="ExperimentRunStep",
+                foreign_table_col="xprs_fk_experimentRun",
+                columns=("xprs_name", *GROUP_OF_SESSIONS_MAPPER.columns),
+            ),
+            ForeignTableFetch(
+                name="ExperimentRunStepContent",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_pk",),
+                foreign_table="ExperimentRunStepContent",
+                foreign_table_col="xrsc_fk_experimentRunStep",
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="Result",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_pk",),
+                foreign_table="Result",
+                foreign_table_col="rslt_fk_experimentRunStep",
+                columns=(
+                    "test_label",
+                    *MOUSE_SESSION_MAPPER.columns,
+                    *STREAMS_MAPPER.columns,
+                ),
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="ExperimentRunStepContent",
+                input_table_cols=("xrsc_fk_content",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+                columns=CONTENT_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ReferenceDataRecord",
+                input_name="Result",
+                input_table_cols=(
+                    "rslt_cf_fk_modulesinStream",
+                    "rslt_cf_fk_rewardDelivery",
+                ),
+                foreign_table="ReferenceDataRecord",
+                foreign_table_col="rdrc_pk",
+                columns=(
+                    "rdrc_fk_referenceDataType",
+                    *REWARD_DELIVERY_MAPPER.columns,
+                    *REWARD_SPOUTS_MAPPER.columns,
+                    *STREAM_MODULE_MAPPER.columns,
+                ),
+            ),
+            ForeignTableFetch(
+                name="RewardSpouts",
+                input_name="ReferenceDataRecord",
+                input_table_cols=("rdrc_cf_fk_rewardSpouts",),
+                foreign_table="ReferenceDataRecord",
+                foreign_table_col="rdrc_pk",
+                columns=(),
+            ),
+        ]
 
     def get_ephys_data_from_slims(
         self,
@@ -405,7 +415,7 @@ class EcephysSessionHandler(SlimsTableHandler):
         end_date_less_than_or_equal: Optional[str] = None,
     ) -> List[SlimsEcephysData]:
         """
-        Get Ephys data from SLIMS.
+        Get Ephys data from SLIMS. Sync version of get_data_async.
 
         Parameters
         ----------
@@ -414,9 +424,9 @@ class EcephysSessionHandler(SlimsTableHandler):
         session_name : str | None
           Name of the session. If None, then no filter will be performed.
         start_date_greater_than_or_equal : str | None
-          Filter experiment runs that were created on or after this datetime.
+          Filter records that were created on or after this datetime.
         end_date_less_than_or_equal : str | None
-          Filter experiment runs that were created on or before this datetime.
+          Filter records that were created on or before this datetime.
 
         Returns
         -------
@@ -428,32 +438,10 @@ class EcephysSessionHandler(SlimsTableHandler):
           The subject_id cannot be an empty string.
 
         """
-
-        if subject_id is not None and len(subject_id) == 0:
-            raise ValueError("subject_id must not be empty!")
-
-        G, root_nodes = self._get_graph(
-            start_date_greater_than_or_equal=self.parse_date(
-                start_date_greater_than_or_equal
-            ),
-            end_date_less_than_or_equal=self.parse_date(
-                end_date_less_than_or_equal
-            ),
-        )
-
-        ephys_data = self._parse_graph(
-            g=G,
-            root_nodes=root_nodes,
-            subject_id=subject_id,
+        return self._run_sync(
+            self.get_data_async,
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
             session_name=session_name,
         )
-
-        ephys_data.sort(
-            key=lambda m: (
-                m.experiment_run_created_on is None,
-                m.experiment_run_created_on,
-            ),
-            reverse=True,
-        )
-
-        return ephys_data
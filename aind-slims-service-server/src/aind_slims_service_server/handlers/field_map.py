@@ -0,0 +1,117 @@
+"""
+Module to map the columns of SLIMS records to the fields of pydantic models
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+from slims.internal import Record
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def to_decimal(value: Any) -> Decimal:
+    """Convert a SLIMS number to a Decimal without float noise."""
+    return Decimal(str(value))
+
+
+def to_datetime(timestamp: int) -> datetime:
+    """Convert a SLIMS timestamp in milliseconds to a UTC datetime."""
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
+
+
+class FieldMap(NamedTuple):
+    """
+    Maps an attribute of a SLIMS column to a model field. The attr is the
+    attribute of the column to read, e.g. value, displayValue or unit. The
+    converter is applied to values that are not None.
+    """
+
+    field: str
+    column: str
+    attr: str = "value"
+    converter: Optional[Callable[[Any], Any]] = None
+
+
+class RecordMapper(Generic[M]):
+    """
+    Extracts the fields of a model from SLIMS records with a list of
+    FieldMaps. The field maps are checked against the model and flattened
+    into tuples once, when the mapper is created at import, so mapping a
+    row is a single loop over the Column objects in the record's instance
+    dict instead of a get_attr_or_none call per field.
+    """
+
+    def __init__(self, model: Type[M], field_maps: Sequence[FieldMap]):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        model : Type[M]
+          The pydantic model the fields belong to.
+        field_maps : Sequence[FieldMap]
+
+        Raises
+        ------
+        ValueError
+          If a field is not a field of the model.
+
+        """
+        unknown_fields = [
+            f.field for f in field_maps if f.field not in model.model_fields
+        ]
+        if unknown_fields:
+            raise ValueError(
+                f"Unknown fields for {model.__name__}: {unknown_fields}"
+            )
+        self.model = model
+        self._field_maps = tuple(tuple(f) for f in field_maps)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Names of the columns read by the mapper, without duplicates."""
+        return tuple(dict.fromkeys(f[1] for f in self._field_maps))
+
+    def extract(self, row: Record) -> Dict[str, Any]:
+        """
+        Values of the mapped fields in a row. Fields whose column is missing
+        from the row are None.
+        Parameters
+        ----------
+        row : Record
+
+        Returns
+        -------
+        Dict[str, Any]
+
+        """
+        columns = vars(row)
+        values = {}
+        for field, column, attr, converter in self._field_maps:
+            value = getattr(columns.get(column), attr, None)
+            if value is not None and converter is not None:
+                value = converter(value)
+            values[field] = value
+        return values
+
+    def create(self, row: Record) -> M:
+        """Create a model from the mapped fields of a row."""
+        return self.model(**self.extract(row))
+
+    def update(self, model: M, row: Record) -> None:
+        """Set the mapped fields of a row on an existing model."""
+        for field, value in self.extract(row).items():
+            setattr(model, field, value)
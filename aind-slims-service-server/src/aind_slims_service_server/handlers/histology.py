@@ -2,15 +2,24 @@
 Module to handle fetching histology data from slims and parsing it to a model
 """
 
-from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple, Union
 
-from networkx import DiGraph
 from slims.criteria import is_one_of
 from slims.internal import Record
 
+from aind_slims_service_server.handlers.field_map import (
+    FieldMap,
+    RecordMapper,
+    to_datetime,
+)
 from aind_slims_service_server.handlers.table_handler import (
+    ForeignTableFetch,
+    RecordGraph,
+    RootPage,
+    RootSpec,
     SlimsTableHandler,
+    SubjectLookup,
 )
 from aind_slims_service_server.models import (
     HistologyReagentData,
@@ -18,10 +27,57 @@ from aind_slims_service_server.models import (
     SlimsHistologyData,
 )
 
+EXPERIMENT_RUN_MAPPER = RecordMapper(
+    SlimsHistologyData,
+    [
+        FieldMap(
+            "experiment_run_created_on",
+            "xprn_createdOn",
+            converter=to_datetime,
+        ),
+        FieldMap("procedure_name", "xptm_name"),
+    ],
+)
+
+SOP_MAPPER = RecordMapper(
+    SlimsHistologyData,
+    [
+        FieldMap("protocol_id", "stop_link"),
+        FieldMap("protocol_name", "stop_name"),
+    ],
+)
+
+WASH_MAPPER = RecordMapper(
+    HistologyWashData,
+    [
+        FieldMap("wash_name", "xprs_name"),
+        FieldMap("wash_type", "xprs_cf_spimWashType"),
+        FieldMap("start_time", "xprs_cf_startTime", converter=to_datetime),
+        FieldMap("end_time", "xprs_cf_endTime", converter=to_datetime),
+        FieldMap("modified_by", "xprs_modifiedBy"),
+        FieldMap("mass", "xprs_cf_mass"),
+    ],
+)
+
+REAGENT_MAPPER = RecordMapper(
+    HistologyReagentData,
+    [
+        FieldMap("name", "cntn_cf_fk_catalogNumberReagents", "displayValue"),
+        FieldMap("source", "cntn_fk_source", "displayValue"),
+        FieldMap("lot_number", "cntn_cf_lotNumber"),
+    ],
+)
+
 
 class HistologySessionHandler(SlimsTableHandler):
     """Class to handle getting SPIM Histology Procedures info from SLIMS."""
 
+    ROOT = RootSpec(
+        "xprn_createdOn",
+        "xprn_pk",
+        "experiment_run_created_on",
+    )
+
     def _get_reagent_data(
         self, records: List[Record]
     ) -> List[HistologyReagentData]:
@@ -46,33 +102,19 @@ class HistologySessionHandler(SlimsTableHandler):
                 "Reagents, Externally Manufactured",
                 "Reagents, Internally Produced",
             ]:
-                n_reagent_lot_number = self.get_attr_or_none(
-                    record, "cntn_cf_lotNumber"
-                )
-                n_reagent_name = self.get_attr_or_none(
-                    record, "cntn_cf_fk_catalogNumberReagents", "displayValue"
-                )
-                n_reagent_source = self.get_attr_or_none(
-                    record, "cntn_fk_source", "displayValue"
-                )
-                reagent_data = HistologyReagentData(
-                    name=n_reagent_name,
-                    source=n_reagent_source,
-                    lot_number=n_reagent_lot_number,
-                )
-                reagents.append(reagent_data)
+                reagents.append(REAGENT_MAPPER.create(record))
         return reagents
 
     def _get_wash_data(
-        self, g: DiGraph, exp_run_step: str, exp_run_step_row: Record
+        self, g: RecordGraph, exp_run_step: int, exp_run_step_row: Record
     ) -> HistologyWashData:
         """
         Get wash data from SLIMS records.
         Parameters
         ----------
-        g : DiGraph
-        exp_run_step : str
-          Name of the node for the experiment run step
+        g : RecordGraph
+        exp_run_step : int
+          Node of the experiment run step
         exp_run_step_row : Record
           The Record attached to the node.
 
@@ -81,51 +123,23 @@ class HistologySessionHandler(SlimsTableHandler):
         HistologyWashData
 
         """
-        wash_data = HistologyWashData()
-        wash_data.wash_name = self.get_attr_or_none(
-            exp_run_step_row, "xprs_name"
-        )
-        wash_data.wash_type = self.get_attr_or_none(
-            exp_run_step_row, "xprs_cf_spimWashType"
-        )
-        start_time_ts = self.get_attr_or_none(
-            exp_run_step_row, "xprs_cf_startTime"
-        )
-        wash_data.start_time = (
-            None
-            if start_time_ts is None
-            else datetime.fromtimestamp(start_time_ts / 1000, tz=timezone.utc)
-        )
-        end_time_ts = self.get_attr_or_none(
-            exp_run_step_row, "xprs_cf_endTime"
-        )
-        wash_data.end_time = (
-            None
-            if end_time_ts is None
-            else datetime.fromtimestamp(end_time_ts / 1000, tz=timezone.utc)
-        )
-        wash_data.modified_by = self.get_attr_or_none(
-            exp_run_step_row, "xprs_modifiedBy"
-        )
-        wash_data.mass = self.get_attr_or_none(
-            exp_run_step_row, "xprs_cf_mass"
-        )
+        wash_data = WASH_MAPPER.create(exp_run_step_row)
         wash_data_successors = g.successors(exp_run_step)
-        records = [g.nodes[n]["row"] for n in wash_data_successors]
+        records = [g.row(n) for n in wash_data_successors]
         reagents = self._get_reagent_data(records)
         wash_data.reagents = reagents
         return wash_data
 
     def _get_specimen_data(
-        self, g: DiGraph, exp_run_step_content: str
+        self, g: RecordGraph, exp_run_step_content: int
     ) -> Tuple[Optional[str], Optional[str]]:
         """
         Get subject_id and specimen_id from Content record.
         Parameters
         ----------
-        g : DiGraph
-        exp_run_step_content : str
-          Name of the node for the experiment run step content
+        g : RecordGraph
+        exp_run_step_content : int
+          Node of the experiment run step content
 
         Returns
         -------
@@ -134,7 +148,7 @@ class HistologySessionHandler(SlimsTableHandler):
 
         """
         content_nodes = g.successors(exp_run_step_content)
-        records = [g.nodes[c]["row"] for c in content_nodes]
+        records = [g.row(c) for c in content_nodes]
         specimen_id = None
         subject_id = None
         for record in records:
@@ -146,49 +160,39 @@ class HistologySessionHandler(SlimsTableHandler):
                 specimen_id = n_specimen_id
         return subject_id, specimen_id
 
-    def _parse_graph(
-        self, g: DiGraph, root_nodes: List[str], subject_id: Optional[str]
-    ) -> List[SlimsHistologyData]:
+    def _iter_parse_graph(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str] = None,
+    ) -> Iterator[SlimsHistologyData]:
         """
-        Parses the graph object into a list of pydantic models.
+        Parses the graph object into pydantic models, one root node at a
+        time. A model is returned per specimen of an experiment run. The
+        models of a run share the same washes list, which must not be
+        modified.
         Parameters
         ----------
-        g : DiGraph
+        g : RecordGraph
           Graph of the SLIMS records.
-        root_nodes : List[str]
+        root_nodes : List[int]
           List of root nodes to pull descendants from.
         subject_id : str | None
           Labtracks ID of mouse to filter records by.
 
         Returns
         -------
-        List[SlimsHistologyData]
+        Iterator[SlimsHistologyData]
         """
 
-        histology_data_list = []
         for node in root_nodes:
             subject_and_specimen_ids = []
-            histology_data = SlimsHistologyData()
+            histology_data = EXPERIMENT_RUN_MAPPER.create(g.row(node))
             washes = []
-            experiment_run_created_on_ts = self.get_attr_or_none(
-                g.nodes[node]["row"], "xprn_createdOn"
-            )
-            histology_data.experiment_run_created_on = (
-                None
-                if experiment_run_created_on_ts is None
-                else datetime.fromtimestamp(
-                    experiment_run_created_on_ts / 1000, tz=timezone.utc
-                )
-            )
-            exp_run_name = self.get_attr_or_none(
-                g.nodes[node]["row"], "xptm_name"
-            )
-            histology_data.procedure_name = exp_run_name
-
             exp_run_steps = g.successors(node)
 
             for exp_run_step in exp_run_steps:
-                exp_run_step_row = g.nodes[exp_run_step]["row"]
+                exp_run_step_row = g.row(exp_run_step)
                 exp_run_step_name = self.get_attr_or_none(
                     exp_run_step_row, "xprs_name"
                 )
@@ -217,13 +221,10 @@ class HistologySessionHandler(SlimsTableHandler):
 
                 exp_run_step_children = g.successors(exp_run_step)
                 for exp_run_step_child in exp_run_step_children:
-                    table_name = g.nodes[exp_run_step_child]["table_name"]
-                    row = g.nodes[exp_run_step_child]["row"]
+                    table_name = g.table_name(exp_run_step_child)
+                    row = g.row(exp_run_step_child)
                     if table_name == "SOP":
-                        stop_link = self.get_attr_or_none(row, "stop_link")
-                        stop_name = self.get_attr_or_none(row, "stop_name")
-                        histology_data.protocol_id = stop_link
-                        histology_data.protocol_name = stop_name
+                        SOP_MAPPER.update(histology_data, row)
                     if table_name == "ExperimentRunStepContent":
                         n_subject_id, n_specimen_id = self._get_specimen_data(
                             g=g, exp_run_step_content=exp_run_step_child
@@ -236,121 +237,124 @@ class HistologySessionHandler(SlimsTableHandler):
                 n_subject_id = n_ids[0]
                 n_specimen_id = n_ids[1]
                 if subject_id is None or subject_id == n_subject_id:
+                    # Shallow copy, so the specimens of a run share the
+                    # parsed washes and reagents instead of copying them.
                     subject_histology_data = histology_data.model_copy(
-                        deep=True,
                         update={
                             "subject_id": n_subject_id,
                             "specimen_id": n_specimen_id,
                         },
                     )
-                    histology_data_list.append(subject_histology_data)
-        return histology_data_list
+                    yield subject_histology_data
 
-    def _get_graph(
+    def _get_lookup(
+        self, subject_id: Optional[Union[str, List[str]]]
+    ) -> Optional[SubjectLookup]:
+        """Lookup of the experiment runs of a subject by its Content ID."""
+        return self._get_experiment_run_lookup("cntn_id", subject_id)
+
+    def _get_fetch_plan(
         self,
         start_date_greater_than_or_equal: Optional[datetime] = None,
         end_date_less_than_or_equal: Optional[datetime] = None,
-    ) -> Tuple[DiGraph, List[str]]:
+        page: Optional[RootPage] = None,
+    ) -> List[ForeignTableFetch]:
         """
-        Generate a Graph of the records from SLIMS for histology.
-
+        Plan of the SLIMS fetches needed for histology experiment runs.
         Parameters
         ----------
         start_date_greater_than_or_equal : datetime | None
           Filter experiment runs that were created on or after this datetime.
         end_date_less_than_or_equal : datetime | None
           Filter experiment runs that were created on or before this datetime.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
 
         Returns
         -------
-        Tuple[DiGraph, List[str]]
-          A directed graph of the SLIMS records and a list of the root nodes.
+        List[ForeignTableFetch]
 
         """
-        experiment_template_rows = self.session.fetch(
-            table="ExperimentTemplate",
-            criteria=is_one_of(
-                "xptm_name",
-                [
-                    "SmartSPIM Labeling",
-                    "SmartSPIM Delipidation",
-                    "SmartSPIM Refractive Index Matching",
-                ],
-            ),
-        )
         date_criteria = self._get_date_criteria(
             start_date=start_date_greater_than_or_equal,
             end_date=end_date_less_than_or_equal,
             field_name="xprn_createdOn",
         )
-        exp_run_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentTemplate",
-            input_rows=experiment_template_rows,
-            input_table_cols=["xptm_pk"],
-            foreign_table="ExperimentRun",
-            foreign_table_col="xprn_fk_experimentTemplate",
-            extra_criteria=date_criteria,
-        )
-        G = DiGraph()
-        root_nodes = []
-        for row in exp_run_rows:
-            G.add_node(
-                f"{row.table_name()}.{row.pk()}",
-                row=row,
-                pk=row.pk(),
-                table_name=row.table_name(),
-            )
-            root_nodes.append(f"{row.table_name()}.{row.pk()}")
-
-        exp_run_step_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRun",
-            input_rows=exp_run_rows,
-            input_table_cols=["xprn_pk"],
-            foreign_table="ExperimentRunStep",
-            foreign_table_col="xprs_fk_experimentRun",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_cf_fk_protocol"],
-            foreign_table="SOP",
-            foreign_table_col="stop_pk",
-            graph=G,
-        )
-        exp_run_step_content_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_pk"],
-            foreign_table="ExperimentRunStepContent",
-            foreign_table_col="xrsc_fk_experimentRunStep",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStepContent",
-            input_rows=exp_run_step_content_rows,
-            input_table_cols=["xrsc_fk_content"],
-            foreign_table="Content",
-            foreign_table_col="cntn_pk",
-            graph=G,
-        )
-        reagent_content_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_cf_fk_reagent"],
-            foreign_table="Content",
-            foreign_table_col="cntn_pk",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="Content",
-            input_rows=reagent_content_rows,
-            input_table_cols=["cntn_cf_fk_catalogNumberReagents"],
-            foreign_table="ReferenceDataRecord",
-            foreign_table_col="rdrc_pk",
-            graph=G,
-        )
-        return G, root_nodes
+        return [
+            ForeignTableFetch(
+                name="ExperimentTemplate",
+                foreign_table="ExperimentTemplate",
+                cacheable=True,
+                extra_criteria=is_one_of(
+                    "xptm_name",
+                    [
+                        "SmartSPIM Labeling",
+                        "SmartSPIM Delipidation",
+                        "SmartSPIM Refractive Index Matching",
+                    ],
+                ),
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="ExperimentRun",
+                input_name="ExperimentTemplate",
+                input_table_cols=("xptm_pk",),
+                foreign_table="ExperimentRun",
+                foreign_table_col="xprn_fk_experimentTemplate",
+                extra_criteria=date_criteria,
+                is_root=True,
+                page=page,
+                columns=EXPERIMENT_RUN_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ExperimentRunStep",
+                input_name="ExperimentRun",
+                input_table_cols=("xprn_pk",),
+                foreign_table="ExperimentRunStep",
+                foreign_table_col="xprs_fk_experimentRun",
+                columns=WASH_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="SOP",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_cf_fk_protocol",),
+                foreign_table="SOP",
+                foreign_table_col="stop_pk",
+                columns=SOP_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ExperimentRunStepContent",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_pk",),
+                foreign_table="ExperimentRunStepContent",
+                foreign_table_col="xrsc_fk_experimentRunStep",
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="ExperimentRunStepContent",
+                input_table_cols=("xrsc_fk_content",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+                columns=("cntn_id", "cntn_barCode"),
+            ),
+            ForeignTableFetch(
+                name="ReagentContent",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_cf_fk_reagent",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+                columns=("cntn_fk_category", *REAGENT_MAPPER.columns),
+            ),
+            ForeignTableFetch(
+                name="ReferenceDataRecord",
+                input_name="ReagentContent",
+                input_table_cols=("cntn_cf_fk_catalogNumberReagents",),
+                foreign_table="ReferenceDataRecord",
+                foreign_table_col="rdrc_pk",
+                columns=(),
+            ),
+        ]
 
     def get_histology_data_from_slims(
         self,
@@ -359,17 +363,16 @@ class HistologySessionHandler(SlimsTableHandler):
         end_date_less_than_or_equal: Optional[str] = None,
     ) -> List[SlimsHistologyData]:
         """
-        Get Histology data from SLIMS.
+        Get Histology data from SLIMS. Sync version of get_data_async.
 
         Parameters
         ----------
         subject_id : str | None
           Labtracks ID of mouse. If None, then no filter will be performed.
         start_date_greater_than_or_equal : str | None
-          Filter experiment runs that were created on or after this datetime.
+          Filter records that were created on or after this datetime.
         end_date_less_than_or_equal : str | None
-          Filter experiment runs that were created on or before this datetime.
-
+          Filter records that were created on or before this datetime.
 
         Returns
         -------
@@ -381,20 +384,9 @@ class HistologySessionHandler(SlimsTableHandler):
           The subject_id cannot be an empty string.
 
         """
-
-        if subject_id is not None and len(subject_id) == 0:
-            raise ValueError("subject_id must not be empty!")
-
-        G, root_nodes = self._get_graph(
-            start_date_greater_than_or_equal=self.parse_date(
-                start_date_greater_than_or_equal
-            ),
-            end_date_less_than_or_equal=self.parse_date(
-                end_date_less_than_or_equal
-            ),
-        )
-        hist_data = self._parse_graph(
-            g=G, root_nodes=root_nodes, subject_id=subject_id
+        return self._run_sync(
+            self.get_data_async,
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
         )
-
-        return hist_data
@@ -2,130 +2,161 @@
 Module to handle fetching imaging data from slims and parsing it to a model
 """
 
-from datetime import datetime, timezone
-from decimal import Decimal
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterator, List, Optional, Union
 
-from networkx import DiGraph, descendants
 from slims.criteria import equals
 
-from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.handlers.field_map import (
+    FieldMap,
+    RecordMapper,
+    to_datetime,
+    to_decimal,
+)
+from aind_slims_service_server.handlers.table_handler import (
+    ForeignTableFetch,
+    RecordGraph,
+    RootPage,
+    RootSpec,
+    SlimsTableHandler,
+    SubjectLookup,
+)
 from aind_slims_service_server.models import SlimsSpimData
 
+EXPERIMENT_RUN_MAPPER = RecordMapper(
+    SlimsSpimData,
+    [
+        FieldMap(
+            "experiment_run_created_on",
+            "xprn_createdOn",
+            converter=to_datetime,
+        ),
+    ],
+)
+
+CONTENT_MAPPER = RecordMapper(
+    SlimsSpimData,
+    [
+        FieldMap("subject_id", "cntn_id"),
+        FieldMap("specimen_id", "cntn_barCode"),
+    ],
+)
+
+SOP_MAPPER = RecordMapper(
+    SlimsSpimData,
+    [
+        FieldMap("protocol_id", "stop_link"),
+        FieldMap("protocol_name", "stop_name"),
+    ],
+)
+
+BRAIN_ORIENTATION_MAPPER = RecordMapper(
+    SlimsSpimData,
+    [
+        FieldMap("z_direction", "rdrc_cf_zDirection"),
+        FieldMap("x_direction", "rdrc_cf_xDirection"),
+        FieldMap("y_direction", "rdrc_cf_yDirection"),
+    ],
+)
+
+INSTRUMENT_MAPPER = RecordMapper(
+    SlimsSpimData, [FieldMap("instrument_id", "rdrc_name")]
+)
+
+RESULT_MAPPER = RecordMapper(
+    SlimsSpimData,
+    [
+        FieldMap("chamber_immersion_medium", "rslt_cf_chamberImmersionMedium"),
+        FieldMap(
+            "chamber_refractive_index",
+            "rslt_cf_chamberRefractiveIndex",
+            converter=to_decimal,
+        ),
+        FieldMap("sample_immersion_medium", "rslt_cf_sampleImmersionMedium"),
+        FieldMap(
+            "sample_refractive_index",
+            "rslt_cf_sampleRefractiveIndex",
+            converter=to_decimal,
+        ),
+        FieldMap("date_performed", "rslt_cf_datePerformed"),
+        FieldMap("experimenter_name", "rslt_cf_fk_operator", "displayValue"),
+    ],
+)
+
+ORDER_MAPPER = RecordMapper(
+    SlimsSpimData,
+    [
+        FieldMap("imaging_channels", "ordr_cf_fluorescenceChannels_Imaging"),
+        FieldMap(
+            "stitching_channels", "ordr_cf_fluorescenceChannels_Stitching"
+        ),
+        FieldMap(
+            "ccf_registration_channels",
+            "ordr_cf_fluorescenceChannels_CcfRegistration",
+        ),
+        FieldMap(
+            "cell_segmentation_channels",
+            "ordr_cf_fluorescenceChannels_CellSegmentation",
+        ),
+        FieldMap("order_created_by", "ordr_createdBy"),
+        FieldMap("order_project_id", "ordr_cf_fk_projectId", "displayValue"),
+    ],
+)
+
+TABLE_MAPPERS = {
+    "Content": CONTENT_MAPPER,
+    "SOP": SOP_MAPPER,
+    "Result": RESULT_MAPPER,
+}
+
+REFERENCE_DATA_MAPPERS = {
+    "SPIM Brain Orientation": BRAIN_ORIENTATION_MAPPER,
+    "AIND Instruments": INSTRUMENT_MAPPER,
+}
+
 
 class ImagingSessionHandler(SlimsTableHandler):
     """Class to handle getting SPIM Imaging info from SLIMS."""
 
-    def _parse_graph(
-        self, g: DiGraph, root_nodes: List[str], subject_id: Optional[str]
-    ) -> List[SlimsSpimData]:
+    ROOT = RootSpec("xprn_createdOn", "xprn_pk", "experiment_run_created_on")
+
+    def _iter_parse_graph(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str] = None,
+    ) -> Iterator[SlimsSpimData]:
         """
-        Parses the graph object into a list of pydantic models.
+        Parses the graph object into pydantic models, one root node at a
+        time.
         Parameters
         ----------
-        g : DiGraph
+        g : RecordGraph
           Graph of the SLIMS records.
-        root_nodes : List[str]
+        root_nodes : List[int]
           List of root nodes to pull descendants from.
         subject_id : Optional[str]
           Labtracks ID of mouse to filter records by.
 
         Returns
         -------
-        List[SlimsSpimData]
+        Iterator[SlimsSpimData]
 
         """
 
-        spim_data_list = []
-        for node in root_nodes:
-            spim_data = SlimsSpimData()
-            node_des = descendants(g, node)
-            experiment_run_created_on_ts = self.get_attr_or_none(
-                g.nodes[node]["row"], "xprn_createdOn"
-            )
-            spim_data.experiment_run_created_on = (
-                None
-                if experiment_run_created_on_ts is None
-                else datetime.fromtimestamp(
-                    experiment_run_created_on_ts / 1000, tz=timezone.utc
-                )
-            )
+        for node, node_des in g.iter_descendants(root_nodes):
+            spim_data = EXPERIMENT_RUN_MAPPER.create(g.row(node))
             for n in node_des:
-                table_name = g.nodes[n]["table_name"]
-                row = g.nodes[n]["row"]
-                if table_name == "Content":
-                    n_subject_id = self.get_attr_or_none(row, "cntn_id")
-                    n_specimen_id = self.get_attr_or_none(row, "cntn_barCode")
-                    spim_data.subject_id = n_subject_id
-                    spim_data.specimen_id = n_specimen_id
-                if table_name == "SOP":
-                    stop_link = self.get_attr_or_none(row, "stop_link")
-                    stop_name = self.get_attr_or_none(row, "stop_name")
-                    spim_data.protocol_id = stop_link
-                    spim_data.protocol_name = stop_name
-                if (
-                    table_name == "ReferenceDataRecord"
-                    and self.get_attr_or_none(
+                table_name = g.table_name(n)
+                row = g.row(n)
+                if table_name in TABLE_MAPPERS:
+                    TABLE_MAPPERS[table_name].update(spim_data, row)
+                if table_name == "ReferenceDataRecord":
+                    ref_type = self.get_attr_or_none(
                         row, "rdrc_fk_referenceDataType", "displayValue"
                     )
-                    == "SPIM Brain Orientation"
-                ):
-                    z_direction = self.get_attr_or_none(
-                        row, "rdrc_cf_zDirection"
-                    )
-                    x_direction = self.get_attr_or_none(
-                        row, "rdrc_cf_xDirection"
-                    )
-                    y_direction = self.get_attr_or_none(
-                        row, "rdrc_cf_yDirection"
-                    )
-                    spim_data.z_direction = z_direction
-                    spim_data.x_direction = x_direction
-                    spim_data.y_direction = y_direction
-                if (
-                    table_name == "ReferenceDataRecord"
-                    and self.get_attr_or_none(
-                        row, "rdrc_fk_referenceDataType", "displayValue"
-                    )
-                    == "AIND Instruments"
-                ):
-                    instrument_name = self.get_attr_or_none(row, "rdrc_name")
-                    spim_data.instrument_id = instrument_name
-                if table_name == "Result":
-                    user = self.get_attr_or_none(
-                        row, "rslt_cf_fk_operator", "displayValue"
-                    )
-                    chamber_immersion_medium = self.get_attr_or_none(
-                        row, "rslt_cf_chamberImmersionMedium"
-                    )
-                    sample_immersion_medium = self.get_attr_or_none(
-                        row, "rslt_cf_sampleImmersionMedium"
-                    )
-                    chamber_refractive_index = self.get_attr_or_none(
-                        row, "rslt_cf_chamberRefractiveIndex"
-                    )
-                    sample_refractive_index = self.get_attr_or_none(
-                        row, "rslt_cf_sampleRefractiveIndex"
-                    )
-                    date_performed = self.get_attr_or_none(
-                        row, "rslt_cf_datePerformed"
-                    )
-                    spim_data.chamber_immersion_medium = (
-                        chamber_immersion_medium
-                    )
-                    spim_data.chamber_refractive_index = (
-                        None
-                        if chamber_refractive_index is None
-                        else Decimal(str(chamber_refractive_index))
-                    )
-                    spim_data.sample_immersion_medium = sample_immersion_medium
-                    spim_data.sample_refractive_index = (
-                        None
-                        if sample_refractive_index is None
-                        else Decimal(str(sample_refractive_index))
-                    )
-                    spim_data.date_performed = date_performed
-                    spim_data.experimenter_name = user
+                    if ref_type in REFERENCE_DATA_MAPPERS:
+                        REFERENCE_DATA_MAPPERS[ref_type].update(spim_data, row)
                 if (
                     table_name == "Order"
                     and self.get_attr_or_none(
@@ -133,158 +164,135 @@ class ImagingSessionHandler(SlimsTableHandler):
                     )
                     == "SmartSPIM Histology and Imaging"
                 ):
-                    spim_data.imaging_channels = self.get_attr_or_none(
-                        row, "ordr_cf_fluorescenceChannels_Imaging"
-                    )
-                    spim_data.stitching_channels = self.get_attr_or_none(
-                        row, "ordr_cf_fluorescenceChannels_Stitching"
-                    )
-                    spim_data.ccf_registration_channels = (
-                        self.get_attr_or_none(
-                            row, "ordr_cf_fluorescenceChannels_CcfRegistration"
-                        )
-                    )
-                    spim_data.cell_segmentation_channels = (
-                        self.get_attr_or_none(
-                            row,
-                            "ordr_cf_fluorescenceChannels_CellSegmentation",
-                        )
-                    )
-                    spim_data.order_created_by = self.get_attr_or_none(
-                        row,
-                        "ordr_createdBy",
-                    )
-                    spim_data.order_project_id = self.get_attr_or_none(
-                        row, "ordr_cf_fk_projectId", "displayValue"
-                    )
+                    ORDER_MAPPER.update(spim_data, row)
             if subject_id is None or subject_id == spim_data.subject_id:
-                spim_data_list.append(spim_data)
-        return spim_data_list
+                yield spim_data
+
+    def _get_lookup(
+        self, subject_id: Optional[Union[str, List[str]]]
+    ) -> Optional[SubjectLookup]:
+        """Lookup of the experiment runs of a subject by its Content ID."""
+        return self._get_experiment_run_lookup("cntn_id", subject_id)
 
-    def _get_graph(
+    def _get_fetch_plan(
         self,
         start_date_greater_than_or_equal: Optional[datetime] = None,
         end_date_less_than_or_equal: Optional[datetime] = None,
-    ) -> Tuple[DiGraph, List[str]]:
+        page: Optional[RootPage] = None,
+    ) -> List[ForeignTableFetch]:
         """
-        Generate a Graph of the records from SLIMS for imaging experiment runs.
+        Plan of the SLIMS fetches needed for imaging experiment runs.
         Parameters
         ----------
         start_date_greater_than_or_equal : datetime | None
           Filter experiment runs that were created on or after this datetime.
         end_date_less_than_or_equal : datetime | None
           Filter experiment runs that were created on or before this datetime.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
 
         Returns
         -------
-        Tuple[DiGraph, List[str]]
-          A directed graph of the SLIMS records and a list of the root nodes.
+        List[ForeignTableFetch]
 
         """
-
-        experiment_template_rows = self.session.fetch(
-            table="ExperimentTemplate",
-            criteria=equals("xptm_name", "SPIM Imaging"),
-        )
         date_criteria = self._get_date_criteria(
             start_date=start_date_greater_than_or_equal,
             end_date=end_date_less_than_or_equal,
             field_name="xprn_createdOn",
         )
-        exp_run_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentTemplate",
-            input_rows=experiment_template_rows,
-            input_table_cols=["xptm_pk"],
-            foreign_table="ExperimentRun",
-            foreign_table_col="xprn_fk_experimentTemplate",
-            extra_criteria=date_criteria,
-        )
-        G = DiGraph()
-        root_nodes = []
-        for row in exp_run_rows:
-            G.add_node(
-                f"{row.table_name()}.{row.pk()}",
-                row=row,
-                pk=row.pk(),
-                table_name=row.table_name(),
-            )
-            root_nodes.append(f"{row.table_name()}.{row.pk()}")
-
-        exp_run_step_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRun",
-            input_rows=exp_run_rows,
-            input_table_cols=["xprn_pk"],
-            foreign_table="ExperimentRunStep",
-            foreign_table_col="xprs_fk_experimentRun",
-            graph=G,
-        )
-
-        _ = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_cf_fk_protocol"],
-            foreign_table="SOP",
-            foreign_table_col="stop_pk",
-            graph=G,
-        )
-
-        exp_run_step_content_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_pk"],
-            foreign_table="ExperimentRunStepContent",
-            foreign_table_col="xrsc_fk_experimentRunStep",
-            graph=G,
-        )
-
-        result_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStep",
-            input_rows=exp_run_step_rows,
-            input_table_cols=["xprs_pk"],
-            foreign_table="Result",
-            foreign_table_col="rslt_fk_experimentRunStep",
-            graph=G,
-        )
-
-        content_rows = self.get_rows_from_foreign_table(
-            input_table="ExperimentRunStepContent",
-            input_rows=exp_run_step_content_rows,
-            input_table_cols=["xrsc_fk_content"],
-            foreign_table="Content",
-            foreign_table_col="cntn_pk",
-            graph=G,
-        )
-
-        _ = self.get_rows_from_foreign_table(
-            input_table="Result",
-            input_rows=result_rows,
-            input_table_cols=[
-                "rslt_cf_fk_instrumentJson",
-                "rslt_cf_fk_spimBrainOrientation",
-            ],
-            foreign_table="ReferenceDataRecord",
-            foreign_table_col="rdrc_pk",
-            graph=G,
-        )
-        # Add Orders
-        order_content_rows = self.get_rows_from_foreign_table(
-            input_table="Content",
-            input_rows=content_rows,
-            input_table_cols=["cntn_pk"],
-            foreign_table="OrderContent",
-            foreign_table_col="rdcn_fk_content",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="OrderContent",
-            input_rows=order_content_rows,
-            input_table_cols=["rdcn_fk_order"],
-            foreign_table="Order",
-            foreign_table_col="ordr_pk",
-            graph=G,
-        )
-
-        return G, root_nodes
+        return [
+            ForeignTableFetch(
+                name="ExperimentTemplate",
+                foreign_table="ExperimentTemplate",
+                cacheable=True,
+                extra_criteria=equals("xptm_name", "SPIM Imaging"),
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="ExperimentRun",
+                input_name="ExperimentTemplate",
+                input_table_cols=("xptm_pk",),
+                foreign_table="ExperimentRun",
+                foreign_table_col="xprn_fk_experimentTemplate",
+                extra_criteria=date_criteria,
+                is_root=True,
+                page=page,
+                columns=EXPERIMENT_RUN_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ExperimentRunStep",
+                input_name="ExperimentRun",
+                input_table_cols=("xprn_pk",),
+                foreign_table="ExperimentRunStep",
+                foreign_table_col="xprs_fk_experimentRun",
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="SOP",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_cf_fk_protocol",),
+                foreign_table="SOP",
+                foreign_table_col="stop_pk",
+                columns=SOP_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ExperimentRunStepContent",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_pk",),
+                foreign_table="ExperimentRunStepContent",
+                foreign_table_col="xrsc_fk_experimentRunStep",
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="Result",
+                input_name="ExperimentRunStep",
+                input_table_cols=("xprs_pk",),
+                foreign_table="Result",
+                foreign_table_col="rslt_fk_experimentRunStep",
+                columns=RESULT_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="ExperimentRunStepContent",
+                input_table_cols=("xrsc_fk_content",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+                columns=CONTENT_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="ReferenceDataRecord",
+                input_name="Result",
+                input_table_cols=(
+                    "rslt_cf_fk_instrumentJson",
+                    "rslt_cf_fk_spimBrainOrientation",
+                ),
+                foreign_table="ReferenceDataRecord",
+                foreign_table_col="rdrc_pk",
+                columns=(
+                    "rdrc_fk_referenceDataType",
+                    *BRAIN_ORIENTATION_MAPPER.columns,
+                    *INSTRUMENT_MAPPER.columns,
+                ),
+            ),
+            # Add Orders
+            ForeignTableFetch(
+                name="OrderContent",
+                input_name="Content",
+                input_table_cols=("cntn_pk",),
+                foreign_table="OrderContent",
+                foreign_table_col="rdcn_fk_content",
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="Order",
+                input_name="OrderContent",
+                input_table_cols=("rdcn_fk_order",),
+                foreign_table="Order",
+                foreign_table_col="ordr_pk",
+                columns=("ordr_fk_orderType", *ORDER_MAPPER.columns),
+            ),
+        ]
 
     def get_spim_data_from_slims(
         self,
@@ -293,16 +301,16 @@ class ImagingSessionHandler(SlimsTableHandler):
         end_date_less_than_or_equal: Optional[str] = None,
     ) -> List[SlimsSpimData]:
         """
-        Get SPIM data from SLIMS.
+        Get SmartSPIM imaging data from SLIMS. Sync version of get_data_async.
 
         Parameters
         ----------
         subject_id : str | None
           Labtracks ID of mouse. If None, then no filter will be performed.
         start_date_greater_than_or_equal : str | None
-          Filter experiment runs that were created on or after this datetime.
+          Filter records that were created on or after this datetime.
         end_date_less_than_or_equal : str | None
-          Filter experiment runs that were created on or before this datetime.
+          Filter records that were created on or before this datetime.
 
         Returns
         -------
@@ -314,29 +322,9 @@ class ImagingSessionHandler(SlimsTableHandler):
           The subject_id cannot be an empty string.
 
         """
-
-        if subject_id is not None and len(subject_id) == 0:
-            raise ValueError("subject_id must not be empty!")
-
-        G, root_nodes = self._get_graph(
-            start_date_greater_than_or_equal=self.parse_date(
-                start_date_greater_than_or_equal
-            ),
-            end_date_less_than_or_equal=self.parse_date(
-                end_date_less_than_or_equal
-            ),
-        )
-
-        spim_data = self._parse_graph(
-            g=G, root_nodes=root_nodes, subject_id=subject_id
+        return self._run_sync(
+            self.get_data_async,
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
         )
-
-        spim_data.sort(
-            key=lambda m: (
-                m.experiment_run_created_on is None,
-                m.experiment_run_created_on,
-            ),
-            reverse=True,
-        )
-
-        return spim_data
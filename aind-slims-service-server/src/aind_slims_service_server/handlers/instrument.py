@@ -1,26 +1,95 @@
 """Module for fetching rig and instrument data from SLIMS"""
 
+import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from slims.criteria import conjunction, contains, equals, greater_than_or_equal
+import httpx
+import orjson
+from slims.criteria import (
+    Junction,
+    conjunction,
+    contains,
+    equals,
+    greater_than_or_equal,
+)
+from slims.internal import Record
 
+from aind_slims_service_server.async_session import AsyncSlims
+from aind_slims_service_server.cache import AttachmentCache
 from aind_slims_service_server.handlers.table_handler import (
     SlimsTableHandler,
 )
+from aind_slims_service_server.instrument_index import InstrumentIndex
 
 
 class InstrumentSessionHandler(SlimsTableHandler):
     """Class to handle getting instrument info from SLIMS."""
 
-    def get_instrument_data(
+    def __init__(
         self,
-        input_id: str,
-        partial_match: bool = False,
-    ) -> List[Dict[str, Any]]:
+        session: AsyncSlims,
+        attachment_cache: Optional[AttachmentCache] = None,
+        instrument_index: Optional[InstrumentIndex] = None,
+        **kwargs: Any,
+    ):
+        """
+        Class constructor.
+        Parameters
+        ----------
+        session : AsyncSlims | SlimsMirror
+        attachment_cache : AttachmentCache | None
+          Cache shared across requests for the downloaded attachments. If
+          None, every attachment is downloaded from SLIMS.
+        instrument_index : InstrumentIndex | None
+          If set and synced, the attachments of an instrument are looked up
+          in the index instead of querying SLIMS.
+        kwargs : Any
+          Passed to SlimsTableHandler, e.g. max_workers, which also caps
+          the number of concurrent attachment downloads.
+        """
+        super().__init__(session, **kwargs)
+        self.attachment_cache = attachment_cache
+        self.instrument_index = instrument_index
+
+    def _get_indexed_attachment_pks(
+        self, input_id: str, partial_match: bool
+    ) -> Optional[List[int]]:
+        """Attachment pks from the instrument index, None if not synced."""
+        if self.instrument_index is None or not self.instrument_index.ready:
+            return None
+        return self.instrument_index.search(input_id, partial_match)
+
+    def _get_cached_attachment(self, pk: int) -> Optional[bytes]:
+        """Content of an attachment if it is in the attachment cache."""
+        if self.attachment_cache is None:
+            return None
+        return self.attachment_cache.get(pk)
+
+    def _cache_attachment(self, pk: int, response: httpx.Response) -> bytes:
+        """Store the content of a successful download and return it."""
+        if self.attachment_cache is not None and response.status_code == 200:
+            self.attachment_cache.set(pk, response.content)
+        return response.content
+
+    async def _get_attachment_content_async(self, pk: int) -> bytes:
+        """
+        Content of an attachment, downloaded only if it is not cached. The
+        cache may read or write spilled contents on disk, so it is used from
+        a worker thread to keep the event loop free.
         """
-        Get Instrument data from SLIMS.
+        content = await asyncio.to_thread(self._get_cached_attachment, pk)
+        if content is None:
+            response = await self._get_attachment_async(pk=pk)
+            content = await asyncio.to_thread(
+                self._cache_attachment, pk, response
+            )
+        return content
 
+    @staticmethod
+    def _get_criteria(input_id: str, partial_match: bool) -> Junction:
+        """
+        Criteria to find the ReferenceDataRecords of an instrument.
         Parameters
         ----------
         input_id : str
@@ -28,7 +97,7 @@ class InstrumentSessionHandler(SlimsTableHandler):
 
         Returns
         -------
-        List[Dict[str, Any]]
+        Junction
 
         Raises
         ------
@@ -46,23 +115,91 @@ class InstrumentSessionHandler(SlimsTableHandler):
             criteria = attachment_criteria.add(contains("rdrc_name", input_id))
         else:
             criteria = attachment_criteria.add(equals("rdrc_name", input_id))
+        return criteria
 
-        rdrc = self.session.fetch(
-            table="ReferenceDataRecord",
-            criteria=criteria,
-        )
+    def _get_attachment_pks(
+        self, input_id: str, rdrc: List[Record]
+    ) -> List[int]:
+        """
+        Primary keys of the instrument json attachments of the records.
+        Parameters
+        ----------
+        input_id : str
+        rdrc : List[Record]
 
+        Returns
+        -------
+        List[int]
+
+        """
         logging.info(
             f"Found {len(rdrc)} ReferenceDataRecord(s) for {input_id}"
         )
-        attm_pks = [
+        return [
             self.get_attr_or_none(r, "rdrc_cf_instrumentJsonAttachment")
             for r in rdrc
             if self.get_attr_or_none(r, "rdrc_cf_instrumentJsonAttachment")
             is not None
         ]
-        attachments = []
-        for attm_pk in attm_pks:
-            response = self._get_attachment(pk=attm_pk)
-            attachments.append(response.json())
-        return attachments
+
+    async def get_instrument_data_async(
+        self,
+        input_id: str,
+        partial_match: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get Instrument data from SLIMS. The attachments are downloaded
+        concurrently, up to max_workers at a time.
+
+        Parameters
+        ----------
+        input_id : str
+        partial_match : bool
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+
+        Raises
+        ------
+        ValueError
+          The input_id cannot be an empty string.
+
+        """
+        criteria = self._get_criteria(input_id, partial_match)
+        attm_pks = self._get_indexed_attachment_pks(input_id, partial_match)
+        if attm_pks is None:
+            rdrc = await self._fetch_async("ReferenceDataRecord", criteria)
+            attm_pks = self._get_attachment_pks(input_id, rdrc)
+        contents = await asyncio.gather(
+            *[self._get_attachment_content_async(pk) for pk in attm_pks]
+        )
+        return [orjson.loads(content) for content in contents]
+
+    def get_instrument_data(
+        self,
+        input_id: str,
+        partial_match: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get Instrument data from SLIMS. Sync version of
+        get_instrument_data_async.
+
+        Parameters
+        ----------
+        input_id : str
+        partial_match : bool
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+
+        Raises
+        ------
+        ValueError
+          The input_id cannot be an empty string.
+
+        """
+        return self._run_sync(
+            self.get_instrument_data_async, input_id, partial_match
+        )
@@ -2,36 +2,386 @@
 Module to handle fetching data from slims
 """
 
+import asyncio
+import base64
+import binascii
+import json
 import logging
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import Any, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from networkx import DiGraph
-from requests.models import Response
+import httpx
 from slims.criteria import (
     Criterion,
     Junction,
     conjunction,
+    disjunction,
+    equals,
+    greater_than,
     greater_than_or_equal,
+    is_null,
     is_one_of,
+    less_than,
     less_than_or_equal,
 )
 from slims.internal import Record
 from slims.slims import Slims
 
+from aind_slims_service_server.async_session import AsyncSlims
+from aind_slims_service_server.cache import TTLCache
+
+T = TypeVar("T")
+
+
+class RootPage(NamedTuple):
+    """
+    One page of root rows. The page is pushed into the root fetch: roots are
+    sorted newest first by created_on_col, ties are broken by pk_col, and only
+    the first limit roots after the cursor are fetched. The cursor holds the
+    created on value and pk of the last root of the previous page.
+    """
+
+    created_on_col: str
+    pk_col: str
+    limit: int
+    cursor: Optional[Tuple[int, int]] = None
+
+
+class RootSpec(NamedTuple):
+    """
+    The root table of a handler's plan. Roots are paged newest first by
+    created_on_col, with ties broken by pk_col, and created_on_field is the
+    model field parsed from created_on_col. Unpaged results are returned
+    newest first as well.
+    """
+
+    created_on_col: str
+    pk_col: str
+    created_on_field: str
+
+
+class ForeignTableFetch(NamedTuple):
+    """
+    A single fetch in a plan of SLIMS table fetches. A fetch without an
+    input_name pulls rows from foreign_table using extra_criteria only.
+    Otherwise, it pulls the rows of foreign_table whose foreign_table_col
+    matches the keys found in input_table_cols of the rows returned by the
+    fetch named input_name. Fetches of near-static lookup rows can be
+    marked cacheable so that they are served from the reference cache.
+    A root fetch can be limited to a page of rows. A fetch restricted to a
+    large set of keys, such as root keys or the subjects of a batch, holds
+    them in key_chunks with one criterion per chunk, and is sent once per
+    chunk with the rows merged. If columns is set, the async fetch parses
+    the rows into RawRecords that keep only those columns and the columns
+    the plan joins on.
+    """
+
+    name: str
+    foreign_table: str
+    foreign_table_col: Optional[str] = None
+    input_name: Optional[str] = None
+    input_table_cols: Tuple[str, ...] = ()
+    extra_criteria: Optional[Union[Criterion, Junction]] = None
+    is_root: bool = False
+    add_to_graph: bool = True
+    cacheable: bool = False
+    page: Optional[RootPage] = None
+    columns: Optional[Tuple[str, ...]] = None
+    key_chunks: Tuple[Union[Criterion, Junction], ...] = ()
+
+
+class SubjectLookup(NamedTuple):
+    """
+    Reverse traversal from the rows that identify a subject (or a single
+    session) to the roots that reference them. The rows of the fetch named
+    key_fetch hold the keys of the roots in key_col, which are matched
+    against root_col of the root table.
+    """
+
+    plan: List[ForeignTableFetch]
+    key_fetch: str
+    key_col: str
+    root_col: str
+
+
+class RecordGraph:
+    """
+    Directed graph of SLIMS records. Nodes are consecutive ints that index
+    per-node lists of rows and table names, a per-table index maps the pk of
+    a record to its node, and the successors of each node are kept in a
+    list of node ints.
+    """
+
+    def __init__(self):
+        """Class constructor."""
+        self._rows: List[Record] = []
+        self._table_names: List[str] = []
+        self._successors: List[List[int]] = []
+        self._index: Dict[str, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        """Number of nodes in the graph."""
+        return len(self._rows)
+
+    def add_node(self, table_name: str, row: Record) -> int:
+        """
+        Add a record to the graph. Adding a record that is already in the
+        graph replaces its row and keeps its edges.
+        Parameters
+        ----------
+        table_name : str
+        row : Record
+
+        Returns
+        -------
+        int
+          The node of the record.
+
+        """
+        table_index = self._index.setdefault(table_name, {})
+        pk = row.pk()
+        node = table_index.get(pk)
+        if node is None:
+            node = len(self._rows)
+            table_index[pk] = node
+            self._rows.append(row)
+            self._table_names.append(table_name)
+            self._successors.append([])
+        else:
+            self._rows[node] = row
+        return node
+
+    def add_nodes(self, table_name: str, rows: List[Record]) -> List[int]:
+        """
+        Add the records of one table to the graph in bulk. See add_node.
+        Parameters
+        ----------
+        table_name : str
+        rows : List[Record]
+
+        Returns
+        -------
+        List[int]
+          The node of each record.
+
+        """
+        table_index = self._index.setdefault(table_name, {})
+        first_new_node = len(self._rows)
+        new_rows = []
+        nodes = []
+        for row in rows:
+            pk = row.pk()
+            node = table_index.get(pk)
+            if node is None:
+                node = first_new_node + len(new_rows)
+                table_index[pk] = node
+                new_rows.append(row)
+            elif node >= first_new_node:
+                new_rows[node - first_new_node] = row
+            else:
+                self._rows[node] = row
+            nodes.append(node)
+        self._rows.extend(new_rows)
+        self._table_names.extend([table_name] * len(new_rows))
+        self._successors.extend([] for _ in new_rows)
+        return nodes
+
+    def get_node(self, table_name: str, pk: Any) -> Optional[int]:
+        """Node of the record with pk in table_name, or None if absent."""
+        table_index = self._index.get(table_name)
+        return None if table_index is None else table_index.get(pk)
+
+    def get_table_index(self, table_name: str) -> Dict[int, int]:
+        """
+        Map of pk to node for the records of a table, for callers that look
+        up many keys of one table. Must not be mutated.
+        """
+        return self._index.get(table_name, {})
+
+    def add_edge(self, u: int, v: int) -> None:
+        """Add an edge from node u to node v if it is not there yet."""
+        successors = self._successors[u]
+        if v not in successors:
+            successors.append(v)
+
+    def row(self, node: int) -> Record:
+        """Record of a node."""
+        return self._rows[node]
+
+    def table_name(self, node: int) -> str:
+        """Table name of a node."""
+        return self._table_names[node]
+
+    def name(self, node: int) -> str:
+        """Readable name of a node, e.g. ExperimentRun.123"""
+        return f"{self._table_names[node]}.{self._rows[node].pk()}"
+
+    def successors(self, node: int) -> List[int]:
+        """Nodes that node has an edge to. Must not be mutated."""
+        return self._successors[node]
+
+    def descendants(self, node: int) -> List[int]:
+        """
+        Nodes reachable from node, not including node itself, in the order
+        they are first reached by a depth-first traversal.
+        Parameters
+        ----------
+        node : int
+
+        Returns
+        -------
+        List[int]
+
+        """
+        return self._collect_descendants(node, set(), {}, set())
+
+    def iter_descendants(
+        self, roots: List[int]
+    ) -> Iterator[Tuple[int, List[int]]]:
+        """
+        Descendants of each root, see descendants. The subtree below a node
+        that more than one node points at (e.g. a Content, SOP or reference
+        data record shared by many sessions) is walked once, and its
+        descendants are reused by every root that reaches it. The work is
+        proportional to the edges of the graph plus the size of the output
+        instead of the number of roots times the size of their subtrees.
+        Parameters
+        ----------
+        roots : List[int]
+
+        Returns
+        -------
+        Iterator[Tuple[int, List[int]]]
+          Each root with its descendants, in the order of roots.
+
+        """
+        in_degree = [0] * len(self._rows)
+        for successors in self._successors:
+            for v in successors:
+                in_degree[v] += 1
+        shared = {n for n, d in enumerate(in_degree) if d > 1}
+        closures: Dict[int, List[int]] = {}
+        for root in roots:
+            yield root, self._collect_descendants(
+                root, shared, closures, set()
+            )
+
+    def _collect_descendants(
+        self,
+        node: int,
+        shared: Set[int],
+        closures: Dict[int, List[int]],
+        in_progress: Set[int],
+    ) -> List[int]:
+        """
+        Depth-first traversal from node. The descendants of shared nodes are
+        computed once and stored in closures. A shared node that is reached
+        again while its own descendants are being computed (a cycle) is
+        walked instead.
+        Parameters
+        ----------
+        node : int
+        shared : Set[int]
+          Nodes whose descendants are stored in closures.
+        closures : Dict[int, List[int]]
+          Descendants of the shared nodes computed so far.
+        in_progress : Set[int]
+          Shared nodes whose descendants are being computed.
+
+        Returns
+        -------
+        List[int]
+
+        """
+        seen = {node}
+        found = []
+        stack = [node]
+        while stack:
+            for child in self._successors[stack.pop()]:
+                if child in seen:
+                    continue
+                seen.add(child)
+                found.append(child)
+                if child not in shared or child in in_progress:
+                    stack.append(child)
+                    continue
+                closure = closures.get(child)
+                if closure is None:
+                    in_progress.add(child)
+                    closure = self._collect_descendants(
+                        child, shared, closures, in_progress
+                    )
+                    closures[child] = closure
+                    in_progress.discard(child)
+                for n in closure:
+                    if n not in seen:
+                        seen.add(n)
+                        found.append(n)
+        return found
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """All edges of the graph as (u, v) pairs."""
+        for u, successors in enumerate(self._successors):
+            for v in successors:
+                yield u, v
+
 
 class SlimsTableHandler:
-    """Class to handle tables pulled from slims."""
+    """
+    Class to handle tables pulled from slims. Handlers that serve a list
+    endpoint set ROOT and implement _get_lookup, _get_fetch_plan and
+    _iter_parse_graph. The query pipeline built on them (validation,
+    fetching, parsing, sorting, and grouping) is shared.
+    """
+
+    ROOT: RootSpec
 
-    def __init__(self, session: Slims):
+    def __init__(
+        self,
+        session: AsyncSlims,
+        max_workers: int = 4,
+        fk_chunk_size: int = 500,
+        reference_cache: Optional[TTLCache] = None,
+    ):
         """
         Class constructor.
         Parameters
         ----------
-        session : Slims
+        session : AsyncSlims | SlimsMirror | Slims
+          A sync Slims session can only be used with the sync methods.
+        max_workers : int
+          Maximum number of requests the handler sends to SLIMS at once.
+          Independent fetches of a plan, the chunks of large key sets and
+          attachment downloads all share this one cap.
+        fk_chunk_size : int
+          Maximum number of keys sent in a single is_one_of criterion.
+        reference_cache : TTLCache | None
+          Cache shared across requests for the rows of cacheable fetches.
+          If None, every fetch goes to SLIMS.
         """
         self.session = session
+        self.max_workers = max_workers
+        self.fk_chunk_size = fk_chunk_size
+        self.reference_cache = reference_cache
+        self._fetch_semaphore = asyncio.Semaphore(max_workers)
 
     @staticmethod
     def parse_html(v: Optional[str]) -> Optional[str]:
@@ -87,9 +437,273 @@ class SlimsTableHandler:
                     f"Invalid date format: {date_str}. Expected ISO format."
                 )
 
-    def _get_attachment(self, pk: int) -> Response:
-        """Uses session object to get attachment by primary key."""
-        return self.session.slims_api.get(f"repo/{pk}")
+    @staticmethod
+    def _sort_root_nodes(
+        g: RecordGraph, root_nodes: List[int], field_name: str
+    ) -> List[int]:
+        """
+        Sort root nodes newest first by a date column of their rows. Rows
+        without a date come first, matching how the handlers sort their
+        parsed models.
+        Parameters
+        ----------
+        g : RecordGraph
+        root_nodes : List[int]
+        field_name : str
+
+        Returns
+        -------
+        List[int]
+
+        """
+
+        def sort_key(node: int) -> Tuple[bool, Any]:
+            """Sort key of a root node."""
+            value = SlimsTableHandler.get_attr_or_none(g.row(node), field_name)
+            return value is None, value
+
+        return sorted(root_nodes, key=sort_key, reverse=True)
+
+    @staticmethod
+    def encode_cursor(created_on: int, pk: int) -> str:
+        """Encode the position of a root row as an opaque cursor."""
+        return (
+            base64.urlsafe_b64encode(json.dumps([created_on, pk]).encode())
+            .decode()
+            .rstrip("=")
+        )
+
+    @staticmethod
+    def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+        """
+        Decode a cursor created by encode_cursor.
+        Parameters
+        ----------
+        cursor : str | None
+
+        Returns
+        -------
+        Tuple[int, int] | None
+          The created on value and pk of a root row.
+
+        Raises
+        ------
+        ValueError
+          If the cursor is malformed.
+
+        """
+        if cursor is None:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_on, pk = json.loads(base64.urlsafe_b64decode(padded))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}.")
+        if not isinstance(created_on, int) or not isinstance(pk, int):
+            raise ValueError(f"Invalid cursor: {cursor}.")
+        return created_on, pk
+
+    @staticmethod
+    def _get_page_criteria(
+        page: RootPage, criteria: Optional[Union[Criterion, Junction]]
+    ) -> Optional[Union[Criterion, Junction]]:
+        """
+        Add a filter for the rows after the page cursor to criteria.
+        Parameters
+        ----------
+        page : RootPage
+        criteria : Criterion | Junction | None
+
+        Returns
+        -------
+        Criterion | Junction | None
+
+        """
+        if page.cursor is None:
+            return criteria
+        created_on, pk = page.cursor
+        after_cursor = (
+            disjunction()
+            .add(less_than(page.created_on_col, created_on))
+            .add(
+                conjunction()
+                .add(equals(page.created_on_col, created_on))
+                .add(less_than(page.pk_col, pk))
+            )
+        )
+        if criteria is None:
+            return after_cursor
+        return conjunction().add(criteria).add(after_cursor)
+
+    @staticmethod
+    def _get_page_fetch_args(page: Optional[RootPage]) -> Dict[str, Any]:
+        """Sort and row bounds sent to SLIMS for a page of rows."""
+        if page is None:
+            return {}
+        return {
+            "sort": [f"-{page.created_on_col}", f"-{page.pk_col}"],
+            "start": 0,
+            "end": page.limit,
+        }
+
+    def _trim_page(
+        self, page: Optional[RootPage], rows: List[Record]
+    ) -> List[Record]:
+        """
+        Sort rows in page order and keep the first page.limit rows. When the
+        rows were fetched in several chunks, each chunk holds up to
+        page.limit rows, so the chunks are merged here into a single page.
+        Parameters
+        ----------
+        page : RootPage | None
+        rows : List[Record]
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        if page is None:
+            return rows
+
+        def sort_key(row: Record) -> Tuple[bool, Any, Any]:
+            """Sort key of a row."""
+            created_on = self.get_attr_or_none(row, page.created_on_col)
+            return created_on is None, created_on, row.pk()
+
+        limit = page.limit
+        return sorted(rows, key=sort_key, reverse=True)[:limit]
+
+    def _get_next_cursor(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        page: Optional[RootPage],
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Cursor of the page after root_nodes. None if the page was not full,
+        in which case there are no more roots to fetch.
+        Parameters
+        ----------
+        g : RecordGraph
+        root_nodes : List[int]
+          Root nodes of the page in page order.
+        page : RootPage | None
+
+        Returns
+        -------
+        Tuple[int, int] | None
+          The created on value and pk of the last root of the page.
+
+        """
+        if page is None or len(root_nodes) < page.limit:
+            return None
+        last_row = g.row(root_nodes[-1])
+        created_on = self.get_attr_or_none(last_row, page.created_on_col)
+        if created_on is None:
+            return None
+        return created_on, last_row.pk()
+
+    async def _get_attachment_async(self, pk: int) -> httpx.Response:
+        """Uses async session object to get attachment by primary key."""
+        async with self._fetch_semaphore:
+            return await self.session.get(f"repo/{pk}")
+
+    async def _fetch_async(
+        self,
+        table: str,
+        criteria: Optional[Union[Criterion, Junction]],
+        columns: Optional[Collection[str]] = None,
+        **kwargs: Any,
+    ) -> List[Record]:
+        """
+        Fetch rows with the async session, capped by max_workers. If columns
+        is set, rows are fetched as RawRecords holding only those columns.
+        Extra kwargs, such as sort, start, and end, are passed to the
+        session.
+        """
+        async with self._fetch_semaphore:
+            if columns is None:
+                return await self.session.fetch(
+                    table=table, criteria=criteria, **kwargs
+                )
+            return await self.session.fetch_raw(
+                table=table, criteria=criteria, columns=columns, **kwargs
+            )
+
+    def _run_sync(
+        self, method: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Run an async method of the handler to completion on a new event loop,
+        for callers that are not async. A sync Slims session is replaced by
+        an AsyncSlims with the same credentials for the duration of the call.
+        Must not be called from a running event loop.
+        Parameters
+        ----------
+        method : Callable[..., Awaitable[T]]
+        args : Any
+        kwargs : Any
+          Passed to method.
+
+        Returns
+        -------
+        T
+
+        """
+
+        async def run() -> T:
+            """Run the method with a semaphore and session of this loop."""
+            session = self.session
+            self._fetch_semaphore = asyncio.Semaphore(self.max_workers)
+            if isinstance(session, Slims):
+                self.session = AsyncSlims.from_slims(session)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                if self.session is not session:
+                    await self.session.aclose()
+                    self.session = session
+
+        return asyncio.run(run())
+
+    @staticmethod
+    def get_after_criteria(
+        sort_col: str, pk_col: str, value: Any, pk: int
+    ) -> Junction:
+        """
+        Criteria of the rows after a row in (sort_col, pk_col) order, used to
+        page a table by key rather than by offset. Rows without a value in
+        sort_col sort last, like in SLIMS.
+        Parameters
+        ----------
+        sort_col : str
+        pk_col : str
+        value : Any
+          Value of sort_col of the last row of the previous page.
+        pk : int
+          Primary key of the last row of the previous page.
+
+        Returns
+        -------
+        Junction
+
+        """
+        if value is None:
+            return (
+                conjunction()
+                .add(is_null(sort_col))
+                .add(greater_than(pk_col, pk))
+            )
+        return (
+            disjunction()
+            .add(greater_than(sort_col, value))
+            .add(
+                conjunction()
+                .add(equals(sort_col, value))
+                .add(greater_than(pk_col, pk))
+            )
+        )
 
     @staticmethod
     def _get_date_criteria(
@@ -134,8 +748,152 @@ class SlimsTableHandler:
             date_criteria = None
         return date_criteria
 
-    # TODO: refactor this to make it simpler
-    def _update_graph(  # noqa: C901
+    @staticmethod
+    def _combine_criteria(
+        *criteria: Optional[Union[Criterion, Junction]],
+    ) -> Optional[Union[Criterion, Junction]]:
+        """
+        Combine the criteria that are not None with a conjunction.
+        Parameters
+        ----------
+        criteria : Criterion | Junction | None
+
+        Returns
+        -------
+        Criterion | Junction | None
+
+        """
+        criteria_list = [c for c in criteria if c is not None]
+        if len(criteria_list) == 0:
+            return None
+        if len(criteria_list) == 1:
+            return criteria_list[0]
+        combined = conjunction()
+        for c in criteria_list:
+            combined.add(c)
+        return combined
+
+    def _get_subject_criteria(
+        self, subject_col: str, subject_id: Union[str, List[str]]
+    ) -> Tuple[Union[Criterion, Junction], ...]:
+        """
+        Key chunks matching the rows of a subject, or of any subject of a
+        batch split into chunks of fk_chunk_size subject IDs.
+        Parameters
+        ----------
+        subject_col : str
+        subject_id : str | List[str]
+
+        Returns
+        -------
+        Tuple[Criterion | Junction, ...]
+
+        """
+        if isinstance(subject_id, str):
+            return (equals(subject_col, subject_id),)
+        return tuple(self._get_chunk_criteria(subject_col, subject_id))
+
+    @staticmethod
+    def _get_unique_subject_ids(subject_ids: List[str]) -> List[str]:
+        """
+        Subject IDs of a batch query without duplicates, in order.
+        Parameters
+        ----------
+        subject_ids : List[str]
+
+        Returns
+        -------
+        List[str]
+
+        Raises
+        ------
+        ValueError
+          The list or one of the subject IDs is empty.
+
+        """
+        if not subject_ids or not all(subject_ids):
+            raise ValueError("subject_ids must not be empty!")
+        return list(dict.fromkeys(subject_ids))
+
+    @staticmethod
+    def _group_by_subject(
+        models: Iterable[T],
+        subject_ids: List[str],
+        get_subject_ids: Callable[[T], Iterable[Optional[str]]],
+    ) -> Dict[str, List[T]]:
+        """
+        Group the results of a batch query by subject. Every subject of the
+        batch gets a list, empty if nothing was found, and a result is added
+        to the list of each requested subject it belongs to.
+        Parameters
+        ----------
+        models : Iterable[T]
+        subject_ids : List[str]
+        get_subject_ids : Callable[[T], Iterable[str | None]]
+          The subjects a result belongs to.
+
+        Returns
+        -------
+        Dict[str, List[T]]
+
+        """
+        grouped: Dict[str, List[T]] = {s: [] for s in subject_ids}
+        for model in models:
+            for subject_id in get_subject_ids(model):
+                if subject_id in grouped:
+                    grouped[subject_id].append(model)
+        return grouped
+
+    def _get_experiment_run_lookup(
+        self, subject_col: str, subject_id: Optional[Union[str, List[str]]]
+    ) -> Optional[SubjectLookup]:
+        """
+        Lookup of the experiment runs that have a step with a Content row of
+        a subject, or of any subject of a batch.
+        Parameters
+        ----------
+        subject_col : str
+          Content column holding the subject ID, e.g. cntn_barCode.
+        subject_id : str | List[str] | None
+
+        Returns
+        -------
+        SubjectLookup | None
+          None if subject_id is None.
+
+        """
+        if subject_id is None:
+            return None
+        return SubjectLookup(
+            plan=[
+                ForeignTableFetch(
+                    name="Content",
+                    foreign_table="Content",
+                    key_chunks=self._get_subject_criteria(
+                        subject_col, subject_id
+                    ),
+                ),
+                ForeignTableFetch(
+                    name="ExperimentRunStepContent",
+                    input_name="Content",
+                    input_table_cols=("cntn_pk",),
+                    foreign_table="ExperimentRunStepContent",
+                    foreign_table_col="xrsc_fk_content",
+                ),
+                ForeignTableFetch(
+                    name="ExperimentRunStep",
+                    input_name="ExperimentRunStepContent",
+                    input_table_cols=("xrsc_fk_experimentRunStep",),
+                    foreign_table="ExperimentRunStep",
+                    foreign_table_col="xprs_pk",
+                ),
+            ],
+            key_fetch="ExperimentRunStep",
+            key_col="xprs_fk_experimentRun",
+            root_col="xprn_pk",
+        )
+
+    def _update_graph(
         self,
         foreign_table: str,
         foreign_rows: List[Record],
@@ -143,7 +901,7 @@ class SlimsTableHandler:
         input_table: str,
         input_rows: List[Record],
         input_table_cols: List[str],
-        g: DiGraph,
+        g: RecordGraph,
     ) -> None:
         """
         Update graph of table relations in place.
@@ -161,123 +919,952 @@ class SlimsTableHandler:
           The records that were pulled from the input table
         input_table_cols : List[str]
           The name of the columns in the input table to match keys against
-        g : DiGraph
+        g : RecordGraph
           The directed graph to updated with the slims information
 
         Returns
         -------
         None
-          Updates the DiGraph object in place.
+          Updates the RecordGraph object in place.
 
         """
-        for row in foreign_rows:
-            g.add_node(
-                f"{foreign_table}.{row.pk()}",
-                row=row,
-                pk=row.pk(),
-                table_name=foreign_table,
-            )
+        foreign_nodes = g.add_nodes(foreign_table, foreign_rows)
         if foreign_table_col.endswith("_pk"):
-            for row in input_rows:
-                for input_table_col in input_table_cols:
-                    foreign_table_pk = self.get_attr_or_none(
-                        row, input_table_col
-                    )
-                    if (
-                        isinstance(foreign_table_pk, int)
-                        and g.nodes.get(f"{foreign_table}.{foreign_table_pk}")
-                        is not None
-                    ):
-                        g.add_edge(
-                            f"{row.table_name()}.{row.pk()}",
-                            f"{foreign_table}.{foreign_table_pk}",
-                        )
-                    elif isinstance(foreign_table_pk, list):
-                        for f_pk in foreign_table_pk:
-                            if (
-                                g.nodes.get(f"{foreign_table}.{f_pk}")
-                                is not None
-                            ):
-                                g.add_edge(
-                                    f"{row.table_name()}.{row.pk()}",
-                                    f"{foreign_table}.{f_pk}",
-                                )
+            foreign_index = g.get_table_index(foreign_table)
+            input_nodes = g.add_nodes(input_table, input_rows)
+            for row, u in zip(input_rows, input_nodes):
+                for key in self._get_row_keys(row, input_table_cols):
+                    v = foreign_index.get(key)
+                    if v is not None:
+                        g.add_edge(u, v)
         else:
-            for row in foreign_rows:
-                input_table_pk = self.get_attr_or_none(row, foreign_table_col)
-                if (
-                    isinstance(input_table_pk, int)
-                    and g.nodes.get(f"{input_table}.{input_table_pk}")
-                    is not None
-                ):
-                    g.add_edge(
-                        f"{input_table}.{input_table_pk}",
-                        f"{row.table_name()}.{row.pk()}",
-                    )
+            input_index = g.get_table_index(input_table)
+            for row, v in zip(foreign_rows, foreign_nodes):
+                input_table_pk = getattr(
+                    vars(row).get(foreign_table_col), "value", None
+                )
+                if isinstance(input_table_pk, int):
+                    u = input_index.get(input_table_pk)
+                    if u is not None:
+                        g.add_edge(u, v)
 
-    # TODO: Allow for multiple input tables
-    def get_rows_from_foreign_table(
-        self,
-        input_table: str,
-        input_rows: List[Record],
-        foreign_table: str,
-        foreign_table_col: str,
-        input_table_cols: List[str],
-        extra_criteria: Optional[Union[Criterion, Junction]] = None,
-        graph: Optional[DiGraph] = None,
-    ) -> List[Record]:
+    @staticmethod
+    def _get_row_keys(row: Record, columns: Sequence[str]) -> List[Any]:
         """
-        Pull rows from foreign table
+        Collect the keys found in the columns of a row in a single pass. List
+        values are flattened and missing values are skipped. Record keeps
+        its Column objects in its instance dict, so they are read from there
+        directly instead of through get_attr_or_none.
         Parameters
         ----------
-        input_table : str
-        input_rows :
-        input_table_cols :
-        foreign_table :
-        foreign_table_col :
-        extra_criteria: Criterion | Junction | None
-        graph : Graph | None
+        row : Record
+        columns : Sequence[str]
 
         Returns
         -------
+        List[Any]
 
         """
-        sets_of_foreign_keys = {r: set() for r in input_table_cols}
-        for row in input_rows:
-            for fk_name in input_table_cols:
-                if self.get_attr_or_none(row, fk_name) is not None:
-                    key_values = self.get_attr_or_none(row, fk_name)
-                    if isinstance(key_values, list):
-                        key_values = set(key_values)
-                    else:
-                        key_values = {key_values}
-                    sets_of_foreign_keys[fk_name] = sets_of_foreign_keys[
-                        fk_name
-                    ].union(key_values)
-        total_fks = set()
-        for v in sets_of_foreign_keys.values():
-            total_fks = total_fks.union(v)
-        if len(total_fks) == 0:
-            rows = []
-        else:
-            main_criteria = is_one_of(foreign_table_col, list(total_fks))
-            if extra_criteria is not None:
-                criteria = conjunction().add(main_criteria).add(extra_criteria)
-            else:
-                criteria = main_criteria
-            rows = self.session.fetch(
-                table=foreign_table,
-                criteria=criteria,
-            )
-        if graph is not None and rows:
-            self._update_graph(
-                input_rows=input_rows,
-                input_table=input_table,
-                input_table_cols=input_table_cols,
-                g=graph,
-                foreign_table=foreign_table,
-                foreign_table_col=foreign_table_col,
-                foreign_rows=rows,
-            )
+        row_columns = vars(row)
+        keys = []
+        for name in columns:
+            value = getattr(row_columns.get(name), "value", None)
+            if isinstance(value, list):
+                keys.extend(value)
+            elif value is not None:
+                keys.append(value)
+        return keys
 
-        return rows
+    def _get_foreign_keys(
+        self, input_rows: List[Record], input_table_cols: List[str]
+    ) -> Set[Any]:
+        """
+        Collect the keys found in the input_table_cols of the input_rows.
+        Parameters
+        ----------
+        input_rows : List[Record]
+        input_table_cols : List[str]
+
+        Returns
+        -------
+        Set[Any]
+
+        """
+        total_fks = set()
+        for row in input_rows:
+            total_fks.update(self._get_row_keys(row, input_table_cols))
+        return total_fks
+
+    def _get_foreign_criteria(
+        self,
+        input_rows: List[Record],
+        input_table_cols: List[str],
+        foreign_table_col: str,
+        extra_criteria: Optional[Union[Criterion, Junction]] = None,
+    ) -> List[Union[Criterion, Junction]]:
+        """
+        Build the criteria to fetch the foreign rows matching the keys in the
+        input rows. Large key sets are split into chunks of fk_chunk_size
+        keys with one criterion per chunk.
+        Parameters
+        ----------
+        input_rows : List[Record]
+        input_table_cols : List[str]
+        foreign_table_col : str
+        extra_criteria : Criterion | Junction | None
+
+        Returns
+        -------
+        List[Criterion | Junction]
+          Empty if the input rows hold no keys.
+
+        """
+        total_fks = list(self._get_foreign_keys(input_rows, input_table_cols))
+        return self._get_chunk_criteria(
+            foreign_table_col, total_fks, extra_criteria
+        )
+
+    def _get_chunk_criteria(
+        self,
+        column: str,
+        keys: List[Any],
+        extra_criteria: Optional[Union[Criterion, Junction]] = None,
+    ) -> List[Union[Criterion, Junction]]:
+        """
+        Split keys into chunks of fk_chunk_size keys, with one is_one_of
+        criterion on column per chunk.
+        Parameters
+        ----------
+        column : str
+        keys : List[Any]
+        extra_criteria : Criterion | Junction | None
+          Added to the criterion of every chunk.
+
+        Returns
+        -------
+        List[Criterion | Junction]
+          Empty if there are no keys.
+
+        """
+        criteria_list = []
+        for start in range(0, len(keys), self.fk_chunk_size):
+            end = start + self.fk_chunk_size
+            main_criteria = is_one_of(column, keys[start:end])
+            if extra_criteria is not None:
+                criteria_list.append(
+                    conjunction().add(main_criteria).add(extra_criteria)
+                )
+            else:
+                criteria_list.append(main_criteria)
+        return criteria_list
+
+    @staticmethod
+    def _merge_rows(chunk_rows: List[List[Record]]) -> List[Record]:
+        """
+        Merge the rows fetched for each chunk of keys. Keys that appear in
+        list columns can match the same foreign row from more than one chunk,
+        so rows are deduplicated by pk.
+        Parameters
+        ----------
+        chunk_rows : List[List[Record]]
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        if len(chunk_rows) == 1:
+            return chunk_rows[0]
+        rows_by_pk: Dict[int, Record] = {}
+        for rows in chunk_rows:
+            for row in rows:
+                rows_by_pk.setdefault(row.pk(), row)
+        return list(rows_by_pk.values())
+
+    async def _fetch_foreign_rows_async(
+        self,
+        input_rows: List[Record],
+        input_table_cols: List[str],
+        foreign_table: str,
+        foreign_table_col: str,
+        extra_criteria: Optional[Union[Criterion, Junction]] = None,
+        page: Optional[RootPage] = None,
+        columns: Optional[Collection[str]] = None,
+    ) -> List[Record]:
+        """
+        Fetch the rows in the foreign table that match the keys in the input
+        rows. Does not touch any graph. Chunks of keys are fetched
+        concurrently, within the max_workers cap of the handler, and merged.
+        Parameters
+        ----------
+        input_rows : List[Record]
+        input_table_cols : List[str]
+        foreign_table : str
+        foreign_table_col : str
+        extra_criteria : Criterion | Junction | None
+        page : RootPage | None
+          If set, only the first page of matching rows is returned.
+        columns : Collection[str] | None
+          If set, the rows are RawRecords holding only these columns.
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        criteria_list = self._get_foreign_criteria(
+            input_rows, input_table_cols, foreign_table_col, extra_criteria
+        )
+        if len(criteria_list) == 0:
+            return []
+        fetch_args = self._get_page_fetch_args(page)
+        chunk_rows = await asyncio.gather(
+            *[
+                self._fetch_async(foreign_table, c, columns, **fetch_args)
+                for c in criteria_list
+            ]
+        )
+        return self._trim_page(page, self._merge_rows(list(chunk_rows)))
+
+    @staticmethod
+    def _get_plan_levels(
+        plan: List[ForeignTableFetch],
+    ) -> List[List[ForeignTableFetch]]:
+        """
+        Group the fetches of a plan into levels. Every fetch in a level only
+        depends on fetches in earlier levels, so the fetches within a level
+        can run concurrently.
+        Parameters
+        ----------
+        plan : List[ForeignTableFetch]
+
+        Returns
+        -------
+        List[List[ForeignTableFetch]]
+
+        Raises
+        ------
+        ValueError
+          If a fetch depends on a fetch that is not in the plan.
+
+        """
+        fetches = {fetch.name: fetch for fetch in plan}
+        depths: Dict[str, int] = {}
+
+        def depth(name: str) -> int:
+            """Number of fetches the named fetch transitively depends on."""
+            if name not in depths:
+                if name not in fetches:
+                    raise ValueError(f"Unknown input fetch {name} in plan!")
+                input_name = fetches[name].input_name
+                depths[name] = (
+                    0 if input_name is None else depth(input_name) + 1
+                )
+            return depths[name]
+
+        levels: List[List[ForeignTableFetch]] = []
+        for fetch in plan:
+            fetch_depth = depth(fetch.name)
+            while len(levels) <= fetch_depth:
+                levels.append([])
+            levels[fetch_depth].append(fetch)
+        return levels
+
+    @staticmethod
+    def _get_plan_columns(
+        plan: List[ForeignTableFetch],
+    ) -> Dict[str, Optional[Set[str]]]:
+        """
+        Columns to keep in the rows of each fetch of a plan. Fetches that
+        declare columns also keep the columns the plan joins on: the key
+        column matched against their input rows, the key columns read by the
+        fetches that take them as input, and the sort column of their page.
+        Rows of the same table share a node in the graph, so fetches of the
+        same table keep the union of their columns, or all columns if any of
+        them does not declare columns.
+        Parameters
+        ----------
+        plan : List[ForeignTableFetch]
+
+        Returns
+        -------
+        Dict[str, Set[str] | None]
+          Columns keyed by fetch name. None if the fetch keeps all columns.
+
+        """
+        plan_columns: Dict[str, Optional[Set[str]]] = {
+            fetch.name: None if fetch.columns is None else set(fetch.columns)
+            for fetch in plan
+        }
+        for fetch in plan:
+            columns = plan_columns[fetch.name]
+            if columns is not None and fetch.input_name is not None:
+                columns.add(fetch.foreign_table_col)
+            if columns is not None and fetch.page is not None:
+                columns.add(fetch.page.created_on_col)
+            input_columns = plan_columns.get(fetch.input_name)
+            if input_columns is not None:
+                input_columns.update(fetch.input_table_cols)
+        table_columns: Dict[str, Optional[Set[str]]] = {}
+        for fetch in plan:
+            columns = plan_columns[fetch.name]
+            if fetch.foreign_table not in table_columns:
+                table_columns[fetch.foreign_table] = columns
+            elif columns is None or table_columns[fetch.foreign_table] is None:
+                table_columns[fetch.foreign_table] = None
+            else:
+                table_columns[fetch.foreign_table] |= columns
+        return {f.name: table_columns[f.foreign_table] for f in plan}
+
+    @staticmethod
+    def _get_lookup_plan(lookup: SubjectLookup) -> List[ForeignTableFetch]:
+        """
+        Plan of a subject lookup, with its key column kept in the rows of
+        the key fetch if that fetch declares columns.
+        """
+        return [
+            (
+                fetch._replace(columns=fetch.columns + (lookup.key_col,))
+                if fetch.name == lookup.key_fetch and fetch.columns is not None
+                else fetch
+            )
+            for fetch in lookup.plan
+        ]
+
+    def _get_reference_cache_key(
+        self,
+        fetch: ForeignTableFetch,
+        columns: Optional[Collection[str]] = None,
+    ) -> Optional[Tuple[str, Optional[str], Optional[Tuple[str, ...]]]]:
+        """
+        Key of a fetch in the reference cache. Only cacheable fetches without
+        an input fetch are cached, since their rows do not depend on the
+        request. Rows holding different columns are cached separately.
+        Parameters
+        ----------
+        fetch : ForeignTableFetch
+        columns : Collection[str] | None
+          Columns kept in the rows of the fetch. None if all are kept.
+
+        Returns
+        -------
+        Tuple[str, str | None, Tuple[str, ...] | None] | None
+          None if the fetch is not cached.
+
+        """
+        if (
+            self.reference_cache is None
+            or not fetch.cacheable
+            or fetch.input_name is not None
+        ):
+            return None
+        criteria = (
+            None
+            if fetch.extra_criteria is None
+            else json.dumps(fetch.extra_criteria.to_dict(), sort_keys=True)
+        )
+        return (
+            fetch.foreign_table,
+            criteria,
+            None if columns is None else tuple(sorted(columns)),
+        )
+
+    def _get_fetch_criteria(
+        self, fetch: ForeignTableFetch
+    ) -> Optional[Union[Criterion, Junction]]:
+        """Extra criteria of a fetch, limited to its page if it has one."""
+        if fetch.page is None:
+            return fetch.extra_criteria
+        return self._get_page_criteria(fetch.page, fetch.extra_criteria)
+
+    async def _run_fetch_async(
+        self,
+        fetch: ForeignTableFetch,
+        results: Dict[str, List[Record]],
+        columns: Optional[Collection[str]] = None,
+    ) -> List[Record]:
+        """
+        Run a single fetch of a plan. A fetch with key_chunks is run once
+        per chunk, and the rows are merged into one page.
+        Parameters
+        ----------
+        fetch : ForeignTableFetch
+        results : Dict[str, List[Record]]
+          Rows returned by fetches in earlier levels keyed by fetch name.
+        columns : Collection[str] | None
+          If set, the rows are RawRecords holding only these columns.
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        if fetch.key_chunks:
+            chunk_rows = await asyncio.gather(
+                *[
+                    self._run_fetch_async(
+                        fetch._replace(
+                            extra_criteria=self._combine_criteria(
+                                fetch.extra_criteria, chunk
+                            ),
+                            key_chunks=(),
+                        ),
+                        results,
+                        columns,
+                    )
+                    for chunk in fetch.key_chunks
+                ]
+            )
+            return self._trim_page(
+                fetch.page, self._merge_rows(list(chunk_rows))
+            )
+        if fetch.input_name is None:
+            cache_key = self._get_reference_cache_key(fetch, columns)
+            if cache_key is not None:
+                rows = self.reference_cache.get(cache_key)
+                if rows is not None:
+                    return rows
+            rows = self._trim_page(
+                fetch.page,
+                await self._fetch_async(
+                    fetch.foreign_table,
+                    self._get_fetch_criteria(fetch),
+                    columns,
+                    **self._get_page_fetch_args(fetch.page),
+                ),
+            )
+            if cache_key is not None:
+                self.reference_cache.set(cache_key, rows)
+            return rows
+        return await self._fetch_foreign_rows_async(
+            input_rows=results[fetch.input_name],
+            input_table_cols=list(fetch.input_table_cols),
+            foreign_table=fetch.foreign_table,
+            foreign_table_col=fetch.foreign_table_col,
+            extra_criteria=self._get_fetch_criteria(fetch),
+            page=fetch.page,
+            columns=columns,
+        )
+
+    def _add_fetch_to_graph(
+        self,
+        plan: List[ForeignTableFetch],
+        fetch: ForeignTableFetch,
+        results: Dict[str, List[Record]],
+        g: RecordGraph,
+        root_nodes: List[int],
+    ) -> None:
+        """
+        Add the rows returned by a fetch to the graph.
+        Parameters
+        ----------
+        plan : List[ForeignTableFetch]
+        fetch : ForeignTableFetch
+        results : Dict[str, List[Record]]
+        g : RecordGraph
+        root_nodes : List[int]
+          Updated in place with the nodes of root fetches.
+        """
+        rows = results[fetch.name]
+        if fetch.is_root:
+            for row in rows:
+                root_nodes.append(g.add_node(row.table_name(), row))
+        elif fetch.add_to_graph and fetch.input_name is not None and rows:
+            input_table = next(
+                f.foreign_table for f in plan if f.name == fetch.input_name
+            )
+            self._update_graph(
+                foreign_table=fetch.foreign_table,
+                foreign_rows=rows,
+                foreign_table_col=fetch.foreign_table_col,
+                input_table=input_table,
+                input_rows=results[fetch.input_name],
+                input_table_cols=list(fetch.input_table_cols),
+                g=g,
+            )
+
+    async def _run_plan_async(
+        self, plan: List[ForeignTableFetch]
+    ) -> Dict[str, List[Record]]:
+        """
+        Run a plan of fetches. Fetches that do not depend on each other are
+        sent to SLIMS concurrently, so the total latency is that of the
+        longest chain of dependent fetches.
+        Parameters
+        ----------
+        plan : List[ForeignTableFetch]
+
+        Returns
+        -------
+        Dict[str, List[Record]]
+          Rows returned by each fetch keyed by fetch name.
+
+        """
+        results: Dict[str, List[Record]] = {}
+        plan_columns = self._get_plan_columns(plan)
+        for level in self._get_plan_levels(plan):
+            level_rows = await asyncio.gather(
+                *[
+                    self._run_fetch_async(f, results, plan_columns[f.name])
+                    for f in level
+                ]
+            )
+            for fetch, rows in zip(level, level_rows):
+                results[fetch.name] = rows
+        return results
+
+    def _get_graph_from_results(
+        self, plan: List[ForeignTableFetch], results: Dict[str, List[Record]]
+    ) -> Tuple[RecordGraph, List[int]]:
+        """
+        Build a graph from the rows returned by a plan of fetches.
+        Parameters
+        ----------
+        plan : List[ForeignTableFetch]
+        results : Dict[str, List[Record]]
+
+        Returns
+        -------
+        Tuple[RecordGraph, List[int]]
+          A directed graph of the SLIMS records and a list of the root nodes.
+
+        """
+        g = RecordGraph()
+        root_nodes = []
+        for level in self._get_plan_levels(plan):
+            for fetch in level:
+                self._add_fetch_to_graph(plan, fetch, results, g, root_nodes)
+        return g, root_nodes
+
+    async def _build_graph_async(
+        self, plan: List[ForeignTableFetch]
+    ) -> Tuple[RecordGraph, List[int]]:
+        """
+        Run a plan of fetches and build a graph from the results. See
+        _run_plan_async.
+        Parameters
+        ----------
+        plan : List[ForeignTableFetch]
+
+        Returns
+        -------
+        Tuple[RecordGraph, List[int]]
+          A directed graph of the SLIMS records and a list of the root nodes.
+
+        """
+        return self._get_graph_from_results(
+            plan, await self._run_plan_async(plan)
+        )
+
+    def _get_root_criteria(
+        self, lookup: SubjectLookup, results: Dict[str, List[Record]]
+    ) -> List[Union[Criterion, Junction]]:
+        """
+        Criteria restricting the root fetch to the roots found by a subject
+        lookup, split into chunks of fk_chunk_size keys.
+        Parameters
+        ----------
+        lookup : SubjectLookup
+        results : Dict[str, List[Record]]
+          Rows returned by the fetches of lookup.plan.
+
+        Returns
+        -------
+        List[Criterion | Junction]
+          Empty if the lookup found no roots.
+
+        """
+        keys = set()
+        for row in results[lookup.key_fetch]:
+            key = SlimsTableHandler.get_attr_or_none(row, lookup.key_col)
+            if isinstance(key, list):
+                keys.update(key)
+            elif key is not None:
+                keys.add(key)
+        return self._get_chunk_criteria(lookup.root_col, sorted(keys))
+
+    async def _build_subject_graph_async(
+        self,
+        lookup: Optional[SubjectLookup],
+        plan: List[ForeignTableFetch],
+    ) -> Tuple[RecordGraph, List[int]]:
+        """
+        Build the graph of a plan, starting from the rows of a subject if a
+        lookup is given. The lookup plan walks from the subject Content rows
+        back up to the keys of their roots, and only those roots are fetched,
+        in chunks of fk_chunk_size keys, and expanded downward.
+        Parameters
+        ----------
+        lookup : SubjectLookup | None
+        plan : List[ForeignTableFetch]
+
+        Returns
+        -------
+        Tuple[RecordGraph, List[int]]
+          A directed graph of the SLIMS records and a list of the root nodes.
+
+        """
+        if lookup is None:
+            return await self._build_graph_async(plan)
+        key_chunks = tuple(
+            self._get_root_criteria(
+                lookup,
+                await self._run_plan_async(self._get_lookup_plan(lookup)),
+            )
+        )
+        if not key_chunks:
+            return RecordGraph(), []
+        return await self._build_graph_async(
+            [
+                f._replace(key_chunks=key_chunks) if f.is_root else f
+                for f in plan
+            ]
+        )
+
+    def _get_lookup(
+        self, subject_id: Optional[Union[str, List[str]]], **filters: Any
+    ) -> Optional[SubjectLookup]:
+        """
+        Lookup of the roots of a subject, or of any subject of a batch.
+        Parameters
+        ----------
+        subject_id : str | List[str] | None
+        filters : Any
+          Other filters of the handler, e.g. session_name.
+
+        Returns
+        -------
+        SubjectLookup | None
+          None if all roots in the date range are fetched.
+
+        """
+        raise NotImplementedError
+
+    def _get_fetch_plan(
+        self,
+        start_date_greater_than_or_equal: Optional[datetime] = None,
+        end_date_less_than_or_equal: Optional[datetime] = None,
+        page: Optional[RootPage] = None,
+    ) -> List[ForeignTableFetch]:
+        """
+        Plan of the SLIMS fetches needed for the roots of the handler.
+        Parameters
+        ----------
+        start_date_greater_than_or_equal : datetime | None
+          Filter roots that were created on or after this datetime.
+        end_date_less_than_or_equal : datetime | None
+          Filter roots that were created on or before this datetime.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
+
+        Returns
+        -------
+        List[ForeignTableFetch]
+
+        """
+        raise NotImplementedError
+
+    def _iter_parse_graph(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str] = None,
+        **filters: Any,
+    ) -> Iterator[Any]:
+        """
+        Parses the graph object into pydantic models, one root node at a
+        time.
+        Parameters
+        ----------
+        g : RecordGraph
+        root_nodes : List[int]
+        subject_id : str | None
+          Labtracks ID of mouse to filter records by.
+        filters : Any
+          Other filters of the handler, e.g. session_name.
+
+        Returns
+        -------
+        Iterator[Any]
+
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _get_subject_ids(model: Any) -> Iterable[Optional[str]]:
+        """The subjects a model belongs to, used to group batch results."""
+        return [model.subject_id]
+
+    def _parse_graph(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Any]:
+        """
+        Parses the graph object into a list of pydantic models. See
+        _iter_parse_graph.
+        """
+        return list(
+            self._iter_parse_graph(
+                g=g, root_nodes=root_nodes, subject_id=subject_id, **filters
+            )
+        )
+
+    async def _get_graph_async(
+        self,
+        start_date_greater_than_or_equal: Optional[datetime] = None,
+        end_date_less_than_or_equal: Optional[datetime] = None,
+        page: Optional[RootPage] = None,
+        subject_id: Optional[Union[str, List[str]]] = None,
+        **filters: Any,
+    ) -> Tuple[RecordGraph, List[int]]:
+        """
+        Generate a Graph of the records from SLIMS for the roots of the
+        handler.
+        Parameters
+        ----------
+        start_date_greater_than_or_equal : datetime | None
+          Filter roots that were created on or after this datetime.
+        end_date_less_than_or_equal : datetime | None
+          Filter roots that were created on or before this datetime.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
+        subject_id : str | List[str] | None
+          If set, only the roots of this subject, or of any subject of a
+          batch, are fetched.
+        filters : Any
+          Other filters of the handler, e.g. session_name.
+
+        Returns
+        -------
+        Tuple[RecordGraph, List[int]]
+          A directed graph of the SLIMS records and a list of the root nodes.
+
+        """
+        return await self._build_subject_graph_async(
+            self._get_lookup(subject_id, **filters),
+            self._get_fetch_plan(
+                start_date_greater_than_or_equal,
+                end_date_less_than_or_equal,
+                page,
+            ),
+        )
+
+    async def _query_graph_async(
+        self,
+        subject_id: Optional[Union[str, List[str]]],
+        start_date_greater_than_or_equal: Optional[str],
+        end_date_less_than_or_equal: Optional[str],
+        page: Optional[RootPage] = None,
+        **filters: Any,
+    ) -> Tuple[RecordGraph, List[int]]:
+        """
+        Validate a query and build the graph of its roots. Unless a page is
+        requested, the roots are sorted newest first. A page is always in
+        page order.
+        Parameters
+        ----------
+        subject_id : str | List[str] | None
+        start_date_greater_than_or_equal : str | None
+        end_date_less_than_or_equal : str | None
+        page : RootPage | None
+        filters : Any
+          Other filters of the handler, e.g. session_name.
+
+        Returns
+        -------
+        Tuple[RecordGraph, List[int]]
+
+        Raises
+        ------
+        ValueError
+          The subject_id cannot be an empty string, and the dates must be in
+          ISO format.
+
+        """
+        if subject_id is not None and len(subject_id) == 0:
+            raise ValueError("subject_id must not be empty!")
+        g, root_nodes = await self._get_graph_async(
+            start_date_greater_than_or_equal=self.parse_date(
+                start_date_greater_than_or_equal
+            ),
+            end_date_less_than_or_equal=self.parse_date(
+                end_date_less_than_or_equal
+            ),
+            page=page,
+            subject_id=subject_id,
+            **filters,
+        )
+        if page is None:
+            root_nodes = self._sort_root_nodes(
+                g, root_nodes, self.ROOT.created_on_col
+            )
+        return g, root_nodes
+
+    async def iter_data_async(
+        self,
+        subject_id: Optional[str] = None,
+        start_date_greater_than_or_equal: Optional[str] = None,
+        end_date_less_than_or_equal: Optional[str] = None,
+        **filters: Any,
+    ) -> AsyncIterator[Any]:
+        """
+        Get the models of the handler from SLIMS. The graph is fetched in
+        full, and models are yielded as each root node is parsed.
+
+        Parameters
+        ----------
+        subject_id : str | None
+          Labtracks ID of mouse. If None, then no filter will be performed.
+        start_date_greater_than_or_equal : str | None
+          Filter roots that were created on or after this datetime.
+        end_date_less_than_or_equal : str | None
+          Filter roots that were created on or before this datetime.
+        filters : Any
+          Other filters of the handler, e.g. session_name.
+
+        Returns
+        -------
+        AsyncIterator[Any]
+
+        Raises
+        ------
+        ValueError
+          The subject_id cannot be an empty string.
+
+        """
+        g, root_nodes = await self._query_graph_async(
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
+            **filters,
+        )
+        for model in self._iter_parse_graph(
+            g=g, root_nodes=root_nodes, subject_id=subject_id, **filters
+        ):
+            yield model
+
+    async def get_data_async(
+        self,
+        subject_id: Optional[str] = None,
+        start_date_greater_than_or_equal: Optional[str] = None,
+        end_date_less_than_or_equal: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Any]:
+        """
+        Get the models of the handler from SLIMS as a list. See
+        iter_data_async.
+        """
+        return [
+            model
+            async for model in self.iter_data_async(
+                subject_id,
+                start_date_greater_than_or_equal,
+                end_date_less_than_or_equal,
+                **filters,
+            )
+        ]
+
+    async def get_data_page_async(
+        self,
+        subject_id: Optional[str] = None,
+        start_date_greater_than_or_equal: Optional[str] = None,
+        end_date_less_than_or_equal: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[Tuple[int, int]] = None,
+        **filters: Any,
+    ) -> Tuple[List[Any], Optional[Tuple[int, int]]]:
+        """
+        Get one page of the models of the handler from SLIMS. Only the roots
+        on the page are fetched from SLIMS and traversed, newest first.
+
+        Parameters
+        ----------
+        subject_id : str | None
+          Labtracks ID of mouse. If None, then no filter will be performed.
+        start_date_greater_than_or_equal : str | None
+          Filter roots that were created on or after this datetime.
+        end_date_less_than_or_equal : str | None
+          Filter roots that were created on or before this datetime.
+        limit : int
+          Maximum number of roots on the page.
+        cursor : Tuple[int, int] | None
+          Cursor returned with the previous page. If None, the first page is
+          returned.
+        filters : Any
+          Other filters of the handler, e.g. session_name.
+
+        Returns
+        -------
+        Tuple[List[Any], Tuple[int, int] | None]
+          The models of the page and the cursor of the next page, which is
+          None if there are no more pages.
+
+        Raises
+        ------
+        ValueError
+          The subject_id cannot be an empty string.
+
+        """
+        page = RootPage(
+            created_on_col=self.ROOT.created_on_col,
+            pk_col=self.ROOT.pk_col,
+            limit=limit,
+            cursor=cursor,
+        )
+        g, root_nodes = await self._query_graph_async(
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
+            page=page,
+            **filters,
+        )
+        models = self._parse_graph(
+            g=g, root_nodes=root_nodes, subject_id=subject_id, **filters
+        )
+        return models, self._get_next_cursor(g, root_nodes, page)
+
+    async def get_data_by_subject_async(
+        self,
+        subject_ids: List[str],
+        start_date_greater_than_or_equal: Optional[str] = None,
+        end_date_less_than_or_equal: Optional[str] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        Get the models of the handler for a batch of subjects. The roots of
+        all subjects are fetched and traversed in a single graph, and the
+        models are grouped by _get_subject_ids.
+
+        Parameters
+        ----------
+        subject_ids : List[str]
+          Labtracks IDs of mice.
+        start_date_greater_than_or_equal : str | None
+          Filter roots that were created on or after this datetime.
+        end_date_less_than_or_equal : str | None
+          Filter roots that were created on or before this datetime.
+
+        Returns
+        -------
+        Dict[str, List[Any]]
+          Results of each subject, in the order of subject_ids.
+
+        Raises
+        ------
+        ValueError
+          The subject_ids or one of the subject IDs is empty.
+
+        """
+        subject_ids = self._get_unique_subject_ids(subject_ids)
+        g, root_nodes = await self._query_graph_async(
+            subject_ids,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
+        )
+        return self._group_by_subject(
+            self._iter_parse_graph(g=g, root_nodes=root_nodes),
+            subject_ids,
+            self._get_subject_ids,
+        )
@@ -3,179 +3,163 @@ Module to handle fetching viral injection data from slims
 and parsing it to a model.
 """
 
-from datetime import datetime, timezone
-from decimal import Decimal
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Union
 
-from networkx import DiGraph, descendants
 from slims.criteria import equals
 
+from aind_slims_service_server.handlers.field_map import (
+    FieldMap,
+    RecordMapper,
+    to_datetime,
+    to_decimal,
+)
 from aind_slims_service_server.handlers.table_handler import (
+    ForeignTableFetch,
+    RecordGraph,
+    RootPage,
+    RootSpec,
     SlimsTableHandler,
+    SubjectLookup,
 )
 from aind_slims_service_server.models import (
     SlimsViralInjectionData,
     SlimsViralMaterialData,
 )
 
+# Columns shared by viral injection and viral material Content rows
+CONTENT_FIELD_MAPS = [
+    FieldMap("content_category", "cntn_fk_category", "displayValue"),
+    FieldMap("content_type", "cntn_fk_contentType", "displayValue"),
+    FieldMap("content_created_on", "cntn_createdOn", converter=to_datetime),
+    FieldMap("content_modified_on", "cntn_modifiedOn", converter=to_datetime),
+    FieldMap("name", "cntn_id"),
+    FieldMap("volume", "cntn_cf_volumeRequired", converter=to_decimal),
+    FieldMap("volume_unit", "cntn_cf_volumeRequired", "unit"),
+    FieldMap("date_made", "cntn_cf_dateMade", converter=to_datetime),
+    FieldMap("intake_date", "cntn_cf_intakeDate_NA", converter=to_datetime),
+    FieldMap(
+        "storage_temperature",
+        "cntn_cf_fk_storageTemp_dynChoice",
+        "displayValue",
+    ),
+    FieldMap(
+        "special_storage_guidelines",
+        "cntn_cf_fk_specialStorageGuidelines",
+        "displayValues",
+    ),
+    FieldMap(
+        "special_handling_guidelines",
+        "cntn_cf_fk_specialHandlingGuidelines",
+        "displayValues",
+    ),
+]
+
+# Counts of the derived, ingredient and mixed records of a row
+COUNT_FIELD_MAPS = [
+    FieldMap("derivation_count", "derivedCount"),
+    FieldMap("ingredient_count", "ingredientCount"),
+    FieldMap("mix_count", "mixCount"),
+]
+
+VIRAL_INJECTION_MAPPER = RecordMapper(
+    SlimsViralInjectionData,
+    CONTENT_FIELD_MAPS
+    + [
+        FieldMap(
+            "viral_injection_buffer",
+            "cntn_cf_fk_viralInjectionBuffer",
+            "displayValue",
+        ),
+        FieldMap(
+            "labeling_protein",
+            "cntn_cf_fk_viralInjectionFluorescentLabelingP",
+            "displayValue",
+        ),
+    ],
+)
+
+ORDER_MAPPER = RecordMapper(
+    SlimsViralInjectionData,
+    [
+        FieldMap("assigned_mice", "ordr_cf_fk_assignedMice", "displayValues"),
+        FieldMap(
+            "requested_for_date",
+            "ordr_cf_requestedForDate",
+            converter=to_datetime,
+        ),
+        FieldMap(
+            "planned_injection_date",
+            "ordr_plannedOnDate",
+            converter=to_datetime,
+        ),
+        FieldMap(
+            "planned_injection_time",
+            "ordr_plannedOnTime",
+            converter=to_datetime,
+        ),
+        FieldMap("order_created_on", "ordr_createdOn", converter=to_datetime),
+    ]
+    + COUNT_FIELD_MAPS,
+)
+
+VIRAL_MATERIAL_MAPPER = RecordMapper(
+    SlimsViralMaterialData,
+    CONTENT_FIELD_MAPS
+    + [
+        FieldMap(
+            "viral_solution_type",
+            "cntn_cf_fk_viralSolutionType",
+            "displayValue",
+        ),
+        FieldMap("virus_name", "cntn_cf_virusName"),
+        FieldMap("lot_number", "cntn_cf_lotNumber"),
+        FieldMap("lab_team", "cntn_cf_fk_labTeam", "displayValue"),
+        FieldMap("virus_type", "cntn_cf_fk_virusType", "displayValue"),
+        FieldMap("virus_serotype", "cntn_cf_fk_virusSerotype", "displayValue"),
+        FieldMap("virus_plasmid_number", "cntn_cf_virusPlasmidNumber"),
+        FieldMap("dose", "cntn_cf_dose", converter=to_decimal),
+        FieldMap("dose_unit", "cntn_cf_doseUnit", "unit"),
+        FieldMap("titer", "cntn_cf_titer", converter=to_decimal),
+        FieldMap("titer_unit", "cntn_cf_titer", "unit"),
+    ]
+    + COUNT_FIELD_MAPS,
+)
+
 
 class ViralInjectionSessionHandler(SlimsTableHandler):
     """Class to handle getting Viral Injection info from SLIMS."""
 
-    def _parse_graph(
-        self, g: DiGraph, root_nodes: List[str], subject_id: Optional[str]
-    ) -> List[SlimsViralInjectionData]:
+    ROOT = RootSpec("cntn_createdOn", "cntn_pk", "content_created_on")
+
+    def _iter_parse_graph(
+        self,
+        g: RecordGraph,
+        root_nodes: List[int],
+        subject_id: Optional[str] = None,
+    ) -> Iterator[SlimsViralInjectionData]:
         """
-        Parses the graph object into a list of pydantic models.
+        Parses the graph object into pydantic models, one root node at a
+        time.
         Parameters
         ----------
-        g : DiGraph
+        g : RecordGraph
           Graph of the SLIMS records.
-        root_nodes : List[str]
+        root_nodes : List[int]
           List of root nodes to pull descendants from.
 
         Returns
         -------
-        List[SlimsViralInjectionData]
+        Iterator[SlimsViralInjectionData]
 
         """
-        vi_data_list = []
-        for node in root_nodes:
-            vi_data = SlimsViralInjectionData()
-            node_des = descendants(g, node)
-            root_row = g.nodes[node]["row"]
-            content_created_on_ts = self.get_attr_or_none(
-                root_row, "cntn_createdOn"
-            )
-            vi_data.content_created_on = (
-                None
-                if content_created_on_ts is None
-                else datetime.fromtimestamp(
-                    content_created_on_ts / 1000, tz=timezone.utc
-                )
-            )
-            vi_data.content_category = self.get_attr_or_none(
-                root_row, "cntn_fk_category", "displayValue"
-            )
-            vi_data.content_type = self.get_attr_or_none(
-                root_row, "cntn_fk_contentType", "displayValue"
-            )
-            vi_data.content_created_on = (
-                None
-                if content_created_on_ts is None
-                else datetime.fromtimestamp(
-                    content_created_on_ts / 1000, tz=timezone.utc
-                )
-            )
-            content_modified_on_ts = self.get_attr_or_none(
-                root_row, "cntn_modifiedOn"
-            )
-            vi_data.content_modified_on = (
-                None
-                if content_modified_on_ts is None
-                else datetime.fromtimestamp(
-                    content_modified_on_ts / 1000, tz=timezone.utc
-                )
-            )
-            vi_data.viral_injection_buffer = self.get_attr_or_none(
-                root_row, "cntn_cf_fk_viralInjectionBuffer", "displayValue"
-            )
-            volume = self.get_attr_or_none(root_row, "cntn_cf_volumeRequired")
-            vi_data.volume = None if volume is None else Decimal(str(volume))
-            vi_data.volume_unit = self.get_attr_or_none(
-                root_row, "cntn_cf_volumeRequired", "unit"
-            )
-            vi_data.labeling_protein = self.get_attr_or_none(
-                root_row,
-                "cntn_cf_fk_viralInjectionFluorescentLabelingP",
-                "displayValue",
-            )
-            vi_data.name = self.get_attr_or_none(root_row, "cntn_id")
-            date_made_ts = self.get_attr_or_none(root_row, "cntn_cf_dateMade")
-            vi_data.date_made = (
-                None
-                if date_made_ts is None
-                else datetime.fromtimestamp(
-                    date_made_ts / 1000, tz=timezone.utc
-                )
-            )
-            intake_date_ts = self.get_attr_or_none(
-                root_row, "cntn_cf_intakeDate_NA"
-            )
-            vi_data.intake_date = (
-                None
-                if intake_date_ts is None
-                else datetime.fromtimestamp(
-                    intake_date_ts / 1000, tz=timezone.utc
-                )
-            )
-            vi_data.storage_temperature = self.get_attr_or_none(
-                root_row, "cntn_cf_fk_storageTemp_dynChoice", "displayValue"
-            )
-            vi_data.special_storage_guidelines = self.get_attr_or_none(
-                root_row,
-                "cntn_cf_fk_specialStorageGuidelines",
-                "displayValues",
-            )
-            vi_data.special_handling_guidelines = self.get_attr_or_none(
-                root_row,
-                "cntn_cf_fk_specialHandlingGuidelines",
-                "displayValues",
-            )
+        for node, node_des in g.iter_descendants(root_nodes):
+            vi_data = VIRAL_INJECTION_MAPPER.create(g.row(node))
             for n in node_des:
-                table_name = g.nodes[n]["table_name"]
-                row = g.nodes[n]["row"]
+                table_name = g.table_name(n)
+                row = g.row(n)
                 if table_name == "Order":
-                    vi_data.assigned_mice = self.get_attr_or_none(
-                        row, "ordr_cf_fk_assignedMice", "displayValues"
-                    )
-                    requested_for_date_ts = self.get_attr_or_none(
-                        row, "ordr_cf_requestedForDate"
-                    )
-                    vi_data.requested_for_date = (
-                        None
-                        if requested_for_date_ts is None
-                        else datetime.fromtimestamp(
-                            requested_for_date_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    planned_injection_date_ts = self.get_attr_or_none(
-                        row, "ordr_plannedOnDate"
-                    )
-                    vi_data.planned_injection_date = (
-                        None
-                        if planned_injection_date_ts is None
-                        else datetime.fromtimestamp(
-                            planned_injection_date_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    planned_injection_time_ts = self.get_attr_or_none(
-                        row, "ordr_plannedOnTime"
-                    )
-                    vi_data.planned_injection_time = (
-                        None
-                        if planned_injection_time_ts is None
-                        else datetime.fromtimestamp(
-                            planned_injection_time_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    order_created_on_ts = self.get_attr_or_none(
-                        row, "ordr_createdOn"
-                    )
-                    vi_data.order_created_on = (
-                        None
-                        if order_created_on_ts is None
-                        else datetime.fromtimestamp(
-                            order_created_on_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    vi_data.derivation_count = self.get_attr_or_none(
-                        row, "derivedCount"
-                    )
-                    vi_data.ingredient_count = self.get_attr_or_none(
-                        row, "ingredientCount"
-                    )
-                    vi_data.mix_count = self.get_attr_or_none(row, "mixCount")
+                    ORDER_MAPPER.update(vi_data, row)
                 if (
                     table_name == "Content"
                     and self.get_attr_or_none(
@@ -183,198 +167,135 @@ class ViralInjectionSessionHandler(SlimsTableHandler):
                     )
                     == "Viral solution"
                 ):
-                    vm_data = SlimsViralMaterialData()
-                    vm_data.content_category = self.get_attr_or_none(
-                        row, "cntn_fk_category", "displayValue"
-                    )
-                    vm_data.content_type = self.get_attr_or_none(
-                        row, "cntn_fk_contentType", "displayValue"
-                    )
-                    content_created_on_ts = self.get_attr_or_none(
-                        row, "cntn_createdOn"
-                    )
-                    vm_data.content_created_on = (
-                        None
-                        if content_created_on_ts is None
-                        else datetime.fromtimestamp(
-                            content_created_on_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    content_modified_on_ts = self.get_attr_or_none(
-                        row, "cntn_modifiedOn"
-                    )
-                    vm_data.content_modified_on = (
-                        None
-                        if content_modified_on_ts is None
-                        else datetime.fromtimestamp(
-                            content_modified_on_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    vm_data.viral_solution_type = self.get_attr_or_none(
-                        row, "cntn_cf_fk_viralSolutionType", "displayValue"
-                    )
-                    vm_data.virus_name = self.get_attr_or_none(
-                        row, "cntn_cf_virusName"
-                    )
-                    vm_data.lot_number = self.get_attr_or_none(
-                        row, "cntn_cf_lotNumber"
-                    )
-                    vm_data.lab_team = self.get_attr_or_none(
-                        row, "cntn_cf_fk_labTeam", "displayValue"
-                    )
-                    vm_data.virus_type = self.get_attr_or_none(
-                        row, "cntn_cf_fk_virusType", "displayValue"
-                    )
-                    vm_data.virus_serotype = self.get_attr_or_none(
-                        row, "cntn_cf_fk_virusSerotype", "displayValue"
-                    )
-                    vm_data.virus_plasmid_number = self.get_attr_or_none(
-                        row, "cntn_cf_virusPlasmidNumber"
-                    )
-                    vm_data.name = self.get_attr_or_none(row, "cntn_id")
-                    dose = self.get_attr_or_none(row, "cntn_cf_dose")
-                    vm_data.dose = None if dose is None else Decimal(str(dose))
-                    vm_data.dose_unit = self.get_attr_or_none(
-                        row, "cntn_cf_doseUnit", "unit"
-                    )
-                    titer = self.get_attr_or_none(row, "cntn_cf_titer")
-                    vm_data.titer = (
-                        None if titer is None else Decimal(str(titer))
+                    vi_data.viral_materials.append(
+                        VIRAL_MATERIAL_MAPPER.create(row)
                     )
-                    vm_data.titer_unit = self.get_attr_or_none(
-                        row, "cntn_cf_titer", "unit"
-                    )
-                    volume = self.get_attr_or_none(
-                        row, "cntn_cf_volumeRequired"
-                    )
-                    vm_data.volume = (
-                        None if volume is None else Decimal(str(volume))
-                    )
-                    vm_data.volume_unit = self.get_attr_or_none(
-                        row, "cntn_cf_volumeRequired", "unit"
-                    )
-                    date_made_ts = self.get_attr_or_none(
-                        row, "cntn_cf_dateMade"
-                    )
-                    vm_data.date_made = (
-                        None
-                        if date_made_ts is None
-                        else datetime.fromtimestamp(
-                            date_made_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    intake_date_ts = self.get_attr_or_none(
-                        row, "cntn_cf_intakeDate_NA"
-                    )
-                    vm_data.intake_date = (
-                        None
-                        if intake_date_ts is None
-                        else datetime.fromtimestamp(
-                            intake_date_ts / 1000, tz=timezone.utc
-                        )
-                    )
-                    vm_data.storage_temperature = self.get_attr_or_none(
-                        row, "cntn_cf_fk_storageTemp_dynChoice", "displayValue"
-                    )
-                    vm_data.special_storage_guidelines = self.get_attr_or_none(
-                        row,
-                        "cntn_cf_fk_specialStorageGuidelines",
-                        "displayValues",
-                    )
-                    vm_data.special_handling_guidelines = (
-                        self.get_attr_or_none(
-                            row,
-                            "cntn_cf_fk_specialHandlingGuidelines",
-                            "displayValues",
-                        )
-                    )
-                    vm_data.derivation_count = self.get_attr_or_none(
-                        row, "derivedCount"
-                    )
-                    vm_data.ingredient_count = self.get_attr_or_none(
-                        row, "ingredientCount"
-                    )
-                    vm_data.mix_count = self.get_attr_or_none(row, "mixCount")
-                    vi_data.viral_materials.append(vm_data)
             if subject_id is None or subject_id in vi_data.assigned_mice:
-                vi_data_list.append(vi_data)
-        return vi_data_list
+                yield vi_data
+
+    @staticmethod
+    def _get_subject_ids(
+        model: SlimsViralInjectionData,
+    ) -> Iterable[Optional[str]]:
+        """Viral injections belong to each of their assigned mice."""
+        return model.assigned_mice or []
+
+    def _get_lookup(
+        self, subject_id: Optional[Union[str, List[str]]]
+    ) -> Optional[SubjectLookup]:
+        """
+        Lookup of the viral injections of a subject, or of any subject of a
+        batch. Starts from the Content row of the mouse and the Orders it is
+        assigned to, instead of every viral injection in the inventory.
+        Parameters
+        ----------
+        subject_id : str | List[str] | None
+
+        Returns
+        -------
+        SubjectLookup | None
+          None if subject_id is None.
 
-    def _get_graph(
+        """
+        if subject_id is None:
+            return None
+        return SubjectLookup(
+            plan=[
+                ForeignTableFetch(
+                    name="Mouse",
+                    foreign_table="Content",
+                    key_chunks=self._get_subject_criteria(
+                        "cntn_barCode", subject_id
+                    ),
+                ),
+                ForeignTableFetch(
+                    name="Order",
+                    input_name="Mouse",
+                    input_table_cols=("cntn_pk",),
+                    foreign_table="Order",
+                    foreign_table_col="ordr_cf_fk_assignedMice",
+                ),
+            ],
+            key_fetch="Order",
+            key_col="ordr_cf_fk_viralInjection",
+            root_col="cntn_pk",
+        )
+
+    def _get_fetch_plan(
         self,
         start_date_greater_than_or_equal: Optional[datetime] = None,
         end_date_less_than_or_equal: Optional[datetime] = None,
-    ) -> Tuple[DiGraph, List[str]]:
+        page: Optional[RootPage] = None,
+    ) -> List[ForeignTableFetch]:
         """
-        Generate a Graph of the records from SLIMS for viral injection
-        contents.
+        Plan of the SLIMS fetches needed for viral injection contents.
         Parameters
         ----------
         start_date_greater_than_or_equal : datetime | None
           The start date to filter the records by.
         end_date_less_than_or_equal : datetime | None
             The end date to filter the records by.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
+
         Returns
         -------
-        Tuple[DiGraph, List[str]]
-          A directed graph of the SLIMS records and a list of the root nodes.
+        List[ForeignTableFetch]
 
         """
-        content_type_rows = self.session.fetch(
-            table="ContentType",
-            criteria=equals("cntp_name", "Viral Injection"),
-        )
         date_criteria = self._get_date_criteria(
             start_date=start_date_greater_than_or_equal,
             end_date=end_date_less_than_or_equal,
             field_name="cntn_createdOn",
         )
-        viral_injection_content_rows = self.get_rows_from_foreign_table(
-            input_table="ContentType",
-            input_rows=content_type_rows,
-            input_table_cols=["cntp_pk"],
-            foreign_table="Content",
-            foreign_table_col="cntn_fk_contentType",
-            extra_criteria=date_criteria,
-        )
-        G = DiGraph()
-        root_nodes = []
-        for row in viral_injection_content_rows:
-            G.add_node(
-                f"{row.table_name()}.{row.pk()}",
-                row=row,
-                pk=row.pk(),
-                table_name=row.table_name(),
-            )
-            root_nodes.append(f"{row.table_name()}.{row.pk()}")
-
-        # content relation: viral injection -> viral materials
-        content_relation_rows = self.get_rows_from_foreign_table(
-            input_table="Content",
-            input_rows=viral_injection_content_rows,
-            input_table_cols=["cntn_pk"],
-            foreign_table="ContentRelation",
-            foreign_table_col="corl_fk_to",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="ContentRelation",
-            input_rows=content_relation_rows,
-            input_table_cols=["corl_fk_from"],
-            foreign_table="Content",
-            foreign_table_col="cntn_pk",
-            graph=G,
-        )
-        _ = self.get_rows_from_foreign_table(
-            input_table="Content",
-            input_rows=viral_injection_content_rows,
-            input_table_cols=["cntn_pk"],
-            foreign_table="Order",
-            foreign_table_col="ordr_cf_fk_viralInjection",
-            graph=G,
-        )
-
-        return G, root_nodes
+        return [
+            ForeignTableFetch(
+                name="ContentType",
+                foreign_table="ContentType",
+                cacheable=True,
+                extra_criteria=equals("cntp_name", "Viral Injection"),
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="ViralInjection",
+                input_name="ContentType",
+                input_table_cols=("cntp_pk",),
+                foreign_table="Content",
+                foreign_table_col="cntn_fk_contentType",
+                extra_criteria=date_criteria,
+                is_root=True,
+                page=page,
+                columns=VIRAL_INJECTION_MAPPER.columns,
+            ),
+            # content relation: viral injection -> viral materials
+            ForeignTableFetch(
+                name="ContentRelation",
+                input_name="ViralInjection",
+                input_table_cols=("cntn_pk",),
+                foreign_table="ContentRelation",
+                foreign_table_col="corl_fk_to",
+                columns=(),
+            ),
+            ForeignTableFetch(
+                name="ViralMaterial",
+                input_name="ContentRelation",
+                input_table_cols=("corl_fk_from",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+                columns=(
+                    "cntn_fk_contentType",
+                    *VIRAL_MATERIAL_MAPPER.columns,
+                ),
+            ),
+            ForeignTableFetch(
+                name="Order",
+                input_name="ViralInjection",
+                input_table_cols=("cntn_pk",),
+                foreign_table="Order",
+                foreign_table_col="ordr_cf_fk_viralInjection",
+                columns=ORDER_MAPPER.columns,
+            ),
+        ]
 
     def get_viral_injection_info_from_slims(
         self,
@@ -383,19 +304,17 @@ class ViralInjectionSessionHandler(SlimsTableHandler):
         end_date_less_than_or_equal: Optional[str] = None,
     ) -> List[SlimsViralInjectionData]:
         """
-        Get Viral injection data from SLIMS.
+        Get Viral Injection data from SLIMS. Sync version of get_data_async.
 
         Parameters
         ----------
-        subject_id : Optional[str]
-            The subject ID to filter the data by.
-            If None, all subjects are included.
-        start_date_greater_than_or_equal : Optional[str]
-            The start date to filter the data by, in ISO format (YYYY-MM-DD).
-            If None, no start date filter is applied.
-        end_date_less_than_or_equal : Optional[str]
-            The end date to filter the data by, in ISO format (YYYY-MM-DD).
-            If None, no end date filter is applied.
+        subject_id : str | None
+          Labtracks ID of mouse. If None, then no filter will be performed.
+        start_date_greater_than_or_equal : str | None
+          Filter records that were created on or after this datetime.
+        end_date_less_than_or_equal : str | None
+          Filter records that were created on or before this datetime.
+
         Returns
         -------
         List[SlimsViralInjectionData]
@@ -406,18 +325,9 @@ class ViralInjectionSessionHandler(SlimsTableHandler):
           The subject_id cannot be an empty string.
 
         """
-        if subject_id is not None and len(subject_id) == 0:
-            raise ValueError("subject_id must not be empty!")
-
-        G, root_nodes = self._get_graph(
-            start_date_greater_than_or_equal=self.parse_date(
-                start_date_greater_than_or_equal
-            ),
-            end_date_less_than_or_equal=self.parse_date(
-                end_date_less_than_or_equal
-            ),
-        )
-        vm_data = self._parse_graph(
-            g=G, root_nodes=root_nodes, subject_id=subject_id
+        return self._run_sync(
+            self.get_data_async,
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
         )
-        return vm_data
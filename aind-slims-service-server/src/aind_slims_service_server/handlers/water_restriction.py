@@ -3,123 +3,146 @@ Module to handle fetching water restriction data from slims
 and parsing it to a model.
 """
 
-from datetime import datetime, timezone
-from decimal import Decimal
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Iterator, List, Optional, Union
 
-from networkx import DiGraph, descendants
 from slims.criteria import conjunction, equals
 
-from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.handlers.field_map import (
+    FieldMap,
+    RecordMapper,
+    to_datetime,
+    to_decimal,
+)
+from aind_slims_service_server.handlers.table_handler import (
+    ForeignTableFetch,
+    RecordGraph,
+    RootPage,
+    RootSpec,
+    SlimsTableHandler,
+    SubjectLookup,
+)
 from aind_slims_service_server.models import SlimsWaterRestrictionData
 
+CONTENT_EVENT_MAPPER = RecordMapper(
+    SlimsWaterRestrictionData,
+    [
+        FieldMap(
+            "content_event_created_on",
+            "cnvn_createdOn",
+            converter=to_datetime,
+        ),
+        FieldMap("start_date", "cnvn_cf_startDate", converter=to_datetime),
+        FieldMap("end_date", "cnvn_cf_endDate", converter=to_datetime),
+        FieldMap("assigned_by", "cnvn_cf_assignedBy"),
+        FieldMap(
+            "target_weight_fraction",
+            "cnvn_cf_targetWeightFraction",
+            converter=to_decimal,
+        ),
+    ],
+)
+
+CONTENT_MAPPER = RecordMapper(
+    SlimsWaterRestrictionData,
+    [
+        FieldMap("subject_id", "cntn_barCode"),
+        FieldMap(
+            "baseline_weight", "cntn_cf_baselineWeight", converter=to_decimal
+        ),
+        FieldMap("weight_unit", "cntn_cf_baselineWeight", "unit"),
+    ],
+)
+
 
 class WaterRestrictionSessionHandler(SlimsTableHandler):
     """Class to handle getting Water Restriction info from SLIMS."""
 
-    def _parse_graph(
+    ROOT = RootSpec("cnvn_createdOn", "cnvn_pk", "content_event_created_on")
+
+    def _iter_parse_graph(
         self,
-        g: DiGraph,
-        root_nodes: List[str],
+        g: RecordGraph,
+        root_nodes: List[int],
         subject_id: Optional[str] = None,
-    ) -> List[SlimsWaterRestrictionData]:
+    ) -> Iterator[SlimsWaterRestrictionData]:
         """
-        Parses the graph object into a list of pydantic models.
+        Parses the graph object into pydantic models, one root node at a
+        time.
         Parameters
         ----------
-        g : DiGraph
+        g : RecordGraph
           Graph of the SLIMS records.
-        root_nodes : List[str]
+        root_nodes : List[int]
           List of root nodes to pull descendants from.
 
         Returns
         -------
-        List[SlimsSpimData]
+        Iterator[SlimsWaterRestrictionData]
 
         """
-        wr_data_list = []
-        for node in root_nodes:
-            wr_data = SlimsWaterRestrictionData()
-            row = g.nodes[node]["row"]
-            content_event_created_on_ts = self.get_attr_or_none(
-                row, "cnvn_createdOn"
-            )
-            wr_data.content_event_created_on = (
-                None
-                if content_event_created_on_ts is None
-                else datetime.fromtimestamp(
-                    content_event_created_on_ts / 1000, tz=timezone.utc
-                )
-            )
-            start_date_ts = self.get_attr_or_none(row, "cnvn_cf_startDate")
-            wr_data.start_date = (
-                None
-                if start_date_ts is None
-                else datetime.fromtimestamp(
-                    start_date_ts / 1000, tz=timezone.utc
-                )
-            )
-            end_date_ts = self.get_attr_or_none(row, "cnvn_cf_endDate")
-            wr_data.end_date = (
-                None
-                if end_date_ts is None
-                else datetime.fromtimestamp(
-                    end_date_ts / 1000, tz=timezone.utc
-                )
-            )
-            wr_data.assigned_by = self.get_attr_or_none(
-                row, "cnvn_cf_assignedBy"
-            )
-            target_weight_fraction = self.get_attr_or_none(
-                row, "cnvn_cf_targetWeightFraction"
-            )
-            wr_data.target_weight_fraction = (
-                None
-                if target_weight_fraction is None
-                else Decimal(str(target_weight_fraction))
-            )
-            node_des = descendants(g, node)
+        for node, node_des in g.iter_descendants(root_nodes):
+            wr_data = CONTENT_EVENT_MAPPER.create(g.row(node))
             for n in node_des:
-                table_name = g.nodes[n]["table_name"]
-                row = g.nodes[n]["row"]
-                if table_name == "Content":
-                    wr_data.subject_id = self.get_attr_or_none(
-                        row, "cntn_barCode"
-                    )
-                    baseline_weight = self.get_attr_or_none(
-                        row, "cntn_cf_baselineWeight"
-                    )
-                    wr_data.baseline_weight = (
-                        None
-                        if baseline_weight is None
-                        else Decimal(str(baseline_weight))
-                    )
-                    wr_data.weight_unit = self.get_attr_or_none(
-                        row, "cntn_cf_baselineWeight", "unit"
-                    )
+                if g.table_name(n) == "Content":
+                    CONTENT_MAPPER.update(wr_data, g.row(n))
             if subject_id is None or subject_id == wr_data.subject_id:
-                wr_data_list.append(wr_data)
-        return wr_data_list
+                yield wr_data
+
+    def _get_lookup(
+        self, subject_id: Optional[Union[str, List[str]]]
+    ) -> Optional[SubjectLookup]:
+        """
+        Lookup of the content events of a subject, or of any subject of a
+        batch. Starts from the Content row of the subject instead of every
+        water restriction event.
+        Parameters
+        ----------
+        subject_id : str | List[str] | None
+
+        Returns
+        -------
+        SubjectLookup | None
+          None if subject_id is None.
+
+        """
+        if subject_id is None:
+            return None
+        return SubjectLookup(
+            plan=[
+                ForeignTableFetch(
+                    name="Content",
+                    foreign_table="Content",
+                    key_chunks=self._get_subject_criteria(
+                        "cntn_barCode", subject_id
+                    ),
+                )
+            ],
+            key_fetch="Content",
+            key_col="cntn_pk",
+            root_col="cnvn_fk_content",
+        )
 
-    def _get_graph(
+    def _get_fetch_plan(
         self,
         start_date_greater_than_or_equal: Optional[datetime] = None,
         end_date_less_than_or_equal: Optional[datetime] = None,
-    ) -> Tuple[DiGraph, List[str]]:
+        page: Optional[RootPage] = None,
+    ) -> List[ForeignTableFetch]:
         """
-        Generate a Graph of the records from SLIMS for water restriction
-        content events.
+        Plan of the SLIMS fetches needed for water restriction content events.
         Parameters
         ----------
         start_date_greater_than_or_equal : datetime | None
           Filter content events that were created on or after this datetime.
         end_date_less_than_or_equal : datetime | None
           Filter content events that were created on or before this datetime.
+        page : RootPage | None
+          If set, only this page of root rows is fetched.
 
         Returns
         -------
-        Tuple[DiGraph, List[str]]
-          A directed graph of the SLIMS records and a list of the root nodes.
+        List[ForeignTableFetch]
 
         """
         date_criteria = self._get_date_criteria(
@@ -128,38 +151,31 @@ class WaterRestrictionSessionHandler(SlimsTableHandler):
             field_name="cnvn_createdOn",
         )
         if date_criteria:
-            content_event_rows = self.session.fetch(
-                table="ContentEvent",
-                criteria=conjunction()
+            content_event_criteria = (
+                conjunction()
                 .add(equals("cnvt_name", "Water Restriction"))
-                .add(date_criteria),
+                .add(date_criteria)
             )
         else:
-            content_event_rows = self.session.fetch(
-                table="ContentEvent",
-                criteria=equals("cnvt_name", "Water Restriction"),
-            )
-        G = DiGraph()
-        root_nodes = []
-        for row in content_event_rows:
-            G.add_node(
-                f"{row.table_name()}.{row.pk()}",
-                row=row,
-                pk=row.pk(),
-                table_name=row.table_name(),
-            )
-            root_nodes.append(f"{row.table_name()}.{row.pk()}")
-
-        _ = self.get_rows_from_foreign_table(
-            input_table="ContentEvent",
-            input_rows=content_event_rows,
-            input_table_cols=["cnvn_fk_content"],
-            foreign_table="Content",
-            foreign_table_col="cntn_pk",
-            graph=G,
-        )
-
-        return G, root_nodes
+            content_event_criteria = equals("cnvt_name", "Water Restriction")
+        return [
+            ForeignTableFetch(
+                name="ContentEvent",
+                foreign_table="ContentEvent",
+                extra_criteria=content_event_criteria,
+                is_root=True,
+                page=page,
+                columns=CONTENT_EVENT_MAPPER.columns,
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="ContentEvent",
+                input_table_cols=("cnvn_fk_content",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+                columns=CONTENT_MAPPER.columns,
+            ),
+        ]
 
     def get_water_restriction_data_from_slims(
         self,
@@ -168,19 +184,20 @@ class WaterRestrictionSessionHandler(SlimsTableHandler):
         end_date_less_than_or_equal: Optional[str] = None,
     ) -> List[SlimsWaterRestrictionData]:
         """
-        Get Water Restriction data from SLIMS.
+        Get Water Restriction data from SLIMS. Sync version of get_data_async.
 
         Parameters
         ----------
         subject_id : str | None
-          Labtracks ID of mouse.
+          Labtracks ID of mouse. If None, then no filter will be performed.
         start_date_greater_than_or_equal : str | None
-          Filter content events that were created on or after this datetime.
+          Filter records that were created on or after this datetime.
         end_date_less_than_or_equal : str | None
-          Filter content events that were created on or before this datetime.
+          Filter records that were created on or before this datetime.
+
         Returns
         -------
-        List[SlimsSlimsWaterRestrictionDataimData]
+        List[SlimsWaterRestrictionData]
 
         Raises
         ------
@@ -188,28 +205,9 @@ class WaterRestrictionSessionHandler(SlimsTableHandler):
           The subject_id cannot be an empty string.
 
         """
-
-        if subject_id is not None and len(subject_id) == 0:
-            raise ValueError("subject_id must not be empty!")
-
-        G, root_nodes = self._get_graph(
-            start_date_greater_than_or_equal=self.parse_date(
-                start_date_greater_than_or_equal
-            ),
-            end_date_less_than_or_equal=self.parse_date(
-                end_date_less_than_or_equal
-            ),
+        return self._run_sync(
+            self.get_data_async,
+            subject_id,
+            start_date_greater_than_or_equal,
+            end_date_less_than_or_equal,
         )
-        wr_data = self._parse_graph(
-            g=G, root_nodes=root_nodes, subject_id=subject_id
-        )
-
-        wr_data.sort(
-            key=lambda m: (
-                m.content_event_created_on is None,
-                m.content_event_created_on,
-            ),
-            reverse=True,
-        )
-
-        return wr_data
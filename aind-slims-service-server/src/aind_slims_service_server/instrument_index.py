@@ -0,0 +1,183 @@
+"""Module to index the names of the instrument records in SLIMS"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from slims.criteria import greater_than_or_equal
+
+from aind_slims_service_server.async_session import AsyncSlims, RawRecord
+from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.session import settings
+
+# Columns of the ReferenceDataRecords read by the index
+INDEX_COLUMNS = (
+    "rdrc_name",
+    "rdrc_cf_instrumentJsonAttachment",
+    "attachmentCount",
+    "rdrc_modifiedOn",
+)
+
+
+class InstrumentEntry(NamedTuple):
+    """Name and instrument json attachment of a ReferenceDataRecord."""
+
+    name: str
+    attachment_pk: int
+
+
+class InstrumentIndex:
+    """
+    In-process index of the ReferenceDataRecords that have an instrument
+    json attachment, keyed by record pk. Instrument queries are answered
+    from the index, so SLIMS does not scan the ReferenceDataRecord table for
+    every partial match. The index is synced with the rows modified since
+    the last sync, paged by (rdrc_modifiedOn, pk). Records deleted in SLIMS
+    are not returned by an incremental sync, so they stay in the index until
+    the service restarts.
+    """
+
+    def __init__(self):
+        """Class constructor."""
+        self.ready = False
+        self._lock = threading.Lock()
+        self._entries: Dict[int, InstrumentEntry] = {}
+        self._modified_on: Optional[int] = None
+
+    def __len__(self) -> int:
+        """Number of indexed records."""
+        return len(self._entries)
+
+    def update(self, rows: List[RawRecord]) -> None:
+        """
+        Add, replace, or remove the entries of modified rows. Rows without
+        a name or an instrument json attachment are removed.
+        Parameters
+        ----------
+        rows : List[RawRecord]
+          ReferenceDataRecords with the INDEX_COLUMNS.
+        """
+        get_attr_or_none = SlimsTableHandler.get_attr_or_none
+        with self._lock:
+            for row in rows:
+                name = get_attr_or_none(row, "rdrc_name")
+                attachment_pk = get_attr_or_none(
+                    row, "rdrc_cf_instrumentJsonAttachment"
+                )
+                count = get_attr_or_none(row, "attachmentCount")
+                if (
+                    name is None
+                    or attachment_pk is None
+                    or (count is not None and count < 1)
+                ):
+                    self._entries.pop(row.pk(), None)
+                else:
+                    self._entries[row.pk()] = InstrumentEntry(
+                        name, attachment_pk
+                    )
+                modified_on = get_attr_or_none(row, "rdrc_modifiedOn")
+                if modified_on is not None and (
+                    self._modified_on is None
+                    or modified_on > self._modified_on
+                ):
+                    self._modified_on = modified_on
+
+    def search(self, input_id: str, partial_match: bool) -> List[int]:
+        """
+        Attachment pks of the records whose name matches, ordered by
+        record pk.
+        Parameters
+        ----------
+        input_id : str
+        partial_match : bool
+          If True, names that contain input_id, ignoring case, like the
+          contains criterion. Otherwise, names equal to input_id.
+
+        Returns
+        -------
+        List[int]
+
+        """
+        with self._lock:
+            entries = sorted(self._entries.items())
+        if partial_match:
+            needle = input_id.lower()
+            return [
+                e.attachment_pk for _, e in entries if needle in e.name.lower()
+            ]
+        return [e.attachment_pk for _, e in entries if e.name == input_id]
+
+    async def sync(self, session: AsyncSlims, page_size: int) -> int:
+        """
+        Pull the ReferenceDataRecords modified since the last sync. The rows
+        are paged by key rather than by offset, so that a record modified
+        during the sync cannot shift the records after it past a page. The
+        index is marked ready after the first complete sync.
+        Parameters
+        ----------
+        session : AsyncSlims
+        page_size : int
+          Number of rows requested per page.
+
+        Returns
+        -------
+        int
+          Number of rows pulled.
+
+        """
+        # Rows modified in the same millisecond as the latest indexed row
+        # may not have been pulled yet, so the bound is inclusive.
+        criteria = (
+            None
+            if self._modified_on is None
+            else greater_than_or_equal("rdrc_modifiedOn", self._modified_on)
+        )
+        n_rows = 0
+        while True:
+            rows = await session.fetch_raw(
+                table="ReferenceDataRecord",
+                criteria=criteria,
+                columns=INDEX_COLUMNS,
+                sort=["rdrc_modifiedOn", "rdrc_pk"],
+                start=0,
+                end=page_size,
+            )
+            self.update(rows)
+            n_rows += len(rows)
+            if len(rows) < page_size:
+                self.ready = True
+                return n_rows
+            criteria = SlimsTableHandler.get_after_criteria(
+                "rdrc_modifiedOn",
+                "rdrc_pk",
+                SlimsTableHandler.get_attr_or_none(
+                    rows[-1], "rdrc_modifiedOn"
+                ),
+                rows[-1].pk(),
+            )
+
+    async def run(
+        self, session: AsyncSlims, poll_seconds: float, page_size: int
+    ) -> None:
+        """
+        Sync the index every poll_seconds until cancelled. A failed sync is
+        logged and retried on the next poll.
+        Parameters
+        ----------
+        session : AsyncSlims
+        poll_seconds : float
+        page_size : int
+        """
+        while True:
+            try:
+                n_rows = await self.sync(session, page_size)
+                logging.debug(f"Synced {n_rows} rows into instrument index.")
+            except Exception as e:
+                logging.warning(
+                    f"An exception occurred syncing instrument index: {e}"
+                )
+            await asyncio.sleep(poll_seconds)
+
+
+instrument_index = InstrumentIndex() if settings.instrument_index else None
@@ -1,14 +1,20 @@
 """Starts and runs a FastAPI Server"""
 
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRoute
 
 from aind_slims_service_server import __version__ as service_version
-from aind_slims_service_server.route import router
+from aind_slims_service_server.async_session import async_session
+from aind_slims_service_server.instrument_index import instrument_index
+from aind_slims_service_server.mirror import mirror
+from aind_slims_service_server.route import NEXT_CURSOR_HEADER, router
+from aind_slims_service_server.session import settings
 
 # The log level can be set by adding an environment variable before launch.
 log_level = os.getenv("LOG_LEVEL", "INFO")
@@ -21,20 +27,57 @@ Service to pull data from SLIMS.
 
 """
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """
+    Start syncing the SLIMS mirror and the instrument index if they are
+    configured, and close the SLIMS connections when the app shuts down.
+    """
+    sync_task = None
+    index_task = None
+    if mirror is not None:
+        sync_task = asyncio.create_task(
+            mirror.run(
+                async_session,
+                poll_seconds=settings.mirror_poll_seconds,
+                page_size=settings.mirror_page_size,
+                reconcile_seconds=settings.mirror_reconcile_seconds,
+            )
+        )
+    if instrument_index is not None:
+        index_task = asyncio.create_task(
+            instrument_index.run(
+                async_session,
+                poll_seconds=settings.instrument_index_poll_seconds,
+                page_size=settings.instrument_index_page_size,
+            )
+        )
+    yield
+    if sync_task is not None:
+        sync_task.cancel()
+        mirror.close()
+    if index_task is not None:
+        index_task.cancel()
+    await async_session.aclose()
+
+
 # noinspection PyTypeChecker
 app = FastAPI(
     title="aind-slims-service",
     description=description,
     summary="Serves data from SLIMS.",
     version=service_version,
+    lifespan=lifespan,
 )
 
 # noinspection PyTypeChecker
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["GET"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 app.include_router(router)
 
@@ -0,0 +1,752 @@
+"""Module to mirror the SLIMS tables the service reads into SQLite"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import orjson
+from slims.criteria import (
+    Criterion,
+    Junction,
+    greater_than,
+    greater_than_or_equal,
+    is_one_of,
+)
+from slims.internal import Record
+
+from aind_slims_service_server.async_session import (
+    AsyncSlims,
+    RawRecord,
+    async_session,
+)
+from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.models import MirrorMetrics
+from aind_slims_service_server.session import settings
+
+# Tables read by the handlers mapped to their column prefix. The prefix is
+# used to find the {prefix}_modifiedOn column the sync polls on.
+MIRROR_TABLES: Dict[str, str] = {
+    "Content": "cntn",
+    "ContentEvent": "cnvn",
+    "ContentRelation": "corl",
+    "ContentType": "cntp",
+    "ExperimentRun": "xprn",
+    "ExperimentRunStep": "xprs",
+    "ExperimentRunStepContent": "xrsc",
+    "ExperimentTemplate": "xptm",
+    "Order": "ordr",
+    "OrderContent": "rdcn",
+    "ReferenceDataRecord": "rdrc",
+    "Result": "rslt",
+    "SOP": "stop",
+}
+
+# Columns other than keys that the handlers' plans and lookups filter on
+# with equals or inSet. They are indexed like the key columns, so that
+# these fetches do not load and parse the whole table.
+INDEXED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "Content": ("cntn_barCode", "cntn_id"),
+    "ContentEvent": ("cnvt_name",),
+    "ContentType": ("cntp_name",),
+    "ExperimentTemplate": ("xptm_name",),
+    "Result": ("rslt_cf_sessionName",),
+}
+
+
+def _text(value: Any) -> str:
+    """Lower-cased string of a value for case-insensitive comparisons."""
+    return str(value).lower()
+
+
+# Criterion operators mapped to a check of a single column value
+_OPERATORS: Dict[str, Callable[[Any, Dict[str, Any]], bool]] = {
+    "equals": lambda v, c: v == c["value"],
+    "iEquals": lambda v, c: _text(v) == _text(c["value"]),
+    "iNotEqual": lambda v, c: _text(v) != _text(c["value"]),
+    "iStartsWith": lambda v, c: _text(v).startswith(_text(c["value"])),
+    "iEndsWith": lambda v, c: _text(v).endswith(_text(c["value"])),
+    "iContains": lambda v, c: _text(c["value"]) in _text(v),
+    "inSet": lambda v, c: v in c["value"],
+    "notInSet": lambda v, c: v not in c["value"],
+    "lessThan": lambda v, c: v < c["value"],
+    "greaterThan": lambda v, c: v > c["value"],
+    "lessOrEqual": lambda v, c: v <= c["value"],
+    "greaterOrEqual": lambda v, c: v >= c["value"],
+    "betweenInclusive": lambda v, c: c["start"] <= v <= c["end"],
+}
+
+# Bumped when the indexed columns change, so that the key index of an
+# existing mirror file is rebuilt.
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    table_name TEXT NOT NULL,
+    pk INTEGER NOT NULL,
+    modified_on INTEGER,
+    entity TEXT NOT NULL,
+    PRIMARY KEY (table_name, pk)
+);
+CREATE TABLE IF NOT EXISTS record_keys (
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    value NOT NULL,
+    pk INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS record_keys_value
+    ON record_keys (table_name, column_name, value);
+CREATE INDEX IF NOT EXISTS record_keys_pk ON record_keys (table_name, pk);
+"""
+
+
+class SlimsMirror:
+    """
+    Local SQLite copy of SLIMS tables. Rows are stored as the raw entities
+    returned by SLIMS and their key columns (*_pk and *_fk_*) and
+    INDEXED_COLUMNS are indexed, so the fetches in a handler's plan become
+    indexed lookups. The mirror exposes the same fetch methods as AsyncSlims
+    and can be passed to the handlers as their session. The SQLite queries
+    and the parsing of entities run in worker threads, off the event loop.
+    Rows deleted in SLIMS are only removed by reconcile, which compares the
+    primary keys of each table with SLIMS.
+    """
+
+    def __init__(
+        self, path: str, tables: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Class constructor.
+        Parameters
+        ----------
+        path : str
+          Path of the SQLite database file, or :memory:.
+        tables : Dict[str, str] | None
+          Tables to sync mapped to their column prefix. Defaults to
+          MIRROR_TABLES.
+        """
+        self.path = path
+        self.tables = MIRROR_TABLES if tables is None else tables
+        self.ready = False
+        self.synced_at: Optional[datetime] = None
+        self.reconciled_at: Optional[datetime] = None
+        self._rows_deleted = 0
+        self._rows_restored = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """
+        Create the tables of the mirror. The key index of a mirror written
+        with an older _SCHEMA_VERSION is rebuilt from the mirrored entities.
+        """
+        version = self._connection.execute("PRAGMA user_version").fetchone()
+        if version[0] == _SCHEMA_VERSION:
+            self._connection.executescript(_SCHEMA)
+            return
+        self._connection.executescript(
+            "DROP TABLE IF EXISTS record_keys;" + _SCHEMA
+        )
+        with self._connection:
+            for table, pk, entity in self._connection.execute(
+                "SELECT table_name, pk, entity FROM records"
+            ).fetchall():
+                self._connection.executemany(
+                    "INSERT INTO record_keys VALUES (?, ?, ?, ?)",
+                    self._get_keys(table, pk, orjson.loads(entity)),
+                )
+        self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _is_key_column(column_name: str) -> bool:
+        """Check whether a column holds primary or foreign keys."""
+        return column_name.endswith("_pk") or "_fk_" in column_name
+
+    def _is_indexed_column(self, table: str, column_name: str) -> bool:
+        """Check whether the values of a column are in the key index."""
+        return self._is_key_column(column_name) or (
+            column_name in INDEXED_COLUMNS.get(table, ())
+        )
+
+    def _get_values(
+        self, table: str, entity: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Column values of a SLIMS entity keyed by column name. The primary key
+        column is filled in from the entity pk if it was not returned.
+        """
+        values = {c["name"]: c.get("value") for c in entity["columns"]}
+        if table in self.tables:
+            values.setdefault(f"{self.tables[table]}_pk", entity["pk"])
+        return values
+
+    def _get_keys(
+        self, table: str, pk: int, entity: Dict[str, Any]
+    ) -> List[Tuple[str, str, Any, int]]:
+        """Rows of the key index for the indexed columns of an entity."""
+        keys = []
+        for name, value in self._get_values(table, entity).items():
+            if not self._is_indexed_column(table, name) or value is None:
+                continue
+            for key in value if isinstance(value, list) else [value]:
+                keys.append((table, name, key, pk))
+        return keys
+
+    def upsert(self, table: str, entities: List[Dict[str, Any]]) -> None:
+        """
+        Insert or replace rows of a table.
+        Parameters
+        ----------
+        table : str
+          Name of the SLIMS table the entities were fetched from.
+        entities : List[Dict[str, Any]]
+          Entities as returned by the SLIMS REST API.
+        """
+        modified_on_col = f"{self.tables.get(table)}_modifiedOn"
+        with self._lock, self._connection:
+            for entity in entities:
+                pk = entity["pk"]
+                values = self._get_values(table, entity)
+                self._connection.execute(
+                    "DELETE FROM record_keys WHERE table_name = ? AND pk = ?",
+                    (table, pk),
+                )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                    (
+                        table,
+                        pk,
+                        values.get(modified_on_col),
+                        json.dumps(entity),
+                    ),
+                )
+                self._connection.executemany(
+                    "INSERT INTO record_keys VALUES (?, ?, ?, ?)",
+                    self._get_keys(table, pk, entity),
+                )
+
+    def delete(self, table: str, pks: Collection[int]) -> None:
+        """
+        Delete rows of a table.
+        Parameters
+        ----------
+        table : str
+        pks : Collection[int]
+          Primary keys of the rows to delete.
+        """
+        rows = [(table, pk) for pk in pks]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM record_keys WHERE table_name = ? AND pk = ?", rows
+            )
+            self._connection.executemany(
+                "DELETE FROM records WHERE table_name = ? AND pk = ?", rows
+            )
+
+    def get_pks(self, table: str) -> Set[int]:
+        """Primary keys of the mirrored rows of a table."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT pk FROM records WHERE table_name = ?", (table,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_modified_on(self, table: str) -> Optional[int]:
+        """Latest modifiedOn timestamp mirrored for a table."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(modified_on) FROM records WHERE table_name = ?",
+                (table,),
+            ).fetchone()
+        return row[0]
+
+    def _get_candidate_pks(
+        self, table: str, criteria: Dict[str, Any]
+    ) -> Optional[Set[int]]:
+        """
+        Use the key index to narrow down the rows that can match criteria.
+        Parameters
+        ----------
+        table : str
+        criteria : Dict[str, Any]
+
+        Returns
+        -------
+        Set[int] | None
+          None if the index cannot be used and the table must be scanned.
+
+        """
+        operator = criteria["operator"]
+        if operator == "and":
+            candidates = None
+            for member in criteria["criteria"]:
+                member_pks = self._get_candidate_pks(table, member)
+                if member_pks is not None:
+                    candidates = (
+                        member_pks
+                        if candidates is None
+                        else candidates & member_pks
+                    )
+            return candidates
+        if operator not in (
+            "equals",
+            "inSet",
+        ) or not self._is_indexed_column(table, criteria["fieldName"]):
+            return None
+        keys = criteria["value"]
+        keys = keys if isinstance(keys, list) else [keys]
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT pk FROM record_keys WHERE table_name = ? "
+                f"AND column_name = ? AND value IN ({placeholders})",
+                [table, criteria["fieldName"]] + keys,
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _get_entities(
+        self, table: str, pks: Optional[Set[int]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Load the entities of a table, optionally restricted to pks. Entities
+        are returned in the order they were last written to the mirror.
+        """
+        with self._lock:
+            if pks is None:
+                rows = self._connection.execute(
+                    "SELECT rowid, entity FROM records WHERE table_name = ?",
+                    (table,),
+                ).fetchall()
+            else:
+                pk_list = sorted(pks)
+                rows = []
+                for start in range(0, len(pk_list), 500):
+                    end = start + 500
+                    chunk = pk_list[start:end]
+                    placeholders = ", ".join("?" * len(chunk))
+                    rows.extend(
+                        self._connection.execute(
+                            "SELECT rowid, entity FROM records "
+                            f"WHERE table_name = ? AND pk IN ({placeholders})",
+                            [table] + chunk,
+                        ).fetchall()
+                    )
+        return [orjson.loads(row[1]) for row in sorted(rows)]
+
+    @classmethod
+    def matches(cls, values: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
+        """
+        Evaluate SLIMS criteria against the column values of a row. Like in
+        SLIMS, a list column matches if any of its items matches.
+        Parameters
+        ----------
+        values : Dict[str, Any]
+          Column values of a row keyed by column name.
+        criteria : Dict[str, Any]
+          Output of Criterion.to_dict
+
+        Returns
+        -------
+        bool
+
+        Raises
+        ------
+        ValueError
+          If the criteria use an operator the mirror does not support.
+
+        """
+        operator = criteria["operator"]
+        if operator in ("and", "or", "not"):
+            results = [cls.matches(values, c) for c in criteria["criteria"]]
+            if operator == "and":
+                return all(results)
+            return any(results) if operator == "or" else not any(results)
+        value = values.get(criteria["fieldName"])
+        if operator in ("isNull", "notNull"):
+            is_null = value is None or value == []
+            return is_null if operator == "isNull" else not is_null
+        if operator not in _OPERATORS:
+            raise ValueError(f"Unsupported criteria operator {operator}!")
+        if value is None:
+            return False
+        items = value if isinstance(value, list) else [value]
+        return any(_OPERATORS[operator](item, criteria) for item in items)
+
+    def _sort_entities(
+        self, table: str, entities: List[Dict[str, Any]], sort: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Sort entities like SLIMS does. A column name prefixed with "-" is
+        sorted in descending order. Rows without a value come first in
+        descending order and last in ascending order.
+        Parameters
+        ----------
+        table : str
+        entities : List[Dict[str, Any]]
+        sort : List[str]
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+
+        """
+        for sort_col in reversed(sort):
+            column = sort_col.lstrip("-")
+
+            def sort_key(entity: Dict[str, Any]) -> Tuple[bool, Any]:
+                """Sort key of an entity."""
+                value = self._get_values(table, entity).get(column)
+                return value is None, value
+
+            entities = sorted(
+                entities, key=sort_key, reverse=sort_col.startswith("-")
+            )
+        return entities
+
+    def _fetch_entities(
+        self,
+        table: str,
+        criteria: Optional[Union[Criterion, Junction]],
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Mirrored entities matching criteria. See fetch_records."""
+        criteria_dict = None if criteria is None else criteria.to_dict()
+        pks = (
+            None
+            if criteria_dict is None
+            else self._get_candidate_pks(table, criteria_dict)
+        )
+        entities = [
+            entity
+            for entity in self._get_entities(table, pks)
+            if criteria_dict is None
+            or self.matches(self._get_values(table, entity), criteria_dict)
+        ]
+        if sort:
+            entities = self._sort_entities(table, entities, sort)
+        return entities[start:end]
+
+    def fetch_records(
+        self,
+        table: str,
+        criteria: Optional[Union[Criterion, Junction]],
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Record]:
+        """
+        Fetch mirrored rows matching criteria.
+        Parameters
+        ----------
+        table : str
+        criteria : Criterion | Junction | None
+        sort : List[str] | None
+          Columns to sort by. Prefix a column with "-" to sort descending.
+        start : int | None
+          Index of the first row to return.
+        end : int | None
+          Index after the last row to return.
+
+        Returns
+        -------
+        List[Record]
+
+        """
+        # noinspection PyTypeChecker
+        return [
+            Record(json_entity=entity, slims_api=None)
+            for entity in self._fetch_entities(
+                table, criteria, sort, start, end
+            )
+        ]
+
+    def _fetch_raw_records(
+        self,
+        table: str,
+        criteria: Optional[Union[Criterion, Junction]],
+        columns: Optional[Collection[str]] = None,
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[RawRecord]:
+        """Same as fetch_records, but returns RawRecords. See fetch_raw."""
+        return [
+            RawRecord.from_entity(entity, columns)
+            for entity in self._fetch_entities(
+                table, criteria, sort, start, end
+            )
+        ]
+
+    async def fetch(
+        self,
+        table: str,
+        criteria: Optional[Union[Criterion, Junction]],
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Record]:
+        """
+        Same as fetch_records, run in a worker thread. Matches the signature
+        of AsyncSlims.
+        """
+        return await asyncio.to_thread(
+            self.fetch_records, table, criteria, sort, start, end
+        )
+
+    async def fetch_raw(
+        self,
+        table: str,
+        criteria: Optional[Union[Criterion, Junction]],
+        columns: Optional[Collection[str]] = None,
+        sort: Optional[List[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[RawRecord]:
+        """
+        Same as fetch, but returns RawRecords holding only the given columns.
+        Matches the signature of AsyncSlims.fetch_raw.
+        """
+        return await asyncio.to_thread(
+            self._fetch_raw_records, table, criteria, columns, sort, start, end
+        )
+
+    async def sync_table(
+        self, session: AsyncSlims, table: str, page_size: int
+    ) -> int:
+        """
+        Pull the rows of a table modified since the last sync. The rows are
+        paged by (modifiedOn, pk) rather than by offset, so that a row
+        modified during the sync cannot shift the rows after it past a
+        page. The rows are written to SQLite in a worker thread.
+        Parameters
+        ----------
+        session : AsyncSlims
+        table : str
+        page_size : int
+          Number of rows requested per page.
+
+        Returns
+        -------
+        int
+          Number of rows pulled.
+
+        """
+        modified_on_col = f"{self.tables[table]}_modifiedOn"
+        pk_col = f"{self.tables[table]}_pk"
+        modified_on = await asyncio.to_thread(self.get_modified_on, table)
+        # Rows modified in the same millisecond as the latest mirrored row
+        # may not have been pulled yet, so the bound is inclusive.
+        criteria = (
+            None
+            if modified_on is None
+            else greater_than_or_equal(modified_on_col, modified_on)
+        )
+        n_rows = 0
+        while True:
+            rows = await session.fetch(
+                table=table,
+                criteria=criteria,
+                sort=[modified_on_col, pk_col],
+                start=0,
+                end=page_size,
+            )
+            entities = [row.json_entity for row in rows]
+            await asyncio.to_thread(self.upsert, table, entities)
+            n_rows += len(rows)
+            if len(rows) < page_size:
+                return n_rows
+            last_values = self._get_values(table, entities[-1])
+            criteria = SlimsTableHandler.get_after_criteria(
+                modified_on_col,
+                pk_col,
+                last_values.get(modified_on_col),
+                rows[-1].pk(),
+            )
+
+    async def _get_remote_pks(
+        self, session: AsyncSlims, table: str, page_size: int
+    ) -> Set[int]:
+        """Primary keys of the rows of a table in SLIMS, paged by pk."""
+        pk_col = f"{self.tables[table]}_pk"
+        pks: Set[int] = set()
+        criteria = None
+        while True:
+            rows = await session.fetch_raw(
+                table=table,
+                criteria=criteria,
+                columns=(pk_col,),
+                sort=[pk_col],
+                start=0,
+                end=page_size,
+            )
+            pks.update(row.pk() for row in rows)
+            if len(rows) < page_size:
+                return pks
+            criteria = greater_than(pk_col, rows[-1].pk())
+
+    async def reconcile_table(
+        self, session: AsyncSlims, table: str, page_size: int
+    ) -> Tuple[int, int]:
+        """
+        Compare the primary keys of a table with SLIMS. Rows deleted in SLIMS
+        are deleted from the mirror, and rows missing from the mirror are
+        pulled.
+        Parameters
+        ----------
+        session : AsyncSlims
+        table : str
+        page_size : int
+          Number of rows requested per page.
+
+        Returns
+        -------
+        Tuple[int, int]
+          Number of rows deleted and number of rows pulled.
+
+        """
+        remote_pks = await self._get_remote_pks(session, table, page_size)
+        local_pks = await asyncio.to_thread(self.get_pks, table)
+        deleted_pks = local_pks - remote_pks
+        await asyncio.to_thread(self.delete, table, deleted_pks)
+        missing_pks = sorted(remote_pks - local_pks)
+        pk_col = f"{self.tables[table]}_pk"
+        for start in range(0, len(missing_pks), page_size):
+            end = start + page_size
+            rows = await session.fetch(
+                table=table, criteria=is_one_of(pk_col, missing_pks[start:end])
+            )
+            await asyncio.to_thread(
+                self.upsert, table, [row.json_entity for row in rows]
+            )
+        return len(deleted_pks), len(missing_pks)
+
+    async def reconcile(self, session: AsyncSlims, page_size: int) -> int:
+        """
+        Reconcile every mirrored table with SLIMS. See reconcile_table.
+        Parameters
+        ----------
+        session : AsyncSlims
+        page_size : int
+
+        Returns
+        -------
+        int
+          Number of rows deleted or pulled.
+
+        """
+        n_rows = 0
+        for table in self.tables:
+            n_deleted, n_restored = await self.reconcile_table(
+                session, table, page_size
+            )
+            self._rows_deleted += n_deleted
+            self._rows_restored += n_restored
+            n_rows += n_deleted + n_restored
+        self.reconciled_at = datetime.now(timezone.utc)
+        return n_rows
+
+    async def sync(self, session: AsyncSlims, page_size: int) -> int:
+        """
+        Pull the rows of every mirrored table modified since the last sync.
+        The mirror is marked ready after the first complete sync.
+        Parameters
+        ----------
+        session : AsyncSlims
+        page_size : int
+
+        Returns
+        -------
+        int
+          Number of rows pulled.
+
+        """
+        n_rows = 0
+        for table in self.tables:
+            n_rows += await self.sync_table(session, table, page_size)
+        self.ready = True
+        self.synced_at = datetime.now(timezone.utc)
+        return n_rows
+
+    async def run(
+        self,
+        session: AsyncSlims,
+        poll_seconds: float,
+        page_size: int,
+        reconcile_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Sync the mirror every poll_seconds until cancelled. The mirror is
+        also reconciled after the first sync and then every
+        reconcile_seconds. A failed sync or reconcile is logged and retried
+        on the next poll.
+        Parameters
+        ----------
+        session : AsyncSlims
+        poll_seconds : float
+        page_size : int
+        reconcile_seconds : float | None
+          If None, the mirror is never reconciled.
+        """
+        reconcile_due = time.monotonic()
+        while True:
+            try:
+                n_rows = await self.sync(session, page_size)
+                logging.debug(f"Synced {n_rows} rows into the SLIMS mirror.")
+                if (
+                    reconcile_seconds is not None
+                    and time.monotonic() >= reconcile_due
+                ):
+                    n_rows = await self.reconcile(session, page_size)
+                    reconcile_due = time.monotonic() + reconcile_seconds
+                    logging.debug(f"Reconciled {n_rows} mirrored rows.")
+            except Exception as e:
+                logging.warning(f"An exception occurred syncing mirror: {e}")
+            await asyncio.sleep(poll_seconds)
+
+    def metrics(self) -> MirrorMetrics:
+        """State of the mirror and when it last caught up with SLIMS."""
+        return MirrorMetrics(
+            enabled=True,
+            ready=self.ready,
+            synced_at=self.synced_at,
+            reconciled_at=self.reconciled_at,
+            rows_deleted=self._rows_deleted,
+            rows_restored=self._rows_restored,
+        )
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._connection.close()
+
+
+mirror = (
+    None if settings.mirror_path is None else SlimsMirror(settings.mirror_path)
+)
+
+
+def get_graph_session() -> Union[AsyncSlims, SlimsMirror]:
+    """
+    Return the session the handlers build their graphs from: the mirror once
+    it has synced, otherwise the process-wide async SLIMS session.
+    """
+    if mirror is not None and mirror.ready:
+        return mirror
+    return async_session
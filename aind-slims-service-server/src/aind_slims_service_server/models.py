@@ -1,9 +1,9 @@
 """Models and schema definitions for backend data structures"""
 
 from decimal import Decimal
-from typing import List, Literal, Optional
+from typing import Annotated, List, Literal, Optional
 
-from pydantic import AwareDatetime, BaseModel
+from pydantic import AwareDatetime, BaseModel, Field
 
 from aind_slims_service_server import __version__
 
@@ -15,6 +15,72 @@ class HealthCheck(BaseModel):
     service_version: str = __version__
 
 
+class SingleFlightMetrics(BaseModel):
+    """Metrics describing coalesced endpoint queries."""
+
+    in_flight: int
+    executed: int
+    coalesced: int
+
+
+class SessionPoolMetrics(BaseModel):
+    """Metrics describing the connection pool of the async SLIMS client."""
+
+    max_connections: int
+    max_keepalive_connections: int
+    max_client_requests: int
+    client_requests: int
+    in_flight: int
+    requests: int = 0
+    clients_created: int = 0
+    recycled: int = 0
+    auth_recycled: int = 0
+
+
+class MirrorMetrics(BaseModel):
+    """Metrics describing the state of the local SLIMS mirror."""
+
+    enabled: bool
+    ready: bool = False
+    synced_at: Optional[AwareDatetime] = None
+    reconciled_at: Optional[AwareDatetime] = None
+    rows_deleted: int = 0
+    rows_restored: int = 0
+
+
+class CacheMetrics(BaseModel):
+    """Metrics describing the state of an in-process cache."""
+
+    size: int
+    max_size: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+# Maximum number of subjects in a batch query, so that the is_one_of
+# criterion sent to SLIMS stays bounded
+MAX_BATCH_SUBJECTS = 500
+
+
+class SubjectBatchQuery(BaseModel):
+    """Request body of a list endpoint queried for a batch of subjects."""
+
+    subject_ids: List[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SUBJECTS,
+        description="Labtracks IDs of mice.",
+        examples=[["750108", "744742"]],
+    )
+    start_date_gte: Optional[str] = Field(
+        None, description="Created on or after. (ISO format)"
+    )
+    end_date_lte: Optional[str] = Field(
+        None, description="Created on or before. (ISO format)"
+    )
+
+
 class EcephysStreamModule(BaseModel):
     """Expected Stream module information from SLIMS"""
 
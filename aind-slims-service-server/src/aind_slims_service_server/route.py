@@ -1,10 +1,44 @@
 """Module to handle endpoint responses"""
 
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from operator import attrgetter
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from fastapi import APIRouter, Depends, Path, Query, status
-from slims.slims import Slims
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
+from aind_slims_service_server.async_session import (
+    AsyncSlims,
+    async_session,
+    get_async_session,
+)
+from aind_slims_service_server.cache import (
+    attachment_cache,
+    reference_cache,
+    result_cache,
+)
 from aind_slims_service_server.handlers.ecephys import EcephysSessionHandler
 from aind_slims_service_server.handlers.histology import (
     HistologySessionHandler,
@@ -13,24 +47,424 @@ from aind_slims_service_server.handlers.imaging import ImagingSessionHandler
 from aind_slims_service_server.handlers.instrument import (
     InstrumentSessionHandler,
 )
+from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
 from aind_slims_service_server.handlers.viral_injection import (
     ViralInjectionSessionHandler,
 )
 from aind_slims_service_server.handlers.water_restriction import (
     WaterRestrictionSessionHandler,
 )
+from aind_slims_service_server.instrument_index import instrument_index
+from aind_slims_service_server.mirror import (
+    SlimsMirror,
+    get_graph_session,
+    mirror,
+)
 from aind_slims_service_server.models import (
+    CacheMetrics,
     HealthCheck,
+    MirrorMetrics,
+    SessionPoolMetrics,
+    SingleFlightMetrics,
     SlimsEcephysData,
     SlimsHistologyData,
     SlimsSpimData,
     SlimsViralInjectionData,
     SlimsWaterRestrictionData,
+    SubjectBatchQuery,
 )
-from aind_slims_service_server.session import get_session
+from aind_slims_service_server.session import settings
+from aind_slims_service_server.single_flight import single_flight
 
 router = APIRouter()
 
+T = TypeVar("T")
+H = TypeVar("H", bound=SlimsTableHandler)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_LIMIT = 1000
+LIST_RESPONSES: Dict[Union[int, str], Dict[str, Any]] = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": (
+            "Successful Response. One JSON object per line if streaming was "
+            "requested with stream=true or Accept: application/x-ndjson."
+        ),
+        "headers": {
+            NEXT_CURSOR_HEADER: {
+                "description": (
+                    "Cursor of the next page if a limit was set and there "
+                    "may be more results."
+                ),
+                "schema": {"type": "string"},
+            }
+        },
+    }
+}
+
+# Lists of models are serialized with these adapters instead of FastAPI's
+# response_model, which validates the models again before serializing them.
+# The response_model is still declared on the routes for the OpenAPI schema.
+ECEPHYS_LIST_ADAPTER = TypeAdapter(List[SlimsEcephysData])
+SPIM_LIST_ADAPTER = TypeAdapter(List[SlimsSpimData])
+HISTOLOGY_LIST_ADAPTER = TypeAdapter(List[SlimsHistologyData])
+WATER_RESTRICTION_LIST_ADAPTER = TypeAdapter(List[SlimsWaterRestrictionData])
+VIRAL_INJECTION_LIST_ADAPTER = TypeAdapter(List[SlimsViralInjectionData])
+ECEPHYS_BY_SUBJECT_ADAPTER = TypeAdapter(Dict[str, List[SlimsEcephysData]])
+SPIM_BY_SUBJECT_ADAPTER = TypeAdapter(Dict[str, List[SlimsSpimData]])
+HISTOLOGY_BY_SUBJECT_ADAPTER = TypeAdapter(Dict[str, List[SlimsHistologyData]])
+WATER_RESTRICTION_BY_SUBJECT_ADAPTER = TypeAdapter(
+    Dict[str, List[SlimsWaterRestrictionData]]
+)
+VIRAL_INJECTION_BY_SUBJECT_ADAPTER = TypeAdapter(
+    Dict[str, List[SlimsViralInjectionData]]
+)
+
+
+def get_table_handler(
+    handler_class: Type[H],
+) -> Callable[[Union[AsyncSlims, SlimsMirror]], H]:
+    """
+    Dependency creating a table handler for a request. The handler reads
+    from the mirror once it is ready and from SLIMS otherwise, and shares
+    the fetch settings and reference cache with every other handler.
+    Parameters
+    ----------
+    handler_class : Type[H]
+
+    Returns
+    -------
+    Callable[[AsyncSlims | SlimsMirror], H]
+
+    """
+
+    def create_handler(
+        session: Union[AsyncSlims, SlimsMirror] = Depends(get_graph_session),
+    ) -> H:
+        """Create the handler with the session of the request."""
+        return handler_class(
+            session=session,
+            max_workers=settings.fetch_max_workers,
+            fk_chunk_size=settings.fk_chunk_size,
+            reference_cache=reference_cache,
+        )
+
+    return create_handler
+
+
+def _json_response(
+    adapter: TypeAdapter,
+    models: Union[List[BaseModel], Dict[str, List[BaseModel]]],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Serialize a list of models straight to JSON bytes in a single pass.
+    Parameters
+    ----------
+    adapter : TypeAdapter
+      Adapter of the list of models, or of the lists grouped by subject.
+    models : List[BaseModel] | Dict[str, List[BaseModel]]
+    headers : Dict[str, str] | None
+
+    Returns
+    -------
+    Response
+
+    """
+    return Response(
+        content=adapter.dump_json(models),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _wants_ndjson(request: Request, stream: bool) -> bool:
+    """Check whether the client asked for a newline-delimited response."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_response(
+    models: AsyncIterator[BaseModel],
+) -> StreamingResponse:
+    """
+    Stream models as newline-delimited JSON. The first model is awaited
+    before the response starts, so that errors raised while fetching from
+    SLIMS are returned as usual instead of cutting off a started stream.
+    Parameters
+    ----------
+    models : AsyncIterator[BaseModel]
+
+    Returns
+    -------
+    StreamingResponse
+
+    """
+    first = await anext(models, None)
+
+    async def lines() -> AsyncIterator[str]:
+        """Serialize one model per line."""
+        if first is None:
+            return
+        yield first.model_dump_json() + "\n"
+        async for model in models:
+            yield model.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _get_page(
+    endpoint: str,
+    fetch_page: Callable[
+        ..., Awaitable[Tuple[List[T], Optional[Tuple[int, int]]]]
+    ],
+    adapter: TypeAdapter,
+    ndjson: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+    start_date_gte: Optional[str],
+    end_date_lte: Optional[str],
+    **params: Any,
+) -> Union[Response, StreamingResponse]:
+    """
+    Get one page of the results of a list endpoint. Identical in-flight
+    queries are coalesced. The cursor is decoded here, and the encoded
+    cursor of the next page is returned in the X-Next-Cursor header.
+    Parameters
+    ----------
+    endpoint : str
+    fetch_page : Callable[..., Awaitable[Tuple[List[T], Tuple | None]]]
+      Async handler method. Called with limit, the decoded cursor,
+      start_date_greater_than_or_equal, end_date_less_than_or_equal, and
+      params.
+    adapter : TypeAdapter
+      Adapter of the list of models, used unless streaming.
+    ndjson : bool
+      Stream the page as newline-delimited JSON.
+    limit : int | None
+    cursor : str | None
+    start_date_gte : str | None
+    end_date_lte : str | None
+    params : Any
+      Other query parameters of the endpoint.
+
+    Returns
+    -------
+    Response | StreamingResponse
+
+    Raises
+    ------
+    HTTPException
+      400 if the cursor is invalid or was sent without a limit.
+
+    """
+    if limit is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A cursor must be sent with a limit.",
+        )
+    try:
+        position = SlimsTableHandler.decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    models, next_position = await single_flight.do(
+        single_flight.make_key(
+            endpoint,
+            limit=limit,
+            cursor=position,
+            start_date_gte=SlimsTableHandler.parse_date(start_date_gte),
+            end_date_lte=SlimsTableHandler.parse_date(end_date_lte),
+            **params,
+        ),
+        lambda: fetch_page(
+            limit=limit,
+            cursor=position,
+            start_date_greater_than_or_equal=start_date_gte,
+            end_date_less_than_or_equal=end_date_lte,
+            **params,
+        ),
+    )
+    headers = {}
+    if next_position is not None:
+        next_cursor = SlimsTableHandler.encode_cursor(*next_position)
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if ndjson:
+        return StreamingResponse(
+            (m.model_dump_json() + "\n" for m in models),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+    return _json_response(adapter, models, headers)
+
+
+async def _get_by_day(
+    endpoint: str,
+    fetch: Callable[..., Awaitable[List[T]]],
+    get_date: Callable[[T], Optional[datetime]],
+    start_date_gte: Optional[str],
+    end_date_lte: Optional[str],
+    **params: Any,
+) -> List[T]:
+    """
+    Get the results of a list endpoint. Identical in-flight queries are
+    coalesced, also if they spell the same dates differently, and results
+    are served from the date-partitioned cache.
+    Parameters
+    ----------
+    endpoint : str
+    fetch : Callable[..., Awaitable[List[T]]]
+      Async handler method. Called with start_date_greater_than_or_equal,
+      end_date_less_than_or_equal, and params.
+    get_date : Callable[[T], datetime | None]
+      The created on date of a result.
+    start_date_gte : str | None
+    end_date_lte : str | None
+    params : Any
+      Other query parameters of the endpoint.
+
+    Returns
+    -------
+    List[T]
+
+    """
+
+    def fetch_between(
+        start: Optional[datetime], end: Optional[datetime]
+    ) -> Awaitable[List[T]]:
+        """Fetch the results created between start and end."""
+        return fetch(
+            start_date_greater_than_or_equal=(
+                None if start is None else start.isoformat()
+            ),
+            end_date_less_than_or_equal=(
+                None if end is None else end.isoformat()
+            ),
+            **params,
+        )
+
+    start = SlimsTableHandler.parse_date(start_date_gte)
+    end = SlimsTableHandler.parse_date(end_date_lte)
+    return await single_flight.do(
+        single_flight.make_key(
+            endpoint, start_date_gte=start, end_date_lte=end, **params
+        ),
+        lambda: result_cache.fetch(
+            key=single_flight.make_key(endpoint, **params),
+            start=start,
+            end=end,
+            fetch=fetch_between,
+            get_date=get_date,
+        ),
+    )
+
+
+async def _get_list(
+    endpoint: str,
+    handler: SlimsTableHandler,
+    adapter: TypeAdapter,
+    ndjson: bool,
+    limit: Optional[int],
+    cursor: Optional[str],
+    start_date_gte: Optional[str],
+    end_date_lte: Optional[str],
+    **params: Any,
+) -> Union[Response, StreamingResponse]:
+    """
+    Get the results of a list endpoint. A page is returned if a limit or
+    cursor is sent. Otherwise, the results are streamed if ndjson is set,
+    or served from the date-partitioned cache.
+    Parameters
+    ----------
+    endpoint : str
+    handler : SlimsTableHandler
+    adapter : TypeAdapter
+      Adapter of the list of models, used unless streaming.
+    ndjson : bool
+      Stream the results as newline-delimited JSON.
+    limit : int | None
+    cursor : str | None
+    start_date_gte : str | None
+    end_date_lte : str | None
+    params : Any
+      Other query parameters of the endpoint.
+
+    Returns
+    -------
+    Response | StreamingResponse
+
+    """
+    if limit is not None or cursor is not None:
+        return await _get_page(
+            endpoint,
+            handler.get_data_page_async,
+            adapter=adapter,
+            ndjson=ndjson,
+            limit=limit,
+            cursor=cursor,
+            start_date_gte=start_date_gte,
+            end_date_lte=end_date_lte,
+            **params,
+        )
+    if ndjson:
+        return await _ndjson_response(
+            handler.iter_data_async(
+                start_date_greater_than_or_equal=start_date_gte,
+                end_date_less_than_or_equal=end_date_lte,
+                **params,
+            )
+        )
+    models = await _get_by_day(
+        endpoint,
+        handler.get_data_async,
+        get_date=attrgetter(handler.ROOT.created_on_field),
+        start_date_gte=start_date_gte,
+        end_date_lte=end_date_lte,
+        **params,
+    )
+    return _json_response(adapter, models)
+
+
+async def _get_by_subject(
+    endpoint: str,
+    handler: SlimsTableHandler,
+    adapter: TypeAdapter,
+    query: SubjectBatchQuery,
+) -> Response:
+    """
+    Get the results of a list endpoint for a batch of subjects, grouped by
+    subject ID. Identical in-flight batches are coalesced. Batches are not
+    served from the date-partitioned cache, which is keyed by single
+    queries.
+    Parameters
+    ----------
+    endpoint : str
+    handler : SlimsTableHandler
+    adapter : TypeAdapter
+      Adapter of the lists grouped by subject.
+    query : SubjectBatchQuery
+
+    Returns
+    -------
+    Response
+
+    """
+    grouped = await single_flight.do(
+        single_flight.make_key(
+            f"{endpoint}/by_subject",
+            subject_ids=tuple(query.subject_ids),
+            start_date_gte=SlimsTableHandler.parse_date(query.start_date_gte),
+            end_date_lte=SlimsTableHandler.parse_date(query.end_date_lte),
+        ),
+        lambda: handler.get_data_by_subject_async(
+            subject_ids=query.subject_ids,
+            start_date_greater_than_or_equal=query.start_date_gte,
+            end_date_less_than_or_equal=query.end_date_lte,
+        ),
+    )
+    return _json_response(adapter, grouped)
+
 
 @router.get(
     "/healthcheck",
@@ -50,11 +484,111 @@ def get_health() -> HealthCheck:
     return HealthCheck()
 
 
+@router.get(
+    "/healthcheck/session_pool",
+    tags=["healthcheck"],
+    summary="SLIMS connection pool metrics",
+    response_model=SessionPoolMetrics,
+)
+def get_session_pool_metrics() -> SessionPoolMetrics:
+    """
+    ## Endpoint to inspect the connection pool of the SLIMS client.
+
+    Returns:
+        SessionPoolMetrics: Pool limits and request/recycle counters
+    """
+    return async_session.metrics()
+
+
+@router.get(
+    "/healthcheck/mirror",
+    tags=["healthcheck"],
+    summary="SLIMS mirror metrics",
+    response_model=MirrorMetrics,
+)
+def get_mirror_metrics() -> MirrorMetrics:
+    """
+    ## Endpoint to inspect how stale the local SLIMS mirror is.
+
+    Returns:
+        MirrorMetrics: Times of the last sync and reconcile of the mirror
+    """
+    if mirror is None:
+        return MirrorMetrics(enabled=False)
+    return mirror.metrics()
+
+
+@router.get(
+    "/healthcheck/single_flight",
+    tags=["healthcheck"],
+    summary="Coalesced request metrics",
+    response_model=SingleFlightMetrics,
+)
+def get_single_flight_metrics() -> SingleFlightMetrics:
+    """
+    ## Endpoint to inspect request coalescing.
+
+    Returns:
+        SingleFlightMetrics: Number of executed and coalesced queries
+    """
+    return single_flight.metrics()
+
+
+@router.get(
+    "/healthcheck/reference_cache",
+    tags=["healthcheck"],
+    summary="Reference data cache metrics",
+    response_model=CacheMetrics,
+)
+def get_reference_cache_metrics() -> CacheMetrics:
+    """
+    ## Endpoint to inspect the cache of lookup rows.
+
+    Returns:
+        CacheMetrics: Size and hit/miss counters of the cache
+    """
+    return reference_cache.metrics()
+
+
+@router.get(
+    "/healthcheck/result_cache",
+    tags=["healthcheck"],
+    summary="Date-partitioned result cache metrics",
+    response_model=CacheMetrics,
+)
+def get_result_cache_metrics() -> CacheMetrics:
+    """
+    ## Endpoint to inspect the cache of results by day.
+
+    Returns:
+        CacheMetrics: Size and hit/miss counters of the cache
+    """
+    return result_cache.metrics()
+
+
+@router.get(
+    "/healthcheck/attachment_cache",
+    tags=["healthcheck"],
+    summary="Attachment cache metrics",
+    response_model=CacheMetrics,
+)
+def get_attachment_cache_metrics() -> CacheMetrics:
+    """
+    ## Endpoint to inspect the cache of downloaded attachments.
+
+    Returns:
+        CacheMetrics: Size and hit/miss counters of the cache
+    """
+    return attachment_cache.metrics()
+
+
 @router.get(
     "/ecephys_sessions",
     response_model=List[SlimsEcephysData],
+    responses=LIST_RESPONSES,
 )
-def get_ecephys_sessions(
+async def get_ecephys_sessions(
+    request: Request,
     subject_id: Optional[str] = Query(
         None,
         alias="subject_id",
@@ -122,28 +656,82 @@ def get_ecephys_sessions(
             },
         },
     ),
-    session: Slims = Depends(get_session),
+    limit: Optional[int] = Query(
+        None,
+        alias="limit",
+        ge=1,
+        le=MAX_PAGE_LIMIT,
+        description=(
+            "Maximum number of experiment runs per page, newest first. The "
+            "cursor of the next page is returned in the X-Next-Cursor header."
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        alias="cursor",
+        description=(
+            "Cursor of the page to return, from the X-Next-Cursor header of "
+            "the previous page."
+        ),
+    ),
+    stream: bool = Query(
+        False,
+        alias="stream",
+        description=(
+            "Stream the results as newline-delimited JSON. Same as sending "
+            "Accept: application/x-ndjson."
+        ),
+    ),
+    handler: EcephysSessionHandler = Depends(
+        get_table_handler(EcephysSessionHandler)
+    ),
 ):
     """
     ## Ecephys session metadata
     Retrieves Ecephys session information from SLIMS.
     """
-    slims_ecephys_sessions = EcephysSessionHandler(
-        session=session
-    ).get_ephys_data_from_slims(
+    return await _get_list(
+        "ecephys_sessions",
+        handler,
+        adapter=ECEPHYS_LIST_ADAPTER,
+        ndjson=_wants_ndjson(request, stream),
+        limit=limit,
+        cursor=cursor,
+        start_date_gte=start_date_gte,
+        end_date_lte=end_date_lte,
         subject_id=subject_id,
         session_name=session_name,
-        start_date_greater_than_or_equal=start_date_gte,
-        end_date_less_than_or_equal=end_date_lte,
     )
-    return slims_ecephys_sessions
+
+
+@router.post(
+    "/ecephys_sessions/by_subject",
+    response_model=Dict[str, List[SlimsEcephysData]],
+)
+async def get_ecephys_sessions_by_subject(
+    query: SubjectBatchQuery,
+    handler: EcephysSessionHandler = Depends(
+        get_table_handler(EcephysSessionHandler)
+    ),
+):
+    """
+    ## Ecephys session metadata of a batch of subjects
+    Retrieves Ecephys session information of several subjects from SLIMS
+    in one query. Results are grouped by subject ID.
+    """
+    return await _get_by_subject(
+        "ecephys_sessions",
+        handler,
+        adapter=ECEPHYS_BY_SUBJECT_ADAPTER,
+        query=query,
+    )
 
 
 @router.get(
     "/aind_instruments/{input_id}",
     response_model=List[Dict[str, Any]],
 )
-def get_aind_instrument(
+async def get_aind_instrument(
     input_id: str = Path(
         ...,
         openapi_examples={
@@ -162,19 +750,34 @@ def get_aind_instrument(
             " that contains the input_id string"
         ),
     ),
-    session: Slims = Depends(get_session),
+    session: AsyncSlims = Depends(get_async_session),
 ):
     """
     ## AIND instrument metadata
     Retrieves AIND Instrument information from SLIMS.
     """
-    handler = InstrumentSessionHandler(session)
-    instrument_data = handler.get_instrument_data(input_id, partial_match)
+    handler = InstrumentSessionHandler(
+        session,
+        attachment_cache=attachment_cache,
+        instrument_index=instrument_index,
+        max_workers=settings.fetch_max_workers,
+    )
+    instrument_data = await single_flight.do(
+        single_flight.make_key(
+            "aind_instruments", input_id=input_id, partial_match=partial_match
+        ),
+        lambda: handler.get_instrument_data_async(input_id, partial_match),
+    )
     return instrument_data
 
 
-@router.get("/smartspim_imaging", response_model=List[SlimsSpimData])
-def get_smartspim_imaging(
+@router.get(
+    "/smartspim_imaging",
+    response_model=List[SlimsSpimData],
+    responses=LIST_RESPONSES,
+)
+async def get_smartspim_imaging(
+    request: Request,
     subject_id: Optional[str] = Query(
         None,
         alias="subject_id",
@@ -231,23 +834,83 @@ def get_smartspim_imaging(
             },
         },
     ),
-    session: Slims = Depends(get_session),
+    limit: Optional[int] = Query(
+        None,
+        alias="limit",
+        ge=1,
+        le=MAX_PAGE_LIMIT,
+        description=(
+            "Maximum number of experiment runs per page, newest first. The "
+            "cursor of the next page is returned in the X-Next-Cursor header."
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        alias="cursor",
+        description=(
+            "Cursor of the page to return, from the X-Next-Cursor header of "
+            "the previous page."
+        ),
+    ),
+    stream: bool = Query(
+        False,
+        alias="stream",
+        description=(
+            "Stream the results as newline-delimited JSON. Same as sending "
+            "Accept: application/x-ndjson."
+        ),
+    ),
+    handler: ImagingSessionHandler = Depends(
+        get_table_handler(ImagingSessionHandler)
+    ),
 ):
     """
     ## SmartSPIM imaging metadata
     Retrieves SmartSPIM imaging information from SLIMS.
     """
-    handler = ImagingSessionHandler(session)
-    spim_data = handler.get_spim_data_from_slims(
+    return await _get_list(
+        "smartspim_imaging",
+        handler,
+        adapter=SPIM_LIST_ADAPTER,
+        ndjson=_wants_ndjson(request, stream),
+        limit=limit,
+        cursor=cursor,
+        start_date_gte=start_date_gte,
+        end_date_lte=end_date_lte,
         subject_id=subject_id,
-        start_date_greater_than_or_equal=start_date_gte,
-        end_date_less_than_or_equal=end_date_lte,
     )
-    return spim_data
 
 
-@router.get("/histology", response_model=List[SlimsHistologyData])
-def get_histology_data(
+@router.post(
+    "/smartspim_imaging/by_subject",
+    response_model=Dict[str, List[SlimsSpimData]],
+)
+async def get_smartspim_imaging_by_subject(
+    query: SubjectBatchQuery,
+    handler: ImagingSessionHandler = Depends(
+        get_table_handler(ImagingSessionHandler)
+    ),
+):
+    """
+    ## SmartSPIM imaging metadata of a batch of subjects
+    Retrieves SmartSPIM imaging information of several subjects from SLIMS
+    in one query. Results are grouped by subject ID.
+    """
+    return await _get_by_subject(
+        "smartspim_imaging",
+        handler,
+        adapter=SPIM_BY_SUBJECT_ADAPTER,
+        query=query,
+    )
+
+
+@router.get(
+    "/histology",
+    response_model=List[SlimsHistologyData],
+    responses=LIST_RESPONSES,
+)
+async def get_histology_data(
+    request: Request,
     subject_id: Optional[str] = Query(
         None,
         alias="subject_id",
@@ -304,25 +967,83 @@ def get_histology_data(
             },
         },
     ),
-    session: Slims = Depends(get_session),
+    limit: Optional[int] = Query(
+        None,
+        alias="limit",
+        ge=1,
+        le=MAX_PAGE_LIMIT,
+        description=(
+            "Maximum number of experiment runs per page, newest first. The "
+            "cursor of the next page is returned in the X-Next-Cursor header."
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        alias="cursor",
+        description=(
+            "Cursor of the page to return, from the X-Next-Cursor header of "
+            "the previous page."
+        ),
+    ),
+    stream: bool = Query(
+        False,
+        alias="stream",
+        description=(
+            "Stream the results as newline-delimited JSON. Same as sending "
+            "Accept: application/x-ndjson."
+        ),
+    ),
+    handler: HistologySessionHandler = Depends(
+        get_table_handler(HistologySessionHandler)
+    ),
 ):
     """
     ## Histology metadata
     Retrieves histology information from SLIMS.
     """
-    handler = HistologySessionHandler(session)
-    histology_data = handler.get_histology_data_from_slims(
+    return await _get_list(
+        "histology",
+        handler,
+        adapter=HISTOLOGY_LIST_ADAPTER,
+        ndjson=_wants_ndjson(request, stream),
+        limit=limit,
+        cursor=cursor,
+        start_date_gte=start_date_gte,
+        end_date_lte=end_date_lte,
         subject_id=subject_id,
-        start_date_greater_than_or_equal=start_date_gte,
-        end_date_less_than_or_equal=end_date_lte,
     )
-    return histology_data
+
+
+@router.post(
+    "/histology/by_subject",
+    response_model=Dict[str, List[SlimsHistologyData]],
+)
+async def get_histology_data_by_subject(
+    query: SubjectBatchQuery,
+    handler: HistologySessionHandler = Depends(
+        get_table_handler(HistologySessionHandler)
+    ),
+):
+    """
+    ## Histology metadata of a batch of subjects
+    Retrieves histology information of several subjects from SLIMS
+    in one query. Results are grouped by subject ID.
+    """
+    return await _get_by_subject(
+        "histology",
+        handler,
+        adapter=HISTOLOGY_BY_SUBJECT_ADAPTER,
+        query=query,
+    )
 
 
 @router.get(
-    "/water_restriction", response_model=List[SlimsWaterRestrictionData]
+    "/water_restriction",
+    response_model=List[SlimsWaterRestrictionData],
+    responses=LIST_RESPONSES,
 )
-def get_water_restriction_data(
+async def get_water_restriction_data(
+    request: Request,
     subject_id: Optional[str] = Query(
         None,
         alias="subject_id",
@@ -379,23 +1100,83 @@ def get_water_restriction_data(
             },
         },
     ),
-    session: Slims = Depends(get_session),
+    limit: Optional[int] = Query(
+        None,
+        alias="limit",
+        ge=1,
+        le=MAX_PAGE_LIMIT,
+        description=(
+            "Maximum number of content events per page, newest first. The "
+            "cursor of the next page is returned in the X-Next-Cursor header."
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        alias="cursor",
+        description=(
+            "Cursor of the page to return, from the X-Next-Cursor header of "
+            "the previous page."
+        ),
+    ),
+    stream: bool = Query(
+        False,
+        alias="stream",
+        description=(
+            "Stream the results as newline-delimited JSON. Same as sending "
+            "Accept: application/x-ndjson."
+        ),
+    ),
+    handler: WaterRestrictionSessionHandler = Depends(
+        get_table_handler(WaterRestrictionSessionHandler)
+    ),
 ):
     """
     ## Water Restriction data
     Retrieves water restriction information from SLIMS.
     """
-    handler = WaterRestrictionSessionHandler(session)
-    water_restriction_data = handler.get_water_restriction_data_from_slims(
+    return await _get_list(
+        "water_restriction",
+        handler,
+        adapter=WATER_RESTRICTION_LIST_ADAPTER,
+        ndjson=_wants_ndjson(request, stream),
+        limit=limit,
+        cursor=cursor,
+        start_date_gte=start_date_gte,
+        end_date_lte=end_date_lte,
         subject_id=subject_id,
-        start_date_greater_than_or_equal=start_date_gte,
-        end_date_less_than_or_equal=end_date_lte,
     )
-    return water_restriction_data
 
 
-@router.get("/viral_injections", response_model=List[SlimsViralInjectionData])
-def get_viral_injections(
+@router.post(
+    "/water_restriction/by_subject",
+    response_model=Dict[str, List[SlimsWaterRestrictionData]],
+)
+async def get_water_restriction_data_by_subject(
+    query: SubjectBatchQuery,
+    handler: WaterRestrictionSessionHandler = Depends(
+        get_table_handler(WaterRestrictionSessionHandler)
+    ),
+):
+    """
+    ## Water Restriction data of a batch of subjects
+    Retrieves water restriction information of several subjects from SLIMS
+    in one query. Results are grouped by subject ID.
+    """
+    return await _get_by_subject(
+        "water_restriction",
+        handler,
+        adapter=WATER_RESTRICTION_BY_SUBJECT_ADAPTER,
+        query=query,
+    )
+
+
+@router.get(
+    "/viral_injections",
+    response_model=List[SlimsViralInjectionData],
+    responses=LIST_RESPONSES,
+)
+async def get_viral_injections(
+    request: Request,
     subject_id: Optional[str] = Query(
         None,
         alias="subject_id",
@@ -452,16 +1233,71 @@ def get_viral_injections(
             },
         },
     ),
-    session: Slims = Depends(get_session),
+    limit: Optional[int] = Query(
+        None,
+        alias="limit",
+        ge=1,
+        le=MAX_PAGE_LIMIT,
+        description=(
+            "Maximum number of viral injections per page, newest first. The "
+            "cursor of the next page is returned in the X-Next-Cursor header."
+        ),
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        alias="cursor",
+        description=(
+            "Cursor of the page to return, from the X-Next-Cursor header of "
+            "the previous page."
+        ),
+    ),
+    stream: bool = Query(
+        False,
+        alias="stream",
+        description=(
+            "Stream the results as newline-delimited JSON. Same as sending "
+            "Accept: application/x-ndjson."
+        ),
+    ),
+    handler: ViralInjectionSessionHandler = Depends(
+        get_table_handler(ViralInjectionSessionHandler)
+    ),
 ):
     """
     ## Viral Injection data
     Retrieves viral injection information from SLIMS.
     """
-    handler = ViralInjectionSessionHandler(session)
-    viral_injection_data = handler.get_viral_injection_info_from_slims(
+    return await _get_list(
+        "viral_injections",
+        handler,
+        adapter=VIRAL_INJECTION_LIST_ADAPTER,
+        ndjson=_wants_ndjson(request, stream),
+        limit=limit,
+        cursor=cursor,
+        start_date_gte=start_date_gte,
+        end_date_lte=end_date_lte,
         subject_id=subject_id,
-        start_date_greater_than_or_equal=start_date_gte,
-        end_date_less_than_or_equal=end_date_lte,
     )
-    return viral_injection_data
+
+
+@router.post(
+    "/viral_injections/by_subject",
+    response_model=Dict[str, List[SlimsViralInjectionData]],
+)
+async def get_viral_injections_by_subject(
+    query: SubjectBatchQuery,
+    handler: ViralInjectionSessionHandler = Depends(
+        get_table_handler(ViralInjectionSessionHandler)
+    ),
+):
+    """
+    ## Viral Injection data of a batch of subjects
+    Retrieves viral injection information of several subjects from SLIMS
+    in one query. Results are grouped by subject ID.
+    """
+    return await _get_by_subject(
+        "viral_injections",
+        handler,
+        adapter=VIRAL_INJECTION_BY_SUBJECT_ADAPTER,
+        query=query,
+    )
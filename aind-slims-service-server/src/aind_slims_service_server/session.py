@@ -1,21 +1,11 @@
 """Module to handle requests session"""
 
-from slims.slims import Slims
+from slims.internal import _SlimsApiException
 
 from aind_slims_service_server.configs import Settings
 
 settings = Settings()
 
 
-def get_session():
-    """
-    Yield a session object. This will automatically close the session when
-    finished.
-    """
-    session = Slims(
-        name=settings.db,
-        username=settings.username,
-        password=settings.password.get_secret_value(),
-        url=settings.host,
-    )
-    yield session
+class SlimsAuthError(_SlimsApiException):
+    """Raised when SLIMS rejects the credentials of a session."""
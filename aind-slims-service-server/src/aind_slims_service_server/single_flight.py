@@ -0,0 +1,79 @@
+"""Module to coalesce identical in-flight requests"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from aind_slims_service_server.models import SingleFlightMetrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key. The first caller starts the
+    work and every caller that arrives while it is still running awaits the
+    same task instead of starting its own, so identical requests cost one
+    upstream execution. Results are shared, so callers must not mutate them.
+    """
+
+    def __init__(self):
+        """Class constructor."""
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(endpoint: str, **params: Any) -> Tuple[Any, ...]:
+        """
+        Build a key from an endpoint name and its query parameters. Unset
+        (None) parameters are dropped and the remaining parameters are
+        sorted by name, so the key does not depend on argument order.
+        Parameters
+        ----------
+        endpoint : str
+        params : Any
+
+        Returns
+        -------
+        Tuple[Any, ...]
+
+        """
+        return (endpoint,) + tuple(
+            sorted((k, v) for k, v in params.items() if v is not None)
+        )
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await func(), or the in-flight call of func for the same key.
+        Parameters
+        ----------
+        key : Hashable
+        func : Callable[[], Awaitable[T]]
+
+        Returns
+        -------
+        T
+
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        # Shield the shared task so that one caller disconnecting does not
+        # cancel the work for the others.
+        return await asyncio.shield(task)
+
+    def metrics(self) -> SingleFlightMetrics:
+        """Counters of executed and coalesced calls."""
+        return SingleFlightMetrics(
+            in_flight=len(self._in_flight),
+            executed=self.executed,
+            coalesced=self.coalesced,
+        )
+
+
+single_flight = SingleFlight()
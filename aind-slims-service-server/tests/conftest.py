@@ -13,6 +13,7 @@ from fastapi.testclient import TestClient
 from pytest_mock import MockFixture
 from slims.internal import Record
 
+from aind_slims_service_server.async_session import RawRecord
 from aind_slims_service_server.main import app
 from aind_slims_service_server.models import (
     EcephysRewardSpouts,
@@ -36,7 +37,8 @@ def mock_slims_fetch(
     resources_dir: Path = RESOURCES_DIR,
 ) -> MagicMock:
     """
-    Patch slims session.fetch to return records from resource files.
+    Patch AsyncSlims.fetch and AsyncSlims.fetch_raw to return records from
+    resource files.
     Parameters:
     ----------
     mocker: MockFixture
@@ -48,7 +50,8 @@ def mock_slims_fetch(
     Returns:
     -------
     MagicMock
-        A mock object that simulates the fetch method of the Slims class.
+        A mock object that simulates the fetch method of the AsyncSlims
+        class.
     """
 
     def fetch_side_effect(table, *args, **kwargs):
@@ -59,9 +62,23 @@ def mock_slims_fetch(
         # noinspection PyTypeChecker
         return [Record(json_entity=j, slims_api=None) for j in records]
 
-    mock_get = mocker.patch("slims.slims.Slims.fetch")
-    mock_get.side_effect = fetch_side_effect
-    return mock_get
+    mock_get_async = mocker.patch(
+        "aind_slims_service_server.async_session.AsyncSlims.fetch"
+    )
+    mock_get_async.side_effect = fetch_side_effect
+
+    def fetch_raw_side_effect(table, *args, columns=None, **kwargs):
+        """Side effect for the mock fetch_raw method."""
+        return [
+            RawRecord.from_entity(r.json_entity, columns)
+            for r in fetch_side_effect(table)
+        ]
+
+    mock_get_raw = mocker.patch(
+        "aind_slims_service_server.async_session.AsyncSlims.fetch_raw"
+    )
+    mock_get_raw.side_effect = fetch_raw_side_effect
+    return mock_get_async
 
 
 @pytest.fixture()
@@ -167,11 +184,13 @@ def mock_get_instrument_data(mocker: MockFixture) -> MagicMock:
     instrument_json_path = RESOURCES_DIR / "instrument" / "instrument.json"
     with open(instrument_json_path) as f:
         instrument_json = json.load(f)
-    mock_response = MagicMock()
+    mock_response = MagicMock(
+        status_code=200, content=json.dumps(instrument_json).encode()
+    )
     mock_response.json.return_value = instrument_json
     mocker.patch(
         "aind_slims_service_server.handlers.instrument."
-        "InstrumentSessionHandler._get_attachment",
+        "InstrumentSessionHandler._get_attachment_async",
         return_value=mock_response,
     )
     return fetch_mock
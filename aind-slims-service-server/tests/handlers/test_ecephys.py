@@ -4,7 +4,9 @@ from typing import List
 from unittest.mock import MagicMock
 
 import pytest
+from slims.slims import Slims
 
+from aind_slims_service_server.async_session import get_async_session
 from aind_slims_service_server.handlers.ecephys import (
     EcephysSessionHandler,
 )
@@ -14,12 +16,10 @@ from aind_slims_service_server.models import SlimsEcephysData
 class TestEcephysSessionHandler:
     """Tests methods in EcephysSessionHandler class"""
 
-    def test_get_graph(self, mock_get_ecephys_data: MagicMock):
-        """Tests _get_graph method"""
-        handler = EcephysSessionHandler(
-            session=MagicMock(fetch=mock_get_ecephys_data)
-        )
-        G, root_nodes = handler._get_graph()
+    async def test_get_graph(self, mock_get_ecephys_data: MagicMock):
+        """Tests _get_graph_async method"""
+        handler = EcephysSessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
         expected_root_nodes = [
             "ExperimentRun.40007",
         ]
@@ -36,40 +36,111 @@ class TestEcephysSessionHandler:
             ("Result.1611", "ReferenceDataRecord.4512"),
             ("ReferenceDataRecord.3466", "ReferenceDataRecord.3467"),
         ]
-        assert expected_root_nodes == root_nodes
-        assert set(expected_edges) == set(G.edges())
+        assert expected_root_nodes == [G.name(n) for n in root_nodes]
+        assert set(expected_edges) == {
+            (G.name(u), G.name(v)) for u, v in G.edges()
+        }
 
-    def test_parse_graph(
+    async def test_parse_graph(
         self,
         mock_get_ecephys_data: MagicMock,
         test_ecephys_data: List[SlimsEcephysData],
     ):
         """Tests _parse_graph method."""
-        handler = EcephysSessionHandler(
-            session=MagicMock(fetch=mock_get_ecephys_data)
-        )
-        g, root_nodes = handler._get_graph()
+        handler = EcephysSessionHandler(session=get_async_session())
+        g, root_nodes = await handler._get_graph_async()
         ecephys_data = handler._parse_graph(
             g=g, root_nodes=root_nodes, subject_id="750108", session_name=None
         )
         assert test_ecephys_data == ecephys_data
 
-    def test_get_ephys_data_from_slims(self, mock_get_ecephys_data):
-        """Tests get_ephys_data_from_slims method"""
-        handler = EcephysSessionHandler(
-            session=MagicMock(fetch=mock_get_ecephys_data)
+    async def test_get_data_async_session_name(self, mock_get_ecephys_data):
+        """Tests the session is resolved from its Result row first"""
+        handler = EcephysSessionHandler(session=get_async_session())
+        ecephys_data = await handler.get_data_async(
+            session_name="ecephys_750108_2024-12-23_14-51-45"
         )
-        ecephys_data = handler.get_ephys_data_from_slims(subject_id="750108")
         assert len(ecephys_data) == 1
+        first_fetch = mock_get_ecephys_data.call_args_list[0].kwargs
+        assert "Result" == first_fetch["table"]
+        assert {
+            "fieldName": "rslt_cf_sessionName",
+            "operator": "equals",
+            "value": "ecephys_750108_2024-12-23_14-51-45",
+        } == first_fetch["criteria"].to_dict()
+
+    async def test_get_data_async(
+        self,
+        mock_get_ecephys_data: MagicMock,
+        test_ecephys_data: List[SlimsEcephysData],
+    ):
+        """Tests get_data_async method"""
+        handler = EcephysSessionHandler(session=get_async_session())
+        data = await handler.get_data_async(subject_id="750108")
+        assert test_ecephys_data == data
+
+    def test_get_ephys_data_from_slims(
+        self,
+        mock_get_ecephys_data: MagicMock,
+        test_ecephys_data: List[SlimsEcephysData],
+    ):
+        """Tests get_ephys_data_from_slims with a sync Slims session"""
+        session = Slims("slims", "http://slims", "user", "pass")
+        handler = EcephysSessionHandler(session=session)
+        data = handler.get_ephys_data_from_slims(
+            session_name="ecephys_750108_2024-12-23_14-51-45"
+        )
+        assert test_ecephys_data == data
+        assert session is handler.session
+
+    async def test_get_data_by_subject_async(
+        self,
+        mock_get_ecephys_data: MagicMock,
+        test_ecephys_data: List[SlimsEcephysData],
+    ):
+        """Tests get_data_by_subject_async method"""
+        handler = EcephysSessionHandler(session=get_async_session())
+        data = await handler.get_data_by_subject_async(
+            subject_ids=["750108", "0", "750108"]
+        )
+        assert {"750108": test_ecephys_data, "0": []} == data
+        with pytest.raises(ValueError) as e:
+            await handler.get_data_by_subject_async(subject_ids=[])
+        assert "subject_ids must not be empty!" in str(e.value)
 
-    def test_get_ephys_data_from_slims_error(self, mock_get_ecephys_data):
-        """Tests get_ephys_data_from_slims method when subject_id empty"""
-        handler = EcephysSessionHandler(
-            session=MagicMock(fetch=mock_get_ecephys_data)
+    async def test_iter_data_async(
+        self,
+        mock_get_ecephys_data: MagicMock,
+        test_ecephys_data: List[SlimsEcephysData],
+    ):
+        """Tests iter_data_async method"""
+        handler = EcephysSessionHandler(session=get_async_session())
+        data = [m async for m in handler.iter_data_async(subject_id="750108")]
+        assert test_ecephys_data == data
+
+    async def test_get_data_page_async(
+        self,
+        mock_get_ecephys_data: MagicMock,
+        test_ecephys_data: List[SlimsEcephysData],
+    ):
+        """Tests get_data_page_async method"""
+        handler = EcephysSessionHandler(session=get_async_session())
+        data, next_cursor = await handler.get_data_page_async(
+            subject_id="750108", limit=10
         )
+        assert test_ecephys_data == data
+        assert next_cursor is None
+
+    async def test_get_data_async_error(self):
+        """Tests async method when subject_id is empty"""
+        handler = EcephysSessionHandler(session=MagicMock())
         with pytest.raises(ValueError) as e:
-            handler.get_ephys_data_from_slims(subject_id="")
+            await handler.get_data_async(subject_id="")
         assert "subject_id must not be empty!" in str(e.value)
+        with pytest.raises(ValueError):
+            await anext(handler.iter_data_async(subject_id=""))
+        with pytest.raises(ValueError):
+            await handler.get_data_page_async(subject_id="")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""Tests methods in field_map module."""
+
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from slims.internal import Record
+
+from aind_slims_service_server.handlers.field_map import (
+    FieldMap,
+    RecordMapper,
+    to_datetime,
+    to_decimal,
+)
+from aind_slims_service_server.models import (
+    EcephysRewardSpouts,
+    HistologyWashData,
+)
+
+
+def create_record(table_name: str, pk: int, columns: list) -> Record:
+    """Create a slims Record with the given column json"""
+    json_entity = {"tableName": table_name, "pk": pk, "columns": columns}
+    # noinspection PyTypeChecker
+    return Record(json_entity=json_entity, slims_api=None)
+
+
+class TestFieldMap(unittest.TestCase):
+    """Test class for RecordMapper and the converters"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up a mapper and a record"""
+        cls.mapper = RecordMapper(
+            HistologyWashData,
+            [
+                FieldMap("wash_name", "xprs_name"),
+                FieldMap("wash_type", "xprs_cf_spimWashType", "displayValue"),
+                FieldMap(
+                    "start_time", "xprs_cf_startTime", converter=to_datetime
+                ),
+                FieldMap("end_time", "xprs_cf_endTime", converter=to_datetime),
+                FieldMap("mass", "xprs_cf_mass"),
+            ],
+        )
+        cls.record = create_record(
+            "ExperimentRunStep",
+            1,
+            [
+                {"name": "xprs_name", "value": "Wash 1"},
+                {
+                    "name": "xprs_cf_spimWashType",
+                    "value": 2,
+                    "displayValue": "Passive Delipidation",
+                },
+                {"name": "xprs_cf_startTime", "value": 1739383200000},
+                {"name": "xprs_cf_endTime", "value": None},
+                {"name": "xprs_cf_mass", "value": 2, "unit": "g"},
+            ],
+        )
+
+    def test_converters(self):
+        """Tests numbers and timestamps are converted"""
+        self.assertEqual(Decimal("0.1"), to_decimal(0.1))
+        self.assertEqual(
+            datetime(2025, 2, 12, 18, tzinfo=timezone.utc),
+            to_datetime(1739383200000),
+        )
+
+    def test_extract(self):
+        """Tests values are read, converted and missing columns are None"""
+        mapper = RecordMapper(
+            EcephysRewardSpouts,
+            [
+                FieldMap("spout_side", "rdrc_cf_spoutSide"),
+                FieldMap("starting_position", "rdrc_cf_startingPosition"),
+            ],
+        )
+        self.assertEqual(
+            {
+                "wash_name": "Wash 1",
+                "wash_type": "Passive Delipidation",
+                "start_time": datetime(2025, 2, 12, 18, tzinfo=timezone.utc),
+                "end_time": None,
+                "mass": 2,
+            },
+            self.mapper.extract(self.record),
+        )
+        self.assertEqual(
+            {"spout_side": None, "starting_position": None},
+            mapper.extract(self.record),
+        )
+
+    def test_create_and_update(self):
+        """Tests models are created and updated from a record"""
+        wash_data = self.mapper.create(self.record)
+        self.assertEqual("Wash 1", wash_data.wash_name)
+        self.assertEqual([], wash_data.reagents)
+        other_wash_data = HistologyWashData(wash_name="Wash 2", mass=1)
+        self.mapper.update(other_wash_data, self.record)
+        self.assertEqual(wash_data, other_wash_data)
+
+    def test_columns(self):
+        """Tests columns are listed once in the order they are mapped"""
+        mapper = RecordMapper(
+            HistologyWashData,
+            [
+                FieldMap("start_time", "xprs_cf_startTime"),
+                FieldMap("wash_name", "xprs_name"),
+                FieldMap("end_time", "xprs_cf_startTime", "unit"),
+            ],
+        )
+        self.assertEqual(("xprs_cf_startTime", "xprs_name"), mapper.columns)
+
+    def test_unknown_field(self):
+        """Tests an error is raised for fields not in the model"""
+        with self.assertRaises(ValueError) as e:
+            RecordMapper(
+                EcephysRewardSpouts, [FieldMap("spout", "rdrc_cf_spoutSide")]
+            )
+        self.assertEqual(
+            "Unknown fields for EcephysRewardSpouts: ['spout']",
+            str(e.exception),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,9 @@ from typing import List
 from unittest.mock import MagicMock
 
 import pytest
+from slims.internal import Record
 
+from aind_slims_service_server.async_session import get_async_session
 from aind_slims_service_server.handlers.histology import (
     HistologySessionHandler,
 )
@@ -14,13 +16,11 @@ from aind_slims_service_server.models import SlimsHistologyData
 class TestHistologySessionHandler:
     """Tests methods in HistologySessionHandler class"""
 
-    def test_get_graph(self, mock_get_histology_data: MagicMock):
-        """Tests _get_graph method"""
+    async def test_get_graph(self, mock_get_histology_data: MagicMock):
+        """Tests _get_graph_async method"""
 
-        handler = HistologySessionHandler(
-            session=MagicMock(fetch=mock_get_histology_data)
-        )
-        G, root_nodes = handler._get_graph()
+        handler = HistologySessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
         expected_root_nodes = ["ExperimentRun.40007"]
         expected_edges = [
             ("ExperimentRun.40007", "ExperimentRunStep.60027"),
@@ -34,45 +34,137 @@ class TestHistologySessionHandler:
             ("ExperimentRunStepContent.9", "Content.166"),
             ("Content.138", "ReferenceDataRecord.1664"),
         ]
-        assert expected_root_nodes == root_nodes
-        assert set(expected_edges) == set(G.edges())
+        assert expected_root_nodes == [G.name(n) for n in root_nodes]
+        assert set(expected_edges) == {
+            (G.name(u), G.name(v)) for u, v in G.edges()
+        }
 
-    def test_parse_graph(
+    async def test_parse_graph(
         self,
         mock_get_histology_data: MagicMock,
         test_histology_data: List[SlimsHistologyData],
     ):
         """Tests _parse_graph_method"""
-        handler = HistologySessionHandler(
-            session=MagicMock(fetch=mock_get_histology_data)
-        )
-        G, root_nodes = handler._get_graph()
+        handler = HistologySessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
 
         hist_data = handler._parse_graph(
             g=G, root_nodes=root_nodes, subject_id="754372"
         )
         assert test_histology_data == hist_data
 
-    def test_get_hist_data_from_slims(
+    async def test_parse_graph_specimens_share_washes(
         self, mock_get_histology_data: MagicMock
     ):
-        """Tests get_hist_data_from_slims method"""
-        handler = HistologySessionHandler(
-            session=MagicMock(fetch=mock_get_histology_data)
+        """Tests the specimens of a run share the parsed washes"""
+        handler = HistologySessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
+        step = G.get_node("ExperimentRunStep", 60027)
+        step_content = G.add_node(
+            "ExperimentRunStepContent",
+            Record(
+                json_entity={
+                    "tableName": "ExperimentRunStepContent",
+                    "pk": 10,
+                    "columns": [],
+                },
+                slims_api=None,
+            ),
+        )
+        content = G.add_node(
+            "Content",
+            Record(
+                json_entity={
+                    "tableName": "Content",
+                    "pk": 167,
+                    "columns": [
+                        {"name": "cntn_id", "value": "754372"},
+                        {"name": "cntn_barCode", "value": "BRN00000003"},
+                    ],
+                },
+                slims_api=None,
+            ),
         )
-        hist_data = handler.get_histology_data_from_slims(subject_id="754372")
-        assert len(hist_data) == 1
+        G.add_edge(step, step_content)
+        G.add_edge(step_content, content)
 
-    def test_get_hist_data_from_slims_error(
-        self, mock_get_histology_data: MagicMock
+        hist_data = handler._parse_graph(
+            g=G, root_nodes=root_nodes, subject_id="754372"
+        )
+        assert ["BRN00000002", "BRN00000003"] == [
+            h.specimen_id for h in hist_data
+        ]
+        assert len(hist_data[0].washes) > 0
+        assert hist_data[0].washes is hist_data[1].washes
+
+    async def test_get_data_async(
+        self,
+        mock_get_histology_data: MagicMock,
+        test_histology_data: List[SlimsHistologyData],
     ):
-        """Tests get_hist_data_from_slims method"""
-        handler = HistologySessionHandler(
-            session=MagicMock(fetch=mock_get_histology_data)
+        """Tests get_data_async method"""
+        handler = HistologySessionHandler(session=get_async_session())
+        data = await handler.get_data_async(subject_id="754372")
+        assert test_histology_data == data
+
+    def test_get_histology_data_from_slims(
+        self,
+        mock_get_histology_data: MagicMock,
+        test_histology_data: List[SlimsHistologyData],
+    ):
+        """Tests get_histology_data_from_slims runs get_data_async"""
+        handler = HistologySessionHandler(session=get_async_session())
+        data = handler.get_histology_data_from_slims(subject_id="754372")
+        assert test_histology_data == data
+
+    async def test_get_data_by_subject_async(
+        self,
+        mock_get_histology_data: MagicMock,
+        test_histology_data: List[SlimsHistologyData],
+    ):
+        """Tests get_data_by_subject_async method"""
+        handler = HistologySessionHandler(session=get_async_session())
+        data = await handler.get_data_by_subject_async(
+            subject_ids=["754372", "0", "754372"]
         )
+        assert {"754372": test_histology_data, "0": []} == data
+        with pytest.raises(ValueError) as e:
+            await handler.get_data_by_subject_async(subject_ids=[])
+        assert "subject_ids must not be empty!" in str(e.value)
+
+    async def test_iter_data_async(
+        self,
+        mock_get_histology_data: MagicMock,
+        test_histology_data: List[SlimsHistologyData],
+    ):
+        """Tests iter_data_async method"""
+        handler = HistologySessionHandler(session=get_async_session())
+        data = [m async for m in handler.iter_data_async(subject_id="754372")]
+        assert test_histology_data == data
+
+    async def test_get_data_page_async(
+        self,
+        mock_get_histology_data: MagicMock,
+        test_histology_data: List[SlimsHistologyData],
+    ):
+        """Tests get_data_page_async method"""
+        handler = HistologySessionHandler(session=get_async_session())
+        data, next_cursor = await handler.get_data_page_async(
+            subject_id="754372", limit=10
+        )
+        assert test_histology_data == data
+        assert next_cursor is None
+
+    async def test_get_data_async_error(self):
+        """Tests async method when subject_id is empty"""
+        handler = HistologySessionHandler(session=MagicMock())
         with pytest.raises(ValueError) as e:
-            handler.get_histology_data_from_slims(subject_id="")
+            await handler.get_data_async(subject_id="")
         assert "subject_id must not be empty!" in str(e.value)
+        with pytest.raises(ValueError):
+            await anext(handler.iter_data_async(subject_id=""))
+        with pytest.raises(ValueError):
+            await handler.get_data_page_async(subject_id="")
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from aind_slims_service_server.async_session import get_async_session
 from aind_slims_service_server.handlers.imaging import (
     ImagingSessionHandler,
 )
@@ -14,13 +15,11 @@ from aind_slims_service_server.models import SlimsSpimData
 class TestImagingSessionHandler:
     """Tests methods in ImagingSessionHandler class"""
 
-    def test_get_graph(self, mock_get_imaging_data: MagicMock):
-        """Tests _get_graph method"""
+    async def test_get_graph(self, mock_get_imaging_data: MagicMock):
+        """Tests _get_graph_async method"""
 
-        handler = ImagingSessionHandler(
-            session=MagicMock(fetch=mock_get_imaging_data)
-        )
-        G, root_nodes = handler._get_graph()
+        handler = ImagingSessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
         expected_root_nodes = [
             "ExperimentRun.40015",
             "ExperimentRun.40016",
@@ -57,42 +56,92 @@ class TestImagingSessionHandler:
             ("Content.235", "OrderContent.32"),
             ("OrderContent.32", "Order.21"),
         ]
-        assert expected_root_nodes == root_nodes
-        assert set(expected_edges) == set(G.edges())
+        assert expected_root_nodes == [G.name(n) for n in root_nodes]
+        assert set(expected_edges) == {
+            (G.name(u), G.name(v)) for u, v in G.edges()
+        }
 
-    def test_parse_graph(
+    async def test_parse_graph(
         self,
         mock_get_imaging_data: MagicMock,
         test_imaging_data: List[SlimsSpimData],
     ):
         """Tests _parse_graph method."""
-        handler = ImagingSessionHandler(
-            session=MagicMock(fetch=mock_get_imaging_data)
-        )
-        g, root_nodes = handler._get_graph()
+        handler = ImagingSessionHandler(session=get_async_session())
+        g, root_nodes = await handler._get_graph_async()
         spim_data = handler._parse_graph(
             g=g, root_nodes=root_nodes, subject_id="744742"
         )
         assert test_imaging_data == spim_data
 
-    def test_get_spim_data_from_slims(self, mock_get_imaging_data: MagicMock):
-        """Tests get_spim_data_from_slims method"""
-        handler = ImagingSessionHandler(
-            session=MagicMock(fetch=mock_get_imaging_data)
+    async def test_get_data_async(
+        self,
+        mock_get_imaging_data: MagicMock,
+        test_imaging_data: List[SlimsSpimData],
+    ):
+        """Tests get_data_async method"""
+        handler = ImagingSessionHandler(session=get_async_session())
+        data = await handler.get_data_async(subject_id="744742")
+        assert test_imaging_data == data
+
+    def test_get_spim_data_from_slims(
+        self,
+        mock_get_imaging_data: MagicMock,
+        test_imaging_data: List[SlimsSpimData],
+    ):
+        """Tests get_spim_data_from_slims runs get_data_async"""
+        handler = ImagingSessionHandler(session=get_async_session())
+        data = handler.get_spim_data_from_slims(subject_id="744742")
+        assert test_imaging_data == data
+
+    async def test_get_data_by_subject_async(
+        self,
+        mock_get_imaging_data: MagicMock,
+        test_imaging_data: List[SlimsSpimData],
+    ):
+        """Tests get_data_by_subject_async method"""
+        handler = ImagingSessionHandler(session=get_async_session())
+        data = await handler.get_data_by_subject_async(
+            subject_ids=["744742", "0", "744742"]
         )
-        spim_data = handler.get_spim_data_from_slims(subject_id="744742")
-        assert len(spim_data) == 1
+        assert {"744742": test_imaging_data, "0": []} == data
+        with pytest.raises(ValueError) as e:
+            await handler.get_data_by_subject_async(subject_ids=[])
+        assert "subject_ids must not be empty!" in str(e.value)
 
-    def test_get_spim_data_from_slims_error(
-        self, mock_get_imaging_data: MagicMock
+    async def test_iter_data_async(
+        self,
+        mock_get_imaging_data: MagicMock,
+        test_imaging_data: List[SlimsSpimData],
     ):
-        """Tests get_spim_data_from_slims method when subject_id empty"""
-        handler = ImagingSessionHandler(
-            session=MagicMock(fetch=mock_get_imaging_data)
+        """Tests iter_data_async method"""
+        handler = ImagingSessionHandler(session=get_async_session())
+        data = [m async for m in handler.iter_data_async(subject_id="744742")]
+        assert test_imaging_data == data
+
+    async def test_get_data_page_async(
+        self,
+        mock_get_imaging_data: MagicMock,
+        test_imaging_data: List[SlimsSpimData],
+    ):
+        """Tests get_data_page_async method"""
+        handler = ImagingSessionHandler(session=get_async_session())
+        data, next_cursor = await handler.get_data_page_async(
+            subject_id="744742", limit=10
         )
+        assert test_imaging_data == data
+        assert next_cursor is None
+
+    async def test_get_data_async_error(self):
+        """Tests async method when subject_id is empty"""
+        handler = ImagingSessionHandler(session=MagicMock())
         with pytest.raises(ValueError) as e:
-            handler.get_spim_data_from_slims(subject_id="")
+            await handler.get_data_async(subject_id="")
         assert "subject_id must not be empty!" in str(e.value)
+        with pytest.raises(ValueError):
+            await anext(handler.iter_data_async(subject_id=""))
+        with pytest.raises(ValueError):
+            await handler.get_data_page_async(subject_id="")
 
 
 if __name__ == "__main__":
@@ -1,58 +1,170 @@
 """Tests methods in instrument handler module"""
 
-from unittest.mock import MagicMock
+import threading
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from aind_slims_service_server.async_session import get_async_session
+from aind_slims_service_server.cache import AttachmentCache
 from aind_slims_service_server.handlers.instrument import (
     InstrumentSessionHandler,
 )
+from aind_slims_service_server.instrument_index import InstrumentIndex
 
 
 class TestInstrumentSessionHandler:
     """Test class for InstrumentSessionHandler"""
 
+    async def test_get_instrument_data_no_records(self):
+        """Test None returned when no ReferenceDataRecord found"""
+        mock_session = MagicMock(fetch=AsyncMock(return_value=[]))
+        handler = InstrumentSessionHandler(session=mock_session)
+        result = await handler.get_instrument_data_async(
+            "NonExistentInstrument"
+        )
+        assert result == []
+
+    async def test_get_instrument_data_partial_match(
+        self,
+        mock_get_instrument_data: MagicMock,
+    ):
+        """Test partial_match=True uses contains criteria"""
+        handler = InstrumentSessionHandler(session=get_async_session())
+        partial_instrument_name = "SmartSPIM"
+        instrument_data = await handler.get_instrument_data_async(
+            partial_instrument_name, partial_match=True
+        )
+        assert instrument_data[0]["instrument_id"] == "SmartSPIM2-2"
+        criteria = mock_get_instrument_data.call_args.kwargs["criteria"]
+        assert "iContains" == criteria.to_dict()["criteria"][1]["operator"]
+
+    async def test_get_instrument_data_async(
+        self,
+        mock_get_instrument_data: MagicMock,
+    ):
+        """Tests get_instrument_data_async method"""
+        handler = InstrumentSessionHandler(
+            session=MagicMock(
+                fetch=AsyncMock(
+                    side_effect=mock_get_instrument_data.side_effect
+                )
+            )
+        )
+        instrument_data = await handler.get_instrument_data_async(
+            "SmartSPIM2-2"
+        )
+        assert instrument_data[0]["instrument_id"] == "SmartSPIM2-2"
+
     def test_get_instrument_data(
         self,
         mock_get_instrument_data: MagicMock,
     ):
-        """Tests get_instrument_data method"""
+        """Tests get_instrument_data runs get_instrument_data_async"""
+        handler = InstrumentSessionHandler(session=get_async_session())
+        instrument_data = handler.get_instrument_data("SmartSPIM2-2")
+        assert instrument_data[0]["instrument_id"] == "SmartSPIM2-2"
+
+    async def test_get_instrument_data_cached(
+        self,
+        mock_get_instrument_data: MagicMock,
+    ):
+        """Tests attachments are downloaded once and then served cached"""
+        cache = AttachmentCache(max_size=2)
         handler = InstrumentSessionHandler(
-            session=MagicMock(fetch=mock_get_instrument_data)
+            session=get_async_session(), attachment_cache=cache
         )
-        instrument_name = "SmartSPIM2-2"
-        instrument_data = handler.get_instrument_data(instrument_name)
-        assert instrument_data[0]["instrument_id"] == instrument_name
+        first = await handler.get_instrument_data_async("SmartSPIM2-2")
+        second = await handler.get_instrument_data_async("SmartSPIM2-2")
+        assert first == second
+        assert first is not second
+        handler._get_attachment_async.assert_called_once()
+        metrics = cache.metrics()
+        assert (1, 1, 1) == (metrics.size, metrics.hits, metrics.misses)
 
-    def test_get_instrument_data_empty_input(self):
-        """Test ValueError when input_id is empty"""
+    async def test_get_instrument_data_async_cached(
+        self,
+        mock_get_instrument_data: MagicMock,
+    ):
+        """Tests failed downloads are not cached"""
+        cache = AttachmentCache(max_size=2)
         handler = InstrumentSessionHandler(
-            session=MagicMock(fetch=MagicMock())
+            session=MagicMock(
+                fetch=AsyncMock(
+                    side_effect=mock_get_instrument_data.side_effect
+                )
+            ),
+            attachment_cache=cache,
         )
-        with pytest.raises(ValueError):
-            handler.get_instrument_data("")
+        handler._get_attachment_async.return_value.status_code = 500
+        await handler.get_instrument_data_async("SmartSPIM2-2")
+        assert 0 == cache.metrics().size
+        handler._get_attachment_async.return_value.status_code = 200
+        await handler.get_instrument_data_async("SmartSPIM2-2")
+        data = await handler.get_instrument_data_async("SmartSPIM2-2")
+        assert data[0]["instrument_id"] == "SmartSPIM2-2"
+        assert 2 == handler._get_attachment_async.call_count
+        assert (1, 1) == (cache.metrics().size, cache.metrics().hits)
 
-    def test_get_instrument_data_no_records(self):
-        """Test None returned when no ReferenceDataRecord found"""
-        mock_session = MagicMock()
-        mock_session.fetch.return_value = []
-        handler = InstrumentSessionHandler(session=mock_session)
-        result = handler.get_instrument_data("NonExistentInstrument")
-        assert result == []
+    async def test_get_instrument_data_cache_in_thread(
+        self,
+        mock_get_instrument_data: MagicMock,
+    ):
+        """Tests the attachment cache is used off the event loop thread"""
+        threads = []
+        cache = MagicMock(
+            get=MagicMock(
+                side_effect=lambda pk: threads.append(
+                    threading.current_thread()
+                )
+            ),
+            set=MagicMock(
+                side_effect=lambda pk, content: threads.append(
+                    threading.current_thread()
+                )
+            ),
+        )
+        handler = InstrumentSessionHandler(
+            session=get_async_session(), attachment_cache=cache
+        )
+        data = await handler.get_instrument_data_async("SmartSPIM2-2")
+        assert data[0]["instrument_id"] == "SmartSPIM2-2"
+        assert 2 == len(threads)
+        assert threading.current_thread() not in threads
 
-    def test_get_instrument_data_partial_match(
+    async def test_get_instrument_data_from_index(
         self,
         mock_get_instrument_data: MagicMock,
     ):
-        """Test partial_match=True uses contains criteria"""
+        """Tests a synced index is used instead of querying SLIMS"""
+        index = InstrumentIndex()
+        session = MagicMock(
+            fetch=AsyncMock(side_effect=mock_get_instrument_data.side_effect)
+        )
         handler = InstrumentSessionHandler(
-            session=MagicMock(fetch=mock_get_instrument_data)
+            session=session, instrument_index=index
         )
-        partial_instrument_name = "SmartSPIM"
-        instrument_data = handler.get_instrument_data(
-            partial_instrument_name, partial_match=True
+        data = await handler.get_instrument_data_async("SmartSPIM2-2")
+        assert 1 == len(data)
+        session.fetch.assert_awaited_once()
+        index.ready = True
+        data = await handler.get_instrument_data_async(
+            "SmartSPIM", partial_match=True
         )
-        assert instrument_data[0]["instrument_id"] == "SmartSPIM2-2"
+        assert [] == data
+        session.fetch.assert_awaited_once()
+        index.search = MagicMock(return_value=[5])
+        data = await handler.get_instrument_data_async(
+            "SmartSPIM", partial_match=True
+        )
+        assert data[0]["instrument_id"] == "SmartSPIM2-2"
+        index.search.assert_called_once_with("SmartSPIM", True)
+
+    async def test_get_instrument_data_async_empty_input(self):
+        """Test ValueError when input_id is empty"""
+        handler = InstrumentSessionHandler(session=MagicMock())
+        with pytest.raises(ValueError):
+            await handler.get_instrument_data_async("", partial_match=True)
 
 
 if __name__ == "__main__":
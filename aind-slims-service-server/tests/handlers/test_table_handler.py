@@ -1,16 +1,130 @@
 """Tests methods in table_handler module."""
 
+import asyncio
+import base64
 import unittest
 from datetime import datetime, timezone
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-import networkx as nx
+from slims.criteria import equals
+from slims.internal import Record
+from slims.slims import Slims
 
+from aind_slims_service_server.async_session import (
+    AsyncSlims,
+    RawColumn,
+    RawRecord,
+)
+from aind_slims_service_server.cache import TTLCache
 from aind_slims_service_server.handlers.table_handler import (
+    ForeignTableFetch,
+    RecordGraph,
+    RootPage,
+    RootSpec,
     SlimsTableHandler,
+    SubjectLookup,
 )
 
 
+def create_record(table_name: str, pk: int, **columns) -> Record:
+    """Create a slims Record with the given columns"""
+    json_entity = {
+        "tableName": table_name,
+        "pk": pk,
+        "columns": [{"name": k, "value": v} for k, v in columns.items()],
+    }
+    # noinspection PyTypeChecker
+    return Record(json_entity=json_entity, slims_api=None)
+
+
+class TestRecordGraph(unittest.TestCase):
+    """Test class for RecordGraph"""
+
+    def test_add_node(self):
+        """Tests records are indexed by table name and pk"""
+        g = RecordGraph()
+        run = g.add_node("Run", create_record("Run", 1))
+        step = g.add_node("Step", create_record("Step", 1))
+        new_row = create_record("Run", 1, run_name="a")
+        self.assertEqual(run, g.add_node("Run", new_row))
+        self.assertEqual(2, len(g))
+        self.assertIs(new_row, g.row(run))
+        self.assertEqual("Step", g.table_name(step))
+        self.assertEqual(step, g.get_node("Step", 1))
+        self.assertIsNone(g.get_node("Step", 2))
+        self.assertIsNone(g.get_node("Content", 1))
+
+    def test_add_nodes(self):
+        """Tests records are added in bulk and duplicates are merged"""
+        g = RecordGraph()
+        run = g.add_node("Run", create_record("Run", 1))
+        run_1, run_2 = create_record("Run", 1), create_record("Run", 2)
+        nodes = g.add_nodes("Run", [run_1, create_record("Run", 2), run_2])
+        self.assertEqual([run, run + 1, run + 1], nodes)
+        self.assertEqual(2, len(g))
+        self.assertIs(run_1, g.row(run))
+        self.assertIs(run_2, g.row(run + 1))
+        self.assertEqual([], g.successors(run + 1))
+        self.assertEqual({1: run, 2: run + 1}, g.get_table_index("Run"))
+        self.assertEqual({}, g.get_table_index("Step"))
+
+    def test_edges_and_descendants(self):
+        """Tests successors, descendants and duplicate edges"""
+        g = RecordGraph()
+        run, step, result, content = [
+            g.add_node(table, create_record(table, 1))
+            for table in ["Run", "Step", "Result", "Content"]
+        ]
+        g.add_edge(run, step)
+        g.add_edge(run, step)
+        g.add_edge(step, result)
+        g.add_edge(run, content)
+        g.add_edge(content, result)
+        self.assertEqual([step, content], g.successors(run))
+        self.assertEqual({step, result, content}, set(g.descendants(run)))
+        self.assertEqual(3, len(g.descendants(run)))
+        self.assertEqual([], g.descendants(result))
+        self.assertEqual(
+            {
+                ("Run.1", "Step.1"),
+                ("Run.1", "Content.1"),
+                ("Step.1", "Result.1"),
+                ("Content.1", "Result.1"),
+            },
+            {(g.name(u), g.name(v)) for u, v in g.edges()},
+        )
+
+    def test_iter_descendants(self):
+        """Tests shared subtrees are reused and cycles are walked"""
+        g = RecordGraph()
+        runs = g.add_nodes("Run", [create_record("Run", i) for i in range(3)])
+        steps = g.add_nodes(
+            "Step", [create_record("Step", i) for i in range(3)]
+        )
+        sop, ref, parent_ref = g.add_nodes(
+            "Ref", [create_record("Ref", i) for i in range(3)]
+        )
+        for run, step in zip(runs, steps):
+            g.add_edge(run, step)
+            g.add_edge(step, sop)
+        g.add_edge(runs[2], ref)
+        g.add_edge(steps[2], ref)
+        g.add_edge(sop, ref)
+        g.add_edge(ref, parent_ref)
+        g.add_edge(parent_ref, ref)
+        g.add_edge(parent_ref, sop)
+        roots = [runs[2], runs[0]]
+        results = list(g.iter_descendants(roots))
+        self.assertEqual(roots, [root for root, _ in results])
+        for root, node_des in results:
+            self.assertEqual(len(set(node_des)), len(node_des))
+            self.assertEqual(set(g.descendants(root)), set(node_des))
+        self.assertEqual({steps[0], sop, ref, parent_ref}, set(results[1][1]))
+        self.assertEqual(
+            {ref, parent_ref}, set(next(g.iter_descendants([sop]))[1])
+        )
+
+
 class TestSlimsTableHandler(unittest.TestCase):
     """Test class for SlimsTableHandler"""
 
@@ -67,6 +181,45 @@ class TestSlimsTableHandler(unittest.TestCase):
 
         self.assertEqual(expected_criteria, criteria.to_dict())
 
+    def test_get_after_criteria(self):
+        """Tests the criteria of the rows after a row in key order"""
+        criteria = SlimsTableHandler.get_after_criteria(
+            "rdrc_modifiedOn", "rdrc_pk", 20, 3
+        )
+        expected_criteria = {
+            "operator": "or",
+            "criteria": [
+                {
+                    "fieldName": "rdrc_modifiedOn",
+                    "operator": "greaterThan",
+                    "value": 20,
+                },
+                {
+                    "operator": "and",
+                    "criteria": [
+                        {
+                            "fieldName": "rdrc_modifiedOn",
+                            "operator": "equals",
+                            "value": 20,
+                        },
+                        {
+                            "fieldName": "rdrc_pk",
+                            "operator": "greaterThan",
+                            "value": 3,
+                        },
+                    ],
+                },
+            ],
+        }
+        self.assertEqual(expected_criteria, criteria.to_dict())
+        criteria = SlimsTableHandler.get_after_criteria(
+            "rdrc_modifiedOn", "rdrc_pk", None, 3
+        )
+        self.assertEqual(
+            ["isNull", "greaterThan"],
+            [c["operator"] for c in criteria.to_dict()["criteria"]],
+        )
+
     def test_parse_html(self):
         """Tests parse html"""
         protocol_html = '<a href="https://example.com">Example</a>'
@@ -120,52 +273,633 @@ class TestSlimsTableHandler(unittest.TestCase):
     def test_update_graph_with_foreign_table_pk_list(self):
         """Tests _update_graph with foreign table
         and a list of foreign keys."""
-        g = nx.DiGraph()
+        g = RecordGraph()
         foreign_table = "Foreign"
         input_table = "Input"
         input_table_cols = ["some_fk"]
         foreign_table_col = "some_fk_pk"
 
-        foreign_row1 = MagicMock()
-        foreign_row1.pk.return_value = 1
-        foreign_row1.table_name.return_value = foreign_table
-        foreign_row2 = MagicMock()
-        foreign_row2.pk.return_value = 2
-        foreign_row2.table_name.return_value = foreign_table
+        foreign_rows = [
+            create_record(foreign_table, 1),
+            create_record(foreign_table, 2),
+        ]
+        input_row = create_record(input_table, 100, some_fk=[1, 2, 3])
 
-        foreign_rows = [foreign_row1, foreign_row2]
+        mock_session = MagicMock()
+        handler = SlimsTableHandler(session=mock_session)
+        handler._update_graph(
+            foreign_table=foreign_table,
+            foreign_rows=foreign_rows,
+            foreign_table_col=foreign_table_col,
+            input_table=input_table,
+            input_rows=[input_row],
+            input_table_cols=input_table_cols,
+            g=g,
+        )
+        self.assertEqual(
+            {
+                (f"{input_table}.100", f"{foreign_table}.1"),
+                (f"{input_table}.100", f"{foreign_table}.2"),
+            },
+            {(g.name(u), g.name(v)) for u, v in g.edges()},
+        )
 
-        for row in foreign_rows:
-            g.add_node(f"{foreign_table}.{row.pk()}")
+    def test_update_graph_with_foreign_table_fk(self):
+        """Tests _update_graph links foreign rows to their input rows"""
+        g = RecordGraph()
+        run = create_record("Run", 1)
+        g.add_node("Run", run)
+        handler = SlimsTableHandler(session=MagicMock())
+        handler._update_graph(
+            foreign_table="Step",
+            foreign_rows=[
+                create_record("Step", 10, step_fk_run=1),
+                create_record("Step", 11, step_fk_run=2),
+                create_record("Step", 12, step_fk_run=[1]),
+                create_record("Step", 13),
+            ],
+            foreign_table_col="step_fk_run",
+            input_table="Run",
+            input_rows=[run],
+            input_table_cols=["run_pk"],
+            g=g,
+        )
+        self.assertEqual(
+            {("Run.1", "Step.10")},
+            {(g.name(u), g.name(v)) for u, v in g.edges()},
+        )
 
-        input_row = MagicMock()
-        input_row.table_name.return_value = input_table
-        input_row.pk.return_value = 100
+    def test_get_row_keys(self):
+        """Tests keys of all columns are collected and lists flattened"""
+        row = create_record("Step", 1, a_fk=1, b_fk=[2, 3], c_fk=None)
+        self.assertEqual(
+            [1, 2, 3],
+            SlimsTableHandler._get_row_keys(
+                row, ["a_fk", "b_fk", "c_fk", "d_fk"]
+            ),
+        )
+
+    def test_sort_root_nodes(self):
+        """Tests root nodes are sorted newest first"""
+        g = RecordGraph()
+        root_nodes = [
+            g.add_node(
+                "Run", create_record("Run", pk, run_createdOn=created_on)
+            )
+            for pk, created_on in [(1, 10), (2, None), (3, 30)]
+        ]
+        sorted_nodes = SlimsTableHandler._sort_root_nodes(
+            g, root_nodes, "run_createdOn"
+        )
+        self.assertEqual(
+            ["Run.2", "Run.3", "Run.1"], [g.name(n) for n in sorted_nodes]
+        )
+
+    def test_encode_decode_cursor(self):
+        """Tests cursors round trip and malformed cursors are rejected"""
+        cursor = SlimsTableHandler.encode_cursor(1739398415380, 42)
+        self.assertEqual(
+            (1739398415380, 42), SlimsTableHandler.decode_cursor(cursor)
+        )
+        self.assertIsNone(SlimsTableHandler.decode_cursor(None))
+        for bad_json in [b"[1]", b"5", b'["a", 1]', b"\xff"]:
+            bad_cursor = base64.urlsafe_b64encode(bad_json).decode()
+            with self.assertRaises(ValueError):
+                SlimsTableHandler.decode_cursor(bad_cursor)
+        with self.assertRaises(ValueError):
+            SlimsTableHandler.decode_cursor("a")
+
+    def test_get_page_criteria(self):
+        """Tests rows after the cursor are added to the criteria"""
+        page = RootPage(
+            created_on_col="run_createdOn", pk_col="run_pk", limit=2
+        )
+        self.assertIsNone(SlimsTableHandler._get_page_criteria(page, None))
+        after_cursor = {
+            "operator": "or",
+            "criteria": [
+                {
+                    "fieldName": "run_createdOn",
+                    "operator": "lessThan",
+                    "value": 10,
+                },
+                {
+                    "operator": "and",
+                    "criteria": [
+                        {
+                            "fieldName": "run_createdOn",
+                            "operator": "equals",
+                            "value": 10,
+                        },
+                        {
+                            "fieldName": "run_pk",
+                            "operator": "lessThan",
+                            "value": 3,
+                        },
+                    ],
+                },
+            ],
+        }
+        page = page._replace(cursor=(10, 3))
+        self.assertEqual(
+            after_cursor,
+            SlimsTableHandler._get_page_criteria(page, None).to_dict(),
+        )
+        self.assertEqual(
+            {
+                "operator": "and",
+                "criteria": [
+                    {
+                        "fieldName": "run_name",
+                        "operator": "equals",
+                        "value": "a",
+                    },
+                    after_cursor,
+                ],
+            },
+            SlimsTableHandler._get_page_criteria(
+                page, equals("run_name", "a")
+            ).to_dict(),
+        )
+
+    def test_get_next_cursor(self):
+        """Tests the next cursor is only returned for a full page"""
+        handler = SlimsTableHandler(session=MagicMock())
+        g = RecordGraph()
+        run_1 = g.add_node("Run", create_record("Run", 1, run_createdOn=10))
+        run_2 = g.add_node("Run", create_record("Run", 2, run_createdOn=None))
+        page = RootPage(
+            created_on_col="run_createdOn", pk_col="run_pk", limit=1
+        )
+        self.assertIsNone(handler._get_next_cursor(g, [run_1], None))
+        self.assertIsNone(
+            handler._get_next_cursor(g, [], page._replace(limit=2))
+        )
+        self.assertIsNone(handler._get_next_cursor(g, [run_2], page))
+        self.assertEqual((10, 1), handler._get_next_cursor(g, [run_1], page))
+
+    def test_combine_criteria(self):
+        """Tests criteria that are not None are combined"""
+        a = equals("a", 1)
+        b = equals("b", 2)
+        self.assertIsNone(SlimsTableHandler._combine_criteria(None, None))
+        self.assertIs(a, SlimsTableHandler._combine_criteria(None, a))
+        self.assertEqual(
+            {"operator": "and", "criteria": [a.to_dict(), b.to_dict()]},
+            SlimsTableHandler._combine_criteria(a, None, b).to_dict(),
+        )
+
+    def test_get_subject_criteria(self):
+        """Tests a batch of subjects is looked up in chunks"""
+        handler = SlimsTableHandler(session=MagicMock(), fk_chunk_size=2)
+        self.assertEqual(
+            [
+                {
+                    "fieldName": "cntn_barCode",
+                    "operator": "equals",
+                    "value": "1",
+                }
+            ],
+            [
+                c.to_dict()
+                for c in handler._get_subject_criteria("cntn_barCode", "1")
+            ],
+        )
+        self.assertEqual(
+            [["1", "2"], ["3"]],
+            [
+                c.to_dict()["value"]
+                for c in handler._get_subject_criteria(
+                    "cntn_barCode", ["1", "2", "3"]
+                )
+            ],
+        )
+        lookup = handler._get_experiment_run_lookup(
+            "cntn_barCode", ["1", "2", "3"]
+        )
+        self.assertEqual(2, len(lookup.plan[0].key_chunks))
+
+    def test_get_unique_subject_ids(self):
+        """Tests duplicates are dropped and empty batches are rejected"""
+        self.assertEqual(
+            ["2", "1"],
+            SlimsTableHandler._get_unique_subject_ids(["2", "1", "2"]),
+        )
+        with self.assertRaises(ValueError):
+            SlimsTableHandler._get_unique_subject_ids([])
+        with self.assertRaises(ValueError):
+            SlimsTableHandler._get_unique_subject_ids(["1", ""])
+
+    def test_group_by_subject(self):
+        """Tests results are added to each requested subject"""
+        grouped = SlimsTableHandler._group_by_subject(
+            [("a", ["1"]), ("b", ["1", "2"]), ("c", [None, "3"])],
+            ["1", "2", "4"],
+            lambda m: m[1],
+        )
+        self.assertEqual(
+            {
+                "1": [("a", ["1"]), ("b", ["1", "2"])],
+                "2": [("b", ["1", "2"])],
+                "4": [],
+            },
+            grouped,
+        )
+
+    def test_get_plan_levels(self):
+        """Tests fetches are grouped by dependency depth"""
+        plan = [
+            ForeignTableFetch(name="A", foreign_table="A"),
+            ForeignTableFetch(name="B", foreign_table="B", input_name="A"),
+            ForeignTableFetch(name="C", foreign_table="C", input_name="A"),
+            ForeignTableFetch(name="D", foreign_table="D", input_name="C"),
+        ]
+        levels = SlimsTableHandler._get_plan_levels(plan)
+        self.assertEqual(
+            [["A"], ["B", "C"], ["D"]],
+            [[f.name for f in level] for level in levels],
+        )
+
+    def test_get_plan_levels_unknown_input(self):
+        """Tests error raised when a fetch depends on an unknown fetch"""
+        plan = [ForeignTableFetch(name="B", foreign_table="B", input_name="A")]
+        with self.assertRaises(ValueError):
+            SlimsTableHandler._get_plan_levels(plan)
 
+    def test_get_reference_cache_key(self):
+        """Tests only cacheable fetches without an input are cached"""
+        handler = SlimsTableHandler(
+            session=MagicMock(),
+            reference_cache=TTLCache(ttl_seconds=60, max_size=2),
+        )
+        fetch = ForeignTableFetch(
+            name="Template", foreign_table="Template", cacheable=True
+        )
+        self.assertEqual(
+            ("Template", None, None),
+            handler._get_reference_cache_key(fetch),
+        )
+        self.assertEqual(
+            ("Template", None, ("xptm_name", "xptm_pk")),
+            handler._get_reference_cache_key(fetch, {"xptm_pk", "xptm_name"}),
+        )
+        self.assertIsNone(
+            handler._get_reference_cache_key(
+                ForeignTableFetch(name="Template", foreign_table="Template")
+            )
+        )
+        self.assertIsNone(
+            SlimsTableHandler(session=MagicMock())._get_reference_cache_key(
+                ForeignTableFetch(
+                    name="Template", foreign_table="Template", cacheable=True
+                )
+            )
+        )
+
+    def test_get_plan_columns(self):
+        """Tests declared columns are extended with the join columns"""
+        page = RootPage(
+            created_on_col="run_createdOn", pk_col="run_pk", limit=1
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Run",
+                foreign_table="Run",
+                is_root=True,
+                page=page,
+                columns=("run_name",),
+            ),
+            ForeignTableFetch(
+                name="Step",
+                input_name="Run",
+                input_table_cols=("run_pk",),
+                foreign_table="Step",
+                foreign_table_col="step_fk_run",
+                columns=("step_name",),
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="Step",
+                input_table_cols=("step_fk_content",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+            ),
+        ]
+        self.assertEqual(
+            {
+                "Run": {"run_name", "run_createdOn", "run_pk"},
+                "Step": {"step_name", "step_fk_run", "step_fk_content"},
+                "Content": None,
+            },
+            SlimsTableHandler._get_plan_columns(plan),
+        )
+        plan.append(
+            ForeignTableFetch(
+                name="NextStep",
+                input_name="Step",
+                input_table_cols=("step_fk_next",),
+                foreign_table="Step",
+                foreign_table_col="step_pk",
+                columns=("step_label",),
+            )
+        )
+        step_columns = {
+            "step_name",
+            "step_label",
+            "step_fk_run",
+            "step_fk_content",
+            "step_fk_next",
+            "step_pk",
+        }
+        plan_columns = SlimsTableHandler._get_plan_columns(plan)
+        self.assertEqual(step_columns, plan_columns["Step"])
+        self.assertEqual(step_columns, plan_columns["NextStep"])
+        plan[-1] = plan[-1]._replace(columns=None)
+        plan_columns = SlimsTableHandler._get_plan_columns(plan)
+        self.assertIsNone(plan_columns["Step"])
+        self.assertIsNone(plan_columns["NextStep"])
+
+    def test_get_lookup_plan(self):
+        """Tests the key column is kept in the rows of the key fetch"""
+        lookup = SubjectLookup(
+            plan=[
+                ForeignTableFetch(
+                    name="Content",
+                    foreign_table="Content",
+                    columns=("cntn_barCode",),
+                ),
+                ForeignTableFetch(
+                    name="Step",
+                    input_name="Content",
+                    input_table_cols=("cntn_pk",),
+                    foreign_table="Step",
+                    foreign_table_col="step_fk_content",
+                ),
+            ],
+            key_fetch="Content",
+            key_col="cntn_fk_run",
+            root_col="run_pk",
+        )
+        plan = SlimsTableHandler._get_lookup_plan(lookup)
+        self.assertEqual(("cntn_barCode", "cntn_fk_run"), plan[0].columns)
+        self.assertIs(lookup.plan[1], plan[1])
+        lookup = lookup._replace(key_fetch="Step")
+        self.assertEqual(
+            lookup.plan, SlimsTableHandler._get_lookup_plan(lookup)
+        )
+
+    def test_handler_hooks_not_implemented(self):
+        """Tests the hooks of the query pipeline must be implemented"""
+        handler = SlimsTableHandler(session=MagicMock())
+        with self.assertRaises(NotImplementedError):
+            handler._get_lookup("123456")
+        with self.assertRaises(NotImplementedError):
+            handler._get_fetch_plan()
+        with self.assertRaises(NotImplementedError):
+            handler._parse_graph(g=RecordGraph(), root_nodes=[])
+
+    def test_run_sync(self):
+        """Tests _run_sync swaps a sync Slims session for the call"""
+        session = Slims("slims", "http://slims", "user", "pass")
+        handler = SlimsTableHandler(session=session, max_workers=2)
+        sessions = []
+
+        async def method(value: int) -> int:
+            """Record the session of the call"""
+            sessions.append(handler.session)
+            return value + 1
+
+        self.assertEqual(2, handler._run_sync(method, 1))
+        self.assertIsInstance(sessions[0], AsyncSlims)
+        self.assertTrue(sessions[0].client.is_closed)
+        self.assertIs(session, handler.session)
         mock_session = MagicMock()
         handler = SlimsTableHandler(session=mock_session)
-        with patch.object(
-            SlimsTableHandler,
-            "get_attr_or_none",
-            return_value=[1, 2],
-        ):
-            handler._update_graph(
-                foreign_table=foreign_table,
-                foreign_rows=foreign_rows,
-                foreign_table_col=foreign_table_col,
-                input_table=input_table,
-                input_rows=[input_row],
-                input_table_cols=input_table_cols,
-                g=g,
-            )
-            self.assertIn(
-                (f"{input_table}.100", f"{foreign_table}.1"), g.edges
+        self.assertEqual(3, handler._run_sync(method, 2))
+        self.assertIs(mock_session, sessions[1])
+        mock_session.aclose.assert_not_called()
+
+
+class TestSlimsTableHandlerAsync(unittest.IsolatedAsyncioTestCase):
+    """Test async methods in SlimsTableHandler"""
+
+    async def test_build_graph_async(self):
+        """Tests _build_graph_async links rows and skips empty inputs"""
+        rows = {
+            "Run": [create_record("Run", 1, run_pk=1)],
+            "Step": [create_record("Step", 10, step_fk_content=30)],
+            "Content": [create_record("Content", 30, cntn_pk=30)],
+        }
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            side_effect=lambda table, criteria: rows[table]
+        )
+        plan = [
+            ForeignTableFetch(name="Run", foreign_table="Run", is_root=True),
+            ForeignTableFetch(
+                name="Step",
+                input_name="Run",
+                input_table_cols=("run_pk",),
+                foreign_table="Step",
+                foreign_table_col="step_fk_run",
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="Step",
+                input_table_cols=("step_fk_content",),
+                foreign_table="Content",
+                foreign_table_col="cntn_pk",
+            ),
+            ForeignTableFetch(
+                name="Empty",
+                input_name="Run",
+                input_table_cols=("missing_col",),
+                foreign_table="Empty",
+                foreign_table_col="empty_fk_run",
+            ),
+        ]
+        handler = SlimsTableHandler(session=mock_session)
+        g, root_nodes = await handler._build_graph_async(plan)
+        self.assertEqual(["Run.1"], [g.name(n) for n in root_nodes])
+        self.assertEqual(
+            {("Step.10", "Content.30")},
+            {(g.name(u), g.name(v)) for u, v in g.edges()},
+        )
+        self.assertEqual(3, mock_session.fetch.await_count)
+
+    async def test_build_graph_async_reference_cache(self):
+        """Tests cacheable lookup rows are served from the cache"""
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            return_value=[create_record("Template", 1, tmpl_pk=1)]
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Template",
+                foreign_table="Template",
+                is_root=True,
+                cacheable=True,
             )
-            self.assertIn(
-                (f"{input_table}.100", f"{foreign_table}.2"), g.edges
+        ]
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        handler = SlimsTableHandler(
+            session=mock_session, reference_cache=cache
+        )
+        await handler._build_graph_async(plan)
+        g, root_nodes = await handler._build_graph_async(plan)
+        self.assertEqual(["Template.1"], [g.name(n) for n in root_nodes])
+        self.assertEqual(1, mock_session.fetch.await_count)
+
+    async def test_fetch_foreign_rows_async_chunked(self):
+        """Tests chunks are fetched concurrently and deduplicated"""
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            return_value=[create_record("Content", 1000)]
+        )
+        handler = SlimsTableHandler(
+            session=mock_session, max_workers=1, fk_chunk_size=2
+        )
+        rows = await handler._fetch_foreign_rows_async(
+            input_rows=[
+                create_record("Step", i, step_fk_content=[i, i + 1])
+                for i in range(0, 6, 2)
+            ],
+            input_table_cols=["step_fk_content"],
+            foreign_table="Content",
+            foreign_table_col="cntn_pk",
+        )
+        self.assertEqual(3, mock_session.fetch.await_count)
+        self.assertEqual([1000], [r.pk() for r in rows])
+
+    async def test_build_graph_async_concurrency_cap(self):
+        """Tests fetches of a level and their chunks share one cap"""
+        in_flight = []
+        max_in_flight = []
+
+        async def fetch(table, criteria):
+            """Track the number of fetches in flight"""
+            in_flight.append(table)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.remove(table)
+            if table == "Run":
+                return [create_record("Run", 1, run_fks=list(range(8)))]
+            return []
+
+        mock_session = MagicMock(fetch=AsyncMock(side_effect=fetch))
+        handler = SlimsTableHandler(
+            session=mock_session, max_workers=3, fk_chunk_size=2
+        )
+        plan = [ForeignTableFetch(name="Run", foreign_table="Run")] + [
+            ForeignTableFetch(
+                name=name,
+                input_name="Run",
+                input_table_cols=("run_fks",),
+                foreign_table=name,
+                foreign_table_col=f"{name}_pk",
             )
+            for name in ("Step", "Result", "Content")
+        ]
+        await handler._build_graph_async(plan)
+        self.assertEqual(13, mock_session.fetch.await_count)
+        self.assertEqual(3, max(max_in_flight))
 
-    def test_get_rows_from_foreign_table_no_foreign_keys(self):
+    async def test_build_graph_async_page(self):
+        """Tests a page of root rows is fetched for the input keys"""
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            side_effect=[
+                [create_record("Template", 1, tmpl_pk=1)],
+                [
+                    create_record("Run", 1, run_createdOn=10),
+                    create_record("Run", 2, run_createdOn=20),
+                ],
+            ]
+        )
+        handler = SlimsTableHandler(session=mock_session)
+        page = RootPage(
+            created_on_col="run_createdOn", pk_col="run_pk", limit=1
+        )
+        plan = [
+            ForeignTableFetch(name="Template", foreign_table="Template"),
+            ForeignTableFetch(
+                name="Run",
+                input_name="Template",
+                input_table_cols=("tmpl_pk",),
+                foreign_table="Run",
+                foreign_table_col="run_fk_template",
+                is_root=True,
+                page=page,
+            ),
+        ]
+        g, root_nodes = await handler._build_graph_async(plan)
+        self.assertEqual(["Run.2"], [g.name(n) for n in root_nodes])
+        self.assertEqual(
+            (20, 2), handler._get_next_cursor(g, root_nodes, page)
+        )
+        fetch_kwargs = mock_session.fetch.await_args.kwargs
+        self.assertEqual(["-run_createdOn", "-run_pk"], fetch_kwargs["sort"])
+
+    async def test_build_graph_async_raw(self):
+        """Tests fetches that declare columns are fetched as raw records"""
+        rows = {
+            "Run": [RawRecord("Run", 1, {"run_pk": RawColumn(1)})],
+            "Step": [
+                RawRecord("Step", 10, {"step_fk_run": RawColumn(1)}),
+                RawRecord("Step", 11, {"step_fk_run": RawColumn(2)}),
+            ],
+        }
+        mock_session = MagicMock()
+        mock_session.fetch_raw = AsyncMock(
+            side_effect=lambda table, criteria, columns: rows[table]
+        )
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        handler = SlimsTableHandler(
+            session=mock_session, reference_cache=cache
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Run",
+                foreign_table="Run",
+                is_root=True,
+                cacheable=True,
+                columns=("run_name",),
+            ),
+            ForeignTableFetch(
+                name="Step",
+                input_name="Run",
+                input_table_cols=("run_pk",),
+                foreign_table="Step",
+                foreign_table_col="step_fk_run",
+                columns=(),
+            ),
+        ]
+        await handler._build_graph_async(plan)
+        g, root_nodes = await handler._build_graph_async(plan)
+        self.assertEqual(["Run.1"], [g.name(n) for n in root_nodes])
+        self.assertEqual(
+            {("Run.1", "Step.10")},
+            {(g.name(u), g.name(v)) for u, v in g.edges()},
+        )
+        self.assertEqual(
+            [{"run_name", "run_pk"}, {"step_fk_run"}, {"step_fk_run"}],
+            [
+                c.kwargs["columns"]
+                for c in mock_session.fetch_raw.await_args_list
+            ],
+        )
+        mock_session.fetch.assert_not_called()
+
+    async def test_get_attachment_async(self):
+        """Tests _get_attachment_async method"""
+        mock_session = MagicMock()
+        mock_session.get = AsyncMock(return_value="response")
+        handler = SlimsTableHandler(session=mock_session)
+        response = await handler._get_attachment_async(pk=123)
+        mock_session.get.assert_awaited_once_with("repo/123")
+        self.assertEqual("response", response)
+
+    async def test_fetch_foreign_rows_async_no_foreign_keys(self):
         """Test when no foreign keys are present."""
         mock_session = MagicMock()
         handler = SlimsTableHandler(session=mock_session)
@@ -175,8 +909,7 @@ class TestSlimsTableHandler(unittest.TestCase):
             "get_attr_or_none",
             return_value=None,
         ):
-            result = handler.get_rows_from_foreign_table(
-                input_table="Input",
+            result = await handler._fetch_foreign_rows_async(
                 input_rows=[input_row],
                 foreign_table="Foreign",
                 foreign_table_col="some_fk_pk",
@@ -185,67 +918,308 @@ class TestSlimsTableHandler(unittest.TestCase):
             self.assertEqual(result, [])
             mock_session.fetch.assert_not_called()
 
-    def test_get_rows_from_foreign_table_with_extra_criteria(self):
+    async def test_fetch_foreign_rows_async_extra_criteria(self):
         """Tests conjunction when extra_criteria is provided."""
+        mock_session = MagicMock(fetch=AsyncMock(return_value=[]))
+        handler = SlimsTableHandler(session=mock_session)
+        input_row = create_record("Input", 1, some_fk=42)
+        extra_criteria = MagicMock(name="extra_criteria")
+        await handler._fetch_foreign_rows_async(
+            input_rows=[input_row],
+            foreign_table="Foreign",
+            foreign_table_col="some_fk_pk",
+            input_table_cols=["some_fk"],
+            extra_criteria=extra_criteria,
+        )
+        mock_session.fetch.assert_awaited_once()
+        _, kwargs = mock_session.fetch.call_args
+        criteria = kwargs.get("criteria")
+        from slims.criteria import Junction
+
+        self.assertIsInstance(criteria, Junction)
+
+    async def test_fetch_foreign_rows_async_key_values_list(self):
+        """Test _fetch_foreign_rows_async where key_values is a list"""
+        mock_session = MagicMock(fetch=AsyncMock(return_value=[]))
+        handler = SlimsTableHandler(session=mock_session)
+        input_row = create_record("Input", 1, some_fk=[1, 2])
+        await handler._fetch_foreign_rows_async(
+            input_rows=[input_row],
+            foreign_table="Foreign",
+            foreign_table_col="some_fk_pk",
+            input_table_cols=["some_fk"],
+        )
+        mock_session.fetch.assert_awaited_once()
+        _, kwargs = mock_session.fetch.call_args
+        criteria = kwargs.get("criteria")
+        self.assertTrue(
+            hasattr(criteria, "to_dict")
+            and set(criteria.to_dict().get("value", [])) == {1, 2}
+        )
+
+    async def test_build_graph_async_root_page(self):
+        """Tests a page of root rows is fetched and sorted newest first"""
         mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            return_value=[
+                create_record("Run", 1, run_createdOn=10),
+                create_record("Run", 3, run_createdOn=20),
+                create_record("Run", 2, run_createdOn=20),
+            ]
+        )
         handler = SlimsTableHandler(session=mock_session)
-        input_row = MagicMock()
-        with patch.object(
-            SlimsTableHandler,
-            "get_attr_or_none",
-            return_value=42,
-        ):
-            extra_criteria = MagicMock(name="extra_criteria")
-            handler.get_rows_from_foreign_table(
-                input_table="Input",
-                input_rows=[input_row],
-                foreign_table="Foreign",
-                foreign_table_col="some_fk_pk",
-                input_table_cols=["some_fk"],
-                extra_criteria=extra_criteria,
+        page = RootPage(
+            created_on_col="run_createdOn",
+            pk_col="run_pk",
+            limit=2,
+            cursor=(30, 4),
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Run", foreign_table="Run", is_root=True, page=page
             )
-            mock_session.fetch.assert_called_once()
-            _, kwargs = mock_session.fetch.call_args
-            criteria = kwargs.get("criteria")
-            from slims.criteria import Junction
-
-            self.assertIsInstance(criteria, Junction)
+        ]
+        g, root_nodes = await handler._build_graph_async(plan)
+        self.assertEqual(["Run.3", "Run.2"], [g.name(n) for n in root_nodes])
+        fetch_kwargs = mock_session.fetch.call_args.kwargs
+        self.assertEqual(["-run_createdOn", "-run_pk"], fetch_kwargs["sort"])
+        self.assertEqual((0, 2), (fetch_kwargs["start"], fetch_kwargs["end"]))
+        self.assertEqual(
+            SlimsTableHandler._get_page_criteria(page, None).to_dict(),
+            fetch_kwargs["criteria"].to_dict(),
+        )
 
-    def test_get_rows_from_foreign_table_key_values_list(self):
-        """Test get_rows_from_foreign_table where key_values is a list"""
+    async def test_fetch_foreign_rows_async_chunked_page(self):
+        """Tests a page fetched in chunks is merged and trimmed"""
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            side_effect=lambda **kwargs: [
+                create_record("Run", pk, run_createdOn=pk)
+                for pk in kwargs["criteria"].to_dict()["value"]
+            ]
+        )
+        handler = SlimsTableHandler(session=mock_session, fk_chunk_size=2)
+        rows = await handler._fetch_foreign_rows_async(
+            input_rows=[create_record("Template", 1, run_pks=[1, 2, 3, 4])],
+            input_table_cols=["run_pks"],
+            foreign_table="Run",
+            foreign_table_col="run_pk",
+            page=RootPage(
+                created_on_col="run_createdOn", pk_col="run_pk", limit=3
+            ),
+        )
+        self.assertEqual([4, 3, 2], [r.pk() for r in rows])
 
+    async def test_build_subject_graph_async(self):
+        """Tests roots are fetched with the keys found by a lookup"""
         mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            side_effect=[
+                [
+                    create_record("Content", 1, cntn_pk=1),
+                    create_record("Content", 2, cntn_pk=[2]),
+                    create_record("Content", 3),
+                ],
+                [create_record("Event", 5, evnt_fk_content=2)],
+                [],
+            ]
+        )
         handler = SlimsTableHandler(session=mock_session)
-        input_row = MagicMock()
-        with patch.object(
-            SlimsTableHandler,
-            "get_attr_or_none",
-            side_effect=[[1, 2], [1, 2]],
-        ):
-            handler.get_rows_from_foreign_table(
-                input_table="Input",
-                input_rows=[input_row],
-                foreign_table="Foreign",
-                foreign_table_col="some_fk_pk",
-                input_table_cols=["some_fk"],
+        lookup = SubjectLookup(
+            plan=[ForeignTableFetch(name="Content", foreign_table="Content")],
+            key_fetch="Content",
+            key_col="cntn_pk",
+            root_col="evnt_fk_content",
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Event", foreign_table="Event", is_root=True
             )
-            mock_session.fetch.assert_called_once()
-            _, kwargs = mock_session.fetch.call_args
-            criteria = kwargs.get("criteria")
-            self.assertTrue(
-                hasattr(criteria, "to_dict")
-                and set(criteria.to_dict().get("value", [])) == {1, 2}
+        ]
+        g, root_nodes = await handler._build_subject_graph_async(lookup, plan)
+        self.assertEqual(["Event.5"], [g.name(n) for n in root_nodes])
+        self.assertEqual(
+            {
+                "fieldName": "evnt_fk_content",
+                "operator": "inSet",
+                "value": [1, 2],
+            },
+            mock_session.fetch.call_args.kwargs["criteria"].to_dict(),
+        )
+        g, root_nodes = await handler._build_subject_graph_async(lookup, plan)
+        self.assertEqual([], [g.name(n) for n in root_nodes])
+        self.assertEqual(0, len(g))
+        self.assertEqual(3, mock_session.fetch.call_count)
+        self.assertIsNone(handler._get_experiment_run_lookup("cntn_id", None))
+
+    async def test_build_subject_graph_async_chunked_page(self):
+        """Tests root keys are fetched in chunks and merged into one page"""
+        events = {
+            1: create_record("Event", 1, evnt_createdOn=10),
+            2: create_record("Event", 2, evnt_createdOn=30),
+            3: create_record("Event", 3, evnt_createdOn=20),
+        }
+
+        async def fetch(table, criteria, **kwargs):
+            """Return the content rows, or the events of a chunk of keys"""
+            if table == "Content":
+                return [create_record("Content", 9, cntn_fk_event=[1, 2, 3])]
+            keys = criteria.to_dict()["criteria"][1]["value"]
+            return [events[k] for k in keys]
+
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(side_effect=fetch)
+        handler = SlimsTableHandler(session=mock_session, fk_chunk_size=2)
+        lookup = SubjectLookup(
+            plan=[ForeignTableFetch(name="Content", foreign_table="Content")],
+            key_fetch="Content",
+            key_col="cntn_fk_event",
+            root_col="evnt_pk",
+        )
+        page = RootPage(
+            created_on_col="evnt_createdOn", pk_col="evnt_pk", limit=2
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Event",
+                foreign_table="Event",
+                extra_criteria=equals("evnt_name", "a"),
+                is_root=True,
+                page=page,
             )
+        ]
+        g, root_nodes = await handler._build_subject_graph_async(lookup, plan)
+        self.assertEqual(
+            ["Event.2", "Event.3"], [g.name(n) for n in root_nodes]
+        )
+        chunk_keys = [
+            c.kwargs["criteria"].to_dict()["criteria"][1]["value"]
+            for c in mock_session.fetch.call_args_list[1:]
+        ]
+        self.assertEqual([[1, 2], [3]], chunk_keys)
 
-    def test_get_attachment(self):
-        """Tests _get_attachment method"""
+    async def test_build_graph_async_levels(self):
+        """Tests _build_graph_async runs every level and links rows"""
+        rows = {
+            "Run": [create_record("Run", 1, run_pk=1)],
+            "Step": [
+                create_record("Step", 10, step_pk=10, step_fk_run=1),
+                create_record("Step", 11, step_pk=11, step_fk_run=1),
+            ],
+            "Result": [create_record("Result", 20, rslt_fk_step=10)],
+            "Content": [create_record("Content", 30, cntn_fk_step=11)],
+            "Skipped": [create_record("Skipped", 40, skp_fk_step=10)],
+        }
         mock_session = MagicMock()
-        mock_response = MagicMock()
-        mock_session.slims_api.get.return_value = mock_response
-        handler = SlimsTableHandler(session=mock_session)
-        response = handler._get_attachment(pk=123)
-        mock_session.slims_api.get.assert_called_once_with("repo/123")
-        self.assertEqual(response, mock_response)
+        mock_session.fetch = AsyncMock(
+            side_effect=lambda table, criteria: rows[table]
+        )
+        plan = [
+            ForeignTableFetch(name="Run", foreign_table="Run", is_root=True),
+            ForeignTableFetch(
+                name="Step",
+                input_name="Run",
+                input_table_cols=("run_pk",),
+                foreign_table="Step",
+                foreign_table_col="step_fk_run",
+            ),
+            ForeignTableFetch(
+                name="Result",
+                input_name="Step",
+                input_table_cols=("step_pk",),
+                foreign_table="Result",
+                foreign_table_col="rslt_fk_step",
+            ),
+            ForeignTableFetch(
+                name="Content",
+                input_name="Step",
+                input_table_cols=("step_pk",),
+                foreign_table="Content",
+                foreign_table_col="cntn_fk_step",
+            ),
+            ForeignTableFetch(
+                name="Skipped",
+                input_name="Step",
+                input_table_cols=("step_pk",),
+                foreign_table="Skipped",
+                foreign_table_col="skp_fk_step",
+                add_to_graph=False,
+            ),
+        ]
+        handler = SlimsTableHandler(session=mock_session, max_workers=2)
+        g, root_nodes = await handler._build_graph_async(plan)
+        self.assertEqual(["Run.1"], [g.name(n) for n in root_nodes])
+        self.assertEqual(
+            {
+                ("Run.1", "Step.10"),
+                ("Run.1", "Step.11"),
+                ("Step.10", "Result.20"),
+                ("Step.11", "Content.30"),
+            },
+            {(g.name(u), g.name(v)) for u, v in g.edges()},
+        )
+        self.assertEqual(5, mock_session.fetch.call_count)
+
+    async def test_build_graph_async_shared_reference_cache(self):
+        """Tests cacheable lookup rows are fetched once across handlers"""
+        rows = {
+            "Template": [create_record("Template", 1, tmpl_pk=1)],
+            "Run": [create_record("Run", 2, run_fk_template=1)],
+        }
+        mock_session = MagicMock()
+        mock_session.fetch = AsyncMock(
+            side_effect=lambda table, criteria: rows[table]
+        )
+        plan = [
+            ForeignTableFetch(
+                name="Template",
+                foreign_table="Template",
+                extra_criteria=equals("tmpl_name", "Imaging"),
+                cacheable=True,
+            ),
+            ForeignTableFetch(
+                name="Run",
+                input_name="Template",
+                input_table_cols=("tmpl_pk",),
+                foreign_table="Run",
+                foreign_table_col="run_fk_template",
+                is_root=True,
+            ),
+        ]
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        for _ in range(2):
+            handler = SlimsTableHandler(
+                session=mock_session, reference_cache=cache
+            )
+            g, root_nodes = await handler._build_graph_async(plan)
+            self.assertEqual(["Run.2"], [g.name(n) for n in root_nodes])
+        fetched_tables = [
+            c.kwargs["table"] for c in mock_session.fetch.call_args_list
+        ]
+        self.assertEqual(["Template", "Run", "Run"], fetched_tables)
+        self.assertEqual(1, cache.metrics().hits)
+
+    async def test_query_graph_async(self):
+        """Tests _query_graph_async validates, parses dates and sorts"""
+        g = RecordGraph()
+        g.add_node("Run", create_record("Run", 1, run_createdOn=1))
+        g.add_node("Run", create_record("Run", 2, run_createdOn=2))
+        handler = SlimsTableHandler(session=MagicMock())
+        handler._get_graph_async = AsyncMock(return_value=(g, [0, 1]))
+        handler.ROOT = RootSpec("run_createdOn", "run_pk", "run_created_on")
+        _, root_nodes = await handler._query_graph_async(
+            "123456", "2025-01-01", None, session_name="a"
+        )
+        self.assertEqual([1, 0], root_nodes)
+        handler._get_graph_async.assert_awaited_once_with(
+            start_date_greater_than_or_equal=datetime(2025, 1, 1),
+            end_date_less_than_or_equal=None,
+            page=None,
+            subject_id="123456",
+            session_name="a",
+        )
+        with self.assertRaises(ValueError):
+            await handler._query_graph_async("", None, None)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from aind_slims_service_server.async_session import get_async_session
 from aind_slims_service_server.handlers.viral_injection import (
     ViralInjectionSessionHandler,
 )
@@ -14,60 +15,112 @@ from aind_slims_service_server.models import SlimsViralInjectionData
 class TestSlimsImagingHandler:
     """Tests methods in SlimsImagingHandler class"""
 
-    def test_get_graph(self, mock_get_viral_injection_data: MagicMock):
-        """Tests _get_graph method"""
+    async def test_get_graph(self, mock_get_viral_injection_data: MagicMock):
+        """Tests _get_graph_async method"""
 
-        handler = ViralInjectionSessionHandler(
-            session=MagicMock(fetch=mock_get_viral_injection_data)
-        )
-        G, root_nodes = handler._get_graph()
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
         expected_root_nodes = ["Content.994", "Content.992"]
         expected_edges = [
             ("Content.994", "ContentRelation.202"),
             ("ContentRelation.202", "Content.992"),
             ("Content.994", "Order.124"),
         ]
-        assert expected_root_nodes == root_nodes
-        assert set(expected_edges) == set(G.edges())
+        assert expected_root_nodes == [G.name(n) for n in root_nodes]
+        assert set(expected_edges) == {
+            (G.name(u), G.name(v)) for u, v in G.edges()
+        }
 
-    def test_parse_graph(
+    async def test_parse_graph(
         self,
         mock_get_viral_injection_data: MagicMock,
         test_viral_injection_data: List[SlimsViralInjectionData],
     ):
         """Tests _parse_graph method."""
-        handler = ViralInjectionSessionHandler(
-            session=MagicMock(fetch=mock_get_viral_injection_data)
-        )
-        g, root_nodes = handler._get_graph()
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        g, root_nodes = await handler._get_graph_async()
         inj_data = handler._parse_graph(
             g=g, root_nodes=root_nodes, subject_id="614178"
         )
         assert test_viral_injection_data == inj_data
 
-    def test_get_viral_injection_data_from_slims(
-        self, mock_get_viral_injection_data: MagicMock
+    async def test_get_data_async(
+        self,
+        mock_get_viral_injection_data: MagicMock,
+        test_viral_injection_data: List[SlimsViralInjectionData],
+    ):
+        """Tests get_data_async method"""
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        data = await handler.get_data_async(subject_id="614178")
+        assert test_viral_injection_data == data
+
+    def test_get_viral_injection_info_from_slims(
+        self,
+        mock_get_viral_injection_data: MagicMock,
+        test_viral_injection_data: List[SlimsViralInjectionData],
     ):
-        """Tests get_viral_injection_info_from_slims method"""
-        handler = ViralInjectionSessionHandler(
-            session=MagicMock(fetch=mock_get_viral_injection_data)
+        """Tests get_viral_injection_info_from_slims runs get_data_async"""
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        data = handler.get_viral_injection_info_from_slims(subject_id="614178")
+        assert test_viral_injection_data == data
+
+    async def test_get_data_by_subject_async(
+        self,
+        mock_get_viral_injection_data: MagicMock,
+        test_viral_injection_data: List[SlimsViralInjectionData],
+    ):
+        """Tests get_data_by_subject_async method"""
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        data = await handler.get_data_by_subject_async(
+            subject_ids=["614178", "0", "614178"]
         )
-        viral_data = handler.get_viral_injection_info_from_slims(
-            subject_id="614178"
+        assert {"614178": test_viral_injection_data, "0": []} == data
+        with pytest.raises(ValueError) as e:
+            await handler.get_data_by_subject_async(subject_ids=[])
+        assert "subject_ids must not be empty!" in str(e.value)
+
+    def test_get_subject_ids(self):
+        """Tests a viral injection belongs to each of its assigned mice"""
+        model = SlimsViralInjectionData(assigned_mice=["1", "2"])
+        assert ["1", "2"] == ViralInjectionSessionHandler._get_subject_ids(
+            model
         )
-        assert len(viral_data) == 1
+        model = SlimsViralInjectionData(assigned_mice=None)
+        assert [] == ViralInjectionSessionHandler._get_subject_ids(model)
 
-    def test_get_viral_injection_info_from_slims_error(
-        self, mock_get_viral_injection_data: MagicMock
+    async def test_iter_data_async(
+        self,
+        mock_get_viral_injection_data: MagicMock,
+        test_viral_injection_data: List[SlimsViralInjectionData],
     ):
-        """Tests get_viral_injection_info_from_slims when subject_id empty"""
-        handler = ViralInjectionSessionHandler(
-            session=MagicMock(fetch=mock_get_viral_injection_data)
+        """Tests iter_data_async method"""
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        data = [m async for m in handler.iter_data_async(subject_id="614178")]
+        assert test_viral_injection_data == data
+
+    async def test_get_data_page_async(
+        self,
+        mock_get_viral_injection_data: MagicMock,
+        test_viral_injection_data: List[SlimsViralInjectionData],
+    ):
+        """Tests get_data_page_async method"""
+        handler = ViralInjectionSessionHandler(session=get_async_session())
+        data, next_cursor = await handler.get_data_page_async(
+            subject_id="614178", limit=10
         )
-        with pytest.raises(ValueError) as e:
-            handler.get_viral_injection_info_from_slims(subject_id="")
+        assert test_viral_injection_data == data
+        assert next_cursor is None
 
+    async def test_get_data_async_error(self):
+        """Tests async method when subject_id is empty"""
+        handler = ViralInjectionSessionHandler(session=MagicMock())
+        with pytest.raises(ValueError) as e:
+            await handler.get_data_async(subject_id="")
         assert "subject_id must not be empty!" in str(e.value)
+        with pytest.raises(ValueError):
+            await anext(handler.iter_data_async(subject_id=""))
+        with pytest.raises(ValueError):
+            await handler.get_data_page_async(subject_id="")
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from aind_slims_service_server.async_session import get_async_session
 from aind_slims_service_server.handlers.water_restriction import (
     WaterRestrictionSessionHandler,
 )
@@ -15,70 +16,116 @@ from aind_slims_service_server.models import SlimsWaterRestrictionData
 class TestSlimsWaterRestrictionHandler:
     """Tests methods in SlimsWaterRestriction class"""
 
-    def test_get_graph(self, mock_get_water_restriction_data: MagicMock):
-        """Tests _get_graph method"""
-        handler = WaterRestrictionSessionHandler(
-            session=MagicMock(fetch=mock_get_water_restriction_data)
-        )
-        G, root_nodes = handler._get_graph()
+    async def test_get_graph(self, mock_get_water_restriction_data: MagicMock):
+        """Tests _get_graph_async method"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async()
         expected_root_nodes = ["ContentEvent.15"]
         expected_edges = [("ContentEvent.15", "Content.55")]
-        assert expected_root_nodes == root_nodes
-        assert set(expected_edges) == set(G.edges())
+        assert expected_root_nodes == [G.name(n) for n in root_nodes]
+        assert set(expected_edges) == {
+            (G.name(u), G.name(v)) for u, v in G.edges()
+        }
 
-    def test_get_graph_date_criteria(
+    async def test_get_graph_date_criteria(
         self, mock_get_water_restriction_data: MagicMock
     ):
-        """Tests _get_graph method"""
-        handler = WaterRestrictionSessionHandler(
-            session=MagicMock(fetch=mock_get_water_restriction_data)
-        )
-        G, root_nodes = handler._get_graph(
+        """Tests _get_graph_async method"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        G, root_nodes = await handler._get_graph_async(
             start_date_greater_than_or_equal=datetime(2024, 12, 13, 19, 43, 32)
         )
         expected_root_nodes = ["ContentEvent.15"]
         expected_edges = [("ContentEvent.15", "Content.55")]
-        assert expected_root_nodes == root_nodes
-        assert set(expected_edges) == set(G.edges())
+        assert expected_root_nodes == [G.name(n) for n in root_nodes]
+        assert set(expected_edges) == {
+            (G.name(u), G.name(v)) for u, v in G.edges()
+        }
 
-    def test_parse_graph(
+    async def test_parse_graph(
         self,
         mock_get_water_restriction_data: MagicMock,
         test_water_restriction_data: List[SlimsWaterRestrictionData],
     ):
         """Tests _parse_graph method."""
-        handler = WaterRestrictionSessionHandler(
-            session=MagicMock(fetch=mock_get_water_restriction_data)
-        )
-        g, root_nodes = handler._get_graph()
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        g, root_nodes = await handler._get_graph_async()
         wr_data = handler._parse_graph(
             g=g, root_nodes=root_nodes, subject_id="762287"
         )
         assert test_water_restriction_data == wr_data
 
-    def test_get_wr_data_from_slims(
-        self, mock_get_water_restriction_data: MagicMock
+    async def test_get_data_async(
+        self,
+        mock_get_water_restriction_data: MagicMock,
+        test_water_restriction_data: List[SlimsWaterRestrictionData],
     ):
-        """Tests get_wr_data_from_slims method"""
-        handler = WaterRestrictionSessionHandler(
-            session=MagicMock(fetch=mock_get_water_restriction_data)
-        )
-        wr_data = handler.get_water_restriction_data_from_slims(
+        """Tests get_data_async method"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        data = await handler.get_data_async(subject_id="762287")
+        assert test_water_restriction_data == data
+
+    def test_get_water_restriction_data_from_slims(
+        self,
+        mock_get_water_restriction_data: MagicMock,
+        test_water_restriction_data: List[SlimsWaterRestrictionData],
+    ):
+        """Tests get_water_restriction_data_from_slims runs get_data_async"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        data = handler.get_water_restriction_data_from_slims(
             subject_id="762287"
         )
-        assert len(wr_data) == 1
+        assert test_water_restriction_data == data
 
-    def test_get_wr_data_from_slims_error(
-        self, mock_get_water_restriction_data: MagicMock
+    async def test_get_data_by_subject_async(
+        self,
+        mock_get_water_restriction_data: MagicMock,
+        test_water_restriction_data: List[SlimsWaterRestrictionData],
     ):
-        """Tests get_wr_data_from_slims method when subject_id empty"""
-        handler = WaterRestrictionSessionHandler(
-            session=MagicMock(fetch=mock_get_water_restriction_data)
-        )
+        """Tests get_data_by_subject_async"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        get_by_subject = handler.get_data_by_subject_async
+        data = await get_by_subject(subject_ids=["762287", "0", "762287"])
+        assert {"762287": test_water_restriction_data, "0": []} == data
         with pytest.raises(ValueError) as e:
-            handler.get_water_restriction_data_from_slims(subject_id="")
+            await get_by_subject(subject_ids=[])
+        assert "subject_ids must not be empty!" in str(e.value)
+
+    async def test_iter_data_async(
+        self,
+        mock_get_water_restriction_data: MagicMock,
+        test_water_restriction_data: List[SlimsWaterRestrictionData],
+    ):
+        """Tests iter_data_async method"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        data = [
+            m async for m in (handler.iter_data_async(subject_id="762287"))
+        ]
+        assert test_water_restriction_data == data
 
+    async def test_get_data_page_async(
+        self,
+        mock_get_water_restriction_data: MagicMock,
+        test_water_restriction_data: List[SlimsWaterRestrictionData],
+    ):
+        """Tests get_data_page_async method"""
+        handler = WaterRestrictionSessionHandler(session=get_async_session())
+        data, next_cursor = await handler.get_data_page_async(
+            subject_id="762287", limit=10
+        )
+        assert test_water_restriction_data == data
+        assert next_cursor is None
+
+    async def test_get_data_async_error(self):
+        """Tests async method when subject_id is empty"""
+        handler = WaterRestrictionSessionHandler(session=MagicMock())
+        with pytest.raises(ValueError) as e:
+            await handler.get_data_async(subject_id="")
         assert "subject_id must not be empty!" in str(e.value)
+        with pytest.raises(ValueError):
+            await anext(handler.iter_data_async(subject_id=""))
+        with pytest.raises(ValueError):
+            await handler.get_data_page_async(subject_id="")
 
 
 if __name__ == "__main__":
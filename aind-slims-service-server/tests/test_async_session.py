@@ -0,0 +1,289 @@
+"""Tests async_session module"""
+
+import json
+
+import httpx
+import pytest
+from slims.criteria import equals
+from slims.internal import Attachment, Record, _SlimsApiException
+from slims.slims import Slims
+
+from aind_slims_service_server.async_session import (
+    AsyncSlims,
+    RawColumn,
+    RawRecord,
+    async_session,
+    get_async_session,
+)
+from aind_slims_service_server.session import SlimsAuthError
+
+
+def create_async_slims(handler) -> AsyncSlims:
+    """Create an AsyncSlims object that sends requests to handler"""
+    slims = AsyncSlims(
+        name="slims", url="http://slims", username="user", password="pass"
+    )
+    slims._create_client = lambda: httpx.AsyncClient(
+        base_url=slims.slims_api.url, transport=httpx.MockTransport(handler)
+    )
+    slims.client = slims._create_client()
+    return slims
+
+
+class TestAsyncSlims:
+    """Test methods in AsyncSlims class"""
+
+    def test_get_async_session(self):
+        """Tests get_async_session returns the shared session"""
+        session = get_async_session()
+        assert session is async_session
+        assert "slims_password" == session.slims_api.password
+
+    def test_from_slims(self):
+        """Tests an AsyncSlims is created from the settings of a Slims"""
+        slims = AsyncSlims.from_slims(
+            Slims("slims", "http://slims", "user", "pass"), max_connections=5
+        )
+        assert "http://slims/rest/" == slims.slims_api.url
+        assert "user" == slims.slims_api.username
+        assert "pass" == slims.slims_api.password
+        assert 5 == slims.max_connections
+
+    async def test_fetch(self):
+        """Tests fetch sends the same body as Slims.fetch"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """Record request and return entities"""
+            requests.append(request)
+            entities = [
+                {"tableName": "Content", "pk": 1, "columns": []},
+                {"tableName": "Attachment", "pk": 2, "columns": []},
+            ]
+            return httpx.Response(200, json={"entities": entities})
+
+        slims = create_async_slims(handler)
+        records = await slims.fetch(
+            "Content", equals("cntn_id", "a"), sort=["cntn_id"], start=0
+        )
+        await slims.aclose()
+        assert isinstance(records[0], Record)
+        assert isinstance(records[1], Attachment)
+        assert "GET" == requests[0].method
+        assert "/rest/Content/advanced" == requests[0].url.path
+        assert {
+            "sortBy": ["cntn_id"],
+            "startRow": 0,
+            "endRow": None,
+            "criteria": {
+                "fieldName": "cntn_id",
+                "operator": "equals",
+                "value": "a",
+            },
+        } == json.loads(requests[0].content)
+
+    async def test_fetch_no_criteria(self):
+        """Tests fetch when criteria is None"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """Record request and return no entities"""
+            requests.append(request)
+            return httpx.Response(200, json={"entities": []})
+
+        slims = create_async_slims(handler)
+        assert [] == await slims.fetch("Content", None)
+        assert "criteria" not in json.loads(requests[0].content)
+
+    async def test_fetch_error(self):
+        """Tests fetch raises on a bad response"""
+        slims = create_async_slims(lambda r: httpx.Response(500, text="err"))
+        with pytest.raises(_SlimsApiException):
+            await slims.fetch("Content", None)
+
+    async def test_fetch_auth_error(self):
+        """Tests fetch raises SlimsAuthError on 401"""
+        slims = create_async_slims(lambda r: httpx.Response(401, text="no"))
+        with pytest.raises(SlimsAuthError):
+            await slims.fetch("Content", None)
+
+    async def test_fetch_auth_error_recycles_client(self):
+        """Tests an accepted client is recreated once SLIMS rejects it"""
+        statuses = [200, 401, 200, 401, 401]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """Return the next status"""
+            return httpx.Response(statuses.pop(0), json={"entities": []})
+
+        slims = create_async_slims(handler)
+        first_client = slims.client
+        assert [] == await slims.fetch("Content", None)
+        assert [] == await slims.fetch("Content", None)
+        second_client = slims.client
+        assert second_client is not first_client
+        assert first_client.is_closed
+        with pytest.raises(SlimsAuthError):
+            await slims.fetch("Content", None)
+        assert second_client.is_closed
+        assert 2 == slims.metrics().auth_recycled
+        assert 5 == slims.metrics().requests
+        await slims.aclose()
+        assert slims.client.is_closed
+        assert [] == statuses
+
+    async def test_recycle_after_max_client_requests(self):
+        """Tests the client is recycled after max_client_requests"""
+        slims = create_async_slims(
+            lambda r: httpx.Response(200, json={"entities": []})
+        )
+        slims.max_client_requests = 2
+        first_client = slims.client
+        await slims.fetch("Content", None)
+        await slims.fetch("Content", None)
+        assert first_client is slims.client
+        await slims.fetch("Content", None)
+        assert first_client is not slims.client
+        assert first_client.is_closed
+        metrics = slims.metrics()
+        assert 1 == metrics.recycled
+        assert 1 == metrics.client_requests
+        assert 0 == metrics.in_flight
+        await slims.aclose()
+
+    async def test_retired_client_closed_after_in_flight(self):
+        """Tests a replaced client is closed once its requests finish"""
+        slims = create_async_slims(lambda r: httpx.Response(200))
+        old_client = slims.client
+        slims._in_flight[old_client] = 1
+        await slims._replace_client()
+        assert [old_client] == slims._retired_clients
+        assert not old_client.is_closed
+        slims._in_flight[old_client] = 0
+        await slims._send(old_client, "GET", "repo/1")
+        assert [] == slims._retired_clients
+        assert old_client.is_closed
+        await slims.aclose()
+
+    def test_create_client_limits(self):
+        """Tests the client is created with the pool limits"""
+        slims = AsyncSlims(
+            name="slims",
+            url="http://slims",
+            username="user",
+            password="pass",
+            max_connections=5,
+            max_keepalive_connections=2,
+        )
+        pool = slims.client._transport._pool
+        assert 5 == pool._max_connections
+        assert 2 == pool._max_keepalive_connections
+        assert 1 == slims.metrics().clients_created
+
+    async def test_recycle_client_replaced(self):
+        """Tests a client replaced by a concurrent request is not recycled"""
+        slims = create_async_slims(lambda r: httpx.Response(200))
+        old_client = slims.client
+        slims._accepted_client = old_client
+        assert await slims._recycle_client(old_client)
+        new_client = slims.client
+        assert await slims._recycle_client(old_client)
+        assert new_client is slims.client
+        await slims.aclose()
+
+    async def test_fetch_raw(self):
+        """Tests fetch_raw sends the same body and keeps only columns"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """Record request and return entities"""
+            requests.append(request)
+            columns = [
+                {"name": "cntn_id", "value": "a", "displayValue": "A"},
+                {"name": "cntn_cf_weight", "value": 2.5, "unit": "g"},
+                {"name": "cntn_cf_unused", "value": "x"},
+            ]
+            entities = [{"tableName": "Content", "pk": 1, "columns": columns}]
+            return httpx.Response(200, json={"entities": entities})
+
+        slims = create_async_slims(handler)
+        assert slims.column_projection is False
+        records = await slims.fetch_raw(
+            "Content",
+            equals("cntn_id", "a"),
+            columns={"cntn_id", "cntn_cf_weight"},
+            sort=["cntn_id"],
+        )
+        await slims.aclose()
+        assert "/rest/Content/advanced" == requests[0].url.path
+        assert ["cntn_id"] == json.loads(requests[0].content)["sortBy"]
+        assert "columns" not in json.loads(requests[0].content)
+        assert [1] == [r.pk() for r in records]
+        assert "Content" == records[0].table_name()
+        assert {
+            "cntn_id": RawColumn("a", "A"),
+            "cntn_cf_weight": RawColumn(2.5, unit="g"),
+        } == vars(records[0])
+
+    async def test_fetch_raw_column_projection(self):
+        """Tests the columns are sent to SLIMS if column_projection is set"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            """Record request and return no entities"""
+            requests.append(request)
+            return httpx.Response(200, json={"entities": []})
+
+        slims = create_async_slims(handler)
+        slims.column_projection = True
+        await slims.fetch_raw("Content", None, columns={"cntn_id", "cntn_pk"})
+        await slims.fetch_raw("Content", None)
+        await slims.aclose()
+        assert ["cntn_id", "cntn_pk"] == json.loads(requests[0].content)[
+            "columns"
+        ]
+        assert "columns" not in json.loads(requests[1].content)
+
+    async def test_fetch_raw_error(self):
+        """Tests fetch_raw raises on a bad response"""
+        slims = create_async_slims(lambda r: httpx.Response(500, text="err"))
+        with pytest.raises(_SlimsApiException):
+            await slims.fetch_raw("Content", None)
+
+    def test_raw_record(self):
+        """Tests a RawRecord reads like a Record"""
+        entity = {
+            "tableName": "Result",
+            "pk": 2,
+            "columns": [
+                {
+                    "name": "rslt_cf_fk_operator",
+                    "value": [3],
+                    "displayValues": ["a"],
+                    "joinedDisplayValue": "a",
+                }
+            ],
+        }
+        raw_record = RawRecord.from_entity(entity, None)
+        record = Record(entity, None)
+        column = raw_record.rslt_cf_fk_operator
+        assert record.pk() == raw_record.pk()
+        assert record.table_name() == raw_record.table_name()
+        assert record.rslt_cf_fk_operator.joinedDisplayValue == (
+            column.joinedDisplayValue
+        )
+        assert ["a"] == column.displayValues
+        assert column.displayValue is None
+        assert not hasattr(raw_record, "rslt_cf_missing")
+        assert {} == vars(RawRecord.from_entity(entity, []))
+
+    async def test_get(self):
+        """Tests get returns the response"""
+        slims = create_async_slims(
+            lambda r: httpx.Response(200, json={"path": r.url.path})
+        )
+        response = await slims.get("repo/1")
+        assert {"path": "/rest/repo/1"} == response.json()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
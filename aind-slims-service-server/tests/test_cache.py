@@ -0,0 +1,244 @@
+"""Tests cache module"""
+
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aind_slims_service_server.cache import (
+    AttachmentCache,
+    DatePartitionedCache,
+    TTLCache,
+)
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test methods in TTLCache class"""
+
+    def test_get_set(self):
+        """Tests values are returned until cleared."""
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", [1])
+        self.assertEqual([1], cache.get("a"))
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+        metrics = cache.metrics()
+        self.assertEqual(1, metrics.hits)
+        self.assertEqual(2, metrics.misses)
+        self.assertEqual(0, metrics.size)
+
+    @patch("aind_slims_service_server.cache.time.monotonic")
+    def test_expiry(self, mock_monotonic: MagicMock):
+        """Tests entries expire after ttl_seconds."""
+        mock_monotonic.return_value = 0
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        cache.set("a", 1)
+        mock_monotonic.return_value = 59
+        self.assertEqual(1, cache.get("a"))
+        mock_monotonic.return_value = 60
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.metrics().size)
+
+    def test_eviction(self):
+        """Tests least recently used entry is evicted when full."""
+        cache = TTLCache(ttl_seconds=60, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(1, cache.metrics().evictions)
+
+
+class TestDatePartitionedCache(unittest.IsolatedAsyncioTestCase):
+    """Test methods in DatePartitionedCache class"""
+
+    @staticmethod
+    def _create_fetch(dates) -> AsyncMock:
+        """Mock fetch returning the dates between start and end"""
+
+        async def fetch(start, end):
+            """Dates between start and end, newest first"""
+            return sorted(
+                [d for d in dates if start <= d <= end], reverse=True
+            )
+
+        return AsyncMock(side_effect=fetch)
+
+    async def test_fetch_cold_months(self):
+        """Tests past months are fetched once and then served from cache."""
+        dates = [
+            datetime(2025, 1, 1, 23, tzinfo=timezone.utc),
+            datetime(2025, 1, 2, 1, tzinfo=timezone.utc),
+            datetime(2025, 2, 3, 1, tzinfo=timezone.utc),
+        ]
+        fetch = self._create_fetch(dates)
+        cache = DatePartitionedCache(ttl_seconds=60, max_size=10, hot_days=1)
+        rows = await cache.fetch(
+            key="k",
+            start=datetime(2025, 1, 1, 12, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 2, 12, tzinfo=timezone.utc),
+            fetch=fetch,
+            get_date=lambda d: d,
+        )
+        self.assertEqual([dates[1], dates[0]], rows)
+        fetch.assert_awaited_once_with(
+            datetime(2025, 1, 1, tzinfo=timezone.utc),
+            datetime(2025, 2, 1, tzinfo=timezone.utc)
+            - timedelta(milliseconds=1),
+        )
+        rows = await cache.fetch(
+            key="k",
+            start=datetime(2025, 1, 1),
+            end=datetime(2025, 2, 3, 12, tzinfo=timezone.utc),
+            fetch=fetch,
+            get_date=lambda d: d,
+        )
+        self.assertEqual(dates[::-1], rows)
+        self.assertEqual(2, fetch.await_count)
+        fetch.assert_awaited_with(
+            datetime(2025, 2, 1, tzinfo=timezone.utc),
+            datetime(2025, 3, 1, tzinfo=timezone.utc)
+            - timedelta(milliseconds=1),
+        )
+        self.assertEqual(2, cache.metrics().size)
+
+    async def test_fetch_long_window(self):
+        """Tests a long window takes one cache entry per month."""
+        fetch = self._create_fetch([])
+        cache = DatePartitionedCache(ttl_seconds=60, max_size=100, hot_days=1)
+        await cache.fetch(
+            key="k",
+            start=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2024, 12, 31, tzinfo=timezone.utc),
+            fetch=fetch,
+            get_date=lambda d: d,
+        )
+        fetch.assert_awaited_once()
+        self.assertEqual(60, cache.metrics().size)
+
+    async def test_fetch_undated_rows(self):
+        """Tests rows without a date are returned first."""
+        dated = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        fetch = AsyncMock(return_value=[dated, None])
+        cache = DatePartitionedCache(ttl_seconds=60, max_size=10, hot_days=1)
+        for _ in range(2):
+            rows = await cache.fetch(
+                key="k",
+                start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                end=datetime(2025, 1, 3, tzinfo=timezone.utc),
+                fetch=fetch,
+                get_date=lambda d: d,
+            )
+            self.assertEqual([None, dated], rows)
+        fetch.assert_awaited_once()
+
+    async def test_fetch_hot_days(self):
+        """Tests days in the hot window are always fetched."""
+        now = datetime.now(timezone.utc)
+        fetch = self._create_fetch([now - timedelta(minutes=1)])
+        cache = DatePartitionedCache(ttl_seconds=60, max_size=10, hot_days=1)
+        for _ in range(2):
+            rows = await cache.fetch(
+                key="k",
+                start=now - timedelta(days=1),
+                end=None,
+                fetch=fetch,
+                get_date=lambda d: d,
+            )
+            self.assertEqual(1, len(rows))
+        self.assertEqual(2, fetch.await_count)
+        self.assertEqual(0, cache.metrics().size)
+
+    async def test_fetch_no_start(self):
+        """Tests unbounded windows bypass the cache."""
+        fetch = AsyncMock(return_value=[None])
+        cache = DatePartitionedCache(ttl_seconds=60, max_size=10, hot_days=1)
+        rows = await cache.fetch(
+            key="k",
+            start=None,
+            end=None,
+            fetch=fetch,
+            get_date=lambda d: d,
+        )
+        self.assertEqual([None], rows)
+        fetch.assert_awaited_once_with(None, None)
+
+    def test_get_partition(self):
+        """Tests days are grouped by month once the month is cold."""
+        last_cold_day = date(2025, 3, 10)
+        self.assertEqual(
+            (date(2025, 2, 1), date(2025, 2, 28)),
+            DatePartitionedCache._get_partition(
+                date(2025, 2, 14), last_cold_day
+            ),
+        )
+        self.assertEqual(
+            (date(2025, 3, 2), date(2025, 3, 2)),
+            DatePartitionedCache._get_partition(
+                date(2025, 3, 2), last_cold_day
+            ),
+        )
+
+    def test_get_ranges(self):
+        """Tests consecutive partitions are grouped."""
+        month = (date(2024, 12, 1), date(2024, 12, 31))
+        days = [(date(2025, 1, d), date(2025, 1, d)) for d in (1, 3)]
+        self.assertEqual(
+            [[month, days[0]], [days[1]]],
+            DatePartitionedCache._get_ranges([month] + days),
+        )
+
+
+class TestAttachmentCache(unittest.TestCase):
+    """Test methods in AttachmentCache class"""
+
+    def test_eviction_without_spill(self):
+        """Tests least recently used content is dropped when full."""
+        cache = AttachmentCache(max_size=2)
+        self.assertIsNone(cache.get(1))
+        cache.set(1, b"a")
+        cache.set(2, b"b")
+        self.assertEqual(b"a", cache.get(1))
+        cache.set(3, b"c")
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(b"c", cache.get(3))
+        metrics = cache.metrics()
+        self.assertEqual(2, metrics.hits)
+        self.assertEqual(2, metrics.misses)
+        self.assertEqual(1, metrics.evictions)
+        self.assertEqual(2, metrics.size)
+
+    def test_spill(self):
+        """Tests evicted contents are spilled to disk and read back."""
+        with tempfile.TemporaryDirectory() as tmp:
+            spill_dir = os.path.join(tmp, "attachments")
+            cache = AttachmentCache(
+                max_size=1, spill_dir=spill_dir, max_spill_size=1
+            )
+            cache.set(1, b"a")
+            cache.set(2, b"b")
+            self.assertEqual(["1"], os.listdir(spill_dir))
+            self.assertEqual(b"a", cache.get(1))
+            self.assertEqual(["2"], os.listdir(spill_dir))
+            cache.set(3, b"c")
+            self.assertIsNone(cache.get(2))
+            self.assertEqual(["1"], os.listdir(spill_dir))
+            cache.set(1, b"d")
+            self.assertEqual(["3"], os.listdir(spill_dir))
+            self.assertEqual(b"d", cache.get(1))
+            metrics = cache.metrics()
+            self.assertEqual(2, metrics.size)
+            self.assertEqual(2, metrics.max_size)
+            self.assertEqual(1, metrics.evictions)
+            cache.clear()
+            self.assertEqual([], os.listdir(spill_dir))
+            self.assertEqual(0, cache.metrics().size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""Tests instrument_index module"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from aind_slims_service_server.async_session import RawRecord
+from aind_slims_service_server.instrument_index import (
+    INDEX_COLUMNS,
+    InstrumentIndex,
+)
+from aind_slims_service_server.main import lifespan
+from aind_slims_service_server.mirror import SlimsMirror
+
+
+def create_entity(pk: int, **columns) -> dict:
+    """Create the entity of a ReferenceDataRecord with the given columns"""
+    return {
+        "tableName": "ReferenceDataRecord",
+        "pk": pk,
+        "columns": [{"name": k, "value": v} for k, v in columns.items()],
+    }
+
+
+def create_row(pk: int, **columns) -> RawRecord:
+    """Create a ReferenceDataRecord with the given columns"""
+    return RawRecord.from_entity(create_entity(pk, **columns), INDEX_COLUMNS)
+
+
+def create_instrument(
+    pk: int, name: str, attachment_pk: int, modified_on: int
+) -> RawRecord:
+    """Create a ReferenceDataRecord with an instrument json attachment"""
+    return create_row(
+        pk,
+        rdrc_name=name,
+        rdrc_cf_instrumentJsonAttachment=attachment_pk,
+        attachmentCount=1,
+        rdrc_modifiedOn=modified_on,
+    )
+
+
+class TestInstrumentIndex:
+    """Test methods in InstrumentIndex class"""
+
+    def test_update_and_search(self):
+        """Tests names are matched exactly or by substring"""
+        index = InstrumentIndex()
+        index.update(
+            [
+                create_instrument(3, "SmartSPIM2-2", 30, 1),
+                create_instrument(1, "SmartSPIM1-1", 10, 2),
+                create_instrument(2, "323_EPHYS1", 20, 3),
+                create_row(4, rdrc_name="No attachment", attachmentCount=0),
+            ]
+        )
+        assert 3 == len(index)
+        assert [30] == index.search("SmartSPIM2-2", partial_match=False)
+        assert [] == index.search("smartspim2-2", partial_match=False)
+        assert [10, 30] == index.search("smartspim", partial_match=True)
+        assert [10, 20] == index.search("1", partial_match=True)
+
+    def test_update_removes_rows(self):
+        """Tests rows that lost their attachment are removed"""
+        index = InstrumentIndex()
+        index.update([create_instrument(1, "SmartSPIM1-1", 10, 1)])
+        index.update(
+            [
+                create_row(
+                    1,
+                    rdrc_name="SmartSPIM1-1",
+                    attachmentCount=1,
+                    rdrc_modifiedOn=2,
+                )
+            ]
+        )
+        assert 0 == len(index)
+        assert [] == index.search("SmartSPIM", partial_match=True)
+
+    async def test_sync(self):
+        """Tests records are synced in pages and then incrementally"""
+        index = InstrumentIndex()
+        pages = [
+            [
+                create_instrument(1, "SmartSPIM1-1", 10, 10),
+                create_instrument(2, "SmartSPIM2-2", 20, 20),
+            ],
+            [],
+            [create_instrument(2, "SmartSPIM2-3", 20, 30)],
+        ]
+        session = MagicMock()
+        session.fetch_raw = AsyncMock(side_effect=pages)
+        assert 2 == await index.sync(session, page_size=2)
+        assert index.ready
+        assert 1 == await index.sync(session, page_size=2)
+        last_call = session.fetch_raw.await_args_list[-1].kwargs
+        assert {
+            "fieldName": "rdrc_modifiedOn",
+            "operator": "greaterOrEqual",
+            "value": 20,
+        } == last_call["criteria"].to_dict()
+        assert INDEX_COLUMNS == last_call["columns"]
+        assert [20] == index.search("SmartSPIM2-3", partial_match=False)
+
+    async def test_sync_record_modified_during_sync(self):
+        """Tests a record modified mid-sync does not make the sync skip any"""
+        source = SlimsMirror(":memory:")
+        source.upsert(
+            "ReferenceDataRecord",
+            [
+                create_entity(
+                    pk,
+                    rdrc_name=f"SmartSPIM{pk}",
+                    rdrc_cf_instrumentJsonAttachment=pk * 10,
+                    rdrc_modifiedOn=10,
+                )
+                for pk in range(1, 6)
+            ],
+        )
+
+        async def fetch_and_modify(**kwargs):
+            """Modify record 1 after the first page is fetched"""
+            rows = await source.fetch_raw(**kwargs)
+            source.upsert(
+                "ReferenceDataRecord",
+                [
+                    create_entity(
+                        1,
+                        rdrc_name="SmartSPIM1",
+                        rdrc_cf_instrumentJsonAttachment=10,
+                        rdrc_modifiedOn=20,
+                    )
+                ],
+            )
+            return rows
+
+        session = MagicMock(fetch_raw=AsyncMock(side_effect=fetch_and_modify))
+        index = InstrumentIndex()
+        await index.sync(session, page_size=2)
+        assert [10, 20, 30, 40, 50] == index.search("SmartSPIM", True)
+        second_call = session.fetch_raw.await_args_list[1].kwargs
+        assert ["rdrc_modifiedOn", "rdrc_pk"] == second_call["sort"]
+        assert 0 == second_call["start"]
+
+    @patch("aind_slims_service_server.instrument_index.asyncio.sleep")
+    @patch("logging.warning")
+    async def test_run(self, mock_warn: MagicMock, mock_sleep: AsyncMock):
+        """Tests run keeps polling after a failed sync"""
+        index = InstrumentIndex()
+        session = MagicMock()
+        session.fetch_raw = AsyncMock(side_effect=[Exception("down"), []])
+        mock_sleep.side_effect = [None, asyncio.CancelledError()]
+        with pytest.raises(asyncio.CancelledError):
+            await index.run(session, poll_seconds=1, page_size=10)
+        mock_warn.assert_called_once()
+        assert index.ready
+
+    async def test_lifespan_syncs_index(self):
+        """Tests the app starts and stops syncing the index"""
+        index = MagicMock()
+        index.run = AsyncMock()
+        async_session = MagicMock()
+        async_session.aclose = AsyncMock()
+        with (
+            patch("aind_slims_service_server.main.instrument_index", index),
+            patch(
+                "aind_slims_service_server.main.async_session", async_session
+            ),
+        ):
+            async with lifespan(MagicMock()):
+                await asyncio.sleep(0)
+        index.run.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
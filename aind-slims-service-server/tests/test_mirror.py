@@ -0,0 +1,501 @@
+"""Tests mirror module"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from slims.criteria import (
+    between_inclusive,
+    conjunction,
+    contains,
+    disjunction,
+    equals,
+    greater_than_or_equal,
+    is_not_null,
+    is_null,
+    is_one_of,
+)
+from slims.internal import Record
+
+from aind_slims_service_server.handlers.ecephys import EcephysSessionHandler
+from aind_slims_service_server.handlers.histology import (
+    HistologySessionHandler,
+)
+from aind_slims_service_server.handlers.imaging import ImagingSessionHandler
+from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.handlers.viral_injection import (
+    ViralInjectionSessionHandler,
+)
+from aind_slims_service_server.handlers.water_restriction import (
+    WaterRestrictionSessionHandler,
+)
+from aind_slims_service_server.main import lifespan
+from aind_slims_service_server.mirror import SlimsMirror, get_graph_session
+
+RESOURCES_DIR = Path(__file__).parent / "resources"
+
+# Resource files mapped to the SLIMS table they were fetched from
+FILE_TO_TABLE = {
+    "content.json": "Content",
+    "content_event.json": "ContentEvent",
+    "content_relation.json": "ContentRelation",
+    "content_type.json": "ContentType",
+    "experiment_run.json": "ExperimentRun",
+    "experiment_run_step.json": "ExperimentRunStep",
+    "experiment_run_step_content.json": "ExperimentRunStepContent",
+    "experiment_template.json": "ExperimentTemplate",
+    "order.json": "Order",
+    "order_content.json": "OrderContent",
+    "reference_data_record.json": "ReferenceDataRecord",
+    "result.json": "Result",
+    "sop.json": "SOP",
+    "vm_content.json": "Content",
+}
+
+
+def create_mirror(resources: str) -> SlimsMirror:
+    """Create an in-memory mirror loaded with a folder of resource files"""
+    mirror = SlimsMirror(":memory:")
+    for file_name, table in FILE_TO_TABLE.items():
+        file_path = RESOURCES_DIR / resources / file_name
+        if file_path.exists():
+            with open(file_path) as f:
+                mirror.upsert(table, json.load(f))
+    return mirror
+
+
+def create_entity(table: str, pk: int, **columns) -> dict:
+    """Create a SLIMS entity with the given columns"""
+    return {
+        "tableName": table,
+        "pk": pk,
+        "columns": [{"name": k, "value": v} for k, v in columns.items()],
+    }
+
+
+class TestSlimsMirror:
+    """Test methods in SlimsMirror class"""
+
+    async def test_ecephys_from_mirror(self, test_ecephys_data):
+        """Tests ecephys data built from the mirror"""
+        handler = EcephysSessionHandler(session=create_mirror("ecephys"))
+        data = await handler.get_data_async()
+        assert test_ecephys_data == data
+
+    async def test_imaging_from_mirror(self, test_imaging_data):
+        """Tests imaging data built from the mirror"""
+        handler = ImagingSessionHandler(session=create_mirror("imaging"))
+        data = await handler.get_data_async(subject_id="744742")
+        assert test_imaging_data == data
+
+    async def test_subject_lookup_from_mirror(
+        self,
+        test_ecephys_data,
+        test_histology_data,
+        test_water_restriction_data,
+    ):
+        """Tests subject queries start from the Content row of the subject"""
+        ecephys_handler = EcephysSessionHandler(
+            session=create_mirror("ecephys")
+        )
+        histology_handler = HistologySessionHandler(
+            session=create_mirror("histology")
+        )
+        wr_handler = WaterRestrictionSessionHandler(
+            session=create_mirror("water_restriction")
+        )
+        assert test_ecephys_data == (
+            await ecephys_handler.get_data_async(subject_id="750108")
+        )
+        assert test_histology_data == (
+            await histology_handler.get_data_async(subject_id="754372")
+        )
+        assert test_water_restriction_data == (
+            await wr_handler.get_data_async(subject_id="762287")
+        )
+        assert [] == await ecephys_handler.get_data_async(subject_id="000000")
+
+    async def test_ecephys_session_from_mirror(self, test_ecephys_data):
+        """Tests session name queries start from the Result row"""
+        handler = EcephysSessionHandler(session=create_mirror("ecephys"))
+        data = await handler.get_data_async(
+            subject_id="750108",
+            session_name="ecephys_750108_2024-12-23_14-51-45",
+        )
+        assert test_ecephys_data == data
+        assert [] == await handler.get_data_async(
+            session_name="ecephys_750108_2024-12-24_00-00-00"
+        )
+
+    async def test_viral_injection_subject_from_mirror(
+        self, test_viral_injection_data
+    ):
+        """Tests subject queries start from the Orders of the mouse"""
+        mirror = create_mirror("viral_injection")
+        mirror.upsert(
+            "Content",
+            [create_entity("Content", 23, cntn_pk=23, cntn_barCode="614178")],
+        )
+        handler = ViralInjectionSessionHandler(session=mirror)
+        data = await handler.get_data_async(subject_id="614178")
+        assert test_viral_injection_data == data
+        assert [] == await handler.get_data_async(subject_id="000000")
+
+    async def test_imaging_pages_from_mirror(self):
+        """Tests paging through imaging data built from the mirror"""
+        handler = ImagingSessionHandler(session=create_mirror("imaging"))
+        expected = await handler.get_data_async()
+        data = []
+        cursor = None
+        for _ in range(len(expected) + 1):
+            page, cursor = await handler.get_data_page_async(
+                limit=2, cursor=cursor
+            )
+            data.extend(page)
+            if cursor is None:
+                break
+        assert expected == data
+        assert cursor is None
+
+    async def test_histology_from_mirror(self, test_histology_data):
+        """Tests histology data built from the mirror"""
+        handler = HistologySessionHandler(session=create_mirror("histology"))
+        data = await handler.get_data_async()
+        assert test_histology_data == data
+
+    async def test_water_restriction_from_mirror(
+        self, test_water_restriction_data
+    ):
+        """Tests water restriction data built from the mirror"""
+        handler = WaterRestrictionSessionHandler(
+            session=create_mirror("water_restriction")
+        )
+        data = await handler.get_data_async()
+        assert test_water_restriction_data == data
+
+    async def test_viral_injection_from_mirror(
+        self, test_viral_injection_data
+    ):
+        """Tests viral injection data built from the mirror"""
+        handler = ViralInjectionSessionHandler(
+            session=create_mirror("viral_injection")
+        )
+        data = await handler.get_data_async()
+        assert test_viral_injection_data == data
+
+    def test_fetch_records(self):
+        """Tests key lookups and filters on other columns"""
+        mirror = SlimsMirror(":memory:")
+        mirror.upsert(
+            "Content",
+            [
+                create_entity("Content", 1, cntn_fk_type=[5, 6], cntn_id="a"),
+                create_entity("Content", 2, cntn_fk_type=5, cntn_id="b"),
+                create_entity("Content", 3, cntn_fk_type=7, cntn_id="c"),
+            ],
+        )
+        by_key = mirror.fetch_records(
+            "Content", is_one_of("cntn_fk_type", [6])
+        )
+        by_key_and_id = mirror.fetch_records(
+            "Content",
+            conjunction()
+            .add(equals("cntn_fk_type", 5))
+            .add(equals("cntn_id", "b")),
+        )
+        by_id = mirror.fetch_records("Content", contains("cntn_id", "C"))
+        assert [1] == [r.pk() for r in by_key]
+        assert [2] == [r.pk() for r in by_key_and_id]
+        assert [3] == [r.pk() for r in by_id]
+        assert 3 == len(mirror.fetch_records("Content", None))
+        assert [] == mirror.fetch_records("Order", None)
+
+    def test_fetch_records_sorted(self):
+        """Tests rows are sorted and bounded like SLIMS"""
+        mirror = SlimsMirror(":memory:")
+        mirror.upsert(
+            "Content",
+            [
+                create_entity("Content", 1, cntn_createdOn=10),
+                create_entity("Content", 2, cntn_createdOn=None),
+                create_entity("Content", 3, cntn_createdOn=10),
+                create_entity("Content", 4, cntn_createdOn=20),
+            ],
+        )
+        rows = mirror.fetch_records(
+            "Content", None, sort=["-cntn_createdOn", "-cntn_pk"]
+        )
+        assert [2, 4, 3, 1] == [r.pk() for r in rows]
+        rows = mirror.fetch_records(
+            "Content", None, sort=["cntn_createdOn", "cntn_pk"], start=1, end=3
+        )
+        assert [3, 4] == [r.pk() for r in rows]
+
+    async def test_fetch_raw(self):
+        """Tests raw rows are filtered, sorted and keep only columns"""
+        mirror = SlimsMirror(":memory:")
+        mirror.upsert(
+            "Content",
+            [
+                create_entity("Content", 1, cntn_fk_a=1, cntn_id="a"),
+                create_entity("Content", 2, cntn_fk_a=2, cntn_id="b"),
+                create_entity("Content", 3, cntn_fk_a=1, cntn_id="c"),
+            ],
+        )
+        rows = await mirror.fetch_raw(
+            "Content",
+            equals("cntn_fk_a", 1),
+            columns=["cntn_id"],
+            sort=["-cntn_id"],
+        )
+        assert [3, 1] == [r.pk() for r in rows]
+        assert [{"cntn_id"}, {"cntn_id"}] == [set(vars(r)) for r in rows]
+        assert "c" == rows[0].cntn_id.value
+
+    def test_upsert_replaces_keys(self):
+        """Tests updated rows are re-indexed"""
+        mirror = SlimsMirror(":memory:")
+        mirror.upsert("Content", [create_entity("Content", 1, cntn_fk_a=1)])
+        mirror.upsert("Content", [create_entity("Content", 1, cntn_fk_a=2)])
+        assert [] == mirror.fetch_records("Content", equals("cntn_fk_a", 1))
+        assert 1 == len(
+            mirror.fetch_records("Content", equals("cntn_fk_a", 2))
+        )
+
+    def test_lookup_columns_indexed(self):
+        """Tests equals on a lookup column does not scan the table"""
+        mirror = SlimsMirror(":memory:")
+        mirror.upsert(
+            "Content",
+            [
+                create_entity("Content", 1, cntn_barCode="0123"),
+                create_entity("Content", 2, cntn_barCode="123"),
+                create_entity("Content", 3, cntn_cf_name="0123"),
+            ],
+        )
+        assert {1} == mirror._get_candidate_pks(
+            "Content", equals("cntn_barCode", "0123").to_dict()
+        )
+        assert (
+            mirror._get_candidate_pks(
+                "Content", equals("cntn_cf_name", "0123").to_dict()
+            )
+            is None
+        )
+        records = mirror.fetch_records(
+            "Content", equals("cntn_barCode", "0123")
+        )
+        assert [1] == [r.pk() for r in records]
+
+    def test_reindex_older_schema(self, tmp_path: Path):
+        """Tests the key index of an older mirror file is rebuilt"""
+        path = str(tmp_path / "mirror.db")
+        mirror = SlimsMirror(path)
+        mirror.upsert("Content", [create_entity("Content", 1, cntn_id="a")])
+        mirror._connection.execute("DELETE FROM record_keys")
+        mirror._connection.execute("PRAGMA user_version = 0")
+        mirror._connection.commit()
+        mirror.close()
+        mirror = SlimsMirror(path)
+        records = mirror.fetch_records("Content", equals("cntn_id", "a"))
+        assert [1] == [r.pk() for r in records]
+        version = mirror._connection.execute("PRAGMA user_version")
+        assert [(1,)] == version.fetchall()
+        mirror.close()
+        mirror = SlimsMirror(path)
+        assert [("cntn_id", "a"), ("cntn_pk", 1)] == sorted(
+            mirror._connection.execute(
+                "SELECT column_name, value FROM record_keys"
+            ).fetchall()
+        )
+        mirror.close()
+
+    async def test_fetch_in_thread(self):
+        """Tests fetch runs the SQLite queries in a worker thread"""
+        mirror = SlimsMirror(":memory:")
+        with patch(
+            "aind_slims_service_server.mirror.asyncio.to_thread",
+            wraps=asyncio.to_thread,
+        ) as mock_to_thread:
+            await mirror.fetch("Content", None)
+            await mirror.fetch_raw("Content", None)
+        assert [mirror.fetch_records, mirror._fetch_raw_records] == [
+            c.args[0] for c in mock_to_thread.call_args_list
+        ]
+
+    def test_matches(self):
+        """Tests evaluation of criteria against column values"""
+        values = {"a": 5, "b": None, "c": "Brain"}
+        assert SlimsMirror.matches(values, is_null("b").to_dict())
+        assert SlimsMirror.matches(values, is_not_null("a").to_dict())
+        assert SlimsMirror.matches(
+            values, between_inclusive("a", 1, 5).to_dict()
+        )
+        assert SlimsMirror.matches(
+            values,
+            disjunction()
+            .add(equals("a", 1))
+            .add(greater_than_or_equal("a", 5))
+            .to_dict(),
+        )
+        assert not SlimsMirror.matches(values, equals("b", 1).to_dict())
+        assert not SlimsMirror.matches(
+            values, {"operator": "not", "criteria": [equals("a", 5).to_dict()]}
+        )
+        with pytest.raises(ValueError):
+            SlimsMirror.matches(values, {"fieldName": "a", "operator": "x"})
+
+    async def test_sync(self):
+        """Tests tables are synced in pages and then incrementally"""
+        mirror = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        pages = [
+            [
+                Record(create_entity("Content", 1, cntn_modifiedOn=10), None),
+                Record(create_entity("Content", 2, cntn_modifiedOn=20), None),
+            ],
+            [],
+            [Record(create_entity("Content", 2, cntn_modifiedOn=30), None)],
+        ]
+        session = MagicMock()
+        session.fetch = AsyncMock(side_effect=pages)
+        assert 2 == await mirror.sync(session, page_size=2)
+        assert mirror.ready
+        assert 20 == mirror.get_modified_on("Content")
+        assert 1 == await mirror.sync(session, page_size=2)
+        assert 30 == mirror.get_modified_on("Content")
+        second_call = session.fetch.await_args_list[1].kwargs
+        assert (
+            SlimsTableHandler.get_after_criteria(
+                "cntn_modifiedOn", "cntn_pk", 20, 2
+            ).to_dict()
+            == second_call["criteria"].to_dict()
+        )
+        assert ["cntn_modifiedOn", "cntn_pk"] == second_call["sort"]
+        assert (0, 2) == (second_call["start"], second_call["end"])
+        last_call = session.fetch.await_args_list[-1].kwargs
+        assert {
+            "fieldName": "cntn_modifiedOn",
+            "operator": "greaterOrEqual",
+            "value": 20,
+        } == last_call["criteria"].to_dict()
+        assert 2 == len(mirror.fetch_records("Content", None))
+
+    async def test_sync_row_modified_during_sync(self):
+        """Tests a row modified mid-sync does not make the sync skip rows"""
+        source = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        source.upsert(
+            "Content",
+            [
+                create_entity("Content", pk, cntn_modifiedOn=10)
+                for pk in range(1, 6)
+            ],
+        )
+        fetch = source.fetch
+
+        async def fetch_and_modify(**kwargs):
+            """Modify row 1 after the first page is fetched"""
+            rows = await fetch(**kwargs)
+            source.upsert(
+                "Content", [create_entity("Content", 1, cntn_modifiedOn=20)]
+            )
+            return rows
+
+        session = MagicMock(fetch=AsyncMock(side_effect=fetch_and_modify))
+        mirror = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        await mirror.sync_table(session, "Content", page_size=2)
+        assert {1, 2, 3, 4, 5} == mirror.get_pks("Content")
+        assert 20 == mirror.get_modified_on("Content")
+
+    async def test_reconcile(self):
+        """Tests rows deleted in SLIMS are removed and missing rows pulled"""
+        source = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        source.upsert(
+            "Content",
+            [create_entity("Content", pk, cntn_fk_a=pk) for pk in (1, 2, 3)],
+        )
+        session = MagicMock(
+            fetch=AsyncMock(side_effect=source.fetch),
+            fetch_raw=AsyncMock(side_effect=source.fetch_raw),
+        )
+        mirror = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        mirror.upsert(
+            "Content",
+            [create_entity("Content", pk, cntn_fk_a=pk) for pk in (1, 2, 4)],
+        )
+        assert 2 == await mirror.reconcile(session, page_size=2)
+        assert {1, 2, 3} == mirror.get_pks("Content")
+        assert [] == mirror.fetch_records("Content", equals("cntn_fk_a", 4))
+        assert 2 == session.fetch_raw.await_count
+        metrics = mirror.metrics()
+        assert (1, 1) == (metrics.rows_deleted, metrics.rows_restored)
+        assert metrics.reconciled_at is not None
+        assert metrics.synced_at is None
+
+    @patch("aind_slims_service_server.mirror.asyncio.sleep")
+    @patch("logging.warning")
+    async def test_run(self, mock_warn: MagicMock, mock_sleep: AsyncMock):
+        """Tests run keeps polling after a failed sync"""
+        mirror = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        session = MagicMock()
+        session.fetch = AsyncMock(side_effect=[Exception("down"), []])
+        mock_sleep.side_effect = [None, asyncio.CancelledError()]
+        with pytest.raises(asyncio.CancelledError):
+            await mirror.run(session, poll_seconds=1, page_size=10)
+        mock_warn.assert_called_once()
+        assert mirror.ready
+
+    @patch("aind_slims_service_server.mirror.asyncio.sleep")
+    async def test_run_reconciles(self, mock_sleep: AsyncMock):
+        """Tests run reconciles after the first sync and then when due"""
+        mirror = SlimsMirror(":memory:", tables={"Content": "cntn"})
+        session = MagicMock(fetch=AsyncMock(return_value=[]))
+        mock_sleep.side_effect = [None, asyncio.CancelledError()]
+        reconcile = AsyncMock(return_value=0)
+        with (
+            patch.object(mirror, "reconcile", reconcile),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await mirror.run(
+                session, poll_seconds=1, page_size=10, reconcile_seconds=3600
+            )
+        reconcile.assert_awaited_once_with(session, 10)
+        assert 2 == session.fetch.await_count
+
+    def test_close(self):
+        """Tests close closes the connection"""
+        mirror = SlimsMirror(":memory:")
+        mirror.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            mirror.get_modified_on("Content")
+
+    def test_get_graph_session(self):
+        """Tests the mirror is used only once it is ready"""
+        mirror = SlimsMirror(":memory:")
+        with patch("aind_slims_service_server.mirror.mirror", mirror):
+            assert mirror is not get_graph_session()
+            mirror.ready = True
+            assert mirror is get_graph_session()
+
+    async def test_lifespan_syncs_mirror(self):
+        """Tests the app starts and stops syncing the mirror"""
+        mirror = MagicMock()
+        mirror.run = AsyncMock()
+        async_session = MagicMock()
+        async_session.aclose = AsyncMock()
+        with (
+            patch("aind_slims_service_server.main.mirror", mirror),
+            patch(
+                "aind_slims_service_server.main.async_session", async_session
+            ),
+        ):
+            async with lifespan(MagicMock()):
+                await asyncio.sleep(0)
+        mirror.run.assert_awaited_once()
+        mirror.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,10 +1,24 @@
 """Test routes"""
 
-from unittest.mock import MagicMock
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from starlette.testclient import TestClient
 
+from aind_slims_service_server.cache import reference_cache
+from aind_slims_service_server.handlers.ecephys import EcephysSessionHandler
+from aind_slims_service_server.handlers.table_handler import SlimsTableHandler
+from aind_slims_service_server.mirror import SlimsMirror
+from aind_slims_service_server.models import SubjectBatchQuery
+from aind_slims_service_server.route import (
+    HISTOLOGY_BY_SUBJECT_ADAPTER,
+    _get_by_subject,
+    get_table_handler,
+)
+from aind_slims_service_server.session import settings
+
 
 class TestRoutes:
     """Test all API routes."""
@@ -15,6 +29,59 @@ class TestRoutes:
         assert response.status_code == 200
         assert response.json()["status"] == "OK"
 
+    def test_get_table_handler(self):
+        """Tests handlers are created with the shared fetch settings"""
+        session = MagicMock()
+        handler = get_table_handler(EcephysSessionHandler)(session)
+        assert isinstance(handler, EcephysSessionHandler)
+        assert session is handler.session
+        assert settings.fetch_max_workers == handler.max_workers
+        assert settings.fk_chunk_size == handler.fk_chunk_size
+        assert reference_cache is handler.reference_cache
+
+    def test_get_session_pool_metrics(self, client):
+        """Tests session pool metrics response"""
+        response = client.get("/healthcheck/session_pool")
+        assert response.status_code == 200
+        assert response.json()["max_connections"] == 100
+        assert response.json()["max_client_requests"] == 10000
+
+    def test_get_mirror_metrics(self, client):
+        """Tests mirror metrics response"""
+        response = client.get("/healthcheck/mirror")
+        assert response.status_code == 200
+        assert response.json()["enabled"] is False
+        with patch(
+            "aind_slims_service_server.route.mirror", SlimsMirror(":memory:")
+        ):
+            response = client.get("/healthcheck/mirror")
+        assert response.json()["enabled"] is True
+        assert response.json()["synced_at"] is None
+
+    def test_get_single_flight_metrics(self, client):
+        """Tests single flight metrics response"""
+        response = client.get("/healthcheck/single_flight")
+        assert response.status_code == 200
+        assert response.json()["in_flight"] == 0
+
+    def test_get_reference_cache_metrics(self, client):
+        """Tests reference cache metrics response"""
+        response = client.get("/healthcheck/reference_cache")
+        assert response.status_code == 200
+        assert response.json()["max_size"] == 256
+
+    def test_get_result_cache_metrics(self, client):
+        """Tests result cache metrics response"""
+        response = client.get("/healthcheck/result_cache")
+        assert response.status_code == 200
+        assert response.json()["max_size"] == 4096
+
+    def test_get_attachment_cache_metrics(self, client):
+        """Tests attachment cache metrics response"""
+        response = client.get("/healthcheck/attachment_cache")
+        assert response.status_code == 200
+        assert response.json()["max_size"] == 256
+
     def test_get_200_ecephys_sessions(
         self, client: TestClient, mock_get_ecephys_data: MagicMock
     ):
@@ -77,6 +144,233 @@ class TestRoutes:
         assert len(data) > 0
         assert data[0]["subject_id"] == "762287"
 
+    def test_get_200_water_restriction_data_by_day(
+        self, client: TestClient, mock_get_water_restriction_data: MagicMock
+    ):
+        """Tests a date window is served from the result cache"""
+        url = (
+            "/water_restriction?subject_id=762287"
+            "&start_date_gte=2024-12-13T00:00:00Z"
+            "&end_date_lte=2024-12-13T20:00:00Z"
+        )
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        hits = client.get("/healthcheck/result_cache").json()["hits"]
+        response = client.get(url)
+        assert len(response.json()) == 1
+        assert client.get("/healthcheck/result_cache").json()["hits"] == (
+            hits + 1
+        )
+
+    def test_get_ndjson_water_restriction_data(
+        self, client: TestClient, mock_get_water_restriction_data: MagicMock
+    ):
+        """Tests streaming newline-delimited JSON with stream=true"""
+        response = client.get("/water_restriction?stream=true")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["subject_id"] == "762287"
+
+    @pytest.mark.parametrize(
+        "url, mock_fixture",
+        [
+            ("/ecephys_sessions", "mock_get_ecephys_data"),
+            ("/smartspim_imaging", "mock_get_imaging_data"),
+            ("/histology", "mock_get_histology_data"),
+            ("/viral_injections", "mock_get_viral_injection_data"),
+        ],
+    )
+    def test_get_ndjson_all_endpoints(
+        self,
+        client: TestClient,
+        request: pytest.FixtureRequest,
+        url: str,
+        mock_fixture: str,
+    ):
+        """Tests every list endpoint can stream newline-delimited JSON"""
+        request.getfixturevalue(mock_fixture)
+        response = client.get(url, params={"stream": True})
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) > 0
+
+    @pytest.mark.parametrize(
+        "url, mock_fixture, model",
+        [
+            ("/ecephys_sessions", "mock_get_ecephys_data", "SlimsEcephysData"),
+            ("/smartspim_imaging", "mock_get_imaging_data", "SlimsSpimData"),
+            ("/histology", "mock_get_histology_data", "SlimsHistologyData"),
+            (
+                "/viral_injections",
+                "mock_get_viral_injection_data",
+                "SlimsViralInjectionData",
+            ),
+        ],
+    )
+    def test_get_json_all_endpoints(
+        self,
+        client: TestClient,
+        request: pytest.FixtureRequest,
+        url: str,
+        mock_fixture: str,
+        model: str,
+    ):
+        """Tests the serialized lists match the models and the schema"""
+        request.getfixturevalue(mock_fixture)
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        streamed = client.get(url, params={"stream": True})
+        expected = [json.loads(line) for line in streamed.text.splitlines()]
+        assert response.json() == expected
+        schema = client.get("/openapi.json").json()["paths"][url]["get"]
+        assert schema["responses"]["200"]["content"]["application/json"][
+            "schema"
+        ]["items"] == {"$ref": f"#/components/schemas/{model}"}
+
+    def test_get_water_restriction_data_page(
+        self, client: TestClient, mock_get_water_restriction_data: MagicMock
+    ):
+        """Tests a page of results with the cursor of the next page"""
+        response = client.get("/water_restriction?limit=1")
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        cursor = response.headers["X-Next-Cursor"]
+        with patch.object(
+            SlimsTableHandler,
+            "decode_cursor",
+            wraps=SlimsTableHandler.decode_cursor,
+        ) as mock_decode_cursor:
+            response = client.get(
+                "/water_restriction",
+                params={"limit": 2, "cursor": cursor, "stream": True},
+            )
+        mock_decode_cursor.assert_called_once_with(cursor)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.parametrize(
+        "url, mock_fixture, has_next_page",
+        [
+            ("/ecephys_sessions", "mock_get_ecephys_data", True),
+            ("/smartspim_imaging", "mock_get_imaging_data", True),
+            ("/histology", "mock_get_histology_data", True),
+            # The newest viral injection in the resources has no created on
+            ("/viral_injections", "mock_get_viral_injection_data", False),
+        ],
+    )
+    def test_get_page_all_endpoints(
+        self,
+        client: TestClient,
+        request: pytest.FixtureRequest,
+        url: str,
+        mock_fixture: str,
+        has_next_page: bool,
+    ):
+        """Tests every list endpoint can return a page of results"""
+        request.getfixturevalue(mock_fixture)
+        response = client.get(url, params={"limit": 1})
+        assert response.status_code == 200
+        assert has_next_page == ("X-Next-Cursor" in response.headers)
+
+    def test_get_page_bad_cursor(self, client: TestClient):
+        """Tests 400 is returned for malformed or unbounded cursors"""
+        response = client.get("/water_restriction?limit=1&cursor=a")
+        assert response.status_code == 400
+        response = client.get("/water_restriction?cursor=WzEsIDJd")
+        assert response.status_code == 400
+
+    def test_get_ndjson_accept_header(
+        self, client: TestClient, mock_get_ecephys_data: MagicMock
+    ):
+        """Tests streaming newline-delimited JSON with an Accept header"""
+        response = client.get(
+            "/ecephys_sessions?subject_id=0",
+            headers={"Accept": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.text == ""
+
+    @pytest.mark.parametrize(
+        "url, mock_fixture, subject_id",
+        [
+            ("/ecephys_sessions", "mock_get_ecephys_data", "750108"),
+            ("/smartspim_imaging", "mock_get_imaging_data", "744742"),
+            ("/histology", "mock_get_histology_data", "754372"),
+            (
+                "/water_restriction",
+                "mock_get_water_restriction_data",
+                "762287",
+            ),
+            ("/viral_injections", "mock_get_viral_injection_data", "614178"),
+        ],
+    )
+    def test_post_by_subject_all_endpoints(
+        self,
+        client: TestClient,
+        request: pytest.FixtureRequest,
+        url: str,
+        mock_fixture: str,
+        subject_id: str,
+    ):
+        """Tests every list endpoint can be queried for a batch of subjects"""
+        request.getfixturevalue(mock_fixture)
+        response = client.post(
+            f"{url}/by_subject", json={"subject_ids": [subject_id, "0"]}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert [subject_id, "0"] == list(data)
+        assert (
+            data[subject_id]
+            == client.get(url, params={"subject_id": subject_id}).json()
+        )
+        assert data["0"] == []
+
+    async def test_by_subject_coalesces_equal_dates(self):
+        """Tests batches with the same dates spelled differently coalesce"""
+        release = asyncio.Event()
+
+        async def fetch(**kwargs):
+            """Slow batch query"""
+            await release.wait()
+            return {"1": []}
+
+        handler = MagicMock()
+        handler.get_data_by_subject_async = AsyncMock(side_effect=fetch)
+        tasks = [
+            asyncio.ensure_future(
+                _get_by_subject(
+                    "histology",
+                    handler,
+                    adapter=HISTOLOGY_BY_SUBJECT_ADAPTER,
+                    query=SubjectBatchQuery(
+                        subject_ids=["1"], start_date_gte=start_date_gte
+                    ),
+                )
+            )
+            for start_date_gte in ("2025-04-10", "2025-04-10T00:00:00")
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(*tasks)
+        assert [b'{"1":[]}'] * 2 == [r.body for r in responses]
+        handler.get_data_by_subject_async.assert_awaited_once()
+
+    def test_post_by_subject_invalid_body(self, client: TestClient):
+        """Tests 422 is returned for empty or oversized batches"""
+        for subject_ids in [[], [""], [str(i) for i in range(501)]]:
+            response = client.post(
+                "/water_restriction/by_subject",
+                json={"subject_ids": subject_ids},
+            )
+            assert response.status_code == 422
+
     def test_get_200_viral_injection_data(
         self, client: TestClient, mock_get_viral_injection_data: MagicMock
     ):
@@ -1,19 +0,0 @@
-"""Tests session module"""
-
-import pytest
-
-from aind_slims_service_server.session import get_session
-
-
-class TestSession:
-    """Test methods in Session Class"""
-
-    def test_get_session(self):
-        """Tests get_session method."""
-
-        session = next(get_session())
-        assert "slims_password" == session.slims_api.password
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
@@ -0,0 +1,79 @@
+"""Tests single_flight module"""
+
+import asyncio
+import unittest
+
+from aind_slims_service_server.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Test methods in SingleFlight class"""
+
+    def test_make_key(self):
+        """Tests key ignores argument order and unset parameters."""
+        key1 = SingleFlight.make_key("histology", subject_id="1", start=None)
+        key2 = SingleFlight.make_key("histology", end=None, subject_id="1")
+        key3 = SingleFlight.make_key("imaging", subject_id="1")
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    async def test_do_coalesces(self):
+        """Tests concurrent calls with the same key share one execution."""
+        single_flight = SingleFlight()
+        calls = []
+        release = asyncio.Event()
+
+        async def func():
+            """Slow upstream query"""
+            calls.append(1)
+            await release.wait()
+            return ["result"]
+
+        tasks = [
+            asyncio.ensure_future(single_flight.do("key", func))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(1, single_flight.metrics().in_flight)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        self.assertEqual([["result"]] * 3, results)
+        self.assertEqual(1, len(calls))
+        metrics = single_flight.metrics()
+        self.assertEqual(0, metrics.in_flight)
+        self.assertEqual(1, metrics.executed)
+        self.assertEqual(2, metrics.coalesced)
+
+    async def test_do_sequential(self):
+        """Tests finished calls are not reused."""
+        single_flight = SingleFlight()
+
+        async def func():
+            """Fast upstream query"""
+            return 1
+
+        await single_flight.do("key", func)
+        await single_flight.do("key", func)
+        self.assertEqual(2, single_flight.metrics().executed)
+        self.assertEqual(0, single_flight.metrics().coalesced)
+
+    async def test_do_error(self):
+        """Tests errors are raised to every waiting caller."""
+        single_flight = SingleFlight()
+
+        async def func():
+            """Failing upstream query"""
+            await asyncio.sleep(0)
+            raise ValueError("bad")
+
+        results = await asyncio.gather(
+            single_flight.do("key", func),
+            single_flight.do("key", func),
+            return_exceptions=True,
+        )
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(0, single_flight.metrics().in_flight)
+
+
+if __name__ == "__main__":
+    unittest.main()